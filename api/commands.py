@@ -1,5 +1,6 @@
 import logging
 import uuid
+from typing import Callable, Optional, Type
 
 import sentry_sdk
 from django.db import transaction
@@ -22,6 +23,7 @@ from api.services.subtask_update_entity_service import SubtaskUpdateEntityServic
 from api.services.task_entity_service import TaskEntityService
 from api.services.task_update_entity_service import TaskUpdateEntityService
 from api.utilities.helpers import Request
+from mbuild.settings import COMMANDS_PROCESSING_BATCH_SIZE
 
 
 class CommandEntityProcessObject(object):
@@ -33,6 +35,35 @@ class CommandEntityProcessObject(object):
         self.parent_entity = parent_entity
 
 
+class CommandBatchCache(object):
+    """
+    Entities shared by commands of a single batch, so they are fetched once per batch.
+    """
+    def __init__(self, commands: list):
+        self.users = User.all_objects.in_bulk({command.user for command in commands if command.user is not None})
+        self.parent_entities = {}
+
+    def get_user(self, pk: int) -> User:
+        if pk not in self.users:
+            self.users[pk] = User.all_objects.filter(pk=pk).get()
+
+        return self.users[pk]
+
+    def get_parent_entity(self, model: Type, local_id: str):
+        key = (model, local_id)
+        if key not in self.parent_entities:
+            parent_entity = model.objects.filter(local_id=local_id).first()
+            if not parent_entity:
+                return None
+
+            self.parent_entities[key] = parent_entity
+
+        return self.parent_entities[key]
+
+    def clear_parent_entities(self) -> None:
+        self.parent_entities = {}
+
+
 logger = logging.getLogger(__name__)
 command_entities_process_objects = {
     Entities.USER.value: CommandEntityProcessObject(
@@ -79,20 +110,43 @@ command_entities_process_objects = {
 
 
 def process_commands(commands: list):
+    commands = list(commands)
+
+    for batch_start in range(0, len(commands), COMMANDS_PROCESSING_BATCH_SIZE):
+        batch = commands[batch_start:batch_start + COMMANDS_PROCESSING_BATCH_SIZE]
+        process_commands_batch(batch)
+
+
+def process_commands_batch(commands: list, on_command_processed: Optional[Callable[[CommandModel], None]] = None):
+    # Each command is committed in its own transaction, so a batch doesn't hold locks
+    # of all its commands. Users and parent entities are still fetched once per batch.
+    batch_cache = CommandBatchCache(commands)
+
     for command in commands:
-        with transaction.atomic():
+        process_command(command, batch_cache)
+        if on_command_processed:
+            on_command_processed(command)
+
+        # Command is marked right after its commit, so it isn't applied again if the batch is interrupted.
+        if not command.is_failed and not command.is_conflicted:
+            command.mark_as_processed()
+
 
+def process_command(command: CommandModel, batch_cache: CommandBatchCache):
+    # Lookups and validation are in the transaction as well, so the command is applied entirely or not at all.
+    try:
+        with transaction.atomic():
             if command.is_entity_create:
-                create_entity(command)
+                create_entity(command, batch_cache)
             elif command.is_entity_update:
-                update_entity(command)
+                update_entity(command, batch_cache)
             elif command.is_entity_delete:
                 delete_entity(command)
+                batch_cache.clear_parent_entities()
             elif command.is_entity_restore:
                 restore_entity(command)
-
-            if not command.is_failed and not command.is_conflicted:
-                command.mark_as_processed()
+    except BaseException as e:
+        capture_fail(e, CommandModel.FailReason.INTERNAL_ERROR, command)
 
 
 def validate(serializer, command: CommandModel):
@@ -106,12 +160,13 @@ def validate(serializer, command: CommandModel):
 
 def perform_action(callback: callable, command: CommandModel):
     try:
-        callback()
+        with transaction.atomic():
+            callback()
     except BaseException as e:
         capture_fail(e, CommandModel.FailReason.INTERNAL_ERROR, command)
 
 
-def create_entity(command: CommandModel):
+def create_entity(command: CommandModel, batch_cache: CommandBatchCache):
     def has_reference_to_local_parent_entity():
         return command.data.get('parent_entity_local_id') is not None
 
@@ -130,9 +185,9 @@ def create_entity(command: CommandModel):
         parent_command_process_object = command_entities_process_objects.get(
             command_process_object.parent_entity
         )
-        parent_entity = parent_command_process_object.model.objects.filter(
-            local_id=command.data['parent_entity_local_id']
-        ).first()
+        parent_entity = batch_cache.get_parent_entity(
+            parent_command_process_object.model, command.data['parent_entity_local_id']
+        )
 
         if not parent_entity:
             logger.error('Missed parent entity')
@@ -141,7 +196,7 @@ def create_entity(command: CommandModel):
 
         command.data[command_process_object.parent_entity] = parent_entity.pk
 
-    user = User.all_objects.filter(pk=command.user).get()
+    user = batch_cache.get_user(command.user)
     serializer_context = {
         'data': command.data,
         'context': {
@@ -172,25 +227,27 @@ def create_entity(command: CommandModel):
 
 def perform_creation(command_process_object, serializer, serializer_context: dict, handler_context: dict, command: CommandModel):
     try:
-        if command_process_object.handler:
-            command_process_object.handler().create(serializer.validated_data, **handler_context)
-        else:
-            serializer(**serializer_context).create(serializer.validated_data)
+        with transaction.atomic():
+            if command_process_object.handler:
+                command_process_object.handler().create(serializer.validated_data, **handler_context)
+            else:
+                serializer(**serializer_context).create(serializer.validated_data)
     except BaseException as e:
         capture_fail(e, CommandModel.FailReason.INTERNAL_ERROR, command)
 
 
 def perform_update(instance, command_process_object, serializer, serializer_context: dict, handler_context: dict, command: CommandModel):
     try:
-        if command_process_object.handler:
-            command_process_object.handler().update(instance, serializer.validated_data, **handler_context)
-        else:
-            serializer(**serializer_context).update(instance, serializer.validated_data)
+        with transaction.atomic():
+            if command_process_object.handler:
+                command_process_object.handler().update(instance, serializer.validated_data, **handler_context)
+            else:
+                serializer(**serializer_context).update(instance, serializer.validated_data)
     except BaseException as e:
         capture_fail(e, CommandModel.FailReason.INTERNAL_ERROR, command)
 
 
-def update_entity(command: CommandModel):
+def update_entity(command: CommandModel, batch_cache: CommandBatchCache):
     command_process_object = command_entities_process_objects.get(command.entity)
     if not command_process_object:
         command.failed_by_invalid_entity()
@@ -209,7 +266,7 @@ def update_entity(command: CommandModel):
         'data': command.data,
         'partial': True,
         'context': {
-            'request': Request(User.all_objects.filter(pk=command.user).get(), []),
+            'request': Request(batch_cache.get_user(command.user), []),
             'project_pk': command.project_id
         },
     }
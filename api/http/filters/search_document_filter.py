@@ -0,0 +1,16 @@
+from rest_framework.filters import SearchFilter
+
+from api.services.search_document_service import SearchDocumentService
+
+
+class SearchDocumentFilter(SearchFilter):
+    """
+    Search by the search document of the entity instead of `search_fields`.
+    Each search term has to be a part of the document, so lookups don't join
+    related tables and can use trigram index of the document.
+    """
+    def filter_queryset(self, request, queryset, view):
+        for search_term in self.get_search_terms(request):
+            queryset = queryset.filter(search_document__contains=SearchDocumentService.normalize(search_term))
+
+        return queryset
@@ -1,5 +1,7 @@
 from rest_framework.response import Response
 
+from api.utilities.helpers import get_boolean_query_param
+
 
 class ListModelMixin:
     """
@@ -9,7 +11,9 @@ class ListModelMixin:
         queryset = self.filter_queryset(self.get_queryset())
         if request.query_params.get('get_total_items_count'):
             return Response({
-                'total_items': self.paginator.django_paginator_class(queryset, self.paginator.page_size).get_total_items_count(),
+                'total_items': self.paginator.django_paginator_class(queryset, self.paginator.page_size).get_total_items_count(
+                    approximate=get_boolean_query_param(request.query_params, 'approximate_total_items_count', False)
+                ),
             })
 
         page = self.paginate_queryset(queryset)
@@ -1 +1,3 @@
 from .page_number import PageNumberPagination
+from .event_cursor import EventCursorPagination
+from .keyset import KeysetPagination
@@ -0,0 +1,66 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine import Q
+from rest_framework import pagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+class EventCursorPagination(pagination.BasePagination):
+    """
+    Keyset pagination over events ordered by creation time.
+    Events with the same creation time are ordered by id, so
+    the opaque `after` token always points to a single event.
+    """
+    cursor_query_param = 'after'
+    page_size_query_param = 'per_page'
+    page_size = 100
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+
+        if cursor := request.query_params.get(self.cursor_query_param):
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+
+        events = list(queryset.order_by('created_at', 'id')[:self.page_size + 1])
+        self.has_next = len(events) > self.page_size
+        self.page = events[:self.page_size]
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next_cursor': self.encode_cursor(self.page[-1]) if self.has_next else None,
+            'items': data
+        })
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Parameter should be an integer.'})
+
+        if page_size < 1:
+            raise ValidationError({self.page_size_query_param: 'Parameter should be a positive integer.'})
+
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def encode_cursor(event) -> str:
+        cursor = json.dumps([event.created_at.isoformat(), str(event.id)])
+
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[datetime, ObjectId]:
+        try:
+            created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+            return datetime.fromisoformat(created_at), ObjectId(pk)
+        except (ValueError, TypeError, InvalidId):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
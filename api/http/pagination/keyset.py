@@ -0,0 +1,188 @@
+import base64
+import datetime
+import json
+from typing import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Field, OrderBy, Q, QuerySet
+from django.db.models.expressions import ExpressionWrapper, RawSQL
+from django.http import StreamingHttpResponse
+from rest_framework import pagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.http.pagination.paginator import Paginator
+
+
+class KeysetCursorEncoder(DjangoJSONEncoder):
+    """
+    Keeps microseconds of time values, which are cut to milliseconds by DjangoJSONEncoder,
+    so the cursor is equal to the key of the last row.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+
+        return super().default(o)
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Keyset pagination over the ordering of the queryset, including composite
+    orderings by annotations and raw expressions. Ordering always ends with
+    the primary key, so the opaque `after` token always points to a single row.
+    Nulls are placed as in Postgres: last in ascending and first in descending order.
+    With `all` parameter the whole list is streamed by chunks of `chunk_size` items.
+    """
+    cursor_query_param = 'after'
+    page_size_query_param = 'per_page'
+    page_size = 10
+    max_page_size = 1000
+    chunk_size = 500
+    key_prefix = '_keyset_'
+    django_paginator_class = Paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        ordering = self.get_ordering(queryset)
+        self.keys = [self._get_key(queryset, item) for item in ordering]
+        queryset = self.annotate_keys(queryset).order_by(*ordering)
+
+        if request.query_params.get('all', False):
+            # Items are serialized chunk by chunk when the response is streamed.
+            self.queryset = queryset
+            self.page = []
+
+            return self.page
+
+        page_size = self.get_page_size(request)
+        if cursor := request.query_params.get(self.cursor_query_param):
+            queryset = queryset.filter(self.get_after_filter(self.decode_cursor(cursor)))
+
+        items = list(queryset[:page_size + 1])
+        self.has_next = len(items) > page_size
+        self.page = items[:page_size]
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.request.query_params.get('all', False):
+            return StreamingHttpResponse(self.stream_all(), content_type='application/json')
+
+        return Response({
+            'next_cursor': self.encode_cursor(self.page[-1]) if self.has_next else None,
+            'items': data
+        })
+
+    def stream_all(self) -> Iterator[str]:
+        yield '{"next_cursor": null, "items": ['
+
+        values, is_first = None, True
+        while True:
+            queryset = self.queryset.filter(self.get_after_filter(values)) if values is not None else self.queryset
+            chunk = list(queryset[:self.chunk_size])
+            if not chunk:
+                break
+
+            data = json.dumps(self.view.get_serializer(chunk, many=True).data, cls=JSONEncoder)[1:-1]
+            if data:
+                yield data if is_first else ',' + data
+                is_first = False
+
+            if len(chunk) < self.chunk_size:
+                break
+
+            values = self.get_values(chunk[-1])
+
+        yield ']}'
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Parameter should be an integer.'})
+
+        if page_size < 1:
+            raise ValidationError({self.page_size_query_param: 'Parameter should be a positive integer.'})
+
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def get_ordering(queryset: QuerySet) -> list:
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not any(name in ('pk', '-pk', 'id', '-id') for name in ordering if isinstance(name, str)):
+            ordering.append('pk')
+
+        return ordering
+
+    def annotate_keys(self, queryset: QuerySet) -> QuerySet:
+        return queryset.annotate(**{
+            f'{self.key_prefix}{index}': expression for index, (expression, _) in enumerate(self.keys)
+        })
+
+    def get_after_filter(self, values: list) -> Q:
+        if len(values) != len(self.keys):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+
+        after_filter, equal_filter = Q(pk__in=[]), Q()
+        for index, ((_, descending), value) in enumerate(zip(self.keys, values)):
+            key = f'{self.key_prefix}{index}'
+
+            if value is None:
+                key_after_filter = Q(**{f'{key}__isnull': False}) if descending else Q(pk__in=[])
+                key_equal_filter = Q(**{f'{key}__isnull': True})
+            else:
+                key_after_filter = Q(**{f'{key}__lt': value}) if descending \
+                    else Q(**{f'{key}__gt': value}) | Q(**{f'{key}__isnull': True})
+                key_equal_filter = Q(**{key: value})
+
+            after_filter |= equal_filter & key_after_filter
+            equal_filter &= key_equal_filter
+
+        return after_filter
+
+    def get_values(self, item) -> list:
+        return [getattr(item, f'{self.key_prefix}{index}') for index in range(len(self.keys))]
+
+    def encode_cursor(self, item) -> str:
+        cursor = json.dumps(self.get_values(item), cls=KeysetCursorEncoder)
+
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> list:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+
+        if not isinstance(values, list):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+
+        return values
+
+    @staticmethod
+    def _get_key(queryset: QuerySet, item) -> tuple:
+        if isinstance(item, str):
+            if item == '?':
+                raise ValidationError('Random ordering can not be paginated by keys.')
+
+            descending, name = item.startswith('-'), item.lstrip('-')
+            if '.' in name:
+                # Ordering by "table.column" of the queryset table.
+                table, column = name.split('.', 1)
+                expression = F(column) if table == queryset.model._meta.db_table else RawSQL(name, ())
+            else:
+                expression = F(name)
+        elif isinstance(item, OrderBy):
+            expression, descending = item.expression, item.descending
+        else:
+            expression, descending = item, False
+
+        # Raw expressions don't declare output field, their values are used as they are.
+        if not isinstance(expression, F) and getattr(expression, '_output_field_or_none', None) is None:
+            expression = ExpressionWrapper(expression, output_field=Field())
+
+        return expression, descending
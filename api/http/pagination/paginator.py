@@ -1,7 +1,9 @@
+import json
 import sys
 from functools import cached_property
 
 from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
 
 
 class Paginator(DjangoPaginator):
@@ -26,5 +28,25 @@ class Paginator(DjangoPaginator):
     def count(self):
         return sys.maxsize
 
-    def get_total_items_count(self):
+    def get_total_items_count(self, approximate=False):
+        if approximate and (count := self.get_estimated_items_count()) is not None:
+            return count
+
         return super().count
+
+    def get_estimated_items_count(self):
+        """Return the number of rows estimated by Postgres planner, without running the query."""
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        sql, params = self.object_list.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+
+        # Plan is decoded by the database driver, but it may be returned as text by other drivers.
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return int(plan[0]['Plan']['Plan Rows'])
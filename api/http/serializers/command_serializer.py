@@ -1,5 +1,6 @@
 import pendulum
 from rest_framework.fields import ChoiceField, DateTimeField, IntegerField
+from rest_framework.serializers import ListSerializer
 from rest_framework_mongoengine.fields import DictField, ObjectIdField
 from rest_framework_mongoengine.serializers import DocumentSerializer
 
@@ -7,9 +8,20 @@ from api.enums.entities import Entities
 from api.models import Command
 
 
+class CommandListSerializer(ListSerializer):
+    def create(self, validated_data):
+        # Insert all commands at once, their order is kept by the insertion order.
+        now = pendulum.now()
+        user = self.context['request'].user.pk
+        commands = [Command(**{**item, 'user': user, 'created_at': now, 'updated_at': now}) for item in validated_data]
+
+        return Command.objects.insert(commands) if commands else []
+
+
 class CommandSerializer(DocumentSerializer):
     class Meta:
         model = Command
+        list_serializer_class = CommandListSerializer
         fields = ('id', 'data', 'type', 'status', 'entity', 'project_id', 'created_at', 'updated_at',
                   'related_entities_local_ids', 'user',)
 
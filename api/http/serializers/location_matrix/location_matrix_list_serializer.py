@@ -134,7 +134,7 @@ class LocationMatrixListSerializer(DependentEntityListSyncSerializer):
 
     def _update_entities(self) -> None:
         entities_ids = {item['id'] for item in self._existing_entities_data}
-        location_matrices = self.child.Meta.model.objects.filter(id__in=entities_ids).all()
+        location_matrices = list(self.child.Meta.model.objects.filter(id__in=entities_ids))
         update_floor_plan_with_areas(location_matrices, self._existing_entities_data)
 
         super()._update_entities()
@@ -149,3 +149,19 @@ class LocationMatrixListSerializer(DependentEntityListSyncSerializer):
                     WHERE location_matrix.id = location_matrix_id
                       AND location_matrix_id IN %s
                 """, (tuple(entities_ids),))
+                cursor.execute("""
+                    UPDATE subtasks SET building = tasks.building,
+                                        level = tasks.level,
+                                        area = tasks.area
+                    FROM tasks
+                    WHERE tasks.id = task_id
+                      AND tasks.location_matrix_id IN %s
+                """, (tuple(entities_ids),))
+                cursor.execute("""
+                    UPDATE quality_issue SET building = location_matrix.building,
+                                             level = location_matrix.level,
+                                             area = location_matrix.area
+                    FROM location_matrix
+                    WHERE location_matrix.id = location_matrix_id
+                      AND location_matrix_id IN %s
+                """, (tuple(entities_ids),))
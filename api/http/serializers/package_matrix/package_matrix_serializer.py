@@ -86,7 +86,8 @@ class PackageMatrixSerializer(BaseModelSerializer):
                 ).all()
 
                 restore_tasks_related_to_reinstated_package_matrix(
-                    package_activity, enabled_location_matrix_packages, location_matrix, self.context['request'].user
+                    package_activity, list(enabled_location_matrix_packages), location_matrix,
+                    self.context['request'].user
                 )
             elif not lmp:
                 location_matrix_package = LocationMatrixPackage(
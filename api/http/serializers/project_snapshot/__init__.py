@@ -1 +1,2 @@
 from .project_snapshot_data_serializer import ProjectSnapshotDataSerializer
+from .project_snapshot_generation_serializer import ProjectSnapshotGenerationSerializer
@@ -0,0 +1,27 @@
+from rest_framework.fields import CharField, DateTimeField, IntegerField, SerializerMethodField
+from rest_framework_mongoengine.fields import ObjectIdField
+from rest_framework_mongoengine.serializers import DocumentSerializer
+
+from api.models.project_snapshot import ProjectSnapshot
+
+
+class ProjectSnapshotGenerationSerializer(DocumentSerializer):
+    class Meta:
+        model = ProjectSnapshot
+        fields = ('id', 'project_id', 'status', 'url', 'previous_snapshot', 'since', 'generation_started_at',
+                  'created_at', 'updated_at',)
+
+    id = ObjectIdField(read_only=True)
+    project_id = IntegerField(read_only=True)
+    status = CharField(read_only=True)
+    url = SerializerMethodField()
+    previous_snapshot = CharField(read_only=True)
+    since = DateTimeField(read_only=True)
+    generation_started_at = DateTimeField(read_only=True)
+    created_at = DateTimeField(read_only=True)
+    updated_at = DateTimeField(read_only=True)
+
+    def get_url(self, obj: ProjectSnapshot):
+        from api.services.project_snapshot_service import ProjectSnapshotService
+
+        return ProjectSnapshotService().get_archive_url(obj) if obj.is_completed else None
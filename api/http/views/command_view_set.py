@@ -9,7 +9,7 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rq import Queue, Worker
+from rq import Worker
 
 from api.http.serializers import CommandSerializer
 from api.http.views.mongoengine_view import MongoEngineModelViewSet
@@ -17,6 +17,7 @@ from api.models import Command, Project
 from api.permissions import IsSuperuser
 from api.permissions.events import IsProjectUser
 from api.commands import process_commands
+from api.rq.queues import CommandProjectQueue
 from api.utilities.query_params_utilities import clean_query_param
 from api.utilities.helpers import get_array_parameter
 
@@ -49,22 +50,15 @@ class CommandViewSet(MongoEngineModelViewSet):
         return super().list(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
-        # Process each command separately to save their order.
-        commands = []
         logger.debug('Commands')
         logger.debug(request.data.get('commands', []))
-        for command in request.data.get('commands', []):
-            logger.debug('Process command')
-            logger.debug(command)
-            serializer = self.get_serializer(data=command)
-            serializer.is_valid(raise_exception=True)
+        serializer = self.get_serializer(data=request.data.get('commands', []), many=True)
+        serializer.is_valid(raise_exception=True)
 
-            try:
-                new_command = serializer.create(serializer.validated_data)
-            except NotUniqueError as exc:
-                raise ValidationError(str(exc))
-
-            commands.append(new_command)
+        try:
+            commands = serializer.create(serializer.validated_data)
+        except NotUniqueError as exc:
+            raise ValidationError(str(exc))
 
         queue_name = 'commands-project-*'
         redis_connection = get_connection(queue_name)
@@ -81,8 +75,8 @@ class CommandViewSet(MongoEngineModelViewSet):
             })
 
         logger.warning('Workers: ' + str(worker_dicts))
-        queue = Queue(queue_name.replace('*', str(kwargs['pk'])), connection=redis_connection,
-                      is_async=settings.RQ_QUEUES[queue_name].get('ASYNC', True))
+        queue = CommandProjectQueue(queue_name.replace('*', str(kwargs['pk'])), connection=redis_connection,
+                                    is_async=settings.RQ_QUEUES[queue_name].get('ASYNC', True))
         queue.enqueue(process_commands, commands)
 
         return Response(request.data.get('commands', []), status=status.HTTP_201_CREATED)
@@ -1,16 +1,23 @@
+from datetime import datetime, timezone
+
+import pendulum
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_api_key.permissions import HasAPIKey
 
+from api.exceptions.resync_required import ResyncRequired
+from api.http.pagination import EventCursorPagination
 from api.http.serializers.event.event_create_serializer import EventCreateSerializer
 from api.http.serializers.event.event_serializer import EventSerializer
 from api.http.views.mongoengine_view import MongoEngineModelViewSet
-from api.models import Event, Project
+from api.models import Event, EventCompaction, Project
 from api.permissions import IsSuperuser
 from api.permissions.events import IsProjectUser
 from api.permissions.permission_group import PermissionGroup
+from api.utilities.helpers import get_boolean_query_param
 
 
 class EventViewSet(MongoEngineModelViewSet):
@@ -21,6 +28,16 @@ class EventViewSet(MongoEngineModelViewSet):
 
     serializer_class = EventSerializer
     queryset = Event.objects().order_by('created_at')
+    cursor_pagination_class = EventCursorPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.cursor_pagination_class() \
+                if get_boolean_query_param(self.request.query_params, 'use_cursor_pagination') \
+                else None
+
+        return self._paginator
 
     def create(self, request, *args, **kwargs):
         serializer = EventCreateSerializer(data=request.data)
@@ -38,6 +55,38 @@ class EventViewSet(MongoEngineModelViewSet):
         query_params = request.query_params
 
         if 'processed_from' in query_params:
+            self._check_events_history_is_available(project, self._parse_processed_from(query_params['processed_from']))
             self.queryset = self.queryset.filter(created_at__gt=query_params['processed_from'], project_id=project.pk)
+        elif self.paginator is not None:
+            self.queryset = self.queryset.filter(project_id=project.pk)
+
+        # Events may be compacted between pages, so the position of the cursor is checked as well.
+        if self.paginator is not None and self.paginator.cursor_query_param in query_params:
+            created_at, _ = self.paginator.decode_cursor(query_params[self.paginator.cursor_query_param])
+            self._check_events_history_is_available(project, created_at)
 
         return super().list(request, *args, **kwargs)
+
+    def _parse_processed_from(self, processed_from: str) -> datetime:
+        try:
+            processed_from = pendulum.parse(processed_from)
+        except ValueError:
+            raise ValidationError({'processed_from': 'Parameter should be a date.'})
+
+        # Durations and periods are parsed too, but they don't point to a moment.
+        if not isinstance(processed_from, datetime):
+            raise ValidationError({'processed_from': 'Parameter should be a date.'})
+
+        return processed_from
+
+    def _check_events_history_is_available(self, project: Project, processed_from: datetime) -> None:
+        compaction = EventCompaction.objects(project_id=project.pk).order_by('-compacted_before').first()
+        if compaction is None:
+            return
+
+        # Mongo keeps dates as naive UTC.
+        if processed_from.tzinfo is not None:
+            processed_from = processed_from.astimezone(timezone.utc).replace(tzinfo=None)
+
+        if processed_from < compaction.compacted_before.replace(tzinfo=None):
+            raise ResyncRequired()
@@ -54,3 +54,6 @@ class FloorPlanViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
             instance._prefetched_objects_cache = {}
 
         return Response(serializer.data)
+
+    def perform_destroy(self, instance):
+        FloorPlanEntityService().delete(instance)
@@ -23,7 +23,7 @@ from api.permissions.permission_group import PermissionGroup
 from api.services.location_matrix_entity_service import LocationMatrixEntityService
 from api.utilities.query_params_utilities import clean_query_param
 from api.utilities.helpers import get_array_parameter
-from api.utilities.location_matrix_utilities import annotate_location_matrix_level_parts
+from api.utilities.location_matrix_utilities import annotate_stored_level_parts
 
 
 class LocationMatrixViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
@@ -102,7 +102,7 @@ class LocationMatrixViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
         return response
 
     def __get_ordered_queryset(self, project_pk):
-        queryset = annotate_location_matrix_level_parts(LocationMatrix.objects)
+        queryset = annotate_stored_level_parts(LocationMatrix.objects)
 
         return self.filter_queryset(
             queryset.filter(project=project_pk).order_by('building', '-level_number', 'level_postfix', 'area').all()
@@ -20,6 +20,7 @@ from api.permissions.is_staff import IsStaff
 from api.permissions.not_allow_any import NotAllowAny
 from api.permissions.permission_group import PermissionGroup
 from api.services.media_entity_service import MediaEntityService
+from api.services.signed_url_cache_service import SignedUrlCacheService
 from api.storages import AzurePrivateReportStorage, AzurePrivateProjectSnapshotStorage
 
 
@@ -73,7 +74,7 @@ class MediaViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
 
         serializer = self.get_serializer(data=files, many=True)
         serializer.is_valid(raise_exception=True)
-        objects = [MediaEntityService().create(validated_data) for validated_data in serializer.validated_data]
+        objects = MediaEntityService().create_many(serializer.validated_data)
 
         return Response(self.get_serializer(objects, many=True, expand=['expanded_project_snapshot_thumbnails.expanded_thumbnail']).data,
                         status=status.HTTP_201_CREATED)
@@ -113,22 +114,20 @@ class MediaViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
         return self._get_private_media(media)
 
     def _get_private_media(self, media):
-        storage = media.get_common_storage()
-        link = storage.url(media.original_link)
+        link = SignedUrlCacheService().get_url(media.get_common_storage(), media.original_link)
 
         return HttpResponseRedirect(redirect_to=link)
 
     def retrieve_private_report(self, request, *args, **kwargs):
         media = get_object_or_404(self.get_queryset().filter(hash=kwargs['uuid']))
         storage = default_storage if media.is_public else AzurePrivateReportStorage()
-        link = storage.url(media.original_link)
+        link = SignedUrlCacheService().get_url(storage, media.original_link)
 
         return HttpResponseRedirect(redirect_to=link)
 
     def retrieve_private_project_snapshot(self, request, *args, **kwargs):
         media = get_object_or_404(self.get_queryset().filter(hash=kwargs['uuid']))
-        storage = AzurePrivateProjectSnapshotStorage()
-        link = storage.url(media.original_link)
+        link = SignedUrlCacheService().get_url(AzurePrivateProjectSnapshotStorage(), media.original_link)
 
         return HttpResponseRedirect(redirect_to=link)
 
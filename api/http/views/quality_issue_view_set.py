@@ -1,3 +1,4 @@
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -5,6 +6,7 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework_api_key.permissions import HasAPIKey
 
 from api.http.filters.quality_issue.quality_issue_filter import QualityIssueFilter
+from api.http.filters.search_document_filter import SearchDocumentFilter
 from api.http.mixins import ListModelMixin
 from api.http.serializers.quality_issue.quality_issue_count_serializer import QualityIssueCountSerializer
 from api.http.serializers.quality_issue.quality_issue_serializer import QualityIssueSerializer
@@ -39,12 +41,7 @@ class QualityIssueViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
     service = QualityIssueEntityService()
     queryset = QualityIssue.objects.all()
     filterset_class = QualityIssueFilter
-    search_fields = ['user__last_name', 'user__first_name', 'user__email',
-                     'location_matrix__building', 'location_matrix__area',
-                     'location_matrix__level', 'id', 'description',
-                     'qualityissueupdate__recipients__email',
-                     'qualityissueupdate__recipients__first_name',
-                     'qualityissueupdate__recipients__last_name']
+    filter_backends = (DjangoFilterBackend, SearchDocumentFilter,)
 
     def create(self, request, *args, **kwargs):
         request.data['user'] = request.user.pk
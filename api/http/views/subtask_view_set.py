@@ -3,6 +3,7 @@ from functools import reduce
 from django.db.models import Prefetch, Q, CharField, Count
 from django.db.models.expressions import RawSQL, Value, Subquery, Exists, OuterRef
 from django.db.models.functions import Concat
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -10,6 +11,7 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework_api_key.permissions import HasAPIKey
 
 from api.http.filters.subtask import SubtaskFilter
+from api.http.filters.search_document_filter import SearchDocumentFilter
 from api.http.mixins import ListModelMixin
 from api.http.serializers import UserSerializer, SubtaskSerializer, SubtaskFilesSerializer, SubtaskCountSerializer, \
     SubtaskBulkCreateSerializer, SubtaskBulkCreateFromQualityIssueSerializer, CompanySerializer
@@ -22,7 +24,7 @@ from api.permissions.permission_group import PermissionGroup
 
 from api.queues.send_report import send_csv_report, send_pdf_report
 from api.services.subtask_entity_service import SubtaskEntityService
-from api.utilities.helpers import is_expanded
+from api.utilities.helpers import is_expanded, get_boolean_query_param
 from api.utilities.subtask_utilities import apply_default_ordering, apply_common_filters_queryset
 from api.utilities.tasks_utilities import SerializableRequest
 
@@ -49,11 +51,7 @@ class SubtaskViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
     service = SubtaskEntityService()
     queryset = Subtask.objects.all()
     filterset_class = SubtaskFilter
-    search_fields = ['id', 'description', 'task__location_matrix__building', 'task__location_matrix__level',
-                     'task__location_matrix__area', 'task__package_activity__name',
-                     'task__package_activity_task__description', 'user__last_name', 'user__first_name', 'user__email',
-                     'subtaskupdate__recipients__email', 'subtaskupdate__recipients__first_name',
-                     'subtaskupdate__recipients__last_name']
+    filter_backends = (DjangoFilterBackend, SearchDocumentFilter,)
 
     def get_queryset(self, filter_subcontractors=True):
         queryset = apply_common_filters_queryset(self.queryset, self.request, self.kwargs, filter_subcontractors)
@@ -68,7 +66,9 @@ class SubtaskViewSet(BaseViewSet, ListModelMixin, ModelViewSet):
 
         if request.query_params.get('get_total_items_count'):
             return Response({
-                'total_items': self.paginator.django_paginator_class(queryset, self.paginator.page_size).get_total_items_count(),
+                'total_items': self.paginator.django_paginator_class(queryset, self.paginator.page_size).get_total_items_count(
+                    approximate=get_boolean_query_param(request.query_params, 'approximate_total_items_count', False)
+                ),
             })
 
         page = self.paginate_queryset(queryset)
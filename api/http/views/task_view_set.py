@@ -1,4 +1,5 @@
 from django.db.models import Prefetch, Subquery, Exists, OuterRef
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -6,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework_api_key.permissions import HasAPIKey
 
 from api.http.filters.task.task_filter import TaskFilter
+from api.http.filters.search_document_filter import SearchDocumentFilter
 from api.http.mixins import ListModelMixin
 from api.http.serializers import UserSerializer, TaskSerializer
 from api.http.serializers.task.task_list_serializer import TaskListSerializer
@@ -47,9 +49,7 @@ class TaskViewSet(BaseViewSet, mixins.UpdateModelMixin, ListModelMixin, mixins.R
     service = TaskEntityService()
     queryset = Task.objects.all()
     filterset_class = TaskFilter
-    search_fields = ['building', 'level', 'area', 'package_activity__name', 'package_activity_task__description',
-                     'user__last_name', 'user__first_name', 'user__email', 'taskupdate__recipients__email',
-                     'taskupdate__recipients__first_name', 'taskupdate__recipients__last_name']
+    filter_backends = (DjangoFilterBackend, SearchDocumentFilter,)
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -69,7 +69,9 @@ class TaskViewSet(BaseViewSet, mixins.UpdateModelMixin, ListModelMixin, mixins.R
 
         if request.query_params.get('get_total_items_count'):
             return Response({
-                'total_items': self.paginator.django_paginator_class(queryset, self.paginator.page_size).get_total_items_count(),
+                'total_items': self.paginator.django_paginator_class(queryset, self.paginator.page_size).get_total_items_count(
+                    approximate=get_boolean_query_param(request.query_params, 'approximate_total_items_count', False)
+                ),
             })
 
         page = self.paginate_queryset(queryset)
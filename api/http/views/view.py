@@ -4,7 +4,7 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.filters import SearchFilter
 from rest_framework.pagination import LimitOffsetPagination
 
-from api.http.pagination import PageNumberPagination
+from api.http.pagination import KeysetPagination, PageNumberPagination
 from api.permissions.permission_group import PermissionGroup
 from api.utilities.helpers import get_boolean_query_param
 
@@ -14,6 +14,7 @@ class BaseViewSet(viewsets.GenericViewSet):
     service_class = None
     pagination_class = PageNumberPagination
     limit_offset_pagination_class = LimitOffsetPagination
+    keyset_pagination_class = KeysetPagination
     filter_backends = (DjangoFilterBackend, SearchFilter,)
 
     def get_serializer(self, *args, **kwargs):
@@ -77,9 +78,11 @@ class BaseViewSet(viewsets.GenericViewSet):
             if self.pagination_class is None:
                 self._paginator = None
             else:
-                pagination_class = self.limit_offset_pagination_class \
-                    if get_boolean_query_param(self.request.query_params, 'use_limit_offset_pagination') \
-                    else self.pagination_class
+                pagination_class = self.pagination_class
+                if get_boolean_query_param(self.request.query_params, 'use_limit_offset_pagination'):
+                    pagination_class = self.limit_offset_pagination_class
+                elif get_boolean_query_param(self.request.query_params, 'use_keyset_pagination'):
+                    pagination_class = self.keyset_pagination_class
                 self._paginator = pagination_class()
 
         return self._paginator
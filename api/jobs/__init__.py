@@ -4,3 +4,5 @@ from .daily_summary_job import DailySummaryJob
 from .weekly_summary_job import WeeklySummaryJob
 from .remove_expired_edit_mode_job import RemoveExpiredEditModeJob
 from .recalculate_statistics_job import RecalculateStatisticsJob
+from .compact_events_job import CompactEventsJob
+from .refresh_search_documents_job import RefreshSearchDocumentsJob
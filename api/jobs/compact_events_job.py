@@ -0,0 +1,13 @@
+from django.core import management
+from django_cron import CronJobBase, Schedule
+
+from api.jobs.helpers import sentry_exceptions
+
+
+class CompactEventsJob(CronJobBase):
+    schedule = Schedule(run_at_times=['03:00'])
+    code = 'api.jobs.CompactEventsJob'
+
+    @sentry_exceptions
+    def do(self):
+        management.call_command('compact_events')
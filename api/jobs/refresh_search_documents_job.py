@@ -0,0 +1,13 @@
+from django.core import management
+from django_cron import CronJobBase, Schedule
+
+from api.jobs.helpers import sentry_exceptions
+
+
+class RefreshSearchDocumentsJob(CronJobBase):
+    schedule = Schedule(run_every_mins=60)
+    code = 'api.jobs.RefreshSearchDocumentsJob'
+
+    @sentry_exceptions
+    def do(self):
+        management.call_command('refresh_search_documents')
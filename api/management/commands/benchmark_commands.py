@@ -0,0 +1,45 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Project, User
+from api.services.command_benchmark_service import CommandBenchmarkService
+
+
+class Command(BaseCommand):
+    help = "Generate chains of offline-sync commands and measure how fast they are processed. " \
+           "Generated entities are stored, so run it against a local database only. " \
+           "It refuses to run in production unless --force is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument('project', help='Project to generate commands for.', type=int)
+        parser.add_argument('user', help='User the commands are sent by.', type=int)
+        parser.add_argument('--chains', help='Number of subtask and quality issue chains.', type=int, default=50)
+        parser.add_argument('--company', help='Company of generated subtasks.', type=int, default=None)
+        parser.add_argument('--json', help='Print report as JSON.', action='store_true')
+        parser.add_argument('--force', help='Run even in production environment.', action='store_true')
+
+    def handle(self, *args, **options):
+        if settings.ENV == 'production' and not options['force']:
+            raise CommandError('Benchmark stores generated entities, so it is not run in production without --force.')
+
+        project = Project.objects.filter(pk=options['project']).first()
+        user = User.objects.filter(pk=options['user']).first()
+        if not project or not user:
+            raise CommandError('Project or user does not exist.')
+
+        service = CommandBenchmarkService()
+        commands = service.generate(project, user, options['chains'], options['company'])
+        report = service.replay(commands).as_dict()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f'{report["commands"]} commands in {report["duration_s"]}s, '
+                          f'{report["commands_per_second"]} commands/s, {report["events"]} events.')
+        for key, statistic in report['entities'].items():
+            self.stdout.write(f'{key}: count={statistic["count"]} p50={statistic["p50_ms"]}ms '
+                              f'p99={statistic["p99_ms"]}ms queries={statistic["queries_per_command"]} '
+                              f'statuses={statistic["statuses"]}')
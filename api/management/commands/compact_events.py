@@ -0,0 +1,26 @@
+import pendulum
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.models import Event
+from api.services.event_compaction_service import EventCompactionService
+
+
+class Command(BaseCommand):
+    help = "Fold events older than the horizon into the latest state of each entity."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', help='Compact events of specific projects.', type=int, nargs='*', default=None)
+        parser.add_argument('--horizon-in-days', help='Compact events older than the given number of days.',
+                            type=int, default=settings.EVENTS_COMPACTION_HORIZON_IN_DAYS)
+
+    def handle(self, *args, **options):
+        compacted_before = pendulum.now().subtract(days=options['horizon_in_days'])
+        projects = options['project'] or Event.objects(created_at__lt=compacted_before).distinct('project_id')
+        service = EventCompactionService()
+
+        for project_id in filter(None, projects):
+            compaction = service.compact(project_id, compacted_before)
+
+            if compaction:
+                self.stdout.write(f'Project {project_id}: {compaction.events_count} events archived to {compaction.archive}.')
@@ -8,5 +8,5 @@ class Command(BaseCommand):
     help = "Process commands to create, delete, or change entity."
 
     def handle(self, *args, **options):
-        commands = CommandModel.objects(status=CommandModel.Statuses.PENDING.value).order_by('created_at')[:100]
+        commands = CommandModel.objects(status=CommandModel.Statuses.PENDING.value).order_by('created_at', 'id')[:100]
         process_commands(commands)
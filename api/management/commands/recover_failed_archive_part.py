@@ -1,8 +1,7 @@
 from django.core.management.base import BaseCommand
 
 from api.models import HandoverDocumentArchivePart
-from api.queues.celery.handover_document_archive import generate_archive_part
-from api.services.handover_document_archive_part_entity_service import HandoverDocumentArchivePartEntityService
+from api.services.handover_document_archive_service import HandoverDocumentArchiveService
 
 
 class Command(BaseCommand):
@@ -36,23 +35,14 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING('Specified archive part doesn\'t failed.'))
                 return
 
-            archive_part = HandoverDocumentArchivePartEntityService().update(
-                archive_part, {'status': HandoverDocumentArchivePart.Status.WAITING, 'error_track_id': None}
-            )
-
-            generate_archive_part.delay(archive_part)
+            HandoverDocumentArchiveService().recover_failed_parts([archive_part])
 
             self.stdout.write(self.style.WARNING('Archive part recovered.'))
         elif all_:
-            queryset = HandoverDocumentArchivePart.objects.filter(
+            handover_document_parts = list(HandoverDocumentArchivePart.objects.filter(
                 status=HandoverDocumentArchivePart.Status.FAILED
-            )
-
-            handover_document_parts = list(queryset)
-
-            queryset.update(status=HandoverDocumentArchivePart.Status.WAITING, error_track_id=None)
+            ).select_related('handover_document_archive'))
 
-            for handover_document_part in handover_document_parts:
-                generate_archive_part.delay(handover_document_part)
+            HandoverDocumentArchiveService().recover_failed_parts(handover_document_parts)
 
             self.stdout.write(self.style.WARNING('All failed archive parts recovered.'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.services.search_document_service import SearchDocumentService
+
+
+class Command(BaseCommand):
+    help = "Refresh search documents of tasks, subtasks and quality issues. " \
+           "Only missing documents are filled, unless --all is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', help='Refresh documents of all entities.', action='store_true')
+
+    def handle(self, *args, **options):
+        service = SearchDocumentService()
+        filters = {} if options['all'] else {'search_document': ''}
+
+        for model_name in service.models:
+            self.stdout.write(f'Search documents refreshing for {model_name} has been started.')
+            service.refresh_by_filters({model_name: filters})
+            self.stdout.write(f'Search documents for {model_name} have been refreshed.')
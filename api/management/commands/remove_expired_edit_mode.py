@@ -2,6 +2,7 @@ import pendulum
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from api.services.project_access_service import ProjectAccessService
 from mbuild.settings import EDIT_MODE_CLOSE_IN_MINUTES
 
 
@@ -13,5 +14,9 @@ class Command(BaseCommand):
 
         with connection.cursor() as cursor:
             cursor.execute("""
-                DELETE FROM edit_mode WHERE EXTRACT(EPOCH FROM (%s - updated_at)) > %s
+                DELETE FROM edit_mode WHERE EXTRACT(EPOCH FROM (%s - updated_at)) > %s RETURNING user_id
             """, (pendulum.now().to_datetime_string(), time_diff_in_seconds))
+            user_ids = [user_id for user_id, in cursor.fetchall()]
+
+        # Raw delete doesn't send signals, so cached edit modes are invalidated here.
+        ProjectAccessService.invalidate(user_ids)
@@ -1,5 +1,6 @@
 from collections import namedtuple
 
+import pendulum
 from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
 
@@ -62,11 +63,12 @@ class Command(BaseCommand):
                                                    package_activity_task_id=pat.pat_id,
                                                    location_matrix_id=pat.lm_id).get()
                 task.deleted = None
+                task.updated_at = pendulum.now()
                 tasks.append(task)
 
-            Task.deleted_objects.bulk_update(tasks, ['deleted'], 100)
+            Task.deleted_objects.bulk_update(tasks, ['deleted', 'updated_at'], 100)
 
-            TaskUpdate.all_objects.filter(task__in=tasks).update(deleted=None)
+            TaskUpdate.all_objects.filter(task__in=tasks).update(deleted=None, updated_at=pendulum.now())
 
             self.stdout.write(self.style.WARNING('Task updates restored.'))
 
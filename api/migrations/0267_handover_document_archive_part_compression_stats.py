@@ -0,0 +1,23 @@
+# Generated by Django 3.2.15 on 2026-10-18 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0266_alter_media_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='handoverdocumentarchivepart',
+            name='compression_ratio',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='handoverdocumentarchivepart',
+            name='cpu_time',
+            field=models.FloatField(null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.15 on 2026-10-18 13:58
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_sent_parts_count(apps, schema_editor):
+    HandoverDocumentArchive = apps.get_model('api', 'HandoverDocumentArchive')
+    HandoverDocumentArchivePart = apps.get_model('api', 'HandoverDocumentArchivePart')
+
+    sent_parts_count = HandoverDocumentArchivePart.objects.filter(
+        handover_document_archive=OuterRef('pk')
+    ).values('handover_document_archive').annotate(
+        count=Count('id', filter=Q(status='sent'))
+    ).values('count')
+
+    HandoverDocumentArchive.objects.update(sent_parts_count=Coalesce(Subquery(sent_parts_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0267_handover_document_archive_part_compression_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='handoverdocumentarchive',
+            name='sent_parts_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='handoverdocumentarchivepart',
+            name='status',
+            field=models.CharField(choices=[('waiting', 'Waiting'), ('queued', 'Queued'), ('running', 'Running'), ('failed', 'Failed'), ('saved', 'Saved'), ('sent', 'Sent')], default='waiting', max_length=7),
+        ),
+        migrations.RunPython(fill_sent_parts_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0268_handover_document_archive_concurrent_parts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='floorplanimage',
+            name='raster',
+            field=models.JSONField(null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0269_floorplanimage_raster'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX location_matrix_level_order
+                ON location_matrix (project_id, building, level_number DESC, level_postfix, area, id)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX location_matrix_level_order;
+            """
+        ),
+    ]
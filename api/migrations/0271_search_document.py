@@ -0,0 +1,62 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0270_add_location_level_order_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='subtask',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='qualityissue',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX tasks_search_document
+                ON tasks USING gin (search_document gin_trgm_ops)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX tasks_search_document;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX subtasks_search_document
+                ON subtasks USING gin (search_document gin_trgm_ops)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX subtasks_search_document;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX quality_issue_search_document
+                ON quality_issue USING gin (search_document gin_trgm_ops)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX quality_issue_search_document;
+            """
+        ),
+    ]
@@ -0,0 +1,190 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0271_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qualityissue',
+            name='area',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='qualityissue',
+            name='building',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='qualityissue',
+            name='level',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='qualityissue',
+            name='project',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='api.project'),
+        ),
+        migrations.AddField(
+            model_name='subtask',
+            name='package_activity',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='api.packageactivity'),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE quality_issue
+                SET building=lm.building,
+                    level=lm.level,
+                    area=lm.area,
+                    project_id=lm.project_id
+                FROM location_matrix lm
+                WHERE quality_issue.location_matrix_id = lm.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE subtasks
+                SET package_activity_id=t.package_activity_id
+                FROM tasks t
+                WHERE subtasks.task_id = t.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE quality_issue
+                ADD COLUMN level_number double precision GENERATED ALWAYS AS (
+                    CASE
+                        WHEN "level"::text ~* '(^-\d.)|(^0.)'
+                            THEN CAST(regexp_replace("level", '[a-zA-Z]+', '.') || '0001' AS double precision)
+                        ELSE CAST(substring("level", '^(-?\d+)') AS double precision) END
+                    ) STORED;
+            """,
+            reverse_sql="""
+                ALTER TABLE quality_issue
+                DROP COLUMN IF EXISTS level_number;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE quality_issue
+                ADD COLUMN level_postfix varchar(50) GENERATED ALWAYS AS (
+                    NULLIF(regexp_replace("level", '^(-?\d+)', ''), '')
+                    ) STORED;
+            """,
+            reverse_sql="""
+                ALTER TABLE quality_issue
+                DROP COLUMN IF EXISTS level_postfix;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE quality_issue
+                ADD COLUMN status_weight_for_staff numeric GENERATED ALWAYS AS (
+                    CASE
+                        WHEN "status" = 'under_review' THEN 1
+                        WHEN "status" = 'requested_approval_rejected' THEN 2
+                        WHEN "status" = 'under_inspection' THEN 3
+                        WHEN "status" = 'declined' THEN 4
+                        WHEN "status" = 'in_progress' THEN 5
+                        WHEN "status" = 'inspection_rejected' THEN 6
+                        WHEN "status" = 'requesting_approval' THEN 7
+                        WHEN "status" = 'contested' THEN 8
+                        WHEN "status" = 'closed' THEN 9
+                        WHEN "status" = 'removed' THEN 10
+                        ELSE 100 END
+                    ) STORED;
+            """,
+            reverse_sql="""
+                ALTER TABLE quality_issue
+                DROP COLUMN IF EXISTS status_weight_for_staff;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE quality_issue
+                ADD COLUMN status_weight_for_client numeric GENERATED ALWAYS AS (
+                    CASE
+                        WHEN "status" = 'contested' THEN 1
+                        WHEN "status" = 'requesting_approval' THEN 2
+                        WHEN "status" = 'under_review' THEN 3
+                        WHEN "status" = 'requested_approval_rejected' THEN 4
+                        WHEN "status" = 'under_inspection' THEN 5
+                        WHEN "status" = 'declined' THEN 6
+                        WHEN "status" = 'in_progress' THEN 7
+                        WHEN "status" = 'inspection_rejected' THEN 8
+                        WHEN "status" = 'closed' THEN 9
+                        WHEN "status" = 'removed' THEN 10
+                        ELSE 100 END
+                    ) STORED;
+            """,
+            reverse_sql="""
+                ALTER TABLE quality_issue
+                DROP COLUMN IF EXISTS status_weight_for_client;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX quality_issue_status_weight_for_staff
+                ON quality_issue (project_id, status_weight_for_staff, building, level_number DESC, level_postfix, area, id)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX quality_issue_status_weight_for_staff;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX quality_issue_status_weight_for_client
+                ON quality_issue (project_id, status_weight_for_client, building, level_number DESC, level_postfix, area, id)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX quality_issue_status_weight_for_client;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX subtasks_closed_level_order
+                ON subtasks (project_id, (status = 'closed'), building, level_number DESC, level_postfix, area,
+                             package_activity_id, id)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX subtasks_closed_level_order;
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                DROP INDEX subtasks_status_weight_for_staff;
+                CREATE INDEX subtasks_status_weight_for_staff
+                ON subtasks (project_id, status_weight_for_staff, building, level_number DESC, level_postfix, area, id)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX subtasks_status_weight_for_staff;
+                CREATE INDEX subtasks_status_weight_for_staff
+                ON subtasks (status_weight_for_staff, building, level_number DESC, level_postfix, area, id)
+                WHERE (deleted IS NULL);
+            """
+        ),
+        migrations.RunSQL(
+            sql="""
+                DROP INDEX subtasks_status_weight_for_subcontractor;
+                CREATE INDEX subtasks_status_weight_for_subcontractor
+                ON subtasks (project_id, status_weight_for_subcontractor, building, level_number DESC, level_postfix, area, id)
+                WHERE (deleted IS NULL);
+            """,
+            reverse_sql="""
+                DROP INDEX subtasks_status_weight_for_subcontractor;
+                CREATE INDEX subtasks_status_weight_for_subcontractor
+                ON subtasks (status_weight_for_subcontractor, building, level_number DESC, level_postfix, area, id)
+                WHERE (deleted IS NULL);
+            """
+        ),
+    ]
@@ -6,6 +6,7 @@ from .command import Command
 from .company import Company
 from .edit_mode import EditMode
 from .event import Event
+from .event_compaction import EventCompaction
 from .floor_plan import FloorPlan
 from .floor_plan_revision_meta import FloorPlanRevisionMeta
 from .floor_plan_image import FloorPlanImage
@@ -23,6 +23,7 @@ class Event(Document):
     meta = {
         'indexes': [
             'created_at',
+            ('project_id', 'created_at', 'id'),
         ]
     }
 
@@ -0,0 +1,15 @@
+from mongoengine import *
+
+
+class EventCompaction(Document):
+    project_id = IntField(required=True)
+    compacted_before = DateTimeField(required=True)
+    archive = StringField(required=False, null=True)
+    events_count = IntField(required=True)
+    created_at = DateTimeField(required=True)
+
+    meta = {
+        'indexes': [
+            ('project_id', '-compacted_before'),
+        ]
+    }
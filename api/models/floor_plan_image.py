@@ -19,6 +19,9 @@ class FloorPlanImage(BaseModel):
         db_table = 'floor_plan_images'
 
     DPI_SIZES = FloorPlanImageSizes(width=200, height=200)
+    RASTER_TILE_SIZE = 512
+    RASTER_OVERVIEW_SIZES = FloorPlanImageSizes(width=1024, height=1024)
 
     plan = models.ForeignKey('Media', on_delete=models.CASCADE)
     image = models.ForeignKey('Media', on_delete=models.CASCADE, related_name='floor_plan_image')
+    raster = models.JSONField(null=True)
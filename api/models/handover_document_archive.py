@@ -27,3 +27,4 @@ class HandoverDocumentArchive(BaseModel):
     user = models.ForeignKey('User', on_delete=models.CASCADE)
     status = models.CharField(max_length=11, choices=Status.choices, default=Status.IN_PROGRESS)
     generation_started_at = models.DateTimeField()
+    sent_parts_count = models.IntegerField(default=0)
@@ -10,6 +10,7 @@ class HandoverDocumentArchivePart(BaseModel):
 
     class Status(models.TextChoices):
         WAITING = 'waiting', _('Waiting')
+        QUEUED = 'queued', _('Queued')
         RUNNING = 'running', _('Running')
         FAILED = 'failed', _('Failed')
         SAVED = 'saved', _('Saved')
@@ -26,6 +27,8 @@ class HandoverDocumentArchivePart(BaseModel):
     media = models.ForeignKey('Media', null=True, on_delete=models.SET_NULL)
     status = models.CharField(max_length=7, choices=Status.choices, default=Status.WAITING)
     error_track_id = models.CharField(max_length=255, null=True)
+    cpu_time = models.FloatField(null=True)
+    compression_ratio = models.FloatField(null=True)
 
     @property
     def is_failed(self):
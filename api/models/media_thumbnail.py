@@ -13,6 +13,8 @@ class ThumbnailSizes:
 
 
 class MediaThumbnail(BaseModel):
+    create_events_on_update = False
+
     _safedelete_policy = SOFT_DELETE
 
     class Meta(BaseModel.Meta):
@@ -1,9 +1,47 @@
 from mongoengine import *
 
+from api.enums import ChoiceEnum
+
 
 class ProjectSnapshot(Document):
-    data = DictField(required=True)
+    class Statuses(ChoiceEnum):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        COMPLETED = 'completed'
+        FAILED = 'failed'
+
+    data = DictField(required=False, null=True)
     generation_started_at = DateTimeField(required=True)
     created_at = DateTimeField(required=True)
     updated_at = DateTimeField(required=True)
     project_id = IntField(required=True)
+    status = StringField(choices=Statuses.choices(), required=False, null=True)
+    location_matrices = ListField(IntField(), required=False)
+    archive = StringField(required=False, null=True)
+    user = IntField(required=False, null=True)
+    error_uuid = StringField(required=False, null=True)
+    previous_snapshot = StringField(required=False, null=True)
+    since = DateTimeField(required=False, null=True)
+
+    meta = {
+        'indexes': [
+            ('project_id', 'created_at',),
+        ]
+    }
+
+    @property
+    def is_completed(self):
+        return self.status == self.Statuses.COMPLETED.value
+
+    def mark_as_running(self, generation_started_at):
+        self.update(status=self.Statuses.RUNNING.value, generation_started_at=generation_started_at,
+                    updated_at=generation_started_at)
+        self.reload()
+
+    def mark_as_completed(self, archive: str, completed_at):
+        self.update(status=self.Statuses.COMPLETED.value, archive=archive, updated_at=completed_at)
+        self.reload()
+
+    def mark_as_failed(self, error_uuid: str, failed_at):
+        self.update(status=self.Statuses.FAILED.value, error_uuid=error_uuid, updated_at=failed_at)
+        self.reload()
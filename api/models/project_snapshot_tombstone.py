@@ -0,0 +1,14 @@
+from mongoengine import *
+
+
+class ProjectSnapshotTombstone(Document):
+    entity = StringField(required=True)
+    entity_id = IntField(required=True)
+    location_matrix_id = IntField(required=False, null=True)
+    deleted_at = DateTimeField(required=True)
+
+    meta = {
+        'indexes': [
+            ('location_matrix_id', 'deleted_at'),
+        ]
+    }
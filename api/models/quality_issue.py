@@ -10,6 +10,14 @@ from api.models.queryset.quality_issue_queryset import QualityIssueQuerySet
 
 
 class QualityIssue(BaseModel):
+    """
+    Model has generated fields `level_number`, `level_postfix`,
+    `status_weight_for_staff` and `status_weight_for_client`.
+    They are created via raw query in migrations because ORM
+    doesn't support this kind of fields. Fields `building`, `level`,
+    `area` and `project` are copied from the location matrix,
+    so the default ordering is covered by raw indexes.
+    """
     _safedelete_policy = SOFT_DELETE
 
     objects = QualityIssueManager(QualityIssueQuerySet)
@@ -40,6 +48,11 @@ class QualityIssue(BaseModel):
     local_id = models.CharField(null=True, blank=True, default=None, max_length=255)
     response_category = models.ForeignKey('ResponseCategory', on_delete=models.SET_NULL, default=None, null=True)
     floor_plan_area_pins = GenericRelation('FloorPlanAreaPin')
+    building = models.CharField(null=True, max_length=255)
+    level = models.CharField(null=True, max_length=255)
+    area = models.CharField(null=True, max_length=255)
+    project = models.ForeignKey('Project', on_delete=models.CASCADE, null=True)
+    search_document = models.TextField(default='', blank=True, editable=False)
 
     def get_to_report_status_name(self) -> str:
         if self.status == self.Status.DECLINED:
@@ -16,6 +16,8 @@ class Subtask(BaseModel):
     doesn't support this kind of fields.
     Also model has two raw indexes `weight_for_staff` and `weight_for_subcontractor`.
     They area include generated fields `level_number` and `level_postfix`.
+    Fields `building`, `level`, `area`, `project` and `package_activity`
+    are copied from the task for the default ordering.
     """
     _safedelete_policy = SOFT_DELETE
 
@@ -63,12 +65,14 @@ class Subtask(BaseModel):
     level = models.CharField(null=True, max_length=255)
     area = models.CharField(null=True, max_length=255)
     project = models.ForeignKey('Project', on_delete=models.CASCADE, null=True)
+    package_activity = models.ForeignKey('PackageActivity', on_delete=models.CASCADE, null=True)
     local_id = models.CharField(null=True, blank=True, default=None, max_length=255)
     date_of_completion = models.DateTimeField(null=True)
     floor_plan_area_pins = GenericRelation('FloorPlanAreaPin')
     closed_files_count = models.IntegerField(default=0)
     files_count = models.IntegerField(default=0)
     created_at = DateTimeFieldOmitAutoNowValue(auto_now_add=True, null=False, editable=False, blank=False)
+    search_document = models.TextField(default='', blank=True, editable=False)
 
     def get_to_report_status_name(self) -> str:
         status = self.status
@@ -85,3 +85,4 @@ class Task(BaseModel):
     building = models.CharField(max_length=255)
     level = models.CharField(max_length=255)
     area = models.CharField(max_length=255)
+    search_document = models.TextField(default='', blank=True, editable=False)
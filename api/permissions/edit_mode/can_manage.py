@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project, EditMode
+from api.models import EditMode
+from api.services.project_access_service import ProjectAccessService
 
 
 class CanManage(BasePermission):
@@ -8,8 +9,10 @@ class CanManage(BasePermission):
         user = request.user
         edit_mode_project = EditMode.objects.filter(project=view.kwargs.get('project_pk'))
         exists = edit_mode_project.exists()
+        is_project_staff = user.is_staff and \
+            ProjectAccessService.for_request(request).is_project_user([view.kwargs.get('project_pk')])
 
         return \
-            (user.is_superuser or Project.objects.filter(pk=view.kwargs.get('project_pk'), users=user, users__is_staff=True).exists()) \
+            (user.is_superuser or is_project_staff) \
             and \
             (not exists or (exists and edit_mode_project.first().user.pk == user.pk))
@@ -1,10 +1,8 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class IsProjectUser(BasePermission):
     def has_permission(self, request, view):
-        user = request.user
-
-        return Project.objects.filter(pk=view.kwargs.get('pk'), users__pk=user.pk).exists()
+        return ProjectAccessService.for_request(request).is_project_user([view.kwargs.get('pk')])
@@ -1,13 +1,11 @@
 from rest_framework.permissions import BasePermission
 from django.utils.translation import gettext_lazy as _
 
-from api.models import EditMode
+from api.services.project_access_service import ProjectAccessService
 
 
 class InProjectEditMode(BasePermission):
     message = _('You have to be in the Edit mode.')
 
     def has_permission(self, request, view):
-        user = request.user
-
-        return EditMode.objects.filter(user=user, project__pk=view.kwargs.get('project_pk')).exists()
+        return ProjectAccessService.for_request(request).is_in_edit_mode(view.kwargs.get('project_pk'))
@@ -1,13 +1,10 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class IsProjectCompanyAdmin(BasePermission):
     def has_permission(self, request, view):
-        user = request.user
-        project_pk = view.kwargs.get('project_pk', request.query_params.getlist('project'))
-        if type(project_pk) is not list:
-            project_pk = [project_pk]
+        project_pks = ProjectAccessService.get_requested_project_pks(request, view)
 
-        return user.is_company_admin and Project.objects.filter(pk__in=project_pk, users__pk=user.pk).exists()
+        return request.user.is_company_admin and ProjectAccessService.for_request(request).is_project_user(project_pks)
@@ -1,11 +1,12 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class IsAllowedForConsultant(BasePermission):
     def has_permission(self, request, view):
         if request.user.is_consultant:
-            return Project.objects.filter(pk__in=request.query_params.getlist('project'),
-                                          is_task_visible_for_clients=True).exists()
+            return ProjectAccessService.for_request(request).is_task_visible_for_clients(
+                request.query_params.getlist('project')
+            )
         return True
\ No newline at end of file
@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project, PackageHandover
+from api.models import PackageHandover
+from api.services.project_access_service import ProjectAccessService
 
 
 class DoesProjectSubcontractorCanUpdate(BasePermission):
@@ -8,6 +9,6 @@ class DoesProjectSubcontractorCanUpdate(BasePermission):
         user = request.user
 
         return user.is_subcontractor and \
-            Project.objects.filter(pk=view.kwargs['project_pk'], users=user).exists() and \
+            ProjectAccessService.for_request(request).is_project_user([view.kwargs['project_pk']]) and \
             PackageHandover.objects.filter(pk=view.kwargs['pk'],
                                            package_matrix__packagematrixcompany__company_id=user.company_id).exists()
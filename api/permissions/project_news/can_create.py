@@ -1,11 +1,10 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class CanCreate(BasePermission):
     def has_permission(self, request, view):
-        user = request.user
         project_pk = request.data.get('project_id')
 
-        return Project.objects.filter(users__pk=user.pk, pk=project_pk).exists()
+        return ProjectAccessService.for_request(request).is_project_user([project_pk])
@@ -1,8 +1,8 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class HasAccess(BasePermission):
     def has_permission(self, request, view):
-        return Project.objects.filter(users=request.user, pk=view.kwargs.get('pk')).exists()
+        return ProjectAccessService.for_request(request).is_project_user([view.kwargs.get('pk')])
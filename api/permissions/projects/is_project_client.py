@@ -1,11 +1,10 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class IsProjectClient(BasePermission):
     def has_permission(self, request, view):
-        user = request.user
         project_pk = view.kwargs.get('pk')
 
-        return user.is_client and Project.objects.filter(users__pk=user.id, pk=project_pk).exists()
+        return request.user.is_client and ProjectAccessService.for_request(request).is_project_user([project_pk])
@@ -1,11 +1,10 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class IsProjectStaff(BasePermission):
     def has_permission(self, request, view):
-        user = request.user
         project_pk = view.kwargs.get('pk')
 
-        return Project.objects.filter(users__pk=user.id, pk=project_pk, users__is_staff=True).exists()
+        return request.user.is_staff and ProjectAccessService.for_request(request).is_project_user([project_pk])
@@ -1,6 +1,6 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class RemovesHimself(BasePermission):
@@ -8,7 +8,7 @@ class RemovesHimself(BasePermission):
         user = request.user
         project_pk = view.kwargs.get('pk')
 
-        return Project.objects.filter(users__pk=user.id, pk=project_pk).exists() and \
+        return ProjectAccessService.for_request(request).is_project_user([project_pk]) and \
                'users' in request.data and \
                len(request.data.get('users')) == 1 and \
                request.data.get('users')[0] == user.pk
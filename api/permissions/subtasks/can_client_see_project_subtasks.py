@@ -1,12 +1,12 @@
 from rest_framework.permissions import BasePermission
-from api.models import ProjectUser
+from api.services.project_access_service import ProjectAccessService
 
 
 class CanClientSeeProjectSubtasks(BasePermission):
     def has_permission(self, request, view):
+        project_pks = [view.kwargs.get('project_pk')]
+        access = ProjectAccessService.for_request(request)
+
         return request.user.is_client and \
-            ProjectUser.objects.filter(
-                project_id=view.kwargs.get('project_pk'),
-                user=request.user,
-                project__is_subtask_visible_for_clients=True
-            ).exists()
+            access.is_project_user(project_pks) and \
+            access.is_subtask_visible_for_clients(project_pks)
@@ -1,13 +1,12 @@
 from rest_framework.permissions import BasePermission
 from django.utils.translation import gettext_lazy as _
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class IsProjectClient(BasePermission):
     message = _('You\'re not a project client.')
 
     def has_permission(self, request, view):
-        user = request.user
-
-        return user.is_client and Project.objects.filter(pk=view.kwargs['project_pk'], users__pk=user.pk).exists()
+        return request.user.is_client and \
+            ProjectAccessService.for_request(request).is_project_user([view.kwargs['project_pk']])
@@ -1,12 +1,13 @@
 from rest_framework.permissions import BasePermission
 
-from api.models import Project
+from api.services.project_access_service import ProjectAccessService
 
 
 class IsProjectUser(BasePermission):
     def has_permission(self, request, view):
         if 'project_or_company_admins' in request.query_params:
-            return Project.objects.filter(pk=int(request.query_params['project_or_company_admins']),
-                                          users=request.user).exists()
+            return ProjectAccessService.for_request(request).is_project_user(
+                [int(request.query_params['project_or_company_admins'])]
+            )
 
         return False
@@ -1,4 +1,5 @@
 from api.queues.core.base import use_rq_if_configured
+from api.utilities.celery_utilities import send_as_snapshot
 
 from api.queues.celery.asset_handover_statistics import \
     create_statistics_on_asset_handover_document_create as create_statistics_on_asset_handover_document_create_celery, \
@@ -38,7 +39,7 @@ def create_statistics_on_asset_handover_document_create(asset_handover_document:
 
 @use_rq_if_configured(update_statistics_on_document_update_rq)
 def update_statistics_on_document_update(asset_handover_document: AssetHandoverDocument) -> None:
-    update_statistics_on_document_update_celery.delay(asset_handover_document)
+    update_statistics_on_document_update_celery.delay(send_as_snapshot(asset_handover_document))
 
 
 @use_rq_if_configured(increase_statistics_for_document_media_status_rq)
@@ -48,17 +49,17 @@ def increase_statistics_for_document_media_status(asset_handover_document_media:
 
 @use_rq_if_configured(decrease_statistics_for_document_media_status_rq)
 def decrease_statistics_for_document_media_status(asset_handover_document_media: AssetHandoverDocumentMedia) -> None:
-    decrease_statistics_for_document_media_status_celery.delay(asset_handover_document_media)
+    decrease_statistics_for_document_media_status_celery.delay(send_as_snapshot(asset_handover_document_media))
 
 
 @use_rq_if_configured(update_statistics_by_statuses_on_document_media_status_change_rq)
 def update_statistics_by_statuses_on_document_media_status_change(asset_handover_document_media: AssetHandoverDocumentMedia) -> None:
-    update_statistics_by_statuses_on_document_media_status_change_celery.delay(asset_handover_document_media)
+    update_statistics_by_statuses_on_document_media_status_change_celery.delay(send_as_snapshot(asset_handover_document_media))
 
 
 @use_rq_if_configured(delete_statistics_on_asset_handover_delete_rq)
 def delete_statistics_on_asset_handover_delete(asset_handover: AssetHandover) -> None:
-    delete_statistics_on_asset_handover_delete_celery.delay(asset_handover)
+    delete_statistics_on_asset_handover_delete_celery.delay(send_as_snapshot(asset_handover))
 
 
 @use_rq_if_configured(undelete_statistics_on_asset_handover_undelete_rq)
@@ -68,7 +69,7 @@ def undelete_statistics_on_asset_handover_undelete(asset_handover: list[AssetHan
 
 @use_rq_if_configured(delete_statistics_on_package_matrix_delete_rq)
 def delete_statistics_on_package_matrix_delete(package_matrix: PackageMatrix) -> None:
-    delete_statistics_on_package_matrix_delete_celery.delay(package_matrix)
+    delete_statistics_on_package_matrix_delete_celery.delay(send_as_snapshot(package_matrix))
 
 
 @use_rq_if_configured(undelete_statistics_on_package_matrix_undelete_rq)
@@ -78,7 +79,7 @@ def undelete_statistics_on_package_matrix_undelete(package_matrix: PackageMatrix
 
 @use_rq_if_configured(delete_statistics_on_project_delete_rq)
 def delete_statistics_on_project_delete(project: Project) -> None:
-    delete_statistics_on_project_delete_celery.delay(project)
+    delete_statistics_on_project_delete_celery.delay(send_as_snapshot(project))
 
 
 @use_rq_if_configured(change_statistics_on_asset_handover_document_media_update_create_rq)
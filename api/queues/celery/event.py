@@ -0,0 +1,8 @@
+from mbuild.settings import app as celery_app
+
+from api.queues.core.event import create_events_from_batches as create_events_from_batches_core
+
+
+@celery_app.task(queue='events', time_limit=3600)
+def create_events_from_batches(batches: list[dict]) -> None:
+    create_events_from_batches_core(batches)
@@ -1,8 +1,20 @@
-from api.models import LocationMatrix
-from api.queues.core.floor_plan import update_floor_plan_with_areas as update_floor_plan_with_area_core
+from api.models import LocationMatrix, FloorPlanImage
+from api.queues.core.floor_plan import update_floor_plan_with_areas as update_floor_plan_with_area_core, \
+    create_floor_plan_raster as create_floor_plan_raster_core, \
+    delete_floor_plan_rasters as delete_floor_plan_rasters_core
 from mbuild.settings import app as celery_app
 
 
 @celery_app.task(queue='floor_plan', time_limit=3600)
 def update_floor_plan_with_areas(location_matrices: list[LocationMatrix], update_data: list[dict]) -> None:
     update_floor_plan_with_area_core(location_matrices, update_data)
+
+
+@celery_app.task(queue='floor_plan', time_limit=3600)
+def create_floor_plan_raster(floor_plan_image: FloorPlanImage) -> None:
+    create_floor_plan_raster_core(floor_plan_image)
+
+
+@celery_app.task(queue='floor_plan', time_limit=3600)
+def delete_floor_plan_rasters(floor_plan_images: list[FloorPlanImage]) -> None:
+    delete_floor_plan_rasters_core(floor_plan_images)
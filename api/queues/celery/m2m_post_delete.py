@@ -25,8 +25,8 @@ def create_key_contacts_m2m_reverse_deletion_events(instance: User):
 
 @celery_app.task(queue='events', time_limit=3600)
 def create_recipient_m2m_reverse_deletion_events(instance: Recipient):
-    task_updates = instance.taskupdate_set.all()
-    subtask_updates = instance.subtaskupdate_set.all()
+    task_updates = list(instance.taskupdate_set.all())
+    subtask_updates = list(instance.subtaskupdate_set.all())
 
     create_reverse_m2m_event.delay(child_instance=instance, parent_instances=task_updates, action='post_remove',
                                    parent_entity_field='task_update', child_entity_field='recipient',
@@ -39,7 +39,7 @@ def create_recipient_m2m_reverse_deletion_events(instance: Recipient):
 
 @celery_app.task(queue='events', time_limit=3600)
 def create_company_m2m_reverse_deletion_events(instance: Company):
-    package_matrix_companies = instance.packagematrixcompany_set.all()
+    package_matrix_companies = list(instance.packagematrixcompany_set.all())
 
     create_reverse_m2m_event.delay(child_instance=instance, parent_instances=package_matrix_companies, action='post_remove',
                                    parent_entity_field='package_matrix_company', child_entity_field='company',
@@ -48,7 +48,7 @@ def create_company_m2m_reverse_deletion_events(instance: Company):
 
 @celery_app.task(queue='events', time_limit=3600)
 def create_package_matrix_m2m_reverse_deletion_events(instance: PackageMatrix):
-    package_matrix_companies = instance.packagematrixcompany_set.all()
+    package_matrix_companies = list(instance.packagematrixcompany_set.all())
 
     create_reverse_m2m_event.delay(child_instance=instance, parent_instances=package_matrix_companies, action='post_remove',
                                    parent_entity_field='package_matrix_company', child_entity_field='package_matrix',
@@ -1,7 +1,7 @@
 from mbuild.settings import app as celery_app
 
 from api.queues.core.media import generate_project_image_thumbnails as generate_project_image_thumbnails_core, \
-    create_thumbnails as create_thumbnails_core
+    create_thumbnails as create_thumbnails_core, create_thumbnails_for_many as create_thumbnails_for_many_core
 
 from api.models import Media
 
@@ -14,3 +14,8 @@ def generate_project_image_thumbnails(image_file_name: str) -> None:
 @celery_app.task(queue='thumbnails', time_limit=3600)
 def create_thumbnails(media: Media) -> None:
     create_thumbnails_core(media)
+
+
+@celery_app.task(queue='thumbnails', time_limit=3600)
+def create_thumbnails_for_many(media: list[Media]) -> None:
+    create_thumbnails_for_many_core(media)
@@ -0,0 +1,8 @@
+from mbuild.settings import app as celery_app
+
+from api.queues.core.project_snapshot import generate_project_snapshot as generate_project_snapshot_core
+
+
+@celery_app.task(queue='reports', time_limit=36000)
+def generate_project_snapshot(snapshot_id: str) -> None:
+    generate_project_snapshot_core(snapshot_id)
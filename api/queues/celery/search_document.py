@@ -0,0 +1,8 @@
+from mbuild.settings import app as celery_app
+
+from api.queues.core.search_document import refresh_search_documents as refresh_search_documents_core
+
+
+@celery_app.task(queue='default', time_limit=3600)
+def refresh_search_documents(filters: dict[str, dict]) -> None:
+    refresh_search_documents_core(filters)
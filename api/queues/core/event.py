@@ -0,0 +1,5 @@
+from api.utilities.event_utilities import create_events_from_batches as create_events_from_batches_utility
+
+
+def create_events_from_batches(batches: list[dict]) -> None:
+    create_events_from_batches_utility(batches)
@@ -1,4 +1,4 @@
-from api.models import LocationMatrix, FloorPlanArea, FloorPlan
+from api.models import LocationMatrix, FloorPlanArea, FloorPlan, FloorPlanImage
 
 
 def update_floor_plan_with_areas(location_matrices: list[LocationMatrix], update_data: list[dict]) -> None:
@@ -11,3 +11,16 @@ def update_floor_plan_with_areas(location_matrices: list[LocationMatrix], update
             area=area
         ).update(area=updating_data['area'])
         FloorPlan.objects.filter(building=building, level=level).update(building=updating_data['building'], level=updating_data['level'])
+
+
+def create_floor_plan_raster(floor_plan_image: FloorPlanImage) -> None:
+    from api.services.floor_plan_image_entity_service import FloorPlanImageEntityService
+
+    FloorPlanImageEntityService().get_raster(floor_plan_image)
+
+
+def delete_floor_plan_rasters(floor_plan_images: list[FloorPlanImage]) -> None:
+    from api.services.floor_plan_image_entity_service import FloorPlanImageEntityService
+
+    for floor_plan_image in floor_plan_images:
+        FloorPlanImageEntityService().delete_raster(floor_plan_image)
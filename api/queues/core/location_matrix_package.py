@@ -1,3 +1,4 @@
+import pendulum
 from django.db.models import Q
 
 from api.models import Task
@@ -19,7 +20,7 @@ def restore_related_tasks_with_entities(location_matrix_package, user):
     QualityIssueEntityService().restore_from_tasks(restoring_tasks.all())
 
     existing_package_activity_tasks_ids = list(restoring_tasks.values_list('package_activity_task__pk', flat=True))
-    restoring_tasks.update(package=location_matrix_package.package, deleted=None)
+    restoring_tasks.update(package=location_matrix_package.package, deleted=None, updated_at=pendulum.now())
 
     package_activity_tasks = location_matrix_package.package_matrix.package_activity.packageactivitytask_set.exclude(
         Q(pk__in=existing_package_activity_tasks_ids) |
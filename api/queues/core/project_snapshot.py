@@ -0,0 +1,9 @@
+from api.models.project_snapshot import ProjectSnapshot
+
+
+def generate_project_snapshot(snapshot_id: str) -> None:
+    from api.services.project_snapshot_service import ProjectSnapshotService
+
+    snapshot = ProjectSnapshot.objects.filter(pk=snapshot_id).first()
+    if snapshot:
+        ProjectSnapshotService().generate(snapshot)
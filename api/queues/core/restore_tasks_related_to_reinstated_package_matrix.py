@@ -1,3 +1,5 @@
+import pendulum
+
 from api.utilities.tasks_utilities import get_task_status, create_task_updates
 
 from api.models import Task, PackageActivityTask
@@ -54,10 +56,11 @@ def restore_tasks_related_to_reinstated_package_matrix(package_activity, locatio
                 )
             elif task.deleted:
                 task.deleted = None
+                task.updated_at = pendulum.now()
                 restoring_tasks.append(task)
 
     if restoring_tasks:
-        Task.objects.bulk_update(restoring_tasks, fields=['deleted'], batch_size=500)
+        Task.objects.bulk_update(restoring_tasks, fields=['deleted', 'updated_at'], batch_size=500)
 
     created_tasks = Task.objects.bulk_create(tasks, 500)
 
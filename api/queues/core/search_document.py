@@ -0,0 +1,5 @@
+from api.services.search_document_service import SearchDocumentService
+
+
+def refresh_search_documents(filters: dict[str, dict]) -> None:
+    SearchDocumentService().refresh_by_filters(filters)
@@ -0,0 +1,9 @@
+from api.queues.core.base import use_rq_if_configured
+
+from api.queues.celery.event import create_events_from_batches as create_events_from_batches_celery
+from api.queues.rq.event import create_events_from_batches as create_events_from_batches_rq
+
+
+@use_rq_if_configured(create_events_from_batches_rq)
+def create_events_from_batches(batches: list[dict]) -> None:
+    create_events_from_batches_celery.delay(batches)
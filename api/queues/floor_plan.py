@@ -1,9 +1,26 @@
-from api.models import LocationMatrix
+from api.models import LocationMatrix, FloorPlanImage
 from api.queues.core.base import use_rq_if_configured
-from api.queues.celery.floor_plan import update_floor_plan_with_areas as update_floor_plan_with_areas_celery
-from api.queues.rq.floor_plan import update_floor_plan_with_areas as update_floor_plan_with_areas_rq
+from api.queues.celery.floor_plan import update_floor_plan_with_areas as update_floor_plan_with_areas_celery, \
+    create_floor_plan_raster as create_floor_plan_raster_celery, \
+    delete_floor_plan_rasters as delete_floor_plan_rasters_celery
+from api.queues.rq.floor_plan import update_floor_plan_with_areas as update_floor_plan_with_areas_rq, \
+    create_floor_plan_raster as create_floor_plan_raster_rq, \
+    delete_floor_plan_rasters as delete_floor_plan_rasters_rq
+from api.utilities.celery_utilities import send_as_snapshot
 
 
 @use_rq_if_configured(update_floor_plan_with_areas_rq)
 def update_floor_plan_with_areas(location_matrices: list[LocationMatrix], updated_data: list[dict]) -> None:
+    # Floor plans are matched by location values from before the update.
+    location_matrices = [send_as_snapshot(location_matrix) for location_matrix in location_matrices]
     update_floor_plan_with_areas_celery.delay(location_matrices, updated_data)
+
+
+@use_rq_if_configured(create_floor_plan_raster_rq)
+def create_floor_plan_raster(floor_plan_image: FloorPlanImage) -> None:
+    create_floor_plan_raster_celery.delay(floor_plan_image)
+
+
+@use_rq_if_configured(delete_floor_plan_rasters_rq)
+def delete_floor_plan_rasters(floor_plan_images: list[FloorPlanImage]) -> None:
+    delete_floor_plan_rasters_celery.delay(floor_plan_images)
@@ -1,6 +1,7 @@
 from typing import List
 
 from api.queues.core.base import use_rq_if_configured
+from api.utilities.celery_utilities import send_as_snapshot
 from api.queues.rq.handover_document import \
     create_handover_document_from_asset_handover_document_media as create_handover_document_from_asset_handover_document_media_rq, \
     delete_handover_document_on_asset_handover_document_media_delete as delete_handover_document_on_asset_handover_document_media_delete_rq, \
@@ -51,12 +52,12 @@ def create_handover_document_from_asset_handover_document_media(asset_handover_d
 
 @use_rq_if_configured(delete_handover_document_on_asset_handover_document_media_delete_rq)
 def delete_handover_document_on_asset_handover_document_media_delete(asset_handover_document_media: AssetHandoverDocumentMedia) -> None:
-    delete_handover_document_on_asset_handover_document_media_delete_celery.delay(asset_handover_document_media)
+    delete_handover_document_on_asset_handover_document_media_delete_celery.delay(send_as_snapshot(asset_handover_document_media))
 
 
 @use_rq_if_configured(delete_handover_document_on_asset_handover_delete_rq)
 def delete_handover_document_on_asset_handover_delete(asset_handover: AssetHandover) -> None:
-    delete_handover_document_on_asset_handover_delete_celery.delay(asset_handover)
+    delete_handover_document_on_asset_handover_delete_celery.delay(send_as_snapshot(asset_handover))
 
 
 @use_rq_if_configured(undelete_handover_document_on_asset_handover_undelete_rq)
@@ -76,17 +77,17 @@ def create_handover_document_from_package_handover_document_media(package_handov
 
 @use_rq_if_configured(delete_handover_document_on_package_handover_document_media_delete_rq)
 def delete_handover_document_on_package_handover_document_media_delete(package_handover_document_media: PackageHandoverDocumentMedia) -> None:
-    delete_handover_document_on_package_handover_document_media_delete_celery.delay(package_handover_document_media)
+    delete_handover_document_on_package_handover_document_media_delete_celery.delay(send_as_snapshot(package_handover_document_media))
 
 
 @use_rq_if_configured(delete_handover_document_on_package_handover_delete_rq)
 def delete_handover_document_on_package_handover_delete(package_handover: PackageHandover) -> None:
-    delete_handover_document_on_package_handover_delete_celery.delay(package_handover)
+    delete_handover_document_on_package_handover_delete_celery.delay(send_as_snapshot(package_handover))
 
 
 @use_rq_if_configured(delete_handover_document_on_package_handover_document_delete_rq)
 def delete_handover_document_on_package_handover_document_delete(package_handover_document: PackageHandoverDocument) -> None:
-    delete_handover_document_on_package_handover_document_delete_celery.delay(package_handover_document)
+    delete_handover_document_on_package_handover_document_delete_celery.delay(send_as_snapshot(package_handover_document))
 
 
 @use_rq_if_configured(update_handover_document_on_asset_handover_document_media_update_rq)
@@ -1,4 +1,5 @@
 from api.queues.core.base import use_rq_if_configured
+from api.utilities.celery_utilities import send_as_snapshot
 
 from api.queues.celery.m2m_post_delete import create_m2m_event as create_m2m_event_celery, \
     create_reverse_m2m_event as create_reverse_m2m_event_celery, \
@@ -18,7 +19,7 @@ from api.models import User, Recipient, Company, PackageMatrix
 
 @use_rq_if_configured(create_m2m_event_rq)
 def create_m2m_event(**kwargs):
-    create_m2m_event_celery.delay(**kwargs)
+    create_m2m_event_celery.delay(**{**kwargs, 'instance': send_as_snapshot(kwargs['instance'])})
 
 
 @use_rq_if_configured(create_reverse_m2m_event_rq)
@@ -28,19 +29,19 @@ def create_reverse_m2m_event(**kwargs):
 
 @use_rq_if_configured(create_key_contacts_m2m_reverse_deletion_events_rq)
 def create_key_contacts_m2m_reverse_deletion_events(instance: User):
-    create_key_contacts_m2m_reverse_deletion_events_celery.delay(instance)
+    create_key_contacts_m2m_reverse_deletion_events_celery.delay(send_as_snapshot(instance))
 
 
 @use_rq_if_configured(create_recipient_m2m_reverse_deletion_events_rq)
 def create_recipient_m2m_reverse_deletion_events(instance: Recipient):
-    create_recipient_m2m_reverse_deletion_events_celery.delay(instance)
+    create_recipient_m2m_reverse_deletion_events_celery.delay(send_as_snapshot(instance))
 
 
 @use_rq_if_configured(create_company_m2m_reverse_deletion_events_rq)
 def create_company_m2m_reverse_deletion_events(instance: Company):
-    create_company_m2m_reverse_deletion_events_celery.delay(instance)
+    create_company_m2m_reverse_deletion_events_celery.delay(send_as_snapshot(instance))
 
 
 @use_rq_if_configured(create_package_matrix_m2m_reverse_deletion_events_rq)
 def create_package_matrix_m2m_reverse_deletion_events(instance: PackageMatrix):
-    create_package_matrix_m2m_reverse_deletion_events_celery.delay(instance)
+    create_package_matrix_m2m_reverse_deletion_events_celery.delay(send_as_snapshot(instance))
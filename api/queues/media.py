@@ -1,9 +1,9 @@
 from api.queues.core.base import use_rq_if_configured
 
 from api.queues.celery.media import generate_project_image_thumbnails as generate_project_image_thumbnails_celery, \
-    create_thumbnails as create_thumbnails_celery
+    create_thumbnails as create_thumbnails_celery, create_thumbnails_for_many as create_thumbnails_for_many_celery
 from api.queues.rq.media import generate_project_image_thumbnails as generate_project_image_thumbnails_rq, \
-    create_thumbnails as create_thumbnails_rq
+    create_thumbnails as create_thumbnails_rq, create_thumbnails_for_many as create_thumbnails_for_many_rq
 
 from api.models import Media
 
@@ -16,3 +16,8 @@ def generate_project_image_thumbnails(image_file_name: str) -> None:
 @use_rq_if_configured(create_thumbnails_rq)
 def create_thumbnails(media: Media) -> None:
     create_thumbnails_celery.delay(media)
+
+
+@use_rq_if_configured(create_thumbnails_for_many_rq)
+def create_thumbnails_for_many(media: list[Media]) -> None:
+    create_thumbnails_for_many_celery.delay(media)
@@ -1,4 +1,5 @@
 from api.queues.core.base import use_rq_if_configured
+from api.utilities.celery_utilities import send_as_snapshot
 
 from api.queues.celery.package_handover_statistics import \
     create_statistics_on_package_handover_document_create as create_statistics_on_package_handover_document_create_celery, \
@@ -35,7 +36,7 @@ def create_statistics_on_package_handover_document_create(package_handover_docum
 
 @use_rq_if_configured(delete_statistics_on_package_handover_document_delete_rq)
 def delete_statistics_on_package_handover_document_delete(package_handover_document: PackageHandoverDocument) -> None:
-    delete_statistics_on_package_handover_document_delete_celery.delay(package_handover_document)
+    delete_statistics_on_package_handover_document_delete_celery.delay(send_as_snapshot(package_handover_document))
 
 
 @use_rq_if_configured(undelete_statistics_on_package_handover_document_undelete_rq)
@@ -50,23 +51,23 @@ def increase_statistics_for_document_media_status(package_handover_document_medi
 
 @use_rq_if_configured(decrease_statistics_for_document_media_status_rq)
 def decrease_statistics_for_document_media_status(package_handover_document_media: PackageHandoverDocumentMedia) -> None:
-    decrease_statistics_for_document_media_status_celery.delay(package_handover_document_media)
+    decrease_statistics_for_document_media_status_celery.delay(send_as_snapshot(package_handover_document_media))
 
 
 @use_rq_if_configured(update_statistics_by_statuses_on_document_media_status_change_rq)
 def update_statistics_by_statuses_on_document_media_status_change(package_handover_document_media: PackageHandoverDocumentMedia) -> None:
-    update_statistics_by_statuses_on_document_media_status_change_celery.delay(package_handover_document_media)
+    update_statistics_by_statuses_on_document_media_status_change_celery.delay(send_as_snapshot(package_handover_document_media))
 
 
 # TODO: Unused task, https://projects.ronasit.com/TomSynnott/MBuild/mbuild-django/-/blob/development/api/signals/asset_handover_statistics/project.py#L12
 @use_rq_if_configured(delete_statistics_on_project_delete_rq)
 def delete_statistics_on_project_delete(project: Project) -> None:
-    delete_statistics_on_project_delete_celery.delay(project)
+    delete_statistics_on_project_delete_celery.delay(send_as_snapshot(project))
 
 
 @use_rq_if_configured(delete_statistics_on_package_handover_delete_rq)
 def delete_statistics_on_package_handover_delete(package_handover: PackageHandover) -> None:
-    delete_statistics_on_package_handover_delete_celery.delay(package_handover)
+    delete_statistics_on_package_handover_delete_celery.delay(send_as_snapshot(package_handover))
 
 
 @use_rq_if_configured(undelete_statistics_on_package_handover_undelete_rq)
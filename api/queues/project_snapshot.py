@@ -0,0 +1,8 @@
+from api.queues.core.base import use_rq_if_configured
+from api.queues.rq.project_snapshot import generate_project_snapshot as generate_project_snapshot_rq
+from api.queues.celery.project_snapshot import generate_project_snapshot as generate_project_snapshot_celery
+
+
+@use_rq_if_configured(generate_project_snapshot_rq)
+def generate_project_snapshot(snapshot_id: str) -> None:
+    generate_project_snapshot_celery.delay(snapshot_id)
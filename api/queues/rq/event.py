@@ -0,0 +1,8 @@
+from django_rq import job
+
+from api.queues.core.event import create_events_from_batches as create_events_from_batches_core
+
+
+@job('events', timeout=3600)
+def create_events_from_batches(batches: list[dict]) -> None:
+    create_events_from_batches_core(batches)
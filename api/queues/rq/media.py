@@ -1,7 +1,7 @@
 from django_rq import job
 
 from api.queues.core.media import generate_project_image_thumbnails as generate_project_image_thumbnails_core, \
-    create_thumbnails as create_thumbnails_core
+    create_thumbnails as create_thumbnails_core, create_thumbnails_for_many as create_thumbnails_for_many_core
 
 
 from api.models import Media
@@ -15,3 +15,8 @@ def generate_project_image_thumbnails(image_file_name: str) -> None:
 @job('thumbnails', timeout=3600)
 def create_thumbnails(media: Media) -> None:
     create_thumbnails_core(media)
+
+
+@job('thumbnails', timeout=3600)
+def create_thumbnails_for_many(media: list[Media]) -> None:
+    create_thumbnails_for_many_core(media)
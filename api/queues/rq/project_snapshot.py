@@ -0,0 +1,8 @@
+from django_rq import job
+
+from api.queues.core.project_snapshot import generate_project_snapshot as generate_project_snapshot_core
+
+
+@job('reports', timeout=36000)
+def generate_project_snapshot(snapshot_id: str) -> None:
+    generate_project_snapshot_core(snapshot_id)
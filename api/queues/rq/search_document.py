@@ -0,0 +1,8 @@
+from django_rq import job
+
+from api.queues.core.search_document import refresh_search_documents as refresh_search_documents_core
+
+
+@job('default', timeout=3600)
+def refresh_search_documents(filters: dict[str, dict]) -> None:
+    refresh_search_documents_core(filters)
@@ -0,0 +1,9 @@
+from api.queues.core.base import use_rq_if_configured
+
+from api.queues.celery.search_document import refresh_search_documents as refresh_search_documents_celery
+from api.queues.rq.search_document import refresh_search_documents as refresh_search_documents_rq
+
+
+@use_rq_if_configured(refresh_search_documents_rq)
+def refresh_search_documents(filters: dict[str, dict]) -> None:
+    refresh_search_documents_celery.delay(filters)
@@ -1,44 +1,123 @@
 import django
-django.setup()
+from django.apps import apps
+
+# Module is loaded by rq worker as a queue class before Django is set up.
+if not apps.ready:
+    django.setup()
 
-import itertools
 import logging
-from time import sleep
+from bisect import bisect_right
+from time import monotonic
 
+from redis import WatchError
 from rq import Queue
 from rq.compat import as_text
-from rq.exceptions import NoSuchJobError
+from rq.connections import resolve_connection
+from rq.exceptions import NoSuchJobError, DequeueTimeout
 from rq.utils import backend_class
 
 
+logger = logging.getLogger(__name__)
+
+
 class CommandProjectQueue(Queue):
+    """
+    Queue of project commands. Worker listens to the `commands-project-*` pattern
+    while jobs are pushed to per-project queues (`commands-project-<id>`).
+
+    Names of non-empty project queues are kept in a registry set, so the worker
+    waits for jobs with a blocking pop over registered queues only. Queues are
+    served round-robin to keep fairness across projects and jobs of a single
+    queue are popped in the order they were pushed.
+    """
+    queue_name_pattern = 'commands-project-*'
+    redis_active_queues_key = 'rq:active-queues:%s'
+    redis_active_queues_wakeup_key = 'rq:active-queues-wakeup:%s'
+
+    # Maximum time in seconds a worker blocks without reloading the registry.
+    registry_refresh_interval = 5
+
+    _last_served_queue_name = None
+    _registered_existing_queues = False
+
+    @classmethod
+    def get_active_queues_key(cls) -> str:
+        return cls.redis_active_queues_key % cls.queue_name_pattern
+
+    @classmethod
+    def get_active_queues_wakeup_key(cls) -> str:
+        return cls.redis_active_queues_wakeup_key % cls.queue_name_pattern
+
+    def push_job_id(self, job_id, pipeline=None, at_front=False):
+        connection = pipeline if pipeline is not None else self.connection.pipeline()
+
+        super().push_job_id(job_id, pipeline=connection, at_front=at_front)
+        connection.sadd(self.get_active_queues_key(), self.name)
+        # Wake up workers blocked on queues registered before this one.
+        connection.lpush(self.get_active_queues_wakeup_key(), self.name)
+        connection.ltrim(self.get_active_queues_wakeup_key(), 0, 0)
+
+        if pipeline is None:
+            connection.execute()
+
+    def unregister_if_empty(self) -> None:
+        with self.connection.pipeline() as pipe:
+            try:
+                # Transaction is aborted if a job is pushed into the queue meanwhile.
+                pipe.watch(self.key)
+                if pipe.llen(self.key) == 0:
+                    pipe.multi()
+                    pipe.srem(self.get_active_queues_key(), self.name)
+                    pipe.execute()
+            except WatchError:
+                pass
+
     @classmethod
     def dequeue_any(cls, queues, timeout, connection=None, job_class=None, serializer=None):
-        """Class method returning the job_class instance at the front of the given
-        set of Queues, where the order of the queues is important.
+        """Class method returning the job_class instance at the front of the
+        registered project queues.
 
-        When all of the Queues are empty, depending on the `timeout` argument,
+        When all of the queues are empty, depending on the `timeout` argument,
         either blocks execution of this function for the duration of the
-        timeout or until new messages arrive on any of the queues, or returns
-        None.
+        timeout or until new jobs arrive on any of the queues, or returns None.
 
         See the documentation of cls.lpop for the interpretation of timeout.
         """
+        connection = resolve_connection(connection)
         job_class = backend_class(cls, 'job_class', override=job_class)
+        wakeup_key = cls.get_active_queues_wakeup_key()
+        deadline = monotonic() + timeout if timeout is not None else None
+
+        cls._register_existing_queues(connection)
 
         while True:
-            queues_list = cls.get_queues_by_regex_name(queues, connection, job_class, serializer)
-            queue_keys = [q.key for q in queues_list]
-            result = cls.lpop(queue_keys, None, connection=connection)
-            if result is None:
-                sleep(1)
-                continue
+            queue_keys = cls._get_active_queue_keys(connection)
+
+            if timeout is None:
+                result = cls.lpop(queue_keys, None, connection=connection)
+                if result is None:
+                    return None
+            else:
+                remaining_time = deadline - monotonic()
+                if remaining_time <= 0:
+                    raise DequeueTimeout(timeout, queue_keys)
+
+                result = connection.blpop(queue_keys + [wakeup_key],
+                                          max(1, int(min(remaining_time, cls.registry_refresh_interval))))
+                if result is None:
+                    continue
 
             queue_key, job_id = map(as_text, result)
+            if queue_key == wakeup_key:
+                continue
+
             queue = cls.from_queue_key(queue_key,
                                        connection=connection,
                                        job_class=job_class,
                                        serializer=serializer)
+            cls._last_served_queue_name = queue.name
+            queue.unregister_if_empty()
+
             try:
                 job = job_class.fetch(job_id, connection=connection, serializer=serializer)
             except NoSuchJobError:
@@ -52,26 +131,28 @@ class CommandProjectQueue(Queue):
                 e.queue = queue
                 raise e
             return job, queue
-        return None, None
 
     @classmethod
-    def get_queues_by_regex_name(cls, queues, connection, job_class, serializer):
-        logger = logging.getLogger(__name__)
-        queues_keys = [
-            [
-                queue_key.decode('utf-8').replace(queue.redis_queue_namespace_prefix, '')
-                for queue_key
-                in list(connection.keys(queue.key))
-            ]
-            for queue in queues
-        ]
-        queues_keys = list(itertools.chain.from_iterable(queues_keys))
-        logger.info('Queues: ' + str(queues_keys))
-        # Add 'default' queue as a stump to prevent error for empty queue list.
-        queues_keys.append('default')
-
-        sorted(queues_keys)
-
-        return [cls(name=q, connection=connection,
-                    job_class=job_class, serializer=serializer)
-                for q in queues_keys]
+    def _get_active_queue_keys(cls, connection) -> list[str]:
+        queue_names = sorted(as_text(queue_name) for queue_name in connection.smembers(cls.get_active_queues_key()))
+
+        # Start from the queue next to the last served one, so busy projects can't starve others.
+        if cls._last_served_queue_name is not None:
+            next_queue_index = bisect_right(queue_names, cls._last_served_queue_name)
+            queue_names = queue_names[next_queue_index:] + queue_names[:next_queue_index]
+
+        return [cls.redis_queue_namespace_prefix + queue_name for queue_name in queue_names]
+
+    @classmethod
+    def _register_existing_queues(cls, connection) -> None:
+        # Queues filled before the registry was introduced have to be registered once.
+        if cls._registered_existing_queues:
+            return
+
+        pattern_key = cls.redis_queue_namespace_prefix + cls.queue_name_pattern
+        for queue_key in connection.scan_iter(match=pattern_key):
+            queue_name = as_text(queue_key)[len(cls.redis_queue_namespace_prefix):]
+            logger.info('Register existing queue %s' % queue_name)
+            connection.sadd(cls.get_active_queues_key(), queue_name)
+
+        cls._registered_existing_queues = True
@@ -1,5 +1,6 @@
 import traceback
 
+from django.db import transaction
 from rest_framework.utils import model_meta
 from typing import Dict, List, Type
 
@@ -15,7 +16,9 @@ class BaseEntityService:
         return self.sync_service(**kwargs)
 
     def create_many(self, validated_data: List[Dict], **kwargs) -> list:
-        return [self.create(entity, **kwargs) for entity in validated_data]
+        # Single transaction lets events of all entities be inserted at once.
+        with transaction.atomic():
+            return [self.create(entity, **kwargs) for entity in validated_data]
 
     @staticmethod
     def _set_many_to_many(instance: Type[BaseModel], many_to_many: Dict) -> None:
@@ -0,0 +1,200 @@
+import math
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional
+
+import pendulum
+from django.db import connection
+
+from api.commands import process_commands_batch
+from api.enums.entities import Entities
+from api.models import Command, Event, LocationMatrix, Project, Subtask, Task, User
+from mbuild.settings import COMMANDS_PROCESSING_BATCH_SIZE
+
+
+@dataclass
+class CommandBenchmarkStatistic:
+    durations: list = field(default_factory=list)
+    queries: list = field(default_factory=list)
+    statuses: dict = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+
+    def get_duration_percentile(self, percent: int) -> float:
+        # Nearest-rank percentile.
+        durations = sorted(self.durations)
+        return durations[max(0, math.ceil(percent / 100 * len(durations)) - 1)]
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'p50_ms': round(self.get_duration_percentile(50) * 1000, 2),
+            'p99_ms': round(self.get_duration_percentile(99) * 1000, 2),
+            'queries_per_command': round(sum(self.queries) / self.count, 2),
+            'statuses': dict(self.statuses),
+        }
+
+
+@dataclass
+class CommandBenchmarkResult:
+    statistics: dict = field(default_factory=lambda: defaultdict(CommandBenchmarkStatistic))
+    duration: float = 0
+    events: int = 0
+
+    @property
+    def count(self) -> int:
+        return sum(statistic.count for statistic in self.statistics.values())
+
+    @property
+    def commands_per_second(self) -> float:
+        return self.count / self.duration if self.duration else 0
+
+    def as_dict(self) -> dict:
+        return {
+            'commands': self.count,
+            'duration_s': round(self.duration, 3),
+            'commands_per_second': round(self.commands_per_second, 2),
+            'events': self.events,
+            'entities': {key: statistic.as_dict() for key, statistic in self.statistics.items()},
+        }
+
+
+class CommandBenchmarkService:
+    """
+    Generates streams of offline-sync commands, chained through `parent_entity_local_id`
+    the same way mobile clients send them, and replays them through the command pipeline.
+    Generated commands and entities are stored, so run it against a local database only.
+    """
+    def generate(self, project: Project, user: User, chains: int, company_id: Optional[int] = None) -> list:
+        tasks = list(Task.objects.filter(location_matrix__project=project).values_list('pk', flat=True)[:chains])
+        location_matrices = list(LocationMatrix.objects.filter(project=project).values_list('pk', flat=True)[:chains])
+        commands = []
+
+        for index in range(chains):
+            if tasks:
+                commands.extend(self._get_subtask_chain(project, user, tasks[index % len(tasks)], company_id))
+            if location_matrices:
+                commands.extend(self._get_quality_issue_chain(
+                    project, user, location_matrices[index % len(location_matrices)]
+                ))
+
+        return Command.objects.insert(commands) if commands else []
+
+    def replay(self, commands: list) -> CommandBenchmarkResult:
+        """
+        Replay commands by batches through the same pipeline as the commands sent by clients.
+        Queries are only counted, not captured, so their logging doesn't add to measured durations.
+        Events are inserted once a batch is committed, so they are counted for the whole replay.
+        """
+        result = CommandBenchmarkResult()
+        projects_ids = {command.project_id for command in commands}
+        events_count = Event.objects(project_id__in=projects_ids).count()
+        queries_count = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries_count
+            queries_count += 1
+
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_query):
+            started_at = perf_counter()
+
+            for batch_start in range(0, len(commands), COMMANDS_PROCESSING_BATCH_SIZE):
+                command_started_at, command_queries_count = perf_counter(), queries_count
+
+                def on_command_processed(command: Command) -> None:
+                    nonlocal command_started_at, command_queries_count
+                    statistic = result.statistics[self._get_statistic_key(command)]
+                    statistic.durations.append(perf_counter() - command_started_at)
+                    statistic.queries.append(queries_count - command_queries_count)
+                    command_started_at, command_queries_count = perf_counter(), queries_count
+
+                process_commands_batch(commands[batch_start:batch_start + COMMANDS_PROCESSING_BATCH_SIZE],
+                                       on_command_processed)
+
+            result.duration = perf_counter() - started_at
+
+        result.events = Event.objects(project_id__in=projects_ids).count() - events_count
+
+        for command in Command.objects(pk__in=[command.pk for command in commands]).only('entity', 'type', 'status'):
+            result.statistics[self._get_statistic_key(command)].statuses[command.status] += 1
+
+        return result
+
+    def _get_statistic_key(self, command: Command) -> str:
+        return f'{command.entity}:{command.type}'
+
+    def _get_subtask_chain(self, project: Project, user: User, task_id: int, company_id: Optional[int]) -> list:
+        subtask_local_id = self._get_local_id()
+
+        return [
+            self._get_command(project, user, Entities.SUBTASK, {
+                'local_id': subtask_local_id,
+                'task': task_id,
+                'user': user.pk,
+                'company': company_id,
+                'description': 'Benchmark subtask',
+                'status': Subtask.Status.IN_PROGRESS.value,
+                'due_date': pendulum.now().add(days=7).isoformat(),
+            }),
+            self._get_command(project, user, Entities.SUBTASK_UPDATE, {
+                'parent_entity_local_id': subtask_local_id,
+                'local_id': self._get_local_id(),
+                'user': user.pk,
+                'comment': 'Benchmark subtask update',
+                'old_data': {'description': 'Benchmark subtask', 'status': Subtask.Status.IN_PROGRESS.value},
+                'new_data': {'description': 'Updated benchmark subtask', 'status': Subtask.Status.IN_PROGRESS.value},
+            }),
+            self._get_command(project, user, Entities.SUBTASK_UPDATE, {
+                'parent_entity_local_id': subtask_local_id,
+                'local_id': self._get_local_id(),
+                'user': user.pk,
+                'comment': 'Benchmark subtask approval request',
+                'old_data': {'status': Subtask.Status.IN_PROGRESS.value},
+                'new_data': {'status': Subtask.Status.REQUESTING_APPROVAL.value},
+            }),
+        ]
+
+    def _get_quality_issue_chain(self, project: Project, user: User, location_matrix_id: int) -> list:
+        quality_issue_local_id = self._get_local_id()
+
+        return [
+            self._get_command(project, user, Entities.QUALITY_ISSUE, {
+                'local_id': quality_issue_local_id,
+                'location_matrix': location_matrix_id,
+                'user': user.pk,
+                'description': 'Benchmark quality issue',
+                'due_date': pendulum.now().add(days=7).isoformat(),
+            }),
+            self._get_command(project, user, Entities.QUALITY_ISSUE_UPDATE, {
+                'parent_entity_local_id': quality_issue_local_id,
+                'local_id': self._get_local_id(),
+                'user': user.pk,
+                'comment': 'Benchmark quality issue comment',
+                'is_comment': True,
+                'old_data': {},
+                'new_data': {},
+            }),
+        ]
+
+    def _get_command(self, project: Project, user: User, entity: Entities, data: dict) -> Command:
+        now = pendulum.now()
+
+        return Command(
+            data=data,
+            type=Command.Types.CREATE_ENTITY.value,
+            status=Command.Statuses.PENDING.value,
+            entity=entity.value,
+            project_id=project.pk,
+            user=user.pk,
+            created_at=now,
+            updated_at=now,
+        )
+
+    def _get_local_id(self) -> str:
+        return f'benchmark-{uuid.uuid4().hex}'
@@ -1,16 +1,18 @@
 import csv
 
-from io import StringIO
-from typing import List, Any
+from contextlib import contextmanager
+from io import TextIOWrapper
+from typing import List, Any, Iterable, Iterator, Optional
 
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
 
 from api.models import Media
 from api.services.media_entity_service import MediaEntityService
 
 
 class CsvFileService:
-    csv_file: SimpleUploadedFile = None
+    csv_file: UploadedFile = None
+    stream: Optional[TextIOWrapper] = None
 
     def __init__(self, file_name: str, media_service: Any = MediaEntityService) -> None:
         if not file_name.endswith('.csv'):
@@ -18,19 +20,42 @@ class CsvFileService:
         self.file_name = file_name
         self.media_service = media_service
 
-    def create_file(self, col_titles: List[str], rows_data: List) -> SimpleUploadedFile:
-        f = StringIO()
+    def create_file(self, col_titles: List[str], rows_data: Iterable) -> UploadedFile:
+        with self.open_file() as f:
+            writer = csv.writer(f)
+            writer.writerow(col_titles)
+            title_count = len(col_titles)
+
+            for row in rows_data:
+                if title_count != len(row):
+                    raise ValueError(f'File: {self.file_name}, the row is shorter than the col_titles. Row: {row}')
+                writer.writerow(row)
+
+        return self.close_file()
+
+    @contextmanager
+    def open_file(self) -> Iterator[TextIOWrapper]:
+        # Rows are written to a temporary file on disk, so the file
+        # is never kept in memory and is uploaded by chunks.
+        self.csv_file = TemporaryUploadedFile(name=self.file_name, content_type='text/csv', size=None, charset='utf8')
+        self.stream = TextIOWrapper(self.csv_file.file, encoding='utf8', newline='')
+
+        try:
+            yield self.stream
+        except BaseException:
+            # Closing the stream closes and removes the temporary file.
+            self.stream.close()
+            self.stream = None
+            raise
+
+    def close_file(self) -> UploadedFile:
+        self.stream.flush()
+        self.stream.detach()
+        self.stream = None
+
+        self.csv_file.size = self.csv_file.tell()
+        self.csv_file.seek(0)
 
-        writer = csv.writer(f)
-        writer.writerow(col_titles)
-        title_count = len(col_titles)
-
-        for row in rows_data:
-            if title_count != len(row):
-                raise ValueError(f'File: {self.file_name}, the row is shorter than the col_titles. Row: {row}')
-            writer.writerow(row)
-
-        self.csv_file = SimpleUploadedFile(content=f.getvalue().encode('utf8'), name=self.file_name, content_type='text/csv')
         return self.csv_file
 
     def save_file_to_media(self) -> Media:
@@ -2,7 +2,7 @@ from typing import Type, Optional
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import UploadedFile
 from django.db.models import TextChoices
 from pydash import human_case
 from rest_framework.request import Request
@@ -14,6 +14,7 @@ from api.models import Task, Subtask, PackageHandoverDocumentMedia, AssetHandove
     Project, HandoverDocument, Package, PackageMatrix, LocationMatrix, LocationMatrixPackage, Company, PackageActivity
 from api.models.base_model import BaseModel
 from api.services.media_entity_service import MediaEntityService
+from api.services.report_cache_service import ReportCacheService
 from api.utilities.report_generators import TaskReportGenerator, SubtaskReportGenerator, QualityIssueReportGenerator, \
     PackageHandoverDocumentMediaReportGenerator, AssetHandoverDocumentMediaReportGenerator, BaseReportGenerator
 from api.utilities.report_generators.asset_handover_information_report_generator import \
@@ -54,32 +55,27 @@ class EntityReportService:
         self.entity_name_in_human_case = human_case(self.model_class.__name__).title()
 
     def send_csv_report(self) -> None:
-        generated_file = self.__get_report_generator().generateCsv()
-        report = self.__save_report(generated_file)
+        report = self.__get_report(self.__get_report_generator(), self.ReportType.CSV)
         subject = self.__get_entity_report_email_subject(self.ReportType.CSV)
         self.__send_email(report, self.ReportType.CSV, subject, ReportCreated)
 
     def send_client_csv_report(self) -> None:
-        generated_file = self.__get_client_report_generator().generateCsv()
-        report = self.__save_report(generated_file)
+        report = self.__get_report(self.__get_client_report_generator(), self.ReportType.CSV)
         subject = self.__get_client_entity_report_email_subject(self.ReportType.CSV)
         self.__send_email(report, self.ReportType.CSV, subject, ClientReportCreated)
 
     def send_client_pdf_report(self) -> None:
-        generated_file = self.__get_client_report_generator().generatePdf()
-        report = self.__save_report(generated_file)
+        report = self.__get_report(self.__get_client_report_generator(), self.ReportType.PDF)
         subject = self.__get_client_entity_report_email_subject(self.ReportType.PDF)
         self.__send_email(report, self.ReportType.PDF, subject, ClientReportCreated)
 
     def send_handover_information_csv_report(self) -> None:
-        generated_file = self.__get_handover_information_report_generator().generateCsv()
-        report = self.__save_report(generated_file)
+        report = self.__get_report(self.__get_handover_information_report_generator(), self.ReportType.CSV)
         subject = self.__get_handover_information_report_email_subject()
         self.__send_email(report, self.ReportType.CSV, subject, HandoverInformationReportCreated)
 
     def send_pdf_report(self) -> None:
-        generated_file = self.__get_report_generator().generatePdf()
-        report = self.__save_report(generated_file)
+        report = self.__get_report(self.__get_report_generator(), self.ReportType.PDF)
         subject = self.__get_entity_report_email_subject(self.ReportType.PDF)
         self.__send_email(report, self.ReportType.PDF, subject, ReportCreated)
 
@@ -141,7 +137,21 @@ class EntityReportService:
 
         raise ValueError('Invalid report model')
 
-    def __save_report(self, generated_file: SimpleUploadedFile) -> Media:
+    def __get_report(self, generator: BaseReportGenerator, report_type: ReportType) -> Media:
+        # Version is taken before generation, so changes made meanwhile aren't missed.
+        report_cache_service = ReportCacheService()
+        cache_key = report_cache_service.get_key(generator, report_type)
+        version = report_cache_service.get_version(generator)
+
+        report = report_cache_service.get(cache_key, version)
+        if report is None:
+            generated_file = generator.generatePdf() if report_type == self.ReportType.PDF else generator.generateCsv()
+            report = self.__save_report(generated_file)
+            report_cache_service.set(cache_key, version, report)
+
+        return report
+
+    def __save_report(self, generated_file: UploadedFile) -> Media:
         return MediaEntityService().save_report({'file': generated_file, 'is_public': False})
 
     def __send_email(self, report: Media, report_type: ReportType, subject: str, email_class) -> None:
@@ -0,0 +1,92 @@
+import gzip
+from datetime import datetime
+from tempfile import TemporaryFile
+from typing import Iterator, Optional
+
+import pendulum
+from bson import json_util
+from django.core.files import File
+
+from api.models import Event, EventCompaction
+from api.storages import AzurePrivateMediaStorage
+
+
+class EventCompactionService:
+    """
+    Folds events older than a horizon into the latest event of each entity.
+    Superseded events are archived to the private storage before removal.
+    Events without `data.id` (many-to-many relations) are left as is.
+    """
+    delete_chunk_size = 1000
+
+    def __init__(self, storage=None):
+        self.storage = storage or AzurePrivateMediaStorage()
+
+    def compact(self, project_id: int, compacted_before: datetime) -> Optional[EventCompaction]:
+        with TemporaryFile() as archive_file:
+            events_count = self._archive_superseded_events(project_id, compacted_before, archive_file)
+
+            if not events_count:
+                return None
+
+            archive_file.seek(0)
+            archive = self.storage.save(self._get_archive_name(project_id, compacted_before), File(archive_file))
+
+        self._delete_superseded_events(project_id, compacted_before)
+
+        return EventCompaction.objects.create(
+            project_id=project_id,
+            compacted_before=compacted_before,
+            archive=archive,
+            events_count=events_count,
+            created_at=pendulum.now()
+        )
+
+    def _archive_superseded_events(self, project_id: int, compacted_before: datetime, archive_file) -> int:
+        events_count = 0
+
+        with gzip.GzipFile(fileobj=archive_file, mode='wb') as archive:
+            for event in self._get_superseded_events(project_id, compacted_before):
+                archive.write(json_util.dumps(event).encode() + b'\n')
+                events_count += 1
+
+        return events_count
+
+    def _delete_superseded_events(self, project_id: int, compacted_before: datetime) -> None:
+        collection = Event._get_collection()
+        event_ids = list()
+
+        for event in self._get_superseded_events(project_id, compacted_before, {'_id': 1}):
+            event_ids.append(event['_id'])
+
+            if len(event_ids) == self.delete_chunk_size:
+                collection.delete_many({'_id': {'$in': event_ids}})
+                event_ids = list()
+
+        if event_ids:
+            collection.delete_many({'_id': {'$in': event_ids}})
+
+    def _get_superseded_events(self, project_id: int, compacted_before: datetime,
+                               projection: dict = None) -> Iterator[dict]:
+        pipeline = [
+            {'$match': {
+                'project_id': project_id,
+                'created_at': {'$lt': compacted_before},
+                'data.id': {'$exists': True},
+            }},
+            {'$sort': {'entity': 1, 'data.id': 1, 'created_at': -1, '_id': -1}},
+        ]
+        previous_key = None
+
+        for event in Event._get_collection().aggregate(pipeline, allowDiskUse=True):
+            key = (event['entity'], event['data']['id'])
+
+            # The first event in a group holds the latest state of an entity.
+            if key == previous_key:
+                yield {field: event[field] for field in projection} if projection else event
+
+            previous_key = key
+
+    @staticmethod
+    def _get_archive_name(project_id: int, compacted_before: datetime) -> str:
+        return f'events/{project_id}/{compacted_before:%Y%m%d%H%M%S}.jsonl.gz'
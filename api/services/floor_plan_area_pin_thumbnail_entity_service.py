@@ -1,13 +1,14 @@
-import gc
 import io
 import operator
 
 from PIL import Image, ImageDraw, ImageFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-from api.models import FloorPlanAreaPinThumbnail, FloorPlanAreaPin, FloorPlanArea, Media
+from api.models import FloorPlanAreaPinThumbnail, FloorPlanAreaPin, FloorPlanArea, Media, FloorPlan, FloorPlanImage
 from api.services.base_entity_service import BaseEntityService
+from api.services.floor_plan_image_entity_service import FloorPlanImageEntityService
 from api.services.media_entity_service import MediaEntityService
+from api.utilities.floor_plan_raster import FloorPlanRaster
 
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
@@ -21,111 +22,108 @@ class FloorPlanAreaPinThumbnailEntityService(BaseEntityService):
     ellipse_border_width = 9
 
     def recreate_from_area(self, floor_plan_area: FloorPlanArea) -> None:
-        pins = FloorPlanAreaPin.objects.filter(floor_plan_area=floor_plan_area).all()
+        # All pins of the area share the floor plan raster and the area crop,
+        # so they are rendered once and only pin dots are drawn for each pin.
+        pins = list(FloorPlanAreaPin.objects.filter(floor_plan_area=floor_plan_area).all())
+        self.model.objects.filter(floor_plan_area_pin__in=pins).delete()
+        if not pins:
+            return
+
+        floor_plan_image = self._get_floor_plan_image(floor_plan_area.floor_plan)
+        raster = FloorPlanImageEntityService().get_raster(floor_plan_image)
+        general_image = self._get_general_image(raster)
+        area_image, area_box = self._get_area_image(raster, floor_plan_area)
+
         for pin in pins:
-            self.model.objects.filter(floor_plan_area_pin=pin).delete()
-            self.create_from_pin(pin)
+            self._create_pin_thumbnails(pin, floor_plan_image.image.name, raster, general_image, area_image, area_box)
 
     def recreate_from_pin(self, pin: FloorPlanAreaPin) -> None:
         self.model.objects.filter(floor_plan_area_pin=pin).delete()
         self.create_from_pin(pin)
 
     def create_temporary_pin_thumbnail(self, validated_data: dict) -> list[Media]:
-        floor_plan_image = validated_data['floor_plan'].get_floor_plan_image()
-
-        if not floor_plan_image:
-            raise ValueError('Floor plan image for floor plan %s does not exist.' % validated_data['floor_plan'].pk)
-
-        storage = floor_plan_image.get_common_storage()
-        image = Image.open(storage.open(floor_plan_image.link))
-        original_image_width, original_image_height = image.size
-        name = 'temp-pin-thumb-%s' % floor_plan_image.name
+        floor_plan_image = self._get_floor_plan_image(validated_data['floor_plan'])
+        raster = FloorPlanImageEntityService().get_raster(floor_plan_image)
+        name = 'temp-pin-thumb-%s' % floor_plan_image.image.name
         images = []
 
         if self.model.Type.GENERAL in validated_data['type']:
-            general_thumbnail_image = image
-            self._add_thumbnail(general_thumbnail_image)
-            self._add_pin_dot(general_thumbnail_image, original_image_width, original_image_height, validated_data['pin_coordinates'])
+            general_thumbnail_image = self._get_general_image(raster)
+            self._add_pin_dot(general_thumbnail_image, raster.width, raster.height, validated_data['pin_coordinates'])
             general_thumbnail = (self._create_thumbnail_media(general_thumbnail_image, name))
             general_thumbnail.type = self.model.Type.GENERAL.value
             images.append(general_thumbnail)
 
-            general_thumbnail_image.close()
-            gc.collect()
-
         if self.model.Type.AREA in validated_data['type']:
-            area_thumbnail_image = Image.open(storage.open(floor_plan_image.link)) if self.model.Type.GENERAL in validated_data['type'] else image
-            area_thumbnail_image = self._cut_pin_area(image=area_thumbnail_image, pin_coordinates=validated_data['pin_coordinates'], floor_plan_area=validated_data['floor_plan_area'])
+            area_thumbnail_image, area_box = self._get_area_image(raster, validated_data['floor_plan_area'])
+            self._add_area_pin_dot(area_thumbnail_image, area_box, validated_data['pin_coordinates'])
             area_thumbnail = (self._create_thumbnail_media(area_thumbnail_image, name))
             area_thumbnail.type = self.model.Type.AREA.value
             images.append(area_thumbnail)
 
-            area_thumbnail_image.close()
-            gc.collect()
-
-        image.close()
-        gc.collect()
-
         return images
 
     def create_from_pin(self, pin: FloorPlanAreaPin) -> None:
-        floor_plan_image = pin.floor_plan_area.floor_plan.get_floor_plan_image()
+        floor_plan_image = self._get_floor_plan_image(pin.floor_plan_area.floor_plan)
+        raster = FloorPlanImageEntityService().get_raster(floor_plan_image)
+        area_image, area_box = self._get_area_image(raster, pin.floor_plan_area)
 
-        if not floor_plan_image:
-            raise ValueError('Floor plan image for floor plan %s does not exist.' % pin.floor_plan_area.floor_plan.pk)
+        self._create_pin_thumbnails(pin, floor_plan_image.image.name, raster, self._get_general_image(raster),
+                                    area_image, area_box)
 
-        storage = floor_plan_image.get_common_storage()
-        image = Image.open(storage.open(floor_plan_image.link))
-        original_image_width, original_image_height = image.size
+    def _get_floor_plan_image(self, floor_plan: FloorPlan) -> FloorPlanImage:
+        floor_plan_image = floor_plan.media.floorplanimage_set.select_related('image').first()
 
-        self._create_area_pin_thumbnail(image.copy(), pin, floor_plan_image.name)
-        self._create_general_pin_thumbnail(image.copy(), original_image_width, original_image_height, pin, floor_plan_image)
-
-        image.close()
+        if not floor_plan_image:
+            raise ValueError('Floor plan image for floor plan %s does not exist.' % floor_plan.pk)
 
-    def _create_thumbnail_media(self, image: Image, name) -> Media:
-        content = io.BytesIO()
-        image.save(content, format='PNG', quality='maximum', optimize=True, progressive=True)
-        file = SimpleUploadedFile(content=content.getvalue(), name=name, content_type='image/png')
-        data = {
-            'file': file,
-            'is_public': False
-        }
-        return MediaEntityService().create(data, create_thumbnail=False)
+        return floor_plan_image
 
-    def _create_general_pin_thumbnail(self, image: Image, width, height, pin, floor_plan_image) -> None:
-        self._add_thumbnail(image)
-        self._add_pin_dot(image, width, height, pin.pin)
-        self._create_pin_thumbnail(image, pin, floor_plan_image.name, FloorPlanAreaPinThumbnail.Type.GENERAL)
+    def _create_pin_thumbnails(self, pin: FloorPlanAreaPin, name: str, raster: FloorPlanRaster, general_image: Image,
+                               area_image: Image, area_box: tuple) -> None:
+        area_pin_image = area_image.copy()
+        self._add_area_pin_dot(area_pin_image, area_box, pin.pin)
+        self._create_pin_thumbnail(area_pin_image, pin, name, FloorPlanAreaPinThumbnail.Type.AREA)
 
-        image.close()
+        general_pin_image = general_image.copy()
+        self._add_pin_dot(general_pin_image, raster.width, raster.height, pin.pin)
+        self._create_pin_thumbnail(general_pin_image, pin, name, FloorPlanAreaPinThumbnail.Type.GENERAL)
 
-    def _create_area_pin_thumbnail(self, image: Image, pin: FloorPlanAreaPin, name) -> None:
-        image = self._cut_pin_area(image=image, pin_coordinates=pin.pin, floor_plan_area=pin.floor_plan_area)
-        self._create_pin_thumbnail(image, pin, name, FloorPlanAreaPinThumbnail.Type.AREA)
+    def _get_general_image(self, raster: FloorPlanRaster) -> Image:
+        image = raster.get_overview().copy()
+        self._add_thumbnail(image)
 
-        image.close()
+        return image
 
-    def _cut_pin_area(self, image: Image, pin_coordinates: dict, floor_plan_area: FloorPlanArea) -> Image:
+    def _get_area_image(self, raster: FloorPlanRaster, floor_plan_area: FloorPlanArea) -> tuple[Image, tuple]:
         area_polygon_points = list(map(operator.itemgetter('x', 'y'), floor_plan_area.polygon['points']))
-
         cropped_image_box = self._get_cropped_image_box(area_polygon_points)
-        image = image.crop(box=(cropped_image_box['left'],
-                                cropped_image_box['top'],
-                                cropped_image_box['right'],
-                                cropped_image_box['bottom']))
+        area_box = (cropped_image_box['left'], cropped_image_box['top'],
+                    cropped_image_box['right'], cropped_image_box['bottom'])
+
+        image = raster.crop(area_box, self._get_thumbnail_size())
+        self._add_thumbnail(image)
 
+        return image, area_box
+
+    def _add_area_pin_dot(self, image: Image, area_box: tuple, pin_coordinates: dict) -> None:
+        left, top, right, bottom = area_box
         cropped_point_coordinates = {
-            'x': pin_coordinates['x'] - cropped_image_box['left'],
-            'y': pin_coordinates['y'] - cropped_image_box['top']
+            'x': pin_coordinates['x'] - left,
+            'y': pin_coordinates['y'] - top
         }
 
-        original_width, original_height = image.size
-
-        self._add_thumbnail(image)
-        self._add_pin_dot(image, original_width, original_height, cropped_point_coordinates)
+        self._add_pin_dot(image, right - left, bottom - top, cropped_point_coordinates)
 
-        return image
+    def _create_thumbnail_media(self, image: Image, name) -> Media:
+        content = io.BytesIO()
+        image.save(content, format='PNG', quality='maximum', optimize=True, progressive=True)
+        file = SimpleUploadedFile(content=content.getvalue(), name=name, content_type='image/png')
+        data = {
+            'file': file,
+            'is_public': False
+        }
+        return MediaEntityService().create(data, create_thumbnail=False)
 
     def _create_pin_thumbnail(self, image: Image, pin, name: str, thumbnail_type: FloorPlanAreaPinThumbnail.Type) -> None:
         thumbnail = self._create_thumbnail_media(image, name)
@@ -136,11 +134,11 @@ class FloorPlanAreaPinThumbnailEntityService(BaseEntityService):
         })
 
     def _add_thumbnail(self, image: Image) -> None:
-        image.thumbnail(
-            (self.thumbnail_sizes[0] * self.thumbnail_size_multiplier,
-             self.thumbnail_sizes[1] * self.thumbnail_size_multiplier),
-            Image.ANTIALIAS
-        )
+        image.thumbnail(self._get_thumbnail_size(), Image.LANCZOS)
+
+    def _get_thumbnail_size(self) -> tuple[int, int]:
+        return (self.thumbnail_sizes[0] * self.thumbnail_size_multiplier,
+                self.thumbnail_sizes[1] * self.thumbnail_size_multiplier)
 
     def _add_pin_dot(self, image: Image, original_width, original_height, point_coordinates) -> None:
         changed_width, changed_height = image.size
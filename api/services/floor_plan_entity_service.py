@@ -1,9 +1,12 @@
 from typing import Dict, Type
 
 import reversion
+from django.db import transaction
 
-from api.models import FloorPlan, FloorPlanRevisionMeta, FloorPlanArea, FloorPlanAreaPin, FloorPlanAreaPinThumbnail
+from api.models import FloorPlan, FloorPlanRevisionMeta, FloorPlanArea, FloorPlanAreaPin, FloorPlanAreaPinThumbnail, \
+    FloorPlanImage, Media
 from api.models.base_model import BaseModel
+from api.queues.floor_plan import delete_floor_plan_rasters
 from api.services.base_entity_service import BaseEntityService
 from api.services.floor_plan_image_entity_service import FloorPlanImageEntityService
 
@@ -50,6 +53,8 @@ class FloorPlanEntityService(BaseEntityService):
                 if instance.media.is_pdf:
                     FloorPlanImageEntityService().create({'media': instance.media})
 
+                self._delete_rasters(old_media)
+
                 if remove_floor_plan_areas_and_floor_plan_pins:
                     FloorPlanAreaPinThumbnail.objects.filter(floor_plan_area_pin__floor_plan_area__floor_plan=instance).delete()
                     FloorPlanAreaPin.objects.filter(floor_plan_area__floor_plan=instance).delete()
@@ -58,3 +63,17 @@ class FloorPlanEntityService(BaseEntityService):
             reversion.set_user(kwargs.get('user'))
 
         return instance
+
+    def delete(self, instance: FloorPlan) -> None:
+        instance.delete()
+        self._delete_rasters(instance.media)
+
+    def _delete_rasters(self, media: Media) -> None:
+        # Media may be shared by floor plans of different projects.
+        if self.model.objects.filter(media=media).exists():
+            return
+
+        # Rasters are built again on demand, if a floor plan gets the media back.
+        floor_plan_images = list(FloorPlanImage.objects.filter(plan=media, raster__isnull=False))
+        if floor_plan_images:
+            transaction.on_commit(lambda: delete_floor_plan_rasters(floor_plan_images))
@@ -1,13 +1,18 @@
+import uuid
 from io import BytesIO
 
+from PIL import Image
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import transaction
 
 from api.models import Media
 from api.models.base_model import BaseModel
 from api.models.floor_plan_image import FloorPlanImage
+from api.queues.floor_plan import create_floor_plan_raster
 from api.services.base_entity_service import BaseEntityService
 from api.services.media_entity_service import MediaEntityService
-from api.utilities.pdf_utilities import convert_pdf_page_to_image
+from api.utilities.floor_plan_raster import FloorPlanRaster
+from api.utilities.pdf_utilities import PdfRasterizer
 
 
 class FloorPlanImageEntityService(BaseEntityService):
@@ -17,16 +22,70 @@ class FloorPlanImageEntityService(BaseEntityService):
         media = validated_data['media']
         storage = media.get_common_storage()
 
-        bytes_input = convert_pdf_page_to_image(page_number=1,
-                                                pdf_data=BytesIO(storage.open(media.name).file.read()),
-                                                image_options={'dpi': (FloorPlanImage.DPI_SIZES.width,
-                                                                       FloorPlanImage.DPI_SIZES.height),
-                                                               'alpha_layer': 255})
+        with PdfRasterizer.from_storage(storage, media.name) as rasterizer:
+            rendered_image = rasterizer.render(page_number=1,
+                                               dpi=(FloorPlanImage.DPI_SIZES.width, FloorPlanImage.DPI_SIZES.height),
+                                               alpha_layer=255)
+
+        bytes_input = BytesIO()
+        rendered_image.save(bytes_input, 'png', dpi=rendered_image.info['dpi'])
 
         converted_image = self._get_in_memory_file(media=media, bytes_input=bytes_input)
         image = MediaEntityService().create(validated_data={'file': converted_image}, create_thumbnail=False)
 
-        return super().create(validated_data={'plan_id': media.id, 'image_id': image.id})
+        floor_plan_image = super().create(validated_data={'plan_id': media.id, 'image_id': image.id})
+        # Tile pyramid takes long to build for large plans, so it isn't built within the upload request.
+        transaction.on_commit(lambda: create_floor_plan_raster(floor_plan_image))
+
+        return floor_plan_image
+
+    def get_raster(self, floor_plan_image: FloorPlanImage) -> FloorPlanRaster:
+        storage = floor_plan_image.image.get_common_storage()
+        if floor_plan_image.raster:
+            return FloorPlanRaster(storage, floor_plan_image.raster)
+
+        # Raster is built without a lock, since the download and tile uploads take long.
+        # Concurrent callers may build it twice, only the first stored raster is kept.
+        raster = self._create_raster(floor_plan_image)
+
+        with transaction.atomic():
+            locked_floor_plan_image = self.model.all_objects.select_for_update().get(pk=floor_plan_image.pk)
+            stored_raster = locked_floor_plan_image.raster
+            if not stored_raster:
+                self.update(locked_floor_plan_image, {'raster': raster.metadata})
+
+        if stored_raster:
+            raster.delete()
+            raster = FloorPlanRaster(storage, stored_raster)
+
+        floor_plan_image.raster = raster.metadata
+
+        return raster
+
+    def delete_raster(self, floor_plan_image: FloorPlanImage) -> None:
+        with transaction.atomic():
+            locked_floor_plan_image = self.model.all_objects.select_for_update().get(pk=floor_plan_image.pk)
+            if not locked_floor_plan_image.raster:
+                return
+
+            FloorPlanRaster(floor_plan_image.image.get_common_storage(), locked_floor_plan_image.raster).delete()
+            self.update(locked_floor_plan_image, {'raster': None})
+
+        floor_plan_image.raster = None
+
+    def _create_raster(self, floor_plan_image: FloorPlanImage) -> FloorPlanRaster:
+        storage = floor_plan_image.image.get_common_storage()
+        with storage.open(floor_plan_image.image.link) as image_file:
+            image = Image.open(image_file)
+            image.load()
+
+        return FloorPlanRaster.create(
+            storage=storage,
+            path=f'floor-plan-rasters/{uuid.uuid4().hex}',
+            image=image,
+            tile_size=FloorPlanImage.RASTER_TILE_SIZE,
+            overview_size=(FloorPlanImage.RASTER_OVERVIEW_SIZES.width, FloorPlanImage.RASTER_OVERVIEW_SIZES.height),
+        )
 
     def _get_in_memory_file(self, media: Media, bytes_input: BytesIO) -> InMemoryUploadedFile:
         name = '.'.join(media.original_link.split('.')[0:-1])
@@ -1,3 +1,5 @@
+from django.db.models import F
+
 from api.models import HandoverDocumentArchive
 from api.services.base_entity_service import BaseEntityService
 
@@ -7,3 +9,13 @@ class HandoverDocumentArchiveEntityService(BaseEntityService):
 
     def set_status_to_completed(self, entity: HandoverDocumentArchive) -> None:
         self.update(entity, {'status': HandoverDocumentArchive.Status.COMPLETED})
+
+    def add_sent_part(self, entity: HandoverDocumentArchive) -> HandoverDocumentArchive:
+        # Parts are sent concurrently, so the counter is incremented by the database.
+        self.model.objects.filter(id=entity.id).update(sent_parts_count=F('sent_parts_count') + 1)
+        entity.refresh_from_db()
+
+        if entity.sent_parts_count >= entity.handoverdocumentarchivepart_set.count():
+            self.set_status_to_completed(entity)
+
+        return entity
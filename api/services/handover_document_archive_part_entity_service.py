@@ -6,6 +6,14 @@ from api.services.base_entity_service import BaseEntityService
 class HandoverDocumentArchivePartEntityService(BaseEntityService):
     model: HandoverDocumentArchivePart = HandoverDocumentArchivePart
 
+    def set_status_to_queued(self, archive_parts: list[HandoverDocumentArchivePart]):
+        self.model.objects.filter(
+            id__in=[archive_part.id for archive_part in archive_parts]
+        ).update(status=HandoverDocumentArchivePart.Status.QUEUED)
+
+        for archive_part in archive_parts:
+            archive_part.status = HandoverDocumentArchivePart.Status.QUEUED
+
     def set_status_to_running(self, archive_part: HandoverDocumentArchivePart):
         self.update(archive_part, {'status': HandoverDocumentArchivePart.Status.RUNNING})
 
@@ -18,3 +26,7 @@ class HandoverDocumentArchivePartEntityService(BaseEntityService):
     def mark_as_failed(self, archive_part: HandoverDocumentArchivePart, error_track_id: str):
         self.update(archive_part, {'status': HandoverDocumentArchivePart.Status.FAILED,
                                    'error_track_id': error_track_id})
+
+    def set_compression_stats(self, archive_part: HandoverDocumentArchivePart, cpu_time: float,
+                              compression_ratio: float):
+        self.update(archive_part, {'cpu_time': cpu_time, 'compression_ratio': compression_ratio})
@@ -1,16 +1,21 @@
 import dataclasses
 import datetime
-import os
+import itertools
+import shutil
+import tempfile
 import time
-import uuid
 from abc import abstractmethod
-from typing import Literal, Optional
-from zipfile import ZipFile, ZIP_DEFLATED, ZipInfo
+from collections import deque
+from contextlib import closing
+from io import TextIOWrapper
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Iterator, Literal, Optional
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED, ZIP64_LIMIT, ZipInfo
 
 from azure.storage.blob import BlobClient, ContentSettings, generate_blob_sas, BlobSasPermissions
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Q, Subquery, OuterRef
+from django.db.models import Q, Subquery, OuterRef, Window, Sum, F, QuerySet
 from sentry_sdk import capture_exception
 from requests.exceptions import ConnectionError
 
@@ -22,11 +27,14 @@ from api.services.handover_document_archive_entity_service import HandoverDocume
 from api.services.handover_document_archive_part_entity_service import HandoverDocumentArchivePartEntityService
 from api.services.media_entity_service import MediaEntityService
 from api.storages import AzurePrivateMediaStorage
+from api.utilities.blob_utilities import AzureBlockBlobWriter, download_blob_chunks
 from api.utilities.handover_document_utilities import extend_file_name_for_archive, replace_forward_slash_by_dash
 from api.utilities.report_generators.handover_document_archive_report_generator import \
     HandoverDocumentArchiveReportGenerator
 from mbuild.settings import AZURE_BLOB_CONNECTION_STRING, AZURE_PRIVATE_MEDIA_CONTAINER, AZURE_ACCOUNT_NAME, \
-    AZURE_ACCOUNT_KEY, HANDOVER_DOCUMENT_ARCHIVE_EXPIRATION_IN_DAYS, HANDOVER_DOCUMENT_ARCHIVE_TEMP_FILE_FOLDER
+    AZURE_ACCOUNT_KEY, HANDOVER_DOCUMENT_ARCHIVE_EXPIRATION_IN_DAYS, HANDOVER_DOCUMENT_ARCHIVE_DOWNLOAD_THREADS, \
+    HANDOVER_DOCUMENT_ARCHIVE_COMPRESSION_LEVEL, HANDOVER_DOCUMENT_ARCHIVE_STORED_EXTENSIONS, \
+    HANDOVER_DOCUMENT_ARCHIVE_PARTS_CONCURRENCY
 
 
 class ArchivePartStrGenerator:
@@ -171,15 +179,24 @@ class PackageHandoverArchiveGroup(BaseHandoverArchiveGroup):
 
 @dataclasses.dataclass
 class ArchivePartBoundaries:
-    size: float = 0
+    size: int = 0
     files_count: int = 0
-    asset_handover_limit: int = 0
-    asset_handover_offset: int = 0
-    package_handover_limit: int = 0
-    package_handover_offset: int = 0
+    asset_handover_media_range: dict = dataclasses.field(default_factory=dict)
+    package_handover_media_range: dict = dataclasses.field(default_factory=dict)
+
+    def add_media(self, entity: Literal['asset_handover', 'package_handover'], media_id: int, part_size: int) -> None:
+        media_range = getattr(self, f'{entity}_media_range')
+        media_range.setdefault('first_id', media_id)
+        media_range['last_id'] = media_id
+
+        self.size = part_size
+        self.files_count += 1
 
 
 class HandoverDocumentArchiveService:
+    # Size of chunks copied from a media file into an archive entry.
+    archive_copy_chunk_size = 1024 * 1024
+
     def initiate_generation_process(self, project: int, user: User, generation_started_at: datetime.datetime) -> None:
         project = Project.objects.filter(id=project).first()
 
@@ -204,15 +221,9 @@ class HandoverDocumentArchiveService:
             for part_boundaries in parts_boundaries:
                 data = {
                     'handover_document_archive_id': handover_document_archive.id,
-                    'asset_handover_media_range': {
-                        'limit': part_boundaries.asset_handover_limit,
-                        'offset': part_boundaries.asset_handover_offset
-                    },
-                    'package_handover_media_range': {
-                        'limit': part_boundaries.package_handover_limit,
-                        'offset': part_boundaries.package_handover_offset
-                    },
-                    'in_range_files_count': part_boundaries.asset_handover_limit + part_boundaries.package_handover_limit,
+                    'asset_handover_media_range': part_boundaries.asset_handover_media_range,
+                    'package_handover_media_range': part_boundaries.package_handover_media_range,
+                    'in_range_files_count': part_boundaries.files_count,
                     'total_files_count': total_files_count
                 }
                 HandoverDocumentArchivePartEntityService().create(data)
@@ -220,9 +231,8 @@ class HandoverDocumentArchiveService:
         self._start_archive_generation(handover_document_archive)
 
     def _start_archive_generation(self, archive: HandoverDocumentArchive) -> None:
-        archive_part = archive.handoverdocumentarchivepart_set.order_by('id').first()
-        if archive_part:
-            self.create_archive_part_file(archive_part)
+        if archive.handoverdocumentarchivepart_set.exists():
+            self._dispatch_waiting_parts(archive)
         else:
             HandoverDocumentArchiveEntityService().set_status_to_completed(archive)
 
@@ -243,36 +253,70 @@ class HandoverDocumentArchiveService:
         HandoverDocumentArchivePartEntityService().set_status_to_sent(archive_part)
 
     def process_next_part(self, archive_part: HandoverDocumentArchivePart) -> None:
-        next_part = HandoverDocumentArchivePart.objects.filter(
-            handover_document_archive_id=archive_part.handover_document_archive.id,
-            id__gt=archive_part.id
-        ).select_related(
-            'handover_document_archive__project', 'handover_document_archive__user'
-        ).order_by('id').first()
-
-        if next_part:
+        archive = archive_part.handover_document_archive
+
+        if archive_part.status == HandoverDocumentArchivePart.Status.SENT:
+            archive = HandoverDocumentArchiveEntityService().add_sent_part(archive)
+
+        if archive.status != HandoverDocumentArchive.Status.COMPLETED:
+            self._dispatch_waiting_parts(archive)
+
+    def recover_failed_parts(self, archive_parts: list[HandoverDocumentArchivePart]) -> None:
+        # Recovered parts wait for a free slot like any other part, so each of them is queued only once.
+        HandoverDocumentArchivePart.objects.filter(
+            id__in=[archive_part.id for archive_part in archive_parts]
+        ).update(status=HandoverDocumentArchivePart.Status.WAITING, error_track_id=None)
+
+        archives = {archive_part.handover_document_archive_id: archive_part.handover_document_archive
+                    for archive_part in archive_parts}
+        for archive in archives.values():
+            self._dispatch_waiting_parts(archive)
+
+    def _dispatch_waiting_parts(self, archive: HandoverDocumentArchive) -> None:
+        # Parts have independent media ranges, so up to the concurrency limit of them are generated at once.
+        with transaction.atomic():
+            # Locking the archive keeps parts finishing at the same time from exceeding the limit.
+            HandoverDocumentArchive.objects.select_for_update().filter(id=archive.id).first()
+
+            archive_parts = archive.handoverdocumentarchivepart_set
+            active_parts_count = archive_parts.filter(status__in=[
+                HandoverDocumentArchivePart.Status.QUEUED, HandoverDocumentArchivePart.Status.RUNNING
+            ]).count()
+            free_slots_count = max(HANDOVER_DOCUMENT_ARCHIVE_PARTS_CONCURRENCY - active_parts_count, 0)
+
+            next_parts = list(archive_parts.filter(
+                status=HandoverDocumentArchivePart.Status.WAITING
+            ).select_related(
+                'handover_document_archive__project', 'handover_document_archive__user'
+            ).order_by('id')[:free_slots_count])
+
+            HandoverDocumentArchivePartEntityService().set_status_to_queued(next_parts)
+
+        for next_part in next_parts:
             generate_archive_part.delay(next_part)
-        else:
-            HandoverDocumentArchiveEntityService().set_status_to_completed(archive_part.handover_document_archive)
 
     def create_archive_part_file(self, archive_part: HandoverDocumentArchivePart) -> Optional[HandoverDocumentArchivePart]:
         archive_part_service = HandoverDocumentArchivePartEntityService()
 
         try:
-            zip_file_name = self._create_temporary_file(archive_part, archive_part_service)
-            media = self._save_file(archive_part, zip_file_name)
+            cpu_time_started_at = time.process_time()
+            media, compression_ratio = self._create_archive_file(archive_part, archive_part_service)
             archive_part = self._set_archive_part_media(archive_part, media)
+            archive_part_service.set_compression_stats(
+                archive_part, time.process_time() - cpu_time_started_at, compression_ratio
+            )
 
             archive_part_service.set_status_to_saved(archive_part)
 
             self.send_archive_part(archive_part)
-            self.process_next_part(archive_part)
         except Exception as e:
             event_id = capture_exception(e)
             archive_part_service.mark_as_failed(archive_part, event_id)
 
-    def _create_temporary_file(self, archive_part: HandoverDocumentArchivePart,
-                               archive_part_service: HandoverDocumentArchivePartEntityService) -> str:
+        self.process_next_part(archive_part)
+
+    def _create_archive_file(self, archive_part: HandoverDocumentArchivePart,
+                             archive_part_service: HandoverDocumentArchivePartEntityService) -> tuple[Media, float]:
         archive_part_service.set_status_to_running(archive_part)
 
         project = archive_part.handover_document_archive.project
@@ -282,20 +326,27 @@ class HandoverDocumentArchiveService:
         package_handover_archive_data, package_handover_files_count = self._get_package_handover_archive_data(
             project, archive_part
         )
-        zip_file_name = self._get_temporary_zipfile_name()
+        archive_name = self._get_archive_name(archive_part)
 
-        with ZipFile(zip_file_name, 'w', compression=ZIP_DEFLATED) as archive:
-            self._archive_document_media(archive, asset_handover_archive_data)
-            self._archive_document_media(archive, package_handover_archive_data)
+        # Archive is streamed to the storage while it's being built, so it never hits the local disk.
+        with self._open_archive_stream(archive_name) as archive_stream:
+            with ZipFile(archive_stream, 'w', compression=ZIP_DEFLATED,
+                         compresslevel=HANDOVER_DOCUMENT_ARCHIVE_COMPRESSION_LEVEL) as archive:
+                # Paths are tracked in a set, since looking them up in the archive name list is linear.
+                archived_paths = set()
+                self._archive_document_media(archive, asset_handover_archive_data, archived_paths)
+                self._archive_document_media(archive, package_handover_archive_data, archived_paths)
 
-            is_first_part = not archive_part.handover_document_archive.handoverdocumentarchivepart_set.filter(
-                id__lt=archive_part.id
-            ).exists()
+                is_first_part = not archive_part.handover_document_archive.handoverdocumentarchivepart_set.filter(
+                    id__lt=archive_part.id
+                ).exists()
 
-            if is_first_part:
-                self._archive_csv_report(archive, project)
+                if is_first_part:
+                    self._archive_csv_report(archive, project)
 
-        return zip_file_name
+            file_size = archive_stream.tell()
+
+        return self._save_file(archive_name, file_size), self._get_compression_ratio(archive)
 
     def _get_sas_url(self, media: Media) -> str:
         blob_url = BlobClient.from_connection_string(
@@ -323,71 +374,46 @@ class HandoverDocumentArchiveService:
 
     def _get_asset_handover_media_boundaries(self, project: Project,
                                              parts_boundaries: list[ArchivePartBoundaries]) -> int:
-        asset_handovers_media = (
-            AssetHandoverDocumentMedia.objects.filter_for_handover_document_archive(project).select_related('media')
-        )
-
-        self._collect_boundaries(parts_boundaries, asset_handovers_media, 'asset_handover')
+        asset_handovers_media = AssetHandoverDocumentMedia.objects.filter_for_handover_document_archive(project)
 
-        return asset_handovers_media.count()
+        return self._collect_boundaries(parts_boundaries, asset_handovers_media, 'asset_handover')
 
     def _get_package_handover_media_boundaries(self, project: Project,
                                                parts_boundaries: list[ArchivePartBoundaries]) -> int:
-        package_handovers_media = (
-            PackageHandoverDocumentMedia.objects.filter_for_handover_document_archive(project)
-            .select_related('media')
-        )
-
-        self._collect_boundaries(parts_boundaries, package_handovers_media, 'package_handover')
-
-        return package_handovers_media.count()
+        package_handovers_media = PackageHandoverDocumentMedia.objects.filter_for_handover_document_archive(project)
+
+        return self._collect_boundaries(parts_boundaries, package_handovers_media, 'package_handover')
+
+    def _collect_boundaries(self, archive_parts_boundaries: list[ArchivePartBoundaries], handovers_media: QuerySet,
+                            entity: Literal['asset_handover', 'package_handover']) -> int:
+        part_size_limit = float(settings.HANDOVER_DOCUMENT_ARCHIVE_PART_SIZE_IN_GB) * 1024 ** 3
+        # Running total of media sizes is calculated by the database, so media rows are not loaded.
+        media_size_running_totals = handovers_media.annotate(
+            size_running_total=Window(expression=Sum('media__size'), order_by=F('id').asc())
+        ).order_by('id').values_list('id', 'size_running_total')
+
+        # Media of the entity continue the last part of previous entity until it's full.
+        if archive_parts_boundaries and archive_parts_boundaries[-1].size < part_size_limit:
+            current_part_boundaries = archive_parts_boundaries[-1]
+            part_started_at = -current_part_boundaries.size
+        else:
+            current_part_boundaries = None
+            part_started_at = 0
 
-    def _collect_boundaries(self, archive_parts_boundaries: list[ArchivePartBoundaries], handovers_media,
-                            entity: Literal['asset_handover', 'package_handover']) -> None:
-        summarized_size = archive_parts_boundaries[-1].size if archive_parts_boundaries else 0
         files_count = 0
-        offset = 0
-
-        if archive_parts_boundaries and archive_parts_boundaries[-1].size < settings.HANDOVER_DOCUMENT_ARCHIVE_PART_SIZE_IN_GB:
-            current_part_boundaries = archive_parts_boundaries.pop()
-        else:
-            current_part_boundaries = ArchivePartBoundaries()
+        for media_id, size_running_total in media_size_running_totals:
+            if current_part_boundaries is None:
+                current_part_boundaries = ArchivePartBoundaries()
+                archive_parts_boundaries.append(current_part_boundaries)
 
-        for handover_media in handovers_media:
+            current_part_boundaries.add_media(entity, media_id, size_running_total - part_started_at)
             files_count += 1
-            summarized_size += round(handover_media.media.size / 1024 / 1024 / 1024, 5)
-
-            if summarized_size >= settings.HANDOVER_DOCUMENT_ARCHIVE_PART_SIZE_IN_GB:
-                self._collect_parts_boundaries(entity, current_part_boundaries, files_count, summarized_size,
-                                               archive_parts_boundaries, offset)
-                offset += files_count
-                summarized_size = 0
-                files_count = 0
-                current_part_boundaries = ArchivePartBoundaries()
 
-        if summarized_size:
-            self._collect_parts_boundaries(entity, current_part_boundaries, files_count, summarized_size,
-                                           archive_parts_boundaries, offset)
-
-    def _collect_parts_boundaries(self, entity: Literal['asset_handover', 'package_handover'],
-                                  current_part_boundaries: ArchivePartBoundaries, files_count: int,
-                                  summarized_size: float, archive_parts_boundaries: list[ArchivePartBoundaries],
-                                  current_file_number: int):
-        self._set_limit_offset(entity, current_part_boundaries, files_count, current_file_number)
-
-        current_part_boundaries.size = summarized_size
-        current_part_boundaries.files_count = files_count
-        archive_parts_boundaries.append(current_part_boundaries)
-
-    def _set_limit_offset(self, entity: Literal['asset_handover', 'package_handover'],
-                          current_part_boundaries: ArchivePartBoundaries, files_count: int,
-                          current_file_number: int) -> None:
-        if entity == 'asset_handover':
-            current_part_boundaries.asset_handover_offset = current_file_number
-            current_part_boundaries.asset_handover_limit = files_count
-        elif entity == 'package_handover':
-            current_part_boundaries.package_handover_offset = current_file_number
-            current_part_boundaries.package_handover_limit = files_count
+            if current_part_boundaries.size >= part_size_limit:
+                current_part_boundaries = None
+                part_started_at = size_running_total
+
+        return files_count
 
     def _set_archive_part_media(
             self, archive_part: HandoverDocumentArchivePart, media: Media
@@ -398,21 +424,53 @@ class HandoverDocumentArchiveService:
 
         return archive_part
 
-    def _get_temporary_zipfile_name(self) -> str:
-        process_salt = str(uuid.uuid4())
-        return f'{HANDOVER_DOCUMENT_ARCHIVE_TEMP_FILE_FOLDER}handover_document_archive_{process_salt}.zip'
+    def _archive_document_media(self, archive: ZipFile, archive_data: dict, archived_paths: set[str]) -> None:
+        archive_media = [(group, handover_document_media)
+                         for group, media_list in archive_data.items()
+                         for handover_document_media in media_list]
+
+        with closing(self._prefetch_files(archive_media)) as prefetched_files:
+            for (group, handover_document_media), file in zip(archive_media, prefetched_files):
+                with file:
+                    file_path = self._get_file_path(archived_paths, group, handover_document_media)
+                    archive_entry = self._open_archive_entry(
+                        archive, file_path, handover_document_media.media.extension, handover_document_media.media.size
+                    )
+
+                    with archive_entry:
+                        shutil.copyfileobj(file, archive_entry, self.archive_copy_chunk_size)
+
+    def _prefetch_files(self, archive_media: list) -> Iterator:
+        # Files are downloaded by a bounded pool ahead of archiving, but yielded in the original order.
+        # Number of files waiting for archiving is limited to keep memory and disk usage flat.
+        window_size = HANDOVER_DOCUMENT_ARCHIVE_DOWNLOAD_THREADS * 2
+        media_iterator = iter(handover_document_media for _, handover_document_media in archive_media)
+
+        with ThreadPoolExecutor(max_workers=HANDOVER_DOCUMENT_ARCHIVE_DOWNLOAD_THREADS) as executor:
+            pending_files = deque(
+                executor.submit(self._prefetch_file, handover_document_media)
+                for handover_document_media in itertools.islice(media_iterator, window_size)
+            )
+
+            try:
+                while pending_files:
+                    pending_file = pending_files.popleft()
+
+                    next_media = next(media_iterator, None)
+                    if next_media is not None:
+                        pending_files.append(executor.submit(self._prefetch_file, next_media))
 
-    def _archive_document_media(self, archive: ZipFile, archive_data: dict) -> None:
-        for group, media_list in archive_data.items():
-            for handover_document_media in media_list:
-                storage = handover_document_media.media.get_common_storage()
-                file_data = self.load_file_data(storage, handover_document_media).read()
-                file_path = self._get_file_path(archive, group, handover_document_media)
-                creation_time = datetime.datetime.now().timetuple()[:6]
-                archiving_file = ZipInfo(file_path, date_time=creation_time)
-                archiving_file.compress_type = ZIP_DEFLATED
+                    yield pending_file.result()
+            finally:
+                # Files downloaded ahead of a failed archiving are closed, so their temporary files are removed.
+                for pending_file in pending_files:
+                    if not pending_file.cancel() and pending_file.exception() is None:
+                        pending_file.result().close()
 
-                archive.writestr(archiving_file, file_data)
+    def _prefetch_file(self, handover_document_media):
+        storage = handover_document_media.media.get_common_storage()
+
+        return self.load_file_data(storage, handover_document_media)
 
     def load_file_data(self, storage, handover_document_media):
         attempt = 1
@@ -425,7 +483,7 @@ class HandoverDocumentArchiveService:
 
         while attempt <= retry_limit:
             try:
-                return storage.open(handover_document_media.media.name)
+                return self._download_file(storage, handover_document_media.media.name)
             except ConnectionError:
                 if attempt == retry_limit:
                     raise
@@ -433,69 +491,81 @@ class HandoverDocumentArchiveService:
                 time.sleep(attempt_sleeping_times.get(attempt, 60))
                 attempt += 1
 
-    def _get_file_path(self, archive: ZipFile, group, handover_document_media) -> str:
+    def _download_file(self, storage, name: str):
+        # Blob is written to a temporary file chunk by chunk instead of being loaded in memory as a whole.
+        # Spooling to disk is deliberate: it lets the pool download files ahead while the archive is
+        # written sequentially, which streaming blob chunks straight into the entry would not allow.
+        file = tempfile.TemporaryFile()
+        try:
+            for chunk in download_blob_chunks(storage, name):
+                file.write(chunk)
+            file.seek(0)
+        except BaseException:
+            file.close()
+            raise
+
+        return file
+
+    def _get_file_path(self, archived_paths: set[str], group, handover_document_media) -> str:
         file_path = group.to_dir_tree() + f'/{handover_document_media.media.name}'
-        if file_path in archive.namelist():
+        if file_path in archived_paths:
             file_path = extend_file_name_for_archive(file_path)
 
+        archived_paths.add(file_path)
+
         return file_path
 
     def _archive_csv_report(self, archive: ZipFile, project: Project) -> None:
-        csv_content, csv_file_name = HandoverDocumentArchiveReportGenerator(
-            project=project,
-        ).generate_csv()
-        creation_time = datetime.datetime.now().timetuple()[:6]
-        archiving_file = ZipInfo(csv_file_name)
+        report_generator = HandoverDocumentArchiveReportGenerator(project=project)
+        entry = self._open_archive_entry(archive, report_generator.get_file_name(), 'csv', None)
 
-        archiving_file.compress_type = ZIP_DEFLATED
-        archiving_file.date_time = creation_time
+        with TextIOWrapper(entry, encoding='utf8', newline='') as stream:
+            report_generator.write_csv(stream)
 
-        archive.writestr(archiving_file, csv_content)
+    def _open_archive_entry(self, archive: ZipFile, file_path: str, extension: Optional[str],
+                            file_size: Optional[int]) -> IO[bytes]:
+        # Deflating already compressed formats burns CPU without any noticeable size gain.
+        if extension and extension.lower() in HANDOVER_DOCUMENT_ARCHIVE_STORED_EXTENSIONS:
+            archiving_file = ZipInfo(file_path, date_time=datetime.datetime.now().timetuple()[:6])
+            archiving_file.compress_type = ZIP_STORED
+            # Size hint lets zipfile decide whether the entry needs zip64 extensions.
+            archiving_file.file_size = file_size or 0
 
-    def _save_file(self, archive_part: HandoverDocumentArchivePart, zip_file_name: str) -> Media:
-        archive_name = self._get_archive_name(archive_part)
-        file_size = os.path.getsize(zip_file_name)
-        connection = BlobClient.from_connection_string(
+            return archive.open(archiving_file, 'w', force_zip64=not file_size)
+
+        # Entries opened by name are deflated with the compression level of the archive,
+        # but get no size hint, so zip64 extensions are forced for large and unknown sizes.
+        return archive.open(file_path, 'w', force_zip64=not file_size or file_size * 1.05 > ZIP64_LIMIT)
+
+    def _get_compression_ratio(self, archive: ZipFile) -> float:
+        compressed_size = sum(archiving_file.compress_size for archiving_file in archive.infolist())
+        uncompressed_size = sum(archiving_file.file_size for archiving_file in archive.infolist())
+
+        return uncompressed_size / compressed_size if compressed_size else 1.0
+
+    def _open_archive_stream(self, archive_name: str) -> AzureBlockBlobWriter:
+        return AzureBlockBlobWriter(
+            self._get_archive_blob_client(archive_name),
+            content_settings=ContentSettings(content_type='application/zip')
+        )
+
+    def _get_archive_blob_client(self, archive_name: str) -> BlobClient:
+        return BlobClient.from_connection_string(
             conn_str=AZURE_BLOB_CONNECTION_STRING,
             container_name=AzurePrivateMediaStorage.azure_container,
             blob_name=archive_name,
         )
 
-        if not connection.exists():
-            connection.create_append_blob(content_settings=ContentSettings(content_type='application/zip'))
-
-        for content in self._gen_content_chunks(zip_file_name):
-            connection.append_block(content, len(content))
-
-        url = connection.url
-        self._remove_temporary_file(zip_file_name)
-
+    def _save_file(self, archive_name: str, file_size: int) -> Media:
         return MediaEntityService().create_media(
             is_public=False,
             rout_name='report_private_retrieve',
-            original_link=url,
+            original_link=self._get_archive_blob_client(archive_name).url,
             file_name=archive_name,
             validated_data={},
             size=file_size
         )
 
-    def _remove_temporary_file(self, zip_file_name: str) -> None:
-        if os.path.exists(zip_file_name):
-            os.remove(zip_file_name)
-
-    def _gen_content_chunks(self, archive_file_path: str) -> bytes:
-        # Maximum block length 4Mb
-        archive_append_block_size = 4 * 1000 * 1000
-
-        with open(archive_file_path, 'rb') as file:
-            while True:
-                data = file.read(archive_append_block_size)
-
-                if data == b'':
-                    break
-
-                yield data
-
     def _get_asset_handover_archive_data(
             self, project: Project, archive_part: HandoverDocumentArchivePart
     ) -> tuple[dict, int]:
@@ -516,9 +586,8 @@ class HandoverDocumentArchiveService:
                 'asset_handover_document__asset_handover__package_activity'
             ).order_by('id')
         )
-        asset_handovers_media = asset_handovers_media[archive_part.asset_handover_media_range['offset']
-                                                      :archive_part.asset_handover_media_range['offset']
-                                                       + archive_part.asset_handover_media_range['limit']]
+        asset_handovers_media = self._filter_by_media_range(asset_handovers_media,
+                                                            archive_part.asset_handover_media_range)
 
         self._group_handover_documents(asset_handovers_media, asset_handover_archive_data,
                                        AssetHandoverArchiveGroup)
@@ -539,15 +608,24 @@ class HandoverDocumentArchiveService:
                 'package_handover_document__package_handover_document_type__group'
             ).order_by('id')
         )
-        package_handovers_media = package_handovers_media[archive_part.package_handover_media_range['offset']
-                                                          :archive_part.package_handover_media_range['offset']
-                                                           + archive_part.package_handover_media_range['limit']]
+        package_handovers_media = self._filter_by_media_range(package_handovers_media,
+                                                              archive_part.package_handover_media_range)
 
         self._group_handover_documents(package_handovers_media, package_handover_archive_data,
                                        PackageHandoverArchiveGroup)
 
         return package_handover_archive_data, len(package_handovers_media)
 
+    def _filter_by_media_range(self, handovers_media: QuerySet, media_range: dict) -> QuerySet:
+        if not media_range:
+            return handovers_media.none()
+
+        if 'first_id' in media_range:
+            return handovers_media.filter(id__gte=media_range['first_id'], id__lte=media_range['last_id'])
+
+        # Parts planned before id ranges were introduced.
+        return handovers_media[media_range['offset']:media_range['offset'] + media_range['limit']]
+
     def _group_handover_documents(
             self, handovers_media: list, handover_archive_data: dict, archive_group_class
     ) -> None:
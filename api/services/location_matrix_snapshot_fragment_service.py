@@ -0,0 +1,149 @@
+import hashlib
+from typing import Iterable, Type
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Max, Count
+
+from api.models import LocationMatrix, LocationMatrixPackage, Task, TaskUpdate, Subtask, SubtaskUpdate, \
+    QualityIssue, QualityIssueUpdate, Company, Package, PackageActivity, PackageMatrix, PackageMatrixCompany, \
+    Project, ResponseCategory, User
+from api.models.base_model import BaseModel
+from mbuild.settings import PROJECT_SNAPSHOT_FRAGMENT_CACHE_LIFETIME
+
+
+class LocationMatrixSnapshotFragmentService:
+    """
+    Cache of location matrices serialized for project snapshots. Each fragment is
+    stored with version of its subtree and of the related entities serialized into it,
+    so a fragment is reused only while none of these entities changed.
+
+    Thumbnails are covered only for media of `media_relations`, so other changed
+    thumbnails are served stale until the fragment expires.
+    """
+    cache_key = 'project_snapshot:location_matrix:%s'
+
+    # Entities serialized into location matrix fragment with the lookup to their location matrix.
+    subtree_entities = (
+        ('location_matrix', LocationMatrix, 'id'),
+        ('location_matrix_package', LocationMatrixPackage, 'location_matrix_id'),
+        ('task', Task, 'location_matrix_id'),
+        ('task_update', TaskUpdate, 'task__location_matrix_id'),
+        ('subtask', Subtask, 'task__location_matrix_id'),
+        ('subtask_update', SubtaskUpdate, 'subtask__task__location_matrix_id'),
+        ('quality_issue', QualityIssue, 'location_matrix_id'),
+        ('quality_issue_update', QualityIssueUpdate, 'quality_issue__location_matrix_id'),
+    )
+
+    # Media relations of the subtree entities. Thumbnails of these media are serialized into fragment.
+    media_relations = (
+        (LocationMatrixPackage, 'media'),
+        (TaskUpdate, 'files'),
+        (Subtask, 'files'),
+        (SubtaskUpdate, 'files'),
+        (QualityIssue, 'attachments'),
+        (QualityIssueUpdate, 'files'),
+    )
+
+    # Entities serialized into location matrix fragment outside of its subtree with the lookup to their project.
+    # Users and companies are shared between projects, so all of them are covered.
+    related_entities = (
+        ('project', Project, 'id'),
+        ('package_matrix', PackageMatrix, 'project_id'),
+        ('package_matrix_company', PackageMatrixCompany, 'package_matrix__project_id'),
+        ('package', Package, 'packagematrix__project_id'),
+        ('package_activity', PackageActivity, 'packagematrix__project_id'),
+        ('response_category', ResponseCategory, 'project_id'),
+        ('user', User, None),
+        ('company', Company, None),
+    )
+
+    def get_related_version(self, project_id: int) -> str:
+        related_states = []
+
+        for entity, model, project_lookup in self.related_entities:
+            queryset = model.all_objects.filter(**{project_lookup: project_id}) if project_lookup else model.all_objects
+            related_states.append((entity, *queryset.aggregate(
+                last_updated_at=Max('updated_at'),
+                last_deleted=Max('deleted'),
+                entities_count=Count('id'),
+            ).values()))
+
+        return hashlib.sha1(repr(related_states).encode()).hexdigest()
+
+    def get_versions(self, location_matrices_ids: list[int], related_version: str = '') -> dict[int, str]:
+        subtree_states = {location_matrix_id: [related_version] for location_matrix_id in location_matrices_ids}
+
+        for entity, model, location_matrix_lookup in self.subtree_entities:
+            states = model.all_objects.filter(
+                **{f'{location_matrix_lookup}__in': location_matrices_ids}
+            ).order_by(with_default_order=False).values(location_matrix_lookup).annotate(
+                last_updated_at=Max('updated_at'),
+                last_deleted=Max('deleted'),
+                entities_count=Count('id'),
+            ).values_list(location_matrix_lookup, 'last_updated_at', 'last_deleted', 'entities_count')
+
+            for location_matrix_id, *state in states:
+                subtree_states[location_matrix_id].append((entity, *state))
+
+        return {
+            location_matrix_id: hashlib.sha1(repr(states).encode()).hexdigest()
+            for location_matrix_id, states in subtree_states.items()
+        }
+
+    def get_many(self, versions: dict[int, str]) -> dict[int, str]:
+        cached_fragments = cache.get_many([self.cache_key % location_matrix_id for location_matrix_id in versions])
+        fragments = {}
+
+        for location_matrix_id, version in versions.items():
+            cached_fragment = cached_fragments.get(self.cache_key % location_matrix_id)
+            if cached_fragment and cached_fragment['version'] == version:
+                fragments[location_matrix_id] = cached_fragment['fragment']
+
+        return fragments
+
+    def set_many(self, fragments: dict[int, tuple[str, str]]) -> None:
+        cache.set_many({
+            self.cache_key % location_matrix_id: {'version': version, 'fragment': fragment}
+            for location_matrix_id, (version, fragment) in fragments.items()
+        }, PROJECT_SNAPSHOT_FRAGMENT_CACHE_LIFETIME)
+
+    def invalidate(self, location_matrices_ids: Iterable[int]) -> None:
+        keys = [self.cache_key % location_matrix_id for location_matrix_id in set(location_matrices_ids) if location_matrix_id]
+        if keys:
+            cache.delete_many(keys)
+
+    def invalidate_for_instances(self, model: Type[BaseModel], instances: list[BaseModel]) -> None:
+        location_matrix_lookup = self.get_location_matrix_lookup(model)
+        self.invalidate(self.get_location_matrix_id(instance, location_matrix_lookup) for instance in instances)
+
+    def invalidate_for_ids(self, model: Type[BaseModel], ids: Iterable[int]) -> None:
+        location_matrix_lookup = self.get_location_matrix_lookup(model)
+        self.invalidate(
+            model.all_objects.filter(pk__in=ids).values_list(location_matrix_lookup, flat=True).distinct()
+        )
+
+    def invalidate_for_media(self, media_ids: Iterable[int]) -> None:
+        media_ids = list(media_ids)
+        location_matrices_ids = set()
+
+        for model, media_field in self.media_relations:
+            location_matrices_ids.update(
+                model.all_objects.filter(
+                    **{f'{media_field}__in': media_ids}
+                ).values_list(self.get_location_matrix_lookup(model), flat=True).distinct()
+            )
+
+        self.invalidate(location_matrices_ids)
+
+    def get_location_matrix_lookup(self, model: Type[BaseModel]) -> str:
+        return next(lookup for _, subtree_model, lookup in self.subtree_entities if subtree_model is model)
+
+    def get_location_matrix_id(self, instance: BaseModel, location_matrix_lookup: str) -> int | None:
+        try:
+            for attribute in location_matrix_lookup.split('__'):
+                instance = getattr(instance, attribute)
+        except ObjectDoesNotExist:
+            return None
+
+        return instance
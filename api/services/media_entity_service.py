@@ -1,19 +1,21 @@
-from typing import Dict, Any, Optional, Tuple
+from io import BytesIO
+from typing import Dict, Any, List, Iterable
 import uuid
 
-from PIL.Image import DecompressionBombError
 from django.conf import settings
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.urls import reverse
+from sentry_sdk import capture_exception
 from storages.base import BaseStorage
 
 from api.models import Media, MediaThumbnail
-from api.queues.media import create_thumbnails
+from api.queues.media import create_thumbnails, create_thumbnails_for_many
 from api.services.base_entity_service import BaseEntityService
 from api.services.media_thumbnail_entity_service import MediaThumbnailEntityService
 from api.services.thumbnail_service import ThumbnailService
 from api.storages import AzurePrivateMediaStorage, AzurePrivateReportStorage
+from api.utilities.image_utilities import open_image
 from mbuild.settings import IMAGE_EXTENSIONS
 
 
@@ -30,69 +32,65 @@ class MediaEntityService(BaseEntityService):
                 create_thumbnails(media=media)
         return media
 
+    def create_many(self, validated_data: List[Dict], **kwargs) -> list:
+        sync_create_thumbnails = any([data.pop('sync_create_thumbnails', False) for data in validated_data])
+        media = super().create_many(validated_data, create_thumbnail=False)
+
+        # Thumbnails of all uploaded files are generated by a single job.
+        if sync_create_thumbnails:
+            self.create_thumbnails_for_many(media)
+        else:
+            create_thumbnails_for_many(media=media)
+
+        return media
+
     def create_thumbnails(self, media: Media) -> None:
+        self.create_thumbnails_for_many([media])
+
+    def create_thumbnails_for_many(self, media: Iterable[Media]) -> None:
+        media_thumbnails = []
+        for media_item in media:
+            try:
+                media_thumbnails.extend(self._get_thumbnails(media_item))
+            except Exception as e:
+                capture_exception(e)
+
+        MediaThumbnailEntityService().create_many(media_thumbnails)
+
+    def _get_thumbnails(self, media: Media) -> list[MediaThumbnail]:
+        # Decoded image of the generated thumbnail is reused for resized
+        # thumbnails, so it is not downloaded from the storage again.
         storage = media.get_common_storage()
         file_path = storage.url(media.original_link)
         thumbnail = media
+        image = None
+
         if media.extension not in IMAGE_EXTENSIONS:
+            thumbnail_file = None
             if media.is_pdf:
-                thumbnail = self.create_thumbnail_for_pdf(
-                    media=media,
-                    storage=storage,
-                )
+                image = ThumbnailService().get_pdf_first_page_image(media=media, storage=storage)
+                thumbnail_file = ThumbnailService().get_image_file(media, image) if image else None
             elif video_stream := ThumbnailService().get_video_stream_info(file_path=file_path):
-                thumbnail = self.create_thumbnail_for_video(
-                    media=media,
-                    file_path=file_path,
-                    video_stream=video_stream,
-                )
+                thumbnail_file = ThumbnailService().get_video_thumbnail(media=media, file_path=file_path,
+                                                                        video_stream=video_stream)
+                image = open_image(BytesIO(thumbnail_file.file.getvalue()), thumbnail_file.name) if thumbnail_file else None
 
+            thumbnail = self.create(
+                {'file': thumbnail_file, 'is_public': False}, create_thumbnail=False
+            ) if thumbnail_file else None
             storage = AzurePrivateMediaStorage()
-        else:
-            MediaThumbnailEntityService().create({
-                'original_media': media,
-                'thumbnail': thumbnail,
-            })
+
+        media_thumbnails = [MediaThumbnail(original_media=media, thumbnail=thumbnail)] if thumbnail else []
 
         if thumbnail and thumbnail.extension in IMAGE_EXTENSIONS:
-            MediaThumbnailEntityService().create_thumbnails_for_project_snapshot(
+            media_thumbnails.extend(MediaThumbnailEntityService().get_project_snapshot_thumbnails(
                 media=media,
                 storage=storage,
                 thumbnail=thumbnail,
-            )
-
-    def create_thumbnail_for_pdf(self, media: Media, storage: BaseStorage,
-                                 dpi: Optional[Tuple] = (MediaThumbnail.PDF_THUMBNAIL_DPI_SIZES.width,
-                                                         MediaThumbnail.PDF_THUMBNAIL_DPI_SIZES.height,)
-                                 ) -> Optional[Media]:
-        try:
-            first_pdf_page = ThumbnailService().get_pdf_first_page(media, storage, dpi)
-        except DecompressionBombError:
-            dpi_step = 50
-            dpi = (dpi[0] - dpi_step,
-                   dpi[1] - dpi_step,)
-
-            if dpi[0] <= 0:
-                return None
-
-            return self.create_thumbnail_for_pdf(media, storage, dpi)
-
-        if first_pdf_page is None:
-            return None
-
-        return self._create_thumbnail_for_file(media, first_pdf_page)
-
-    def create_thumbnail_for_video(self, media: Media, file_path: str, video_stream: dict) -> Optional[Media]:
-        in_memory_file = ThumbnailService().get_video_thumbnail(media=media, file_path=file_path, video_stream=video_stream)
-        return self._create_thumbnail_for_file(media, in_memory_file) if in_memory_file else None
-
-    def _create_thumbnail_for_file(self, media: Media, file: InMemoryUploadedFile) -> Media:
-        image_from_file = self.create({'file': file, 'is_public': False}, create_thumbnail=False)
-        MediaThumbnailEntityService().create({
-            'original_media': media,
-            'thumbnail': image_from_file,
-        })
-        return image_from_file
+                image=image,
+            ))
+
+        return media_thumbnails
 
     def save_report(self, validated_data: Dict) -> Media:
         return self._perform_create(validated_data, 'report_private_retrieve', AzurePrivateReportStorage())
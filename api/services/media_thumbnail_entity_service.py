@@ -1,19 +1,17 @@
 import dataclasses
-from io import BytesIO
-from typing import Iterator
+from typing import Iterator, Optional
 
-import PIL
 from PIL import Image, ImageFile
-from PIL.Image import DecompressionBombError
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from pillow_heif import register_heif_opener
+from safedelete import HARD_DELETE
 from sentry_sdk import capture_exception
 from storages.base import BaseStorage
-from wand.image import Image as WandImage
 
 from api.models import Media
 from api.models.media_thumbnail import MediaThumbnail, ThumbnailSizes
 from api.services.base_entity_service import BaseEntityService
+from api.services.location_matrix_snapshot_fragment_service import LocationMatrixSnapshotFragmentService
+from api.utilities.image_utilities import open_image, resize_image_cascade, save_image_to_buffer
 
 
 ImageFile.LOAD_TRUNCATED_IMAGES = True
@@ -34,79 +32,104 @@ class MediaThumbnailEntityService(BaseEntityService):
             media: Media,
             thumbnail: Media,
             storage: BaseStorage,
+            image: Optional[Image.Image] = None,
     ) -> None:
+        self.create_many(self.get_project_snapshot_thumbnails(media, thumbnail, storage, image))
+
+    def create_many(self, media_thumbnails: list[MediaThumbnail]) -> None:
+        # Bulk insert doesn't send post_save, so snapshot fragments
+        # of the original media are invalidated here.
+        try:
+            self.model.objects.bulk_create(media_thumbnails)
+        except Exception:
+            self._delete_thumbnail_media(media_thumbnails)
+            raise
+
+        LocationMatrixSnapshotFragmentService().invalidate_for_media(
+            {media_thumbnail.original_media_id for media_thumbnail in media_thumbnails}
+        )
+
+    def get_project_snapshot_thumbnails(
+            self,
+            media: Media,
+            thumbnail: Media,
+            storage: BaseStorage,
+            image: Optional[Image.Image] = None,
+    ) -> list[MediaThumbnail]:
         thumbnails = self.get_thumbnails_if_not_exists(media=media, thumbnail=thumbnail, storage=storage,
-                                                       sizes=MediaThumbnail.PROJECT_SNAPSHOT_THUMBNAIL_SIZES)
-        for thumbnail in thumbnails:
-            self.create({
-                'original_media': media,
-                'thumbnail': thumbnail.media,
-                'width': thumbnail.width,
-                'height': thumbnail.height,
-            })
-
-    def get_thumbnails_if_not_exists(self, media: Media, thumbnail: Media, storage: BaseStorage, sizes: list[ThumbnailSizes]) -> \
-            Iterator[ThumbnailMedia]:
+                                                       sizes=MediaThumbnail.PROJECT_SNAPSHOT_THUMBNAIL_SIZES,
+                                                       image=image)
+        return [
+            self.model(original_media=media, thumbnail=resized_thumbnail.media,
+                       width=resized_thumbnail.width, height=resized_thumbnail.height)
+            for resized_thumbnail in thumbnails
+        ]
+
+    def get_thumbnails_if_not_exists(self, media: Media, thumbnail: Media, storage: BaseStorage, sizes: list[ThumbnailSizes],
+                                     image: Optional[Image.Image] = None) -> Iterator[ThumbnailMedia]:
         """
             Generates and yields thumbnail images of different sizes for a given media item if they do not already exist.
 
-            This function opens the original thumbnail image, resizes it according to the dimensions specified in the sizes
-            parameter, and creates new thumbnail media objects if they do not exist in the database.
+            This function opens the original thumbnail image once, unless it is already decoded and passed as image,
+            and resizes it by cascade to the dimensions specified in the sizes parameter. New thumbnail media objects
+            are created only for sizes which do not exist in the database.
 
             :param media: A Media object representing the original media item.
             :param thumbnail: A Media object representing the original thumbnail image.
             :param storage: A BaseStorage object to interact with the storage backend.
             :param sizes: A list of ThumbnailSizes objects containing the dimensions for the thumbnail images to be created.
+            :param image: Decoded original thumbnail image, when it is already in memory.
             :return: An iterator yielding ThumbnailMedia objects containing the created thumbnail media and dimensions.
             """
-        from api.services.media_entity_service import MediaEntityService
+        if image is not None:
+            yield from self._create_resized_thumbnails(media, thumbnail, image, sizes)
+            return
 
         with storage.open(thumbnail.original_link) as image_file:
-            if thumbnail.original_link.lower().endswith('heic'):
-                register_heif_opener()
-            elif thumbnail.original_link.lower().endswith('svg'):
-                with WandImage(file=image_file) as svg_file, svg_file.convert('png') as converted_file:
-                    image_file = BytesIO()
-                    converted_file.save(file=image_file)
-
             try:
-                image = Image.open(image_file)
-            except DecompressionBombError:
-                PIL.Image.MAX_IMAGE_PIXELS = None
-                image = Image.open(image_file)
+                image = open_image(image_file, thumbnail.original_link)
             except Exception as e:
                 capture_exception(e)
-                return []
-
-            for size in sizes:
-                resized_image_file = self._create_resized_in_memory_image(image, size, thumbnail)
-                thumbnail_exists = self.model.objects.filter(
-                    original_media=media,
-                    thumbnail__name=resized_image_file.name,
-                ).exists()
-                if not thumbnail_exists:
-                    thumbnail = MediaEntityService().create_thumbnail_media(resized_image_file, media.local_id)
-                    yield ThumbnailMedia(media=thumbnail, width=size.width, height=size.height)
-
-    def _create_resized_in_memory_image(self, image: Image, sizes: ThumbnailSizes, media: Media) -> InMemoryUploadedFile:
+                return
+
+            yield from self._create_resized_thumbnails(media, thumbnail, image, sizes)
+
+    def _create_resized_thumbnails(self, media: Media, thumbnail: Media, image: Image.Image,
+                                   sizes: list[ThumbnailSizes]) -> Iterator[ThumbnailMedia]:
+        from api.services.media_entity_service import MediaEntityService
+
+        extension, pil_format, file_content_type = self._get_image_format(thumbnail)
+        file_names = {(size.width, size.height): f'{self._generate_image_name_by_size(thumbnail.name, size)}.{extension}'
+                      for size in sizes}
+        existing_file_names = set(self.model.objects.filter(
+            original_media=media,
+            thumbnail__name__in=file_names.values(),
+        ).values_list('thumbnail__name', flat=True))
+        missing_boxes = [box for box, file_name in file_names.items() if file_name not in existing_file_names]
+
+        for (width, height), resized_image in resize_image_cascade(image, missing_boxes):
+            b = save_image_to_buffer(resized_image, pil_format)
+            resized_image_file = InMemoryUploadedFile(b, None, file_names[(width, height)], file_content_type,
+                                                      b.getbuffer().nbytes, None)
+
+            resized_thumbnail = MediaEntityService().create_thumbnail_media(resized_image_file, media.local_id)
+            yield ThumbnailMedia(media=resized_thumbnail, width=width, height=height)
+
+    def _delete_thumbnail_media(self, media_thumbnails: list[MediaThumbnail]) -> None:
+        # Original media of images is their own thumbnail, it is kept.
+        thumbnails = [media_thumbnail.thumbnail for media_thumbnail in media_thumbnails
+                      if media_thumbnail.thumbnail_id != media_thumbnail.original_media_id]
+
+        for thumbnail in thumbnails:
+            thumbnail.get_common_storage().delete(thumbnail.original_link)
+
+        Media.all_objects.filter(pk__in=[thumbnail.pk for thumbnail in thumbnails]).delete(force_policy=HARD_DELETE)
+
+    def _get_image_format(self, media: Media) -> tuple[str, str, str]:
         if media.extension in ('jpeg', 'jpg'):
-            extension = 'jpeg'
-            pil_format = 'JPEG'
-            file_content_type = 'image/jpeg'
-        else:
-            extension = 'png'
-            pil_format = 'PNG'
-            file_content_type = 'image/png'
-
-        b = BytesIO()
-
-        copied_image = image.copy()
-        copied_image = copied_image.convert('RGB')
-        copied_image.thumbnail((sizes.width, sizes.height), Image.ANTIALIAS)
-        copied_image.save(b, format=pil_format, quality='maximum', optimize=True, progressive=True)
-
-        new_filename = self._generate_image_name_by_size(media.name, sizes)
-        return InMemoryUploadedFile(b, None, f'{new_filename}.{extension}', file_content_type, b.getbuffer().nbytes, None)
+            return 'jpeg', 'JPEG', 'image/jpeg'
+
+        return 'png', 'PNG', 'image/png'
 
     def _generate_image_name_by_size(self, name: str, sizes: ThumbnailSizes) -> str:
         return f'{sizes.width}x{sizes.height}_{name}'
@@ -0,0 +1,103 @@
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.models import EditMode, Project, User
+
+
+class ProjectAccessService:
+    """
+    Project memberships and edit modes of a user, which are checked by permission classes.
+    They are loaded once for a request and kept in the cache for a short time, the cache
+    is invalidated by signals when project users or edit modes change. Project flags
+    are not user specific, so they are only kept for the request.
+    """
+    cache_key = 'project_access:%s'
+    request_attribute = '_project_access'
+
+    def __init__(self, user: User):
+        self.user = user
+        self._access = None
+        self._projects_flags = {}
+
+    @classmethod
+    def for_request(cls, request) -> 'ProjectAccessService':
+        service = getattr(request, cls.request_attribute, None)
+        if service is None or service.user != request.user:
+            service = cls(request.user)
+            setattr(request, cls.request_attribute, service)
+
+        return service
+
+    @classmethod
+    def get_requested_project_pks(cls, request, view) -> list:
+        project_pk = view.kwargs.get('project_pk', request.query_params.getlist('project'))
+
+        return project_pk if type(project_pk) is list else [project_pk]
+
+    @classmethod
+    def invalidate(cls, user_ids: Iterable[int]) -> None:
+        cache.delete_many([cls.cache_key % user_id for user_id in set(user_ids)])
+
+    def is_project_user(self, project_pks: Iterable) -> bool:
+        project_ids = self._get_access()['projects']
+
+        return any(project_id in project_ids for project_id in self._to_ids(project_pks))
+
+    def is_in_edit_mode(self, project_pk) -> bool:
+        return any(project_id in self._get_access()['edit_mode_projects'] for project_id in self._to_ids([project_pk]))
+
+    def is_task_visible_for_clients(self, project_pks: Iterable) -> bool:
+        return any(flags['is_task_visible_for_clients'] for flags in self._get_projects_flags(project_pks))
+
+    def is_subtask_visible_for_clients(self, project_pks: Iterable) -> bool:
+        return any(flags['is_subtask_visible_for_clients'] for flags in self._get_projects_flags(project_pks))
+
+    def _get_access(self) -> dict:
+        if self._access is None:
+            self._access = self._load_access()
+
+        return self._access
+
+    def _load_access(self) -> dict:
+        if not self.user or not self.user.is_authenticated:
+            return {'projects': set(), 'edit_mode_projects': set()}
+
+        access = cache.get(self.cache_key % self.user.pk)
+        if access is None:
+            access = {
+                'projects': list(Project.objects.filter(users__pk=self.user.pk).values_list('pk', flat=True)),
+                'edit_mode_projects': list(EditMode.objects.filter(
+                    user=self.user, project__isnull=False
+                ).values_list('project_id', flat=True)),
+            }
+            cache.set(self.cache_key % self.user.pk, access, settings.PROJECT_ACCESS_CACHE_LIFETIME)
+
+        return {key: set(project_ids) for key, project_ids in access.items()}
+
+    def _get_projects_flags(self, project_pks: Iterable) -> list[dict]:
+        project_ids = self._to_ids(project_pks)
+        missing_project_ids = [project_id for project_id in project_ids if project_id not in self._projects_flags]
+
+        if missing_project_ids:
+            self._projects_flags.update({project_id: None for project_id in missing_project_ids})
+            self._projects_flags.update(
+                (project['pk'], project)
+                for project in Project.objects.filter(pk__in=missing_project_ids).values(
+                    'pk', 'is_task_visible_for_clients', 'is_subtask_visible_for_clients'
+                )
+            )
+
+        return [self._projects_flags[project_id] for project_id in project_ids if self._projects_flags[project_id]]
+
+    @staticmethod
+    def _to_ids(project_pks: Iterable) -> list[int]:
+        return [project_id for project_id in map(ProjectAccessService._to_id, project_pks) if project_id is not None]
+
+    @staticmethod
+    def _to_id(project_pk) -> Optional[int]:
+        try:
+            return int(project_pk)
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,444 @@
+import io
+import logging
+from typing import BinaryIO, Iterator, Optional, Type
+
+import pendulum
+import ujson
+from azure.storage.blob import BlobClient, ContentSettings
+from django.db.models import Prefetch, QuerySet, Q
+from pydash import snake_case
+from sentry_sdk import capture_exception
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from api.http.serializers import LocationMatrixSerializer
+from api.models import Project, LocationMatrixPackage, SubtaskUpdate, Subtask, QualityIssueUpdate, User
+from api.models.base_model import BaseModel
+from api.models.project_snapshot import ProjectSnapshot
+from api.models.project_snapshot_tombstone import ProjectSnapshotTombstone
+from api.storages import AzurePrivateProjectSnapshotStorage
+from api.utilities.blob_utilities import AzureBlockBlobWriter
+from api.services.location_matrix_snapshot_fragment_service import LocationMatrixSnapshotFragmentService
+from api.services.signed_url_cache_service import SignedUrlCacheService
+from api.utilities.json_utilities import iterencode, EncodedJSON
+from api.utilities.transaction_utilities import get_transaction_outbox
+from mbuild.settings import AZURE_BLOB_CONNECTION_STRING
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectSnapshotService:
+    # Number of location matrices loaded with all their relations at once.
+    location_matrices_chunk_size = 50
+
+    # Entities tracked by delta snapshots with the lookup to their location matrix.
+    delta_entities = LocationMatrixSnapshotFragmentService.subtree_entities
+
+    location_matrix_expand = [
+        'expanded_tasks.expanded_package',
+        'expanded_tasks.expanded_location_matrix.expanded_project',
+
+        'expanded_location_matrix_packages.expanded_media.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_location_matrix_packages.expanded_package',
+        'expanded_location_matrix_packages.expanded_location_matrix',
+        'expanded_location_matrix_packages.expanded_package_activity',
+
+        'expanded_location_matrix_packages.expanded_package_matrix.expanded_project',
+        'expanded_location_matrix_packages.expanded_package_matrix.expanded_package',
+        'expanded_location_matrix_packages.expanded_package_matrix.expanded_package_activity',
+        'expanded_location_matrix_packages.expanded_package_matrix.expanded_companies',
+
+        'expanded_tasks.expanded_updates.expanded_user.expanded_deleted',
+        'expanded_tasks.expanded_updates.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_tasks.expanded_updates.expanded_recipients.expanded_user.expanded_deleted',
+
+        'expanded_tasks.expanded_subtasks.expanded_company',
+        'expanded_tasks.expanded_subtasks.expanded_user.expanded_deleted',
+        'expanded_tasks.expanded_subtasks.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_tasks.expanded_subtasks.expanded_closed_files',
+        'expanded_tasks.expanded_subtasks.expanded_location_matrix',
+
+        'expanded_tasks.expanded_subtasks.expanded_last_confirmed_update.expanded_user.expanded_deleted',
+        'expanded_tasks.expanded_subtasks.expanded_last_confirmed_update.expanded_previous_status',
+        'expanded_tasks.expanded_subtasks.expanded_last_confirmed_update.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_tasks.expanded_subtasks.expanded_last_confirmed_update.expanded_recipients.expanded_user.expanded_deleted',
+
+        'expanded_tasks.expanded_subtasks.expanded_last_update.expanded_user.expanded_deleted',
+        'expanded_tasks.expanded_subtasks.expanded_last_update.expanded_previous_status',
+        'expanded_tasks.expanded_subtasks.expanded_last_update.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_tasks.expanded_subtasks.expanded_last_update.expanded_recipients.expanded_user',
+
+        'expanded_tasks.expanded_subtasks.expanded_updates.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_tasks.expanded_subtasks.expanded_updates.expanded_user.expanded_deleted',
+        'expanded_tasks.expanded_subtasks.expanded_updates.expanded_recipients',
+        'expanded_tasks.expanded_subtasks.expanded_updates.expanded_recipients.expanded_user.expanded_deleted',
+
+        'expanded_quality_issues.expanded_user.expanded_deleted',
+        'expanded_quality_issues.expanded_attachments.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_quality_issues.expanded_last_status_change_update',
+        'expanded_quality_issues.expanded_old_quality_issue',
+        'expanded_quality_issues.expanded_last_recipients',
+        'expanded_quality_issues.expanded_last_recipients.expanded_user.expanded_deleted',
+        'expanded_quality_issues.expanded_location_matrix',
+        'expanded_quality_issues.expanded_response_category',
+        'expanded_quality_issues.expanded_location_matrix.expanded_project',
+
+        'expanded_quality_issues.expanded_last_confirmed_update.expanded_user.expanded_deleted',
+        'expanded_quality_issues.expanded_last_confirmed_update.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_quality_issues.expanded_last_confirmed_update.expanded_recipients.expanded_user.expanded_deleted',
+
+        'expanded_quality_issues.expanded_last_update.expanded_recipients.expanded_user.expanded_deleted',
+        'expanded_quality_issues.expanded_last_update.expanded_user.expanded_deleted',
+        'expanded_quality_issues.expanded_last_update.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_quality_issues.expanded_last_update.expanded_previous_status',  # Needs to optimize
+
+        'expanded_quality_issues.expanded_updates.expanded_recipients.expanded_user.expanded_deleted',
+        'expanded_quality_issues.expanded_updates.expanded_user.expanded_deleted',
+        'expanded_quality_issues.expanded_updates.expanded_files.expanded_project_snapshot_thumbnails.expanded_thumbnail',
+        'expanded_quality_issues.expanded_updates.expanded_previous_status',  # Needs to optimize
+    ]
+
+    def create_snapshot(self, project: Project, location_matrices: list[int], user: Optional[User],
+                        previous_snapshot: Optional[ProjectSnapshot] = None,
+                        since: Optional[pendulum.DateTime] = None) -> ProjectSnapshot:
+        now = pendulum.now()
+
+        if previous_snapshot and not since:
+            since = pendulum.instance(previous_snapshot.generation_started_at)
+
+        return ProjectSnapshot.objects.create(
+            project_id=project.pk,
+            location_matrices=location_matrices,
+            status=ProjectSnapshot.Statuses.PENDING.value,
+            user=user.pk if user else None,
+            previous_snapshot=str(previous_snapshot.pk) if previous_snapshot else None,
+            since=since,
+            generation_started_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+
+    def generate(self, snapshot: ProjectSnapshot) -> None:
+        snapshot.mark_as_running(pendulum.now())
+
+        try:
+            project = Project.objects.select_related('image').get(pk=snapshot.project_id)
+            archive_name = f'snapshots/{snapshot.project_id}/{snapshot.pk}.zip'
+
+            # Archive is streamed to the storage while location matrices are serialized one by one.
+            with self._open_archive_stream(archive_name) as archive_stream:
+                self.write_snapshot(archive_stream, project, list(snapshot.location_matrices),
+                                    pendulum.instance(snapshot.generation_started_at),
+                                    since=pendulum.instance(snapshot.since) if snapshot.since else None,
+                                    previous_snapshot=snapshot.previous_snapshot)
+
+            snapshot.mark_as_completed(archive_name, pendulum.now())
+        except Exception as e:
+            logger.exception(repr(e))
+            snapshot.mark_as_failed(capture_exception(e), pendulum.now())
+
+    def get_archive_url(self, snapshot: ProjectSnapshot) -> str:
+        return SignedUrlCacheService().get_url(AzurePrivateProjectSnapshotStorage(), snapshot.archive)
+
+    def write_snapshot(self, stream: BinaryIO, project: Project, location_matrices_ids: list[int],
+                       generation_started_at: pendulum.DateTime, since: Optional[pendulum.DateTime] = None,
+                       previous_snapshot: Optional[str] = None) -> None:
+        """
+        Write zipped snapshot JSON to the stream. When `since` is passed only location
+        matrices with changes in their subtree are included along with ids of entities
+        deleted after `since`.
+        """
+        with ZipFile(stream, mode='w', compression=ZIP_DEFLATED) as archive:
+            with archive.open(f'{snake_case(project.name)}.json', mode='w') as archive_entry, \
+                    io.TextIOWrapper(archive_entry, encoding='utf-8') as json_file:
+                if since:
+                    snapshot_content = self._get_delta_snapshot_content(project, location_matrices_ids,
+                                                                        generation_started_at, since,
+                                                                        previous_snapshot)
+                else:
+                    snapshot_content = self._get_snapshot_content(project, location_matrices_ids,
+                                                                  generation_started_at)
+
+                for chunk in iterencode(snapshot_content):
+                    json_file.write(chunk)
+
+    def _get_snapshot_content(self, project: Project, location_matrices_ids: list[int],
+                              generation_started_at: pendulum.DateTime) -> dict:
+        from api.http.serializers.project_snapshot import ProjectSnapshotDataSerializer
+
+        project = Project.objects.prefetch_related(
+            'packagematrix_set__package',
+            'packagematrix_set__package_activity__files',
+            'packagematrix_set__package_activity__packageactivitytask_set',
+            'packagematrix_set__companies',
+            'packagematrix_set__project',
+            'key_contacts',
+            'users__company'
+        ).select_related('image').filter(id=project.id).get()
+        snapshot_data = ProjectSnapshotDataSerializer(project, expand=['company_admins']).data
+
+        return {
+            'data': {
+                **snapshot_data,
+                'location_matrix': self._serialize_location_matrices(project, location_matrices_ids),
+            },
+            'project_id': project.pk,
+            'generation_started_at': generation_started_at.to_datetime_string(),
+            'created_at': pendulum.now().to_datetime_string(),
+            'updated_at': pendulum.now().to_datetime_string(),
+        }
+
+    def _get_delta_snapshot_content(self, project: Project, location_matrices_ids: list[int],
+                                    generation_started_at: pendulum.DateTime, since: pendulum.DateTime,
+                                    previous_snapshot: Optional[str]) -> dict:
+        snapshot_content = self._get_snapshot_content(
+            project, self._get_changed_location_matrices(location_matrices_ids, since), generation_started_at
+        )
+        snapshot_content['data']['deleted'] = self._get_tombstones(location_matrices_ids, since)
+
+        return {
+            **snapshot_content,
+            'since': since.to_datetime_string(),
+            'previous_snapshot': previous_snapshot,
+        }
+
+    def _get_changed_location_matrices(self, location_matrices_ids: list[int], since: pendulum.DateTime) -> list[int]:
+        changed_location_matrices = set()
+
+        for _, model, location_matrix_lookup in self.delta_entities:
+            changed_location_matrices.update(
+                model.all_objects.filter(
+                    Q(updated_at__gte=since) | Q(deleted__gte=since),
+                    **{f'{location_matrix_lookup}__in': location_matrices_ids}
+                ).values_list(location_matrix_lookup, flat=True).distinct()
+            )
+
+        changed_location_matrices.update(
+            ProjectSnapshotTombstone.objects(
+                location_matrix_id__in=location_matrices_ids, deleted_at__gte=since
+            ).distinct('location_matrix_id')
+        )
+
+        return sorted(changed_location_matrices)
+
+    def add_tombstone(self, model: Type[BaseModel], instance: BaseModel) -> None:
+        # Only the first step of the lookup is read from the instance, so no queries are made per deleted row.
+        location_matrix_lookup = LocationMatrixSnapshotFragmentService().get_location_matrix_lookup(model)
+        reference_field = location_matrix_lookup.split('__')[0]
+        reference = getattr(instance, model._meta.get_field(reference_field).attname)
+        deleted_entity = (model, instance.pk, reference)
+
+        outbox = get_tombstone_outbox()
+        if outbox:
+            outbox.deleted_entities.append(deleted_entity)
+        else:
+            self.create_tombstones([deleted_entity])
+
+    def create_tombstones(self, deleted_entities: list[tuple[Type[BaseModel], int, Optional[int]]]) -> None:
+        deleted_at = pendulum.now()
+        location_matrices_ids = {}
+        tombstones = []
+
+        # Parents are resolved before their children, so children of parents deleted
+        # in the same transaction get location matrix from tombstones of their parents.
+        for entity, model, location_matrix_lookup in self.delta_entities:
+            references = {pk: reference for deleted_model, pk, reference in deleted_entities if deleted_model is model}
+            if not references:
+                continue
+
+            reference_field, _, related_lookup = location_matrix_lookup.partition('__')
+            if related_lookup:
+                related_model = model._meta.get_field(reference_field).related_model
+                related_location_matrices_ids = {
+                    pk: location_matrix_id for (deleted_model, pk), location_matrix_id in location_matrices_ids.items()
+                    if deleted_model is related_model
+                }
+                related_location_matrices_ids.update(
+                    related_model.all_objects.filter(pk__in=set(references.values())).values_list('pk', related_lookup)
+                )
+                references = {pk: related_location_matrices_ids.get(reference) for pk, reference in references.items()}
+
+            for pk, location_matrix_id in references.items():
+                location_matrices_ids[(model, pk)] = location_matrix_id
+                tombstones.append(ProjectSnapshotTombstone(
+                    entity=entity,
+                    entity_id=pk,
+                    location_matrix_id=location_matrix_id,
+                    deleted_at=deleted_at,
+                ))
+
+        if tombstones:
+            ProjectSnapshotTombstone.objects.insert(tombstones)
+
+    def _get_tombstones(self, location_matrices_ids: list[int], since: pendulum.DateTime) -> dict[str, list[int]]:
+        tombstones = {
+            entity: set(
+                model.deleted_objects.filter(
+                    deleted__gte=since,
+                    **{f'{location_matrix_lookup}__in': location_matrices_ids}
+                ).values_list('id', flat=True)
+            )
+            for entity, model, location_matrix_lookup in self.delta_entities
+        }
+
+        # Hard deleted entities are known only by tombstones recorded on their deletion.
+        hard_deleted = ProjectSnapshotTombstone.objects(
+            location_matrix_id__in=location_matrices_ids, deleted_at__gte=since
+        ).only('entity', 'entity_id')
+        for tombstone in hard_deleted:
+            tombstones[tombstone.entity].add(tombstone.entity_id)
+
+        return {entity: sorted(ids) for entity, ids in tombstones.items()}
+
+    def _serialize_location_matrices(self, project: Project, location_matrices_ids: list[int]) -> Iterator[EncodedJSON]:
+        fragment_service = LocationMatrixSnapshotFragmentService()
+        location_matrices = project.locationmatrix_set.filter(
+            id__in=location_matrices_ids, deleted__isnull=True
+        ).order_by('id')
+        location_matrices_ids = list(location_matrices.values_list('id', flat=True))
+        related_version = fragment_service.get_related_version(project.pk)
+
+        for chunk_start in range(0, len(location_matrices_ids), self.location_matrices_chunk_size):
+            chunk_ids = location_matrices_ids[chunk_start:chunk_start + self.location_matrices_chunk_size]
+            versions = fragment_service.get_versions(chunk_ids, related_version)
+            fragments = fragment_service.get_many(versions)
+            missing_ids = [location_matrix_id for location_matrix_id in chunk_ids if location_matrix_id not in fragments]
+
+            if missing_ids:
+                serialized_fragments = {}
+
+                for location_matrix in self._prefetch_location_matrices(location_matrices.filter(id__in=missing_ids)):
+                    logger.debug('Start forming location matrix %s data. Project %s' % (location_matrix.id, project.pk,))
+
+                    serialized_fragments[location_matrix.id] = ujson.dumps(
+                        LocationMatrixSerializer(location_matrix, expand=self.location_matrix_expand).data
+                    )
+
+                fragment_service.set_many({
+                    location_matrix_id: (versions[location_matrix_id], fragment)
+                    for location_matrix_id, fragment in serialized_fragments.items()
+                })
+                fragments.update(serialized_fragments)
+
+            for location_matrix_id in chunk_ids:
+                if location_matrix_id in fragments:
+                    yield EncodedJSON(fragments[location_matrix_id])
+
+    def _prefetch_location_matrices(self, location_matrices: QuerySet) -> QuerySet:
+        return location_matrices.prefetch_related(
+            Prefetch('task_set__location_matrix__project__image'),
+            Prefetch('task_set__package_activity__files'),
+            Prefetch('task_set__package_activity'),
+            Prefetch('task_set__package_activity_task'),
+            Prefetch('task_set__user'),
+            Prefetch(
+                'task_set__location_matrix__locationmatrixpackage_set',
+                queryset=LocationMatrixPackage.all_objects.select_related('package').order_by('-created_at'),
+                to_attr='locationmatrixpackage_set_with_package'
+            ),
+
+            Prefetch('task_set__taskupdate_set__user'),
+            Prefetch('task_set__taskupdate_set__files__mediathumbnail_set__thumbnail'),
+            Prefetch('task_set__taskupdate_set__recipients__user'),
+
+            Prefetch('task_set__subtask_set__company'),
+            Prefetch('task_set__subtask_set__files__mediathumbnail_set__thumbnail'),
+            Prefetch('task_set__subtask_set__user'),
+            Prefetch(
+                'task_set__subtask_set__subtaskupdate_set',
+                queryset=SubtaskUpdate.objects.filter(
+                    new_data__status=Subtask.Status.CLOSED
+                ).prefetch_related('files__mediathumbnail_set__thumbnail'),
+                to_attr='closed_files_updates'
+            ),
+
+            Prefetch('task_set__subtask_set__last_update__files__mediathumbnail_set__thumbnail'),
+            Prefetch('task_set__subtask_set__last_update__recipients__user'),
+            Prefetch('task_set__subtask_set__last_update__user'),
+            Prefetch(
+                'task_set__subtask_set__last_update__subtask__subtaskupdate_set',
+                queryset=SubtaskUpdate.objects.all().get_with_changed_status_in_desc_order(),
+                to_attr='last_updates_with_changed_status'
+            ),
+
+            Prefetch('task_set__subtask_set__subtaskupdate_set__recipients__user'),
+            Prefetch('task_set__subtask_set__subtaskupdate_set__user'),
+            Prefetch('task_set__subtask_set__subtaskupdate_set__files__mediathumbnail_set__thumbnail'),
+
+            Prefetch('qualityissue_set__attachments__mediathumbnail_set__thumbnail'),
+            Prefetch('qualityissue_set__user'),
+            Prefetch('qualityissue_set__location_matrix'),
+            Prefetch('qualityissue_set__old_quality_issue__attachments'),
+
+            Prefetch('qualityissue_set__last_confirmed_update__files__mediathumbnail_set__thumbnail'),
+            Prefetch('qualityissue_set__last_confirmed_update__recipients__user'),
+            Prefetch('qualityissue_set__last_confirmed_update__user'),
+
+            Prefetch('qualityissue_set__qualityissueupdate_set__files__mediathumbnail_set__thumbnail'),
+            Prefetch('qualityissue_set__qualityissueupdate_set__recipients__user'),
+            Prefetch('qualityissue_set__qualityissueupdate_set__user'),
+            Prefetch(
+                'qualityissue_set__qualityissueupdate_set',
+                queryset=QualityIssueUpdate.objects.all().get_for_last_recipients().prefetch_related('recipients__user'),
+                to_attr='quality_issue_last_recipients'
+            ),
+            Prefetch(
+                'qualityissue_set__qualityissueupdate_set',
+                queryset=QualityIssueUpdate.objects.order_by('-created_at').prefetch_related(
+                    'recipients__user',
+                    'files__mediathumbnail_set__thumbnail',
+                ).select_related('user'),
+                to_attr='last_updates'
+            ),
+            Prefetch(
+                'qualityissue_set__qualityissueupdate_set',
+                queryset=QualityIssueUpdate.objects.all().prefetch_related('recipients', 'files').get_with_changed_status_in_desc_order(),
+                to_attr='last_updates_with_changed_status'
+            ),
+
+            Prefetch('task_set__subtask_set__last_confirmed_update__files__mediathumbnail_set__thumbnail'),
+            Prefetch('task_set__subtask_set__last_confirmed_update__recipients__user'),
+            Prefetch('task_set__subtask_set__last_confirmed_update__user'),
+            Prefetch(
+                'task_set__subtask_set__last_confirmed_update__subtask__subtaskupdate_set',
+                queryset=SubtaskUpdate.objects.all().get_with_changed_status_in_desc_order(),
+                to_attr='last_updates_with_changed_status'
+            ),
+
+            Prefetch('locationmatrixpackage_set__package'),
+            Prefetch('locationmatrixpackage_set__media__mediathumbnail_set__thumbnail'),
+            Prefetch('locationmatrixpackage_set__package_activity'),
+            Prefetch('locationmatrixpackage_set__package_matrix__package'),
+            Prefetch('locationmatrixpackage_set__package_matrix__package_activity'),
+            Prefetch('locationmatrixpackage_set__package_matrix__package_activity__files'),
+            Prefetch('locationmatrixpackage_set__package_matrix__package_activity__packageactivitytask_set'),
+            Prefetch('locationmatrixpackage_set__package_matrix__project'),
+            Prefetch('locationmatrixpackage_set__package_matrix__companies'),
+        )
+
+    def _open_archive_stream(self, archive_name: str) -> AzureBlockBlobWriter:
+        return AzureBlockBlobWriter(
+            BlobClient.from_connection_string(
+                conn_str=AZURE_BLOB_CONNECTION_STRING,
+                container_name=AzurePrivateProjectSnapshotStorage.azure_container,
+                blob_name=archive_name,
+            ),
+            content_settings=ContentSettings(content_type='application/zip')
+        )
+
+
+class ProjectSnapshotTombstoneOutbox:
+    """
+    Collects entities hard deleted inside a transaction and records
+    their tombstones with a single insert once the transaction is committed.
+    """
+
+    def __init__(self):
+        self.deleted_entities = list()
+
+    def __call__(self) -> None:
+        ProjectSnapshotService().create_tombstones(self.deleted_entities)
+
+
+def get_tombstone_outbox() -> Optional[ProjectSnapshotTombstoneOutbox]:
+    return get_transaction_outbox('project_snapshot_tombstone', ProjectSnapshotTombstoneOutbox)
@@ -1,6 +1,7 @@
 from copy import deepcopy
 from typing import Optional
 
+import pendulum
 from django.db.models import Exists, OuterRef
 
 from api.models import LocationMatrix, Project, QualityIssue, User, Task, LocationMatrixPackage
@@ -29,6 +30,10 @@ class QualityIssueEntityService(BaseEntityService):
         floor_plan_area_pin = validated_data.pop('floor_plan_area_pin', None)
         recipients = validated_data.pop('recipients', [])
         validated_data['status'] = QualityIssue.Status.UNDER_REVIEW.value
+        validated_data['building'] = validated_data['location_matrix'].building
+        validated_data['level'] = validated_data['location_matrix'].level
+        validated_data['area'] = validated_data['location_matrix'].area
+        validated_data['project_id'] = validated_data['location_matrix'].project_id
 
         quality_issue = super().create(validated_data)
 
@@ -62,6 +67,19 @@ class QualityIssueEntityService(BaseEntityService):
 
         return quality_issue
 
+    def update(self, instance: QualityIssue, validated_data: dict, **kwargs) -> QualityIssue:
+        location_matrix = validated_data.get('location_matrix')
+        if location_matrix and location_matrix.pk != instance.location_matrix_id:
+            validated_data = {
+                **validated_data,
+                'building': location_matrix.building,
+                'level': location_matrix.level,
+                'area': location_matrix.area,
+                'project': location_matrix.project,
+            }
+
+        return super().update(instance, validated_data, **kwargs)
+
     def bulk_create(self, project: Project, validated_data: dict, user: User) -> list:
         area_filter = validated_data.pop('area', None)
         filters = {
@@ -108,13 +126,15 @@ class QualityIssueEntityService(BaseEntityService):
             subtask__task__package_activity_task_id=activity_task_pk,
             subtask__task__location_matrix__deleted__isnull=True,
             subtask__task__location_matrix__project__id=project_pk
-        ).update(deleted=None)
+        ).update(deleted=None, updated_at=pendulum.now())
 
     def restore_from_tasks(self, tasks):
         task_chunks = [tasks[i:i + 500] for i in range(0, len(tasks), 500)]
 
         for chunk in task_chunks:
-            self.model.deleted_objects.filter(subtask__task_id__in=[task.id for task in chunk]).update(deleted=None)
+            self.model.deleted_objects.filter(
+                subtask__task_id__in=[task.id for task in chunk]
+            ).update(deleted=None, updated_at=pendulum.now())
 
     def is_comment_creation_for_quality_issue_without_related_subtask_forbidden(self, quality_issue: QualityIssue, user: User) -> bool:
         return (not quality_issue.subtask_set.exists()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+from collections import deque
+from functools import lru_cache
+from typing import Optional, Type
+
+from django.core.cache import cache
+from django.db.models import Max, Count
+
+from api.models import Event, Media, Project
+from api.utilities.report_generators import BaseReportGenerator
+from mbuild.settings import REPORT_CACHE_LIFETIME
+
+
+class ReportCacheService:
+    """
+    Cache of generated reports. Report is identified by its generator, project,
+    query params and the user it is generated for, and it is stored with the data
+    version of the moment generation started. Report is reused only while the
+    data version stays the same, so any change of the exported data regenerates it.
+    """
+    cache_key = 'report:%s'
+
+    def get_key(self, generator: BaseReportGenerator, report_type: str) -> str:
+        query_params = generator.request.query_params
+        fingerprint = {
+            'generator': f'{type(generator).__module__}.{type(generator).__qualname__}',
+            'report_type': report_type,
+            'project': generator.project.pk if generator.project else None,
+            'query_params': {key: query_params.getlist(key) for key in sorted(query_params.keys())},
+            'scope': self._get_visibility_scope(generator),
+        }
+
+        return self.cache_key % hashlib.sha1(json.dumps(fingerprint, default=str).encode()).hexdigest()
+
+    def get_version(self, generator: BaseReportGenerator) -> str:
+        states = [self._get_project_state(generator.project)] if generator.project else []
+
+        for model in (generator.model, *generator.cache_dependencies):
+            states.append(self._get_model_state(model, generator.project))
+
+        return hashlib.sha1(repr(states).encode()).hexdigest()
+
+    def get(self, key: str, version: str) -> Optional[Media]:
+        cached_report = cache.get(key)
+        if not cached_report or cached_report['version'] != version:
+            return None
+
+        return Media.objects.filter(pk=cached_report['media']).first()
+
+    def set(self, key: str, version: str, report: Media) -> None:
+        cache.set(key, {'version': version, 'media': report.pk}, REPORT_CACHE_LIFETIME)
+
+    def _get_visibility_scope(self, generator: BaseReportGenerator) -> str:
+        # Report content depends on the role and projects of the user
+        # and some reports mention the user, so reports are not shared.
+        return f'user:{generator.request.user.pk}'
+
+    def _get_project_state(self, project: Project) -> Optional[str]:
+        # Changes of project entities are tracked by events,
+        # so the latest event is the data version of the project.
+        last_event = Event.objects(project_id=project.pk).order_by('-created_at', '-id').only('id').first()
+
+        return str(last_event.pk) if last_event else None
+
+    def _get_model_state(self, model: Type, project: Optional[Project]) -> tuple:
+        queryset = model.all_objects.order_by(with_default_order=False)
+        # Changes of other projects don't change the exported data.
+        if project and (project_lookup := self._get_project_lookup(model)):
+            queryset = queryset.filter(**{project_lookup: project.pk})
+
+        return tuple(queryset.aggregate(
+            last_updated_at=Max('updated_at'),
+            last_deleted=Max('deleted'),
+            entities_count=Count('id'),
+        ).values())
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_project_lookup(model: Type, max_depth: int = 4) -> Optional[str]:
+        """
+        Get the shortest lookup from the model to its project by forward relations.
+        Models which don't belong to a project, like companies, get None.
+        """
+        if model is Project:
+            return 'pk'
+
+        related_models = deque([(model, '', 0)])
+        visited_models = {model}
+        while related_models:
+            related_model, lookup, depth = related_models.popleft()
+            if depth == max_depth:
+                continue
+
+            for field in related_model._meta.concrete_fields:
+                if not (field.many_to_one or field.one_to_one):
+                    continue
+
+                field_lookup = f'{lookup}__{field.name}' if lookup else field.name
+                if field.related_model is Project:
+                    return field_lookup
+
+                if field.related_model not in visited_models:
+                    visited_models.add(field.related_model)
+                    related_models.append((field.related_model, field_lookup, depth + 1))
+
+        return None
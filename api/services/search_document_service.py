@@ -0,0 +1,68 @@
+from typing import Iterable, Type
+
+from django.db import connection
+
+from api.models import QualityIssue, Subtask, Task
+from api.models.base_model import BaseModel
+
+
+class SearchDocumentService:
+    """
+    Search documents of tasks, subtasks and quality issues. Document is lowercased text of all
+    searchable values of an entity, including values of its location, user and update recipients,
+    so list search is a substring lookup of one column covered by a trigram index instead of
+    `icontains` lookups over joins. Documents are refreshed by signals when these values change.
+    """
+    models = {model.__name__: model for model in (Task, Subtask, QualityIssue)}
+    fields = {
+        Task: ['building', 'level', 'area', 'package_activity__name', 'package_activity_task__description',
+               'user__last_name', 'user__first_name', 'user__email', 'taskupdate__recipients__email',
+               'taskupdate__recipients__first_name', 'taskupdate__recipients__last_name'],
+        Subtask: ['id', 'description', 'task__location_matrix__building', 'task__location_matrix__level',
+                  'task__location_matrix__area', 'task__package_activity__name',
+                  'task__package_activity_task__description', 'user__last_name', 'user__first_name', 'user__email',
+                  'subtaskupdate__recipients__email', 'subtaskupdate__recipients__first_name',
+                  'subtaskupdate__recipients__last_name'],
+        QualityIssue: ['user__last_name', 'user__first_name', 'user__email',
+                       'location_matrix__building', 'location_matrix__area',
+                       'location_matrix__level', 'id', 'description',
+                       'qualityissueupdate__recipients__email',
+                       'qualityissueupdate__recipients__first_name',
+                       'qualityissueupdate__recipients__last_name'],
+    }
+    # Search terms are split by whitespaces, so a term never matches across two values.
+    separator = '\n'
+    batch_size = 500
+
+    @staticmethod
+    def normalize(value) -> str:
+        return str(value).lower()
+
+    def get_entity_fields(self, model: Type[BaseModel]) -> set[str]:
+        # Own fields of the entity which its document depends on.
+        return {field.split('__')[0] for field in self.fields[model]}
+
+    def refresh(self, model: Type[BaseModel], ids: Iterable[int]) -> None:
+        ids = list(set(ids))
+
+        for offset in range(0, len(ids), self.batch_size):
+            documents = self.get_documents(model, ids[offset:offset + self.batch_size])
+            # Documents are written with plain update to not create events and trigger signals of the entity.
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'UPDATE {model._meta.db_table} SET search_document = %s WHERE id = %s',
+                    [(document, pk) for pk, document in documents.items()]
+                )
+
+    def refresh_by_filters(self, filters: dict[str, dict]) -> None:
+        for model_name, model_filters in filters.items():
+            model = self.models[model_name]
+            self.refresh(model, model.all_objects.filter(**model_filters).values_list('pk', flat=True))
+
+    def get_documents(self, model: Type[BaseModel], ids: Iterable[int]) -> dict[int, str]:
+        values = {pk: [] for pk in ids}
+
+        for pk, *row in model.all_objects.filter(pk__in=values.keys()).values_list('pk', *self.fields[model]):
+            values[pk].extend(self.normalize(value) for value in row if value is not None and value != '')
+
+        return {pk: self.separator.join(dict.fromkeys(entity_values)) for pk, entity_values in values.items()}
@@ -0,0 +1,48 @@
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.core.files.storage import Storage
+
+
+class SignedUrlCacheService:
+    """
+    Cache of blob URLs signed by storages. URL is cached by container and blob name for
+    the `url_cache_lifetime` of the storage, but never longer than its signature stays
+    valid with a margin, so a returned URL still has time to be opened by the client.
+    Storages without `url_cache_lifetime` build their URLs without the cache.
+    """
+    cache_key = 'signed_url:%s:%s'
+    expiration_margin = 60 * 5
+
+    def get_url(self, storage: Storage, name: str) -> str:
+        return self.get_urls(storage, [name])[name]
+
+    def get_urls(self, storage: Storage, names: Iterable[str]) -> dict[str, str]:
+        names = set(names)
+        lifetime = self._get_lifetime(storage)
+        if not lifetime:
+            return {name: str(storage.url(name)) for name in names}
+
+        keys = {self._get_key(storage, name): name for name in names}
+        urls = {keys[key]: url for key, url in cache.get_many(keys.keys()).items()}
+
+        missing_urls = {key: str(storage.url(name)) for key, name in keys.items() if name not in urls}
+        if missing_urls:
+            cache.set_many(missing_urls, lifetime)
+            urls.update((keys[key], url) for key, url in missing_urls.items())
+
+        return urls
+
+    def _get_key(self, storage: Storage, name: str) -> str:
+        container = getattr(storage, 'azure_container', None) or type(storage).__name__
+
+        return self.cache_key % (container, name)
+
+    def _get_lifetime(self, storage: Storage) -> Optional[int]:
+        lifetime = getattr(storage, 'url_cache_lifetime', None)
+        expiration_secs = getattr(storage, 'expiration_secs', None)
+
+        if lifetime and expiration_secs:
+            return max(min(lifetime, expiration_secs - self.expiration_margin), 0)
+
+        return lifetime
@@ -40,6 +40,7 @@ class SubtaskEntityService(BaseEntityService):
         validated_data['level'] = validated_data['task'].level
         validated_data['area'] = validated_data['task'].area
         validated_data['project'] = project
+        validated_data['package_activity_id'] = validated_data['task'].package_activity_id
 
         quality_issue = validated_data.get('quality_issue')
         if quality_issue and quality_issue.due_date:
@@ -133,6 +134,7 @@ class SubtaskEntityService(BaseEntityService):
     def update(self, instance: Subtask, validated_data: dict, task_update_local_id: int = None, **kwargs) -> Subtask:
         update_data = deepcopy(validated_data)
         self._set_date_of_completion(instance, update_data)
+        self._set_task_location(instance, update_data)
         result = super().update(instance, update_data)
         self._change_status_of_related_task_depending_on_count_opened_subtasks(instance, task_update_local_id)
 
@@ -160,13 +162,15 @@ class SubtaskEntityService(BaseEntityService):
             task__package_activity_task_id=activity_task_pk,
             task__location_matrix__deleted__isnull=True,
             task__location_matrix__project__id=project_pk
-        ).update(deleted=None)
+        ).update(deleted=None, updated_at=pendulum.now())
 
     def restore_from_tasks(self, tasks: list[Task]) -> None:
         task_chunks = [tasks[i:i + 500] for i in range(0, len(tasks), 500)]
 
         for task_chunk in task_chunks:
-            Subtask.deleted_objects.filter(task_id__in=[task.id for task in task_chunk]).update(deleted=None)
+            Subtask.deleted_objects.filter(
+                task_id__in=[task.id for task in task_chunk]
+            ).update(deleted=None, updated_at=pendulum.now())
 
     def _create_subtask_update(
             self,
@@ -247,6 +251,15 @@ class SubtaskEntityService(BaseEntityService):
             'new_data': new_data
         }
 
+    def _set_task_location(self, subtask: Subtask, update_data: dict) -> None:
+        task = update_data.get('task')
+        if task and task.pk != subtask.task_id:
+            update_data['building'] = task.building
+            update_data['level'] = task.level
+            update_data['area'] = task.area
+            update_data['project'] = task.location_matrix.project
+            update_data['package_activity'] = task.package_activity
+
     def _set_date_of_completion(self, subtask: Subtask, update_data: dict) -> None:
         if not subtask.is_closed and update_data.get('status') == Subtask.Status.CLOSED:
             update_data['date_of_completion'] = pendulum.now().to_datetime_string()
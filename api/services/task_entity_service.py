@@ -87,7 +87,7 @@ class TaskEntityService(BaseEntityService):
             package_activity_task_id=activity_task_pk,
             location_matrix__deleted__isnull=True,
             location_matrix__project__id=project_pk
-        ).update(deleted=None)
+        ).update(deleted=None, updated_at=pendulum.now())
 
     def _set_date_of_approval(self, task: Task, update_data: dict) -> None:
         if task.status != Task.Statuses.ACCEPTED and update_data.get('status') == Task.Statuses.ACCEPTED:
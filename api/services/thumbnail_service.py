@@ -3,12 +3,13 @@ from math import ceil
 from typing import Optional, Tuple
 
 import ffmpeg
+from PIL import Image
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from sentry_sdk import utils, push_scope, capture_exception
 from storages.base import BaseStorage
 
 from api.models import Media, MediaThumbnail
-from api.utilities.pdf_utilities import convert_pdf_page_to_image
+from api.utilities.pdf_utilities import PdfRasterizer
 from mbuild.settings import VIDEO_EXTENSIONS
 
 
@@ -30,14 +31,17 @@ class ThumbnailService:
 
         return next((stream for stream in probe['streams'] if stream['codec_type'] == 'video'), None)
 
-    def get_pdf_first_page(self, media: Media, storage: BaseStorage,
-                           dpi: Optional[Tuple] = (MediaThumbnail.PDF_THUMBNAIL_DPI_SIZES.width,
-                                                   MediaThumbnail.PDF_THUMBNAIL_DPI_SIZES.height)
-                           ) -> Optional[InMemoryUploadedFile]:
-        bytes_input = convert_pdf_page_to_image(page_number=1, pdf_data=BytesIO(storage.open(media.name).file.read()),
-                                                image_options={'dpi': dpi})
-        if bytes_input is None:
-            return None
+    def get_pdf_first_page_image(self, media: Media, storage: BaseStorage,
+                                 dpi: Optional[Tuple] = (MediaThumbnail.PDF_THUMBNAIL_DPI_SIZES.width,
+                                                         MediaThumbnail.PDF_THUMBNAIL_DPI_SIZES.height)
+                                 ) -> Optional[Image.Image]:
+        # Rasterizer lowers DPI of pages larger than the maximal resolution itself.
+        with PdfRasterizer.from_storage(storage, media.name) as rasterizer:
+            return rasterizer.render(page_number=1, dpi=dpi)
+
+    def get_image_file(self, media: Media, image: Image.Image) -> InMemoryUploadedFile:
+        bytes_input = BytesIO()
+        image.save(bytes_input, 'png', dpi=image.info.get('dpi'))
 
         return self._get_in_memory_file(media=media, bytes_input=bytes_input)
 
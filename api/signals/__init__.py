@@ -40,3 +40,17 @@ from .handover_document.package_handover_document_media import on_package_handov
 from .handover_document.package_handover import on_package_handover_delete
 from .handover_document.location_matrix import on_location_matrix_update
 from .handover_document.package_handover_document import on_package_handover_document_delete
+
+from .project_snapshot import on_location_matrix_subtree_post_save, on_location_matrix_subtree_post_update, \
+    on_location_matrix_subtree_post_bulk_save, on_location_matrix_subtree_files_changed, on_media_thumbnail_post_save, \
+    on_location_matrix_subtree_post_delete
+
+from .project_access import on_project_access_changed, on_project_access_bulk_created, \
+    on_project_users_access_changed, on_project_access_project_deleted
+
+from .search_document import on_search_document_entity_save, on_search_document_entities_bulk_save, \
+    on_search_document_entities_update, on_search_document_entity_update_save, \
+    on_search_document_entity_updates_bulk_create, on_search_document_recipients_change, \
+    on_search_document_user_save, on_search_document_recipient_save, on_search_document_package_activity_save, \
+    on_search_document_package_activity_task_save, on_search_document_location_matrix_save, \
+    on_search_document_location_matrices_bulk_update
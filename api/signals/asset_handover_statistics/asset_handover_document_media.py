@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from safedelete.signals import post_softdelete
@@ -10,7 +11,7 @@ from api.queues.asset_handover_statistics import increase_statistics_for_documen
 @receiver(signal=post_save, sender=AssetHandoverDocumentMedia)
 def on_asset_handover_document_media_post_save(sender, instance: AssetHandoverDocumentMedia, **kwargs):
     if kwargs.get('created', False) and not kwargs.get('raw', False):
-        increase_statistics_for_document_media_status(instance)
+        transaction.on_commit(lambda: increase_statistics_for_document_media_status(instance))
 
     if not kwargs.get('created', False) and not kwargs.get('raw', False) and kwargs.get('update_fields'):
         def status_in_update_fields():
@@ -23,10 +24,10 @@ def on_asset_handover_document_media_post_save(sender, instance: AssetHandoverDo
                 and instance.update_fields_original_values['status'] != instance.status
 
         if is_status_changed():
-            update_statistics_by_statuses_on_document_media_status_change(instance)
+            transaction.on_commit(lambda: update_statistics_by_statuses_on_document_media_status_change(instance))
 
 
 @receiver(signal=(post_delete, post_softdelete), sender=AssetHandoverDocumentMedia)
 def on_asset_handover_document_media_post_delete(sender, instance: AssetHandoverDocumentMedia, **kwargs):
     if not kwargs.get('raw', False):
-        decrease_statistics_for_document_media_status(instance)
+        transaction.on_commit(lambda: decrease_statistics_for_document_media_status(instance))
@@ -5,7 +5,7 @@ from api.models import Subtask, Task, TaskUpdate, SubtaskUpdate, Package, Packag
     LocationMatrix, PackageMatrixHiddenActivityTask, PackageMatrix, Project, User, ProjectUser, Recipient, Media, \
     Company, PackageMatrixCompany, QualityIssue, QualityIssueUpdate, LocationMatrixPackage, ResponseCategory
 from api.models.project_news import ProjectNews
-from api.utilities.event_utilities import create_events_for_bulk_post_save, get_project_id
+from api.utilities.event_utilities import create_events_for_bulk_post_save
 
 
 @receiver(post_save, sender=Company)
@@ -41,6 +41,5 @@ def on_entities_post_save(sender, instance, **kwargs):
 
     if not kwargs.get('raw', False) and not safedelete_save():
         kwargs['instances'] = [instance]
-        kwargs['project_id'] = get_project_id(instance)
 
         create_events_for_bulk_post_save(**kwargs)
@@ -5,7 +5,7 @@ from api.models import Task, TaskUpdate, Subtask, SubtaskUpdate, Package, Packag
     LocationMatrix, PackageMatrix, PackageMatrixHiddenActivityTask, Project, User, Recipient, \
     Media, ProjectUser, Company, PackageMatrixCompany, QualityIssue, LocationMatrixPackage
 from api.models.project_news import ProjectNews
-from api.utilities.event_utilities import create_events_for_bulk_post_save, get_project_id
+from api.utilities.event_utilities import create_events_for_bulk_post_save
 
 
 @receiver(post_undelete, sender=Company)
@@ -31,6 +31,5 @@ from api.utilities.event_utilities import create_events_for_bulk_post_save, get_
 def on_entities_post_undelete(sender, instance, **kwargs):
     if not kwargs.get('raw', False):
         kwargs['instances'] = [instance]
-        kwargs['project_id'] = get_project_id(instance)
 
         create_events_for_bulk_post_save(**kwargs)
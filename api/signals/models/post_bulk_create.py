@@ -1,7 +1,7 @@
 from django.dispatch import receiver
 
 from api.signals.models import post_bulk_create
-from api.utilities.event_utilities import create_events_for_bulk_post_save, get_project_id
+from api.utilities.event_utilities import create_events_for_bulk_post_save
 
 
 @receiver(post_bulk_create)
@@ -12,6 +12,4 @@ def on_post_bulk_create(sender, **kwargs):
     if len(instances) == 0 or not sender.create_events_on_update:
         return
 
-    kwargs['project_id'] = get_project_id(instances[0])
-
     create_events_for_bulk_post_save(**kwargs)
@@ -1,3 +1,4 @@
+import pendulum
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -9,4 +10,4 @@ def package_activity_post_save(sender, instance, **kwargs):
     if not kwargs.get('created', False) and not kwargs.get('raw', False):
         location_matrix_packages = LocationMatrixPackage.objects.filter(package_matrix__package_activity=instance.pk)
 
-        location_matrix_packages.update(package_activity_name=instance.name)
+        location_matrix_packages.update(package_activity_name=instance.name, updated_at=pendulum.now())
@@ -0,0 +1,2 @@
+from .project_access import on_project_access_changed, on_project_access_bulk_created, \
+    on_project_users_access_changed, on_project_access_project_deleted
@@ -0,0 +1,49 @@
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from safedelete.signals import post_softdelete, post_undelete
+
+from api.models import EditMode, Project, ProjectUser
+from api.services.project_access_service import ProjectAccessService
+from api.signals.models.signal import post_bulk_create
+
+
+def invalidate_project_access_on_commit(user_ids: Iterable[int]) -> None:
+    # Access cached by a concurrent request before the commit would be the old one.
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: ProjectAccessService.invalidate(user_ids))
+
+
+@receiver(post_save, sender=EditMode)
+@receiver(post_save, sender=ProjectUser)
+@receiver(post_delete, sender=EditMode)
+@receiver(post_delete, sender=ProjectUser)
+def on_project_access_changed(sender, instance, **kwargs):
+    invalidate_project_access_on_commit([instance.user_id])
+
+
+@receiver(post_bulk_create, sender=EditMode)
+@receiver(post_bulk_create, sender=ProjectUser)
+def on_project_access_bulk_created(sender, **kwargs):
+    invalidate_project_access_on_commit([instance.user_id for instance in kwargs.get('instances') or []])
+
+
+@receiver(m2m_changed, sender=Project.users.through)
+def on_project_users_access_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        invalidate_project_access_on_commit([instance.pk])
+    elif action == 'pre_clear':
+        invalidate_project_access_on_commit(instance.users.values_list('pk', flat=True))
+    else:
+        invalidate_project_access_on_commit(pk_set or [])
+
+
+@receiver(post_softdelete, sender=Project)
+@receiver(post_undelete, sender=Project)
+def on_project_access_project_deleted(sender, instance, **kwargs):
+    invalidate_project_access_on_commit(ProjectUser.objects.filter(project=instance).values_list('user_id', flat=True))
@@ -0,0 +1,3 @@
+from .location_matrix_fragment import on_location_matrix_subtree_post_save, on_location_matrix_subtree_post_update, \
+    on_location_matrix_subtree_post_bulk_save, on_location_matrix_subtree_files_changed, on_media_thumbnail_post_save
+from .tombstone import on_location_matrix_subtree_post_delete
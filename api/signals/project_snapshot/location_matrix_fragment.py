@@ -0,0 +1,104 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from safedelete.signals import post_softdelete, post_undelete
+
+from api.models import LocationMatrix, LocationMatrixPackage, Task, TaskUpdate, Subtask, SubtaskUpdate, QualityIssue, \
+    QualityIssueUpdate, MediaThumbnail
+from api.services.location_matrix_snapshot_fragment_service import LocationMatrixSnapshotFragmentService
+from api.signals.models.signal import post_update, post_bulk_create, post_bulk_update
+
+
+@receiver(post_save, sender=LocationMatrix)
+@receiver(post_save, sender=LocationMatrixPackage)
+@receiver(post_save, sender=QualityIssue)
+@receiver(post_save, sender=QualityIssueUpdate)
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=SubtaskUpdate)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=TaskUpdate)
+@receiver(post_delete, sender=LocationMatrix)
+@receiver(post_delete, sender=LocationMatrixPackage)
+@receiver(post_delete, sender=QualityIssue)
+@receiver(post_delete, sender=QualityIssueUpdate)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=SubtaskUpdate)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TaskUpdate)
+@receiver(post_softdelete, sender=LocationMatrix)
+@receiver(post_softdelete, sender=LocationMatrixPackage)
+@receiver(post_softdelete, sender=QualityIssue)
+@receiver(post_softdelete, sender=QualityIssueUpdate)
+@receiver(post_softdelete, sender=Subtask)
+@receiver(post_softdelete, sender=SubtaskUpdate)
+@receiver(post_softdelete, sender=Task)
+@receiver(post_softdelete, sender=TaskUpdate)
+@receiver(post_undelete, sender=LocationMatrix)
+@receiver(post_undelete, sender=LocationMatrixPackage)
+@receiver(post_undelete, sender=QualityIssue)
+@receiver(post_undelete, sender=QualityIssueUpdate)
+@receiver(post_undelete, sender=Subtask)
+@receiver(post_undelete, sender=SubtaskUpdate)
+@receiver(post_undelete, sender=Task)
+@receiver(post_undelete, sender=TaskUpdate)
+def on_location_matrix_subtree_post_save(sender, instance, **kwargs):
+    if not kwargs.get('raw', False):
+        LocationMatrixSnapshotFragmentService().invalidate_for_instances(sender, [instance])
+
+
+@receiver(post_update, sender=LocationMatrix)
+@receiver(post_update, sender=LocationMatrixPackage)
+@receiver(post_update, sender=QualityIssue)
+@receiver(post_update, sender=QualityIssueUpdate)
+@receiver(post_update, sender=Subtask)
+@receiver(post_update, sender=SubtaskUpdate)
+@receiver(post_update, sender=Task)
+@receiver(post_update, sender=TaskUpdate)
+def on_location_matrix_subtree_post_update(sender, **kwargs):
+    if kwargs.get('instances'):
+        LocationMatrixSnapshotFragmentService().invalidate_for_ids(sender, kwargs['instances'])
+
+
+@receiver(post_bulk_create, sender=LocationMatrix)
+@receiver(post_bulk_create, sender=LocationMatrixPackage)
+@receiver(post_bulk_create, sender=QualityIssue)
+@receiver(post_bulk_create, sender=QualityIssueUpdate)
+@receiver(post_bulk_create, sender=Subtask)
+@receiver(post_bulk_create, sender=SubtaskUpdate)
+@receiver(post_bulk_create, sender=Task)
+@receiver(post_bulk_create, sender=TaskUpdate)
+@receiver(post_bulk_update, sender=LocationMatrix)
+@receiver(post_bulk_update, sender=LocationMatrixPackage)
+@receiver(post_bulk_update, sender=QualityIssue)
+@receiver(post_bulk_update, sender=QualityIssueUpdate)
+@receiver(post_bulk_update, sender=Subtask)
+@receiver(post_bulk_update, sender=SubtaskUpdate)
+@receiver(post_bulk_update, sender=Task)
+@receiver(post_bulk_update, sender=TaskUpdate)
+def on_location_matrix_subtree_post_bulk_save(sender, **kwargs):
+    if kwargs.get('instances'):
+        instances_ids = [instance.pk for instance in kwargs['instances']]
+        LocationMatrixSnapshotFragmentService().invalidate_for_ids(sender, instances_ids)
+
+
+@receiver(m2m_changed, sender=LocationMatrixPackage.media.through)
+@receiver(m2m_changed, sender=TaskUpdate.files.through)
+@receiver(m2m_changed, sender=Subtask.files.through)
+@receiver(m2m_changed, sender=SubtaskUpdate.files.through)
+@receiver(m2m_changed, sender=QualityIssue.attachments.through)
+@receiver(m2m_changed, sender=QualityIssueUpdate.files.through)
+def on_location_matrix_subtree_files_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    fragment_service = LocationMatrixSnapshotFragmentService()
+    if reverse:
+        fragment_service.invalidate_for_ids(model, pk_set or [])
+    else:
+        fragment_service.invalidate_for_instances(type(instance), [instance])
+
+
+@receiver(post_save, sender=MediaThumbnail)
+def on_media_thumbnail_post_save(sender, instance, **kwargs):
+    # Thumbnails are created in background after media is attached to entities.
+    if not kwargs.get('raw', False):
+        LocationMatrixSnapshotFragmentService().invalidate_for_media([instance.original_media_id])
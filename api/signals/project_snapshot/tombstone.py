@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from api.models import LocationMatrix, LocationMatrixPackage, Task, TaskUpdate, Subtask, SubtaskUpdate, QualityIssue, \
+    QualityIssueUpdate
+from api.services.project_snapshot_service import ProjectSnapshotService
+
+
+@receiver(post_delete, sender=LocationMatrix)
+@receiver(post_delete, sender=LocationMatrixPackage)
+@receiver(post_delete, sender=QualityIssue)
+@receiver(post_delete, sender=QualityIssueUpdate)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=SubtaskUpdate)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TaskUpdate)
+def on_location_matrix_subtree_post_delete(sender, instance, **kwargs):
+    # Hard deleted entities leave no rows, so delta snapshots find them by tombstones.
+    # Tombstones are recorded once the transaction is committed.
+    if not kwargs.get('raw', False):
+        ProjectSnapshotService().add_tombstone(sender, instance)
@@ -0,0 +1,6 @@
+from .search_document import on_search_document_entity_save, on_search_document_entities_bulk_save, \
+    on_search_document_entities_update, on_search_document_entity_update_save, \
+    on_search_document_entity_updates_bulk_create, on_search_document_recipients_change, \
+    on_search_document_user_save, on_search_document_recipient_save, on_search_document_package_activity_save, \
+    on_search_document_package_activity_task_save, on_search_document_location_matrix_save, \
+    on_search_document_location_matrices_bulk_update
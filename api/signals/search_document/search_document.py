@@ -0,0 +1,143 @@
+from django.db import transaction
+from django.db.models.signals import post_save, m2m_changed
+from django.dispatch import receiver
+
+from api.models import LocationMatrix, PackageActivity, PackageActivityTask, QualityIssue, QualityIssueUpdate, \
+    Recipient, Subtask, SubtaskUpdate, Task, TaskUpdate, User
+from api.queues.search_document import refresh_search_documents
+from api.services.search_document_service import SearchDocumentService
+from api.signals.models.signal import post_update, post_bulk_create, post_bulk_update
+
+updates_entities = {
+    TaskUpdate: (Task, 'task_id'),
+    SubtaskUpdate: (Subtask, 'subtask_id'),
+    QualityIssueUpdate: (QualityIssue, 'quality_issue_id'),
+}
+
+
+def refresh_search_documents_on_commit(filters: dict[str, dict]) -> None:
+    # Queue task must see the change, including values copied by raw queries later in the transaction.
+    transaction.on_commit(lambda: refresh_search_documents(filters))
+
+
+def is_search_data_changed(created: bool, raw: bool, update_fields, search_fields: set) -> bool:
+    # Entity has no tasks, subtasks or quality issues yet, unless it is loaded from fixtures.
+    if created and not raw:
+        return False
+
+    return not update_fields or bool(search_fields & set(update_fields))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=QualityIssue)
+def on_search_document_entity_save(sender, instance, created, update_fields=None, **kwargs):
+    service = SearchDocumentService()
+    if created or not update_fields or service.get_entity_fields(sender) & set(update_fields):
+        service.refresh(sender, [instance.pk])
+
+
+@receiver(post_bulk_create, sender=Task)
+@receiver(post_bulk_create, sender=Subtask)
+@receiver(post_bulk_create, sender=QualityIssue)
+@receiver(post_bulk_update, sender=Task)
+@receiver(post_bulk_update, sender=Subtask)
+@receiver(post_bulk_update, sender=QualityIssue)
+def on_search_document_entities_bulk_save(sender, **kwargs):
+    SearchDocumentService().refresh(sender, [instance.pk for instance in kwargs.get('instances') or [] if instance.pk])
+
+
+@receiver(post_update, sender=Task)
+@receiver(post_update, sender=Subtask)
+@receiver(post_update, sender=QualityIssue)
+def on_search_document_entities_update(sender, **kwargs):
+    SearchDocumentService().refresh(sender, kwargs.get('instances') or [])
+
+
+@receiver(post_save, sender=TaskUpdate)
+@receiver(post_save, sender=SubtaskUpdate)
+@receiver(post_save, sender=QualityIssueUpdate)
+def on_search_document_entity_update_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    model, field = updates_entities[sender]
+    relation = field.removesuffix('_id')
+    # Recipients are added to a new update later, so only moving it to another entity changes documents.
+    if is_search_data_changed(created, raw, update_fields, {relation}):
+        previous_entity = getattr(instance, 'update_fields_original_values', {}).get(relation)
+        ids = [getattr(instance, field)] + ([previous_entity.pk] if previous_entity else [])
+        SearchDocumentService().refresh(model, ids)
+
+
+@receiver(post_bulk_create, sender=TaskUpdate)
+@receiver(post_bulk_create, sender=SubtaskUpdate)
+@receiver(post_bulk_create, sender=QualityIssueUpdate)
+def on_search_document_entity_updates_bulk_create(sender, **kwargs):
+    model, field = updates_entities[sender]
+    SearchDocumentService().refresh(model, [getattr(instance, field) for instance in kwargs.get('instances') or []])
+
+
+@receiver(m2m_changed, sender=TaskUpdate.recipients.through)
+@receiver(m2m_changed, sender=SubtaskUpdate.recipients.through)
+@receiver(m2m_changed, sender=QualityIssueUpdate.recipients.through)
+def on_search_document_recipients_change(sender, instance, action, reverse, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        model, field = updates_entities[type(instance)]
+        SearchDocumentService().refresh(model, [getattr(instance, field)])
+
+
+@receiver(post_save, sender=User)
+def on_search_document_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if is_search_data_changed(created, raw, update_fields, {'first_name', 'last_name', 'email'}):
+        refresh_search_documents_on_commit({
+            'Task': {'user': instance.pk},
+            'Subtask': {'user': instance.pk},
+            'QualityIssue': {'user': instance.pk},
+        })
+
+
+@receiver(post_save, sender=Recipient)
+def on_search_document_recipient_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if is_search_data_changed(created, raw, update_fields, {'first_name', 'last_name', 'email'}):
+        refresh_search_documents_on_commit({
+            'Task': {'taskupdate__recipients': instance.pk},
+            'Subtask': {'subtaskupdate__recipients': instance.pk},
+            'QualityIssue': {'qualityissueupdate__recipients': instance.pk},
+        })
+
+
+@receiver(post_save, sender=PackageActivity)
+def on_search_document_package_activity_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if is_search_data_changed(created, raw, update_fields, {'name'}):
+        refresh_search_documents_on_commit({
+            'Task': {'package_activity': instance.pk},
+            'Subtask': {'task__package_activity': instance.pk},
+        })
+
+
+@receiver(post_save, sender=PackageActivityTask)
+def on_search_document_package_activity_task_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if is_search_data_changed(created, raw, update_fields, {'description'}):
+        refresh_search_documents_on_commit({
+            'Task': {'package_activity_task': instance.pk},
+            'Subtask': {'task__package_activity_task': instance.pk},
+        })
+
+
+@receiver(post_save, sender=LocationMatrix)
+def on_search_document_location_matrix_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if is_search_data_changed(created, raw, update_fields, {'building', 'level', 'area'}):
+        refresh_search_documents_on_commit({
+            'Task': {'location_matrix': instance.pk},
+            'Subtask': {'task__location_matrix': instance.pk},
+            'QualityIssue': {'location_matrix': instance.pk},
+        })
+
+
+@receiver(post_bulk_update, sender=LocationMatrix)
+def on_search_document_location_matrices_bulk_update(sender, **kwargs):
+    location_matrices = [instance.pk for instance in kwargs.get('instances') or []]
+    if location_matrices and {'building', 'level', 'area'} & set(kwargs.get('update_fields') or []):
+        refresh_search_documents_on_commit({
+            'Task': {'location_matrix__in': location_matrices},
+            'Subtask': {'task__location_matrix__in': location_matrices},
+            'QualityIssue': {'location_matrix__in': location_matrices},
+        })
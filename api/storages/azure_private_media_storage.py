@@ -7,3 +7,4 @@ class AzurePrivateMediaStorage(AzureStorage):
     account_key = settings.AZURE_ACCOUNT_KEY
     azure_container = settings.AZURE_PRIVATE_MEDIA_CONTAINER
     expiration_secs = 3600
+    url_cache_lifetime = settings.PRIVATE_MEDIA_URL_CACHE_LIFETIME
@@ -7,3 +7,4 @@ class AzurePrivateProjectSnapshotStorage(AzureStorage):
     account_key = settings.AZURE_ACCOUNT_KEY
     azure_container = settings.AZURE_PRIVATE_PROJECT_SNAPSHOT_CONTAINER
     expiration_secs = 3600
+    url_cache_lifetime = settings.PRIVATE_PROJECT_SNAPSHOT_URL_CACHE_LIFETIME
@@ -11,3 +11,4 @@ class AzurePrivateReportStorage(AzureStorage):
     account_key = settings.AZURE_ACCOUNT_KEY
     azure_container = settings.AZURE_PRIVATE_REPORT_CONTAINER
     expiration_secs = 3600
+    url_cache_lifetime = settings.PRIVATE_REPORT_URL_CACHE_LIFETIME
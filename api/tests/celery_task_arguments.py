@@ -0,0 +1,129 @@
+import pickle
+from unittest import mock
+
+import pendulum
+from celery.exceptions import Retry
+from django.utils.datastructures import MultiValueDict
+from kombu.exceptions import EncodeError
+from kombu.serialization import dumps, loads, prepare_accept_content
+from safedelete import HARD_DELETE
+
+from api.enums.summary_type import SummaryType
+from api.models import Media, Task, User
+from api.tests.test import TestCase
+from api.queues.celery.media import create_thumbnails
+from api.utilities.celery_utilities import TASK_ARGUMENTS_SERIALIZER, MissingModelInstance, send_as_snapshot
+from api.utilities.helpers import Request
+from mbuild.settings import app as celery_app
+
+
+class CeleryTaskArgumentsTest(TestCase):
+    fixtures = ['api/tests/fixtures/dumps/tasks.json']
+
+    def dumps(self, body):
+        return dumps(body, serializer=celery_app.conf.task_serializer)
+
+    def loads(self, content_type, content_encoding, data):
+        return loads(data, content_type, content_encoding, accept=prepare_accept_content(celery_app.conf.accept_content))
+
+    def test_send_model_instances_as_references(self):
+        tasks = list(Task.objects.prefetch_related('taskupdate_set').filter(pk__in=[2, 3]).order_by('pk'))
+        user = User.objects.get(pk=1)
+        body = ((tasks, user, Task, SummaryType.daily),
+                {'counters': {'tasks': 2}, 'since': pendulum.datetime(2020, 9, 29)}, {})
+
+        content_type, content_encoding, data = self.dumps(body)
+
+        self.assertNotIn('taskupdate', data)
+        Task.objects.filter(pk=2).update(status=Task.Statuses.ACCEPTED)
+
+        with self.assertNumQueries(2):
+            (decoded_tasks, decoded_user, model, summary_type), kwargs, embed = self.loads(content_type,
+                                                                                             content_encoding, data)
+
+        self.assertEqual([task.pk for task in decoded_tasks], [2, 3])
+        self.assertEqual(decoded_tasks[0].status, Task.Statuses.ACCEPTED)
+        self.assertEqual(decoded_user, user)
+        self.assertIs(model, Task)
+        self.assertIs(summary_type, SummaryType.daily)
+        self.assertEqual(kwargs, {'counters': {'tasks': 2}, 'since': pendulum.datetime(2020, 9, 29)})
+        self.assertEqual(embed, {})
+
+    def test_send_model_instance_as_snapshot(self):
+        user = User.objects.get(pk=1)
+        user.update_fields_original_values = {'first_name': user.first_name}
+        user.first_name = 'Brad'
+        content_type, content_encoding, data = self.dumps(((send_as_snapshot(user),), {}, {}))
+        User.objects.filter(pk=1).update(first_name='Jerry')
+
+        with self.assertNumQueries(0):
+            (decoded_user,), _, _ = self.loads(content_type, content_encoding, data)
+
+        self.assertEqual(decoded_user, user)
+        self.assertEqual(decoded_user.first_name, 'Brad')
+        self.assertEqual(decoded_user.update_fields_original_values, user.update_fields_original_values)
+
+    def test_restore_deleted_model_instance_from_snapshot(self):
+        media = Media.objects.get(pk=1)
+        content_type, content_encoding, data = self.dumps(((send_as_snapshot(media),), {}, {}))
+        Media.all_objects.filter(pk=1).delete(force_policy=HARD_DELETE)
+        self.assertHardDeleted(Media, {'pk': 1})
+
+        (decoded_media,), _, _ = self.loads(content_type, content_encoding, data)
+
+        self.assertEqual(decoded_media.pk, 1)
+        self.assertEqual(decoded_media.name, media.name)
+        self.assertEqual(decoded_media.link, media.link)
+        self.assertFalse(decoded_media._state.adding)
+
+    def test_load_missing_model_instance(self):
+        content_type, content_encoding, data = self.dumps(((Media.objects.get(pk=1),), {}, {}))
+        Media.all_objects.filter(pk=1).delete(force_policy=HARD_DELETE)
+
+        (decoded_media,), _, _ = self.loads(content_type, content_encoding, data)
+
+        self.assertIsInstance(decoded_media, MissingModelInstance)
+        self.assertIs(decoded_media.model, Media)
+        self.assertEqual(decoded_media.pk, 1)
+        # Retried task is sent with the same reference.
+        self.assertEqual(data, self.dumps(((decoded_media,), {}, {}))[2])
+
+    def test_retry_task_with_missing_model_instance(self):
+        missing_media = MissingModelInstance('api', 'media', 1)
+
+        create_thumbnails.push_request(called_directly=False, retries=0)
+        try:
+            with mock.patch.object(create_thumbnails, 'retry', side_effect=Retry) as retry:
+                with self.assertRaises(Retry):
+                    create_thumbnails(missing_media)
+
+            retry.assert_called_once()
+        finally:
+            create_thumbnails.pop_request()
+
+        with self.assertRaises(Media.DoesNotExist):
+            create_thumbnails(missing_media)
+
+    def test_send_request(self):
+        user = User.objects.get(pk=1)
+        request = Request(user, MultiValueDict({'status': ['accepted', 'declined'], 'sort': ['pk']}))
+
+        (decoded_request,), _, _ = self.loads(*self.dumps(((request,), {}, {})))
+
+        self.assertIsInstance(decoded_request, Request)
+        self.assertEqual(decoded_request.user, user)
+        self.assertEqual(decoded_request.query_params.getlist('status'), ['accepted', 'declined'])
+        self.assertEqual(decoded_request.query_params.get('sort'), 'pk')
+
+    def test_forbid_to_send_unsupported_values(self):
+        with self.assertRaises(EncodeError):
+            self.dumps(((Task.objects.all(),), {}, {}))
+
+    def test_load_pickled_message(self):
+        user = User.objects.get(pk=1)
+        data = pickle.dumps(((user,), {}, {}))
+
+        (decoded_user,), _, _ = self.loads('application/x-python-serialize', 'binary', data)
+
+        self.assertEqual(decoded_user, user)
+        self.assertEqual(celery_app.conf.task_serializer, TASK_ARGUMENTS_SERIALIZER)
@@ -1,5 +1,6 @@
 from django.core.management import call_command
 
+from api.commands import process_commands_batch
 from api.enums.entities import Entities
 from api.models import Command, Subtask, SubtaskUpdate, Task, Event, TaskUpdate, QualityIssueUpdate, QualityIssue
 from api.tests.test import TransactionTestCase
@@ -70,6 +71,18 @@ class CommandTest(TransactionTestCase):
         ).count() == 1)
         self.assertDatabaseHas(Subtask, {'local_id': 'BUIF737382323'})
 
+    def test_create_with_invalid_command_by_superuser(self):
+        data = self.load_request_fixture('/commands/create_commands.json')
+        data['commands'][-1]['entity'] = 'unknown'
+        commands_count = Command.objects.count()
+        superuser = self._get_superuser()
+
+        self.force_login_user(superuser.pk)
+        response = self.client.post('/api/projects/1/commands/', data)
+
+        self.assertBadRequest(response)
+        self.assertEqual(commands_count, Command.objects.count())
+
     def test_unauthorized_create(self):
         data = self.load_request_fixture('/commands/create_commands.json')
         response = self.client.post('/api/projects/1/commands/', data)
@@ -144,6 +157,21 @@ class CommandTest(TransactionTestCase):
 
         self.assertEventsExist('/command/process_commands_events_assertion.json')
 
+    def test_process_commands_batch_with_missing_user(self):
+        commands = list(Command.objects(status=Command.Statuses.PENDING.value).order_by('created_at', 'id'))
+        failed_command = next(command for command in commands
+                              if command.data.get('description') == 'successfully updated subtask')
+        failed_command.user = 0
+
+        process_commands_batch(commands)
+
+        self.assertTrue(Command.objects(pk=failed_command.pk, status=Command.Statuses.FAILED.value,
+                                        fail_reason=Command.FailReason.INTERNAL_ERROR.value))
+        self.assertDatabaseMissing(Subtask, {'pk': 1, 'description': 'successfully updated subtask'})
+        self.assertTrue(Command.objects(data__description='successfully deleted subtask',
+                                        status=Command.Statuses.PROCESSED.value))
+        self.assertDatabaseMissing(Subtask, 2)
+
     def __remove_id_from_response_data(self, response):
         for key, r in enumerate(response.data):
             del response.data[key]['id']
@@ -0,0 +1,44 @@
+from io import StringIO
+import json
+
+from django.core.management import call_command, CommandError
+from django.test import override_settings
+
+from api.models import Command, QualityIssue, QualityIssueUpdate, Subtask, SubtaskUpdate
+from api.tests.test import TransactionTestCase
+
+
+class CommandBenchmarkTest(TransactionTestCase):
+    mongo_fixtures = ['api/tests/fixtures/dumps/mongo/command.json']
+    fixtures = ['api/tests/fixtures/dumps/command.json']
+
+    def test_benchmark_commands(self):
+        output = StringIO()
+        call_command('benchmark_commands', 5, 1, '--chains=2', '--company=2', '--json', stdout=output)
+        report = json.loads(output.getvalue())
+
+        self.assertEqual(10, report['commands'])
+        self.assertGreater(report['events'], 0)
+        self.assertEqual(
+            {'subtask:create_entity', 'subtask_update:create_entity',
+             'quality_issue:create_entity', 'quality_issue_update:create_entity'},
+            set(report['entities'])
+        )
+        self.assertEqual(4, report['entities']['subtask_update:create_entity']['count'])
+        self.assertEqual({'processed': 4}, report['entities']['subtask_update:create_entity']['statuses'])
+        for statistic in report['entities'].values():
+            self.assertLessEqual(statistic['p50_ms'], statistic['p99_ms'])
+            self.assertGreater(statistic['queries_per_command'], 0)
+
+        self.assertEqual(10, Command.objects(data__local_id__startswith='benchmark-').count())
+        self.assertEqual(2, Subtask.objects.filter(local_id__startswith='benchmark-').count())
+        self.assertEqual(4, SubtaskUpdate.objects.filter(local_id__startswith='benchmark-').count())
+        self.assertEqual(2, QualityIssue.objects.filter(local_id__startswith='benchmark-').count())
+        self.assertEqual(2, QualityIssueUpdate.objects.filter(local_id__startswith='benchmark-').count())
+
+    @override_settings(ENV='production')
+    def test_forbid_benchmark_in_production(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_commands', 5, 1, '--chains=2', '--company=2', '--json', stdout=StringIO())
+
+        self.assertEqual(0, Subtask.objects.filter(local_id__startswith='benchmark-').count())
@@ -32,7 +32,8 @@ class CompaniesTest(TestCase):
         new_company = self.load_request_fixture('/companies/create_company.json')
 
         self.force_login_user(self.superuser.pk)
-        response = self.client.post('/api/companies/', new_company)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/companies/', new_company)
 
         self.assertCreated(response)
         self.assertDatabaseHas(Company, new_company)
@@ -51,7 +52,8 @@ class CompaniesTest(TestCase):
         update_company = self.load_request_fixture('/companies/update_company.json')
 
         self.force_login_user(self.superuser.pk)
-        response = self.client.put('/api/companies/2/', update_company)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/companies/2/', update_company)
 
         self.assertOk(response)
         self.assertDatabaseHas(Company, {'pk': 2, **update_company})
@@ -75,7 +77,8 @@ class CompaniesTest(TestCase):
 
     def test_delete(self):
         self.force_login_user(self.superuser.pk)
-        response = self.client.delete('/api/companies/6/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/companies/6/')
 
         self.assertNoContent(response)
         self.assertDatabaseMissing(Company, 6)
@@ -1,6 +1,10 @@
+import pendulum
+from django.core.management import call_command
 from django.db.models import Q
+from rest_framework.test import APIRequestFactory
 
-from api.models import EditMode, User
+from api.models import EditMode, Project, User
+from api.services.project_access_service import ProjectAccessService
 from api.tests.test import TestCase, data_provider
 
 
@@ -100,3 +104,58 @@ class EditModeTest(TestCase):
         })
 
         self.assertUnauthorized(response)
+
+
+class ProjectAccessServiceTest(TestCase):
+    fixtures = ['api/tests/fixtures/dumps/edit_mode.json']
+
+    def test_resolve_access_once_per_request(self):
+        request = APIRequestFactory().get('/api/projects/2/edit-mode/')
+        request.user = User.objects.get(pk=3)
+
+        with self.assertNumQueries(2):
+            access = ProjectAccessService.for_request(request)
+            self.assertTrue(access.is_project_user([2]))
+            self.assertTrue(access.is_project_user(['4', 1]))
+            self.assertFalse(access.is_project_user([1, 'project']))
+            self.assertTrue(access.is_in_edit_mode(2))
+            self.assertFalse(access.is_in_edit_mode(4))
+            self.assertIs(ProjectAccessService.for_request(request), access)
+
+        # Next request of the user reads access from the cache.
+        with self.assertNumQueries(0):
+            self.assertTrue(ProjectAccessService(request.user).is_project_user([2]))
+
+    def test_invalidate_access_on_project_users_and_edit_mode_change(self):
+        user = User.objects.get(pk=3)
+        self.assertFalse(ProjectAccessService(user).is_project_user([1]))
+        self.assertFalse(ProjectAccessService(user).is_in_edit_mode(6))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.get(pk=1).users.add(user)
+            EditMode.objects.create(project_id=6, user=user)
+
+            # Access is invalidated only when the change is committed.
+            self.assertFalse(ProjectAccessService(user).is_project_user([1]))
+
+        with self.assertNumQueries(2):
+            access = ProjectAccessService(user)
+            self.assertTrue(access.is_project_user([1]))
+            self.assertTrue(access.is_in_edit_mode(6))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.get(pk=1).users.remove(user)
+            EditMode.objects.filter(project_id=6, user=user).delete()
+
+        access = ProjectAccessService(user)
+        self.assertFalse(access.is_project_user([1]))
+        self.assertFalse(access.is_in_edit_mode(6))
+
+    def test_invalidate_access_on_expired_edit_mode_removal(self):
+        user = User.objects.get(pk=3)
+        self.assertTrue(ProjectAccessService(user).is_in_edit_mode(2))
+
+        EditMode.objects.filter(user=user).update(updated_at=pendulum.now().subtract(days=1))
+        call_command('remove_expired_edit_mode')
+
+        self.assertFalse(ProjectAccessService(user).is_in_edit_mode(2))
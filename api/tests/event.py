@@ -1,11 +1,24 @@
+from unittest import mock
+
+import pendulum
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
 from django.db.models import Q
+from django.test import override_settings
+from kombu.serialization import dumps, loads, prepare_accept_content
 
-from api.tests.test import TestCase
+from api.enums.entities import Entities
+from api.models import Company, Event, EventCompaction
+from api.services.event_compaction_service import EventCompactionService
+from api.tests.test import TestCase, TransactionTestCase
+from api.utilities.event_utilities import create_events, create_events_from_batches, get_event_outbox
+from mbuild.settings import app as celery_app
 
 
 class EventTest(TestCase):
     mongo_fixtures = ['api/tests/fixtures/dumps/mongo/event.json']
     fixtures = ['api/tests/fixtures/dumps/event.json']
+    fss = FileSystemStorage()
 
     def test_staff_list(self):
         project_staff = self._get_staff(project=1)
@@ -22,6 +35,79 @@ class EventTest(TestCase):
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/event/staff_get_processed_from.json')
 
+    def test_staff_list_with_cursor_pagination(self):
+        project_staff = self._get_staff(project=1)
+        self.force_login_user(project_staff.pk)
+        expected_response = self.client.get('/api/projects/1/events/', {'processed_from': '2020-02-02'})
+
+        events = []
+        query_params = {'processed_from': '2020-02-02', 'use_cursor_pagination': True, 'per_page': 1}
+        while True:
+            response = self.client.get('/api/projects/1/events/', query_params)
+
+            self.assertOk(response)
+            events.extend(response.data['items'])
+
+            if response.data['next_cursor'] is None:
+                break
+
+            query_params['after'] = response.data['next_cursor']
+
+        self.assertCountEqual([event['id'] for event in events], [event['id'] for event in expected_response.data])
+
+    def test_list_with_invalid_cursor(self):
+        project_staff = self._get_staff(project=1)
+        self.force_login_user(project_staff.pk)
+        response = self.client.get('/api/projects/1/events/', {'use_cursor_pagination': True, 'after': 'invalid'})
+
+        self.assertBadRequest(response)
+
+    def test_list_after_events_compaction(self):
+        EventCompaction.objects.create(project_id=1, compacted_before=pendulum.datetime(2020, 2, 4),
+                                       events_count=1, created_at=pendulum.now())
+        project_staff = self._get_staff(project=1)
+        self.force_login_user(project_staff.pk)
+
+        response = self.client.get('/api/projects/1/events/', {'processed_from': '2020-02-02'})
+        self.assertEquals(response.status_code, 410)
+
+        response = self.client.get('/api/projects/1/events/', {'processed_from': '2020-02-04'})
+        self.assertOk(response)
+
+    def test_list_by_cursor_after_events_compaction(self):
+        project_staff = self._get_staff(project=1)
+        self.force_login_user(project_staff.pk)
+        response = self.client.get('/api/projects/1/events/', {'processed_from': '2020-02-02',
+                                                               'use_cursor_pagination': True, 'per_page': 1})
+        self.assertOk(response)
+
+        EventCompaction.objects.create(project_id=1, compacted_before=pendulum.datetime(2020, 2, 10),
+                                       events_count=1, created_at=pendulum.now())
+
+        response = self.client.get('/api/projects/1/events/', {'use_cursor_pagination': True, 'per_page': 1,
+                                                               'after': response.data['next_cursor']})
+        self.assertEquals(response.status_code, 410)
+
+    def test_list_with_non_date_processed_from(self):
+        project_staff = self._get_staff(project=1)
+        self.force_login_user(project_staff.pk)
+
+        response = self.client.get('/api/projects/1/events/', {'processed_from': 'P1D'})
+        self.assertBadRequest(response)
+
+        response = self.client.get('/api/projects/1/events/', {'processed_from': 'invalid'})
+        self.assertBadRequest(response)
+
+    @mock.patch('api.storages.AzurePrivateMediaStorage.save', fss.save)
+    def test_compact_events(self):
+        compaction = EventCompactionService().compact(1, pendulum.datetime(2020, 2, 10))
+
+        self.assertEqual(compaction.events_count, 1)
+        self.assertTrue(self.fss.exists(compaction.archive))
+        self.assertEqual(Event.objects(project_id=1, data__id=5).count(), 1)
+        self.assertEqual(Event.objects(project_id=1, data__id=5).get().created_at, pendulum.datetime(2020, 2, 5).naive())
+        self.assertEqual(Event.objects(project_id=2).count(), 2)
+
     def test_create_by_staff(self):
         data = self.load_request_fixture('/events/create_events.json')
         project_staff = self._get_staff(project=1)
@@ -72,3 +158,65 @@ class EventTest(TestCase):
     def __remove_id_from_response_data(self, response):
         for key, r in enumerate(response.data):
             del response.data[key]['id']
+
+
+class EventOutboxTest(TransactionTestCase):
+    def test_insert_events_on_commit(self):
+        with transaction.atomic():
+            create_events([{'id': 1}, {'id': 2}], Event.Types.ENTITY_CREATED, Entities.TASK.value, 1)
+            create_events([{'id': 1}], Event.Types.ENTITY_UPDATED, Entities.TASK.value, 1)
+
+            self.assertEqual(Event.objects.count(), 0)
+
+        self.assertEqual(Event.objects.count(), 3)
+
+    def test_stamp_events_on_commit(self):
+        with transaction.atomic():
+            pendulum.set_test_now(pendulum.datetime(2020, 1, 1, 10, 00))
+            create_events([{'id': 1}], Event.Types.ENTITY_CREATED, Entities.TASK.value, 1)
+            create_events([{'id': 2}], Event.Types.ENTITY_CREATED, Entities.TASK.value, 1)
+            pendulum.set_test_now(pendulum.datetime(2020, 1, 1, 10, 5))
+
+        self.assertEqual(Event.objects.distinct('created_at'), [pendulum.datetime(2020, 1, 1, 10, 5).naive()])
+        self.assertEqual([event.data for event in Event.objects.order_by('id')], [{'id': 1}, {'id': 2}])
+
+    def test_discard_events_on_rollback(self):
+        with transaction.atomic():
+            create_events([{'id': 1}], Event.Types.ENTITY_CREATED, Entities.TASK.value, 1)
+
+            try:
+                with transaction.atomic():
+                    create_events([{'id': 2}], Event.Types.ENTITY_CREATED, Entities.TASK.value, 1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(Event.objects.count(), 1)
+        self.assertEqual(Event.objects.get().data, {'id': 1})
+
+    @override_settings(EVENTS_ASYNC_SERIALIZATION=True)
+    def test_serialize_events_after_commit(self):
+        with transaction.atomic():
+            company = Company.objects.create(name='Initial')
+            company.name = 'Renamed'
+            company.save(update_fields=['name'])
+
+            self.assertEqual(Event.objects.count(), 0)
+
+        self.assertEqual(Event.objects.count(), 2)
+        self.assertEqual(Event.objects(data__id=company.pk).distinct('data.name'), ['Renamed'])
+
+    @override_settings(EVENTS_ASYNC_SERIALIZATION=True)
+    def test_send_batches_as_task_arguments(self):
+        with transaction.atomic():
+            company = Company.objects.create(name='Initial')
+            batches = get_event_outbox().batches
+            content_type, content_encoding, data = dumps(((batches,), {}, {}), serializer=celery_app.conf.task_serializer)
+
+        (decoded_batches,), _, _ = loads(data, content_type, content_encoding,
+                                         accept=prepare_accept_content(celery_app.conf.accept_content))
+        self.assertEqual(decoded_batches, batches)
+
+        create_events_from_batches(decoded_batches)
+
+        self.assertEqual(Event.objects(data__id=company.pk, type=Event.Types.ENTITY_CREATED.value).count(), 2)
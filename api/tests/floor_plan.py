@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.core.files.storage import FileSystemStorage
 from django.db.models import Q
 from django.urls import reverse
@@ -29,6 +31,22 @@ class FloorPlanTest(TestCase):
         self.assertDatabaseHas(FloorPlan, {'project': 5, **creation_data})
         self.assertDatabaseHas(FloorPlanImage, {'plan': creation_data['media']})
 
+    @mock.patch('api.services.floor_plan_image_entity_service.create_floor_plan_raster')
+    def test_create_raster_in_background(self, create_floor_plan_raster):
+        fixture_path = f'{self.requests_fixtures_dir}/floor_plans/test.pdf'
+        self.load_and_save_fake_pdf(path=fixture_path, name='broom.pdf')
+
+        creation_data = self.load_request_fixture('/floor_plans/create_floor_plan_from_pdf.json')
+
+        self._log_in_as_superuser()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/floor-plans/', creation_data)
+
+        self.assertCreated(response)
+        floor_plan_image = FloorPlanImage.objects.get(plan=creation_data['media'])
+        self.assertIsNone(floor_plan_image.raster)
+        create_floor_plan_raster.assert_called_once_with(floor_plan_image)
+
     def test_create_by_company_admin(self):
         creation_data = self.load_request_fixture('/floor_plans/create_floor_plan.json')
         company_admin = self._get_company_admin()
@@ -326,6 +344,28 @@ class FloorPlanTest(TestCase):
         self.assertNoContent(response)
         self.assertSoftDeleted(FloorPlan, 2)
 
+    @mock.patch('api.services.floor_plan_entity_service.delete_floor_plan_rasters')
+    def test_delete_raster(self, delete_floor_plan_rasters):
+        FloorPlanImage.objects.filter(pk=1).update(raster={'path': 'floor-plan-rasters/troom'})
+        self._log_in_as_superuser()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/5/floor-plans/1/')
+
+        self.assertNoContent(response)
+        delete_floor_plan_rasters.assert_called_once_with([FloorPlanImage.objects.get(pk=1)])
+
+    @mock.patch('api.services.floor_plan_entity_service.delete_floor_plan_rasters')
+    def test_keep_raster_of_media_used_by_another_floor_plan(self, delete_floor_plan_rasters):
+        FloorPlanImage.objects.create(plan_id=6, image_id=8, raster={'path': 'floor-plan-rasters/troom'})
+        self._log_in_as_superuser()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/5/floor-plans/6/')
+
+        self.assertNoContent(response)
+        delete_floor_plan_rasters.assert_not_called()
+
     def test_forbid_delete_by_non_project_admin(self):
         non_project_admin = self._get_admin(~Q(project=5))
         self.force_login_user(non_project_admin.pk)
@@ -1,10 +1,14 @@
+import uuid
 from unittest import mock
 
+from PIL import Image
 from django.core.files.storage import FileSystemStorage
 from rest_framework.reverse import reverse
 
-from api.models import Media
+from api.models import Media, FloorPlanImage
+from api.services.floor_plan_image_entity_service import FloorPlanImageEntityService
 from api.tests.test import TestCase
+from api.utilities.floor_plan_raster import FloorPlanRaster
 
 
 class FloorPlanAreaPinThumbnailTest(TestCase):
@@ -65,3 +69,52 @@ class FloorPlanAreaPinThumbnailTest(TestCase):
             is_public=False,
             name__startswith='temp-pin-thumb'
         ).count(), 2)
+
+    def test_use_raster_created_by_concurrent_request(self):
+        floor_plan_image = FloorPlanImage.objects.get(pk=1)
+        metadata = {'path': 'floor-plan-rasters/troom', 'mode': 'RGBA', 'levels': [[1200, 700], [600, 350]], 'tile_size': 512}
+        built_raster = mock.Mock()
+
+        def create_raster_concurrently(*args, **kwargs):
+            FloorPlanImage.objects.filter(pk=1).update(raster=metadata)
+            return built_raster
+
+        with mock.patch.object(FloorPlanImageEntityService, '_create_raster', side_effect=create_raster_concurrently):
+            raster = FloorPlanImageEntityService().get_raster(floor_plan_image)
+
+        built_raster.delete.assert_called_once()
+        self.assertEqual(metadata, raster.metadata)
+        self.assertEqual(metadata, floor_plan_image.raster)
+        self.assertDatabaseHas(FloorPlanImage, {'pk': 1, 'raster': metadata})
+
+
+class FloorPlanRasterTest(TestCase):
+    fss = FileSystemStorage()
+
+    def test_crop(self):
+        image = Image.linear_gradient('L').resize((1200, 700)).convert('RGBA')
+        raster = FloorPlanRaster.create(self.fss, f'floor-plan-rasters/{uuid.uuid4().hex}', image, tile_size=256, overview_size=(300, 300))
+
+        self.assertEqual([(1200, 700), (600, 350), (300, 175), (150, 88)], raster.levels)
+        self.assertEqual((300, 175), raster.get_overview().size)
+        self.assertEqual(list(image.crop((100, 200, 700, 650)).getdata()),
+                         list(raster.crop((100, 200, 700, 650)).getdata()))
+
+    def test_crop_downscaled(self):
+        image = Image.linear_gradient('L').resize((1200, 700)).convert('RGBA')
+        raster = FloorPlanRaster.create(self.fss, f'floor-plan-rasters/{uuid.uuid4().hex}', image, tile_size=256, overview_size=(300, 300))
+
+        self.assertEqual((300, 113), raster.crop((0, 100, 1200, 550), max_size=(280, 280)).size)
+        self.assertEqual((1200, 450), raster.crop((0, 100, 1200, 550), max_size=(1000, 1000)).size)
+
+    def test_delete(self):
+        image = Image.linear_gradient('L').resize((1200, 700)).convert('RGBA')
+        path = f'floor-plan-rasters/{uuid.uuid4().hex}'
+        raster = FloorPlanRaster.create(self.fss, path, image, tile_size=256, overview_size=(300, 300))
+
+        raster.delete()
+
+        self.assertFalse(self.fss.exists(FloorPlanRaster.get_overview_name(path)))
+        self.assertFalse(self.fss.exists(FloorPlanRaster.get_tile_name(path, 0, 4, 2)))
+        self.assertFalse(self.fss.exists(FloorPlanRaster.get_tile_name(path, 3, 0, 0)))
+
@@ -1,7 +1,8 @@
+import io
 import json
 import os
 from unittest import mock
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
 import pendulum
 from django.core.files.storage import FileSystemStorage
@@ -14,6 +15,8 @@ from api.models import User, HandoverDocumentArchive, HandoverDocumentArchivePar
 from api.queues.celery.handover_document_archive import generate_archive_part
 from api.services.handover_document_archive_service import HandoverDocumentArchiveService
 from api.tests.test import TestCase
+from api.utilities.blob_utilities import AzureBlockBlobWriter
+from mbuild.settings import HANDOVER_DOCUMENT_ARCHIVE_STORED_EXTENSIONS
 
 
 class HandoverDocumentArchiveTest(TestCase):
@@ -26,14 +29,13 @@ class HandoverDocumentArchiveTest(TestCase):
     def mock_media_link(self, *args, **kwargs):
         return 'http://localhost/media/troom.png'
 
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._get_temporary_zipfile_name',
-                lambda *args, **kwargs: 'handover_document_archive_1.zip')
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._remove_temporary_file',
-                lambda *args, **kwargs: None)
-    @mock.patch('azure.storage.blob._blob_client.BlobClient.exists', lambda *args, **kwargs: False)
-    @mock.patch('azure.storage.blob.BlobClient.append_block', lambda *args, **kwargs: None)
-    @mock.patch('azure.storage.blob.BlobClient.create_append_blob', lambda *args, **kwargs: None)
-    @mock.patch('api.storages.AzurePrivateMediaStorage.open', file_system_storage.open)
+    def mock_download_blob_chunks(storage, name):
+        with HandoverDocumentArchiveTest.file_system_storage.open(name) as file:
+            yield from iter(lambda: file.read(1024), b'')
+
+    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._open_archive_stream',
+                lambda *args, **kwargs: open('handover_document_archive_1.zip', 'wb'))
+    @mock.patch('api.services.handover_document_archive_service.download_blob_chunks', mock_download_blob_chunks)
     @mock.patch('api.storages.AzurePrivateReportStorage.save', file_system_storage.save)
     @mock.patch('api.storages.AzurePrivateReportStorage.url', mock_media_link)
     @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
@@ -78,12 +80,23 @@ class HandoverDocumentArchiveTest(TestCase):
                                     'status': HandoverDocumentArchivePart.Status.SENT,
                                     'media__isnull': True})
 
+        self.assertDatabaseHas(HandoverDocumentArchivePart,
+                               {'id': archive_part.id,
+                                'cpu_time__isnull': False,
+                                'compression_ratio__isnull': False})
+
         with ZipFile('handover_document_archive_1.zip', 'r') as zip_archive:
             folder_structure = self.load_response_fixture('/handover_document_archive/completed_archive_folder_structure_assertion.json')
             archive_files = zip_archive.namelist()
             for file_path in folder_structure:
                 self.assertIn(file_path, archive_files)
 
+            for archive_file in zip_archive.infolist():
+                extension = archive_file.filename.rsplit('.', 1)[-1].lower()
+                expected_compress_type = ZIP_STORED \
+                    if extension in HANDOVER_DOCUMENT_ARCHIVE_STORED_EXTENSIONS else ZIP_DEFLATED
+                self.assertEqual(expected_compress_type, archive_file.compress_type)
+
         os.remove('handover_document_archive_1.zip')
 
         self.assertEmailEquals([
@@ -95,14 +108,9 @@ class HandoverDocumentArchiveTest(TestCase):
             }
         ])
 
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._get_temporary_zipfile_name',
-                lambda *args, **kwargs: 'handover_document_archive_5.zip')
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._remove_temporary_file',
-                lambda *args, **kwargs: None)
-    @mock.patch('azure.storage.blob._blob_client.BlobClient.exists', lambda *args, **kwargs: False)
-    @mock.patch('azure.storage.blob.BlobClient.append_block', lambda *args, **kwargs: None)
-    @mock.patch('azure.storage.blob.BlobClient.create_append_blob', lambda *args, **kwargs: None)
-    @mock.patch('api.storages.AzurePrivateMediaStorage.open', file_system_storage.open)
+    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._open_archive_stream',
+                lambda *args, **kwargs: open('handover_document_archive_5.zip', 'wb'))
+    @mock.patch('api.services.handover_document_archive_service.download_blob_chunks', mock_download_blob_chunks)
     @mock.patch('api.storages.AzurePrivateReportStorage.save', file_system_storage.save)
     @mock.patch('api.storages.AzurePrivateReportStorage.url', mock_media_link)
     @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
@@ -165,14 +173,9 @@ class HandoverDocumentArchiveTest(TestCase):
             }
         ])
 
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._get_temporary_zipfile_name',
-                lambda *args, **kwargs: 'handover_document_archive_6.zip')
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._remove_temporary_file',
-                lambda *args, **kwargs: None)
-    @mock.patch('azure.storage.blob._blob_client.BlobClient.exists', lambda *args, **kwargs: False)
-    @mock.patch('azure.storage.blob.BlobClient.append_block', lambda *args, **kwargs: None)
-    @mock.patch('azure.storage.blob.BlobClient.create_append_blob', lambda *args, **kwargs: None)
-    @mock.patch('api.storages.AzurePrivateMediaStorage.open', file_system_storage.open)
+    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService._open_archive_stream',
+                lambda *args, **kwargs: open('handover_document_archive_6.zip', 'wb'))
+    @mock.patch('api.services.handover_document_archive_service.download_blob_chunks', mock_download_blob_chunks)
     @mock.patch('api.storages.AzurePrivateReportStorage.save', file_system_storage.save)
     @mock.patch('api.storages.AzurePrivateReportStorage.url', mock_media_link)
     @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
@@ -235,6 +238,94 @@ class HandoverDocumentArchiveTest(TestCase):
             }
         ])
 
+    def test_stage_archive_blob_by_blocks(self):
+        blob_client = mock.Mock()
+
+        with mock.patch.object(AzureBlockBlobWriter, 'block_size', 4):
+            with AzureBlockBlobWriter(blob_client) as archive_stream:
+                archive_stream.write(b'troom.')
+                archive_stream.write(b'png')
+                self.assertEqual(9, archive_stream.tell())
+                blob_client.commit_block_list.assert_not_called()
+
+        staged_blocks = [call.args for call in blob_client.stage_block.call_args_list]
+        self.assertEqual([b'troo', b'm.pn', b'g'], [data for _, data in staged_blocks])
+        self.assertEqual(1, len({len(block_id) for block_id, _ in staged_blocks}))
+
+        block_list = blob_client.commit_block_list.call_args.args[0]
+        self.assertEqual([block_id for block_id, _ in staged_blocks], [block.id for block in block_list])
+
+    def test_discard_archive_blob_on_error(self):
+        blob_client = mock.Mock()
+
+        with self.assertRaises(ValueError):
+            with AzureBlockBlobWriter(blob_client) as archive_stream:
+                archive_stream.write(b'troom.png')
+                raise ValueError
+
+        blob_client.commit_block_list.assert_not_called()
+
+    def test_archive_to_non_seekable_stream(self):
+        blob_client = mock.Mock()
+
+        with mock.patch.object(AzureBlockBlobWriter, 'block_size', 1024):
+            with AzureBlockBlobWriter(blob_client) as archive_stream:
+                self.assertFalse(archive_stream.seekable())
+
+                with ZipFile(archive_stream, 'w', compression=ZIP_DEFLATED) as archive:
+                    service = HandoverDocumentArchiveService()
+                    with service._open_archive_entry(archive, 'rooms/troom.png', 'png', None) as archive_entry:
+                        archive_entry.write(os.urandom(5000))
+                    with service._open_archive_entry(archive, 'rooms/troom.txt', 'txt', 5000) as archive_entry:
+                        archive_entry.write(b'troom' * 1000)
+                    archive.writestr('report.csv', 'id,name\n1,troom\n' * 100)
+
+                archive_size = archive_stream.tell()
+
+        blob_content = b''.join(call.args[1] for call in blob_client.stage_block.call_args_list)
+        self.assertEqual(archive_size, len(blob_content))
+
+        with ZipFile(io.BytesIO(blob_content), 'r') as zip_archive:
+            self.assertIsNone(zip_archive.testzip())
+            self.assertEqual(['rooms/troom.png', 'rooms/troom.txt', 'report.csv'], zip_archive.namelist())
+            self.assertEqual(ZIP_STORED, zip_archive.getinfo('rooms/troom.png').compress_type)
+            self.assertEqual(5000, zip_archive.getinfo('rooms/troom.png').file_size)
+            self.assertEqual(ZIP_DEFLATED, zip_archive.getinfo('rooms/troom.txt').compress_type)
+            self.assertEqual(5000, zip_archive.getinfo('rooms/troom.txt').file_size)
+
+    def test_close_prefetched_files_on_archive_error(self):
+        files = []
+
+        def prefetch_file(handover_document_media):
+            files.append(io.BytesIO(b'troom.png'))
+            return files[-1]
+
+        service = HandoverDocumentArchiveService()
+        archive_data = {'group': [mock.Mock(), mock.Mock(), mock.Mock()]}
+        archive = mock.Mock()
+        archive.open.side_effect = ValueError
+
+        with mock.patch.object(service, '_prefetch_file', prefetch_file), \
+                mock.patch.object(service, '_get_file_path', lambda *args: 'troom.png'):
+            with self.assertRaises(ValueError):
+                service._archive_document_media(archive, archive_data, set())
+
+        self.assertEqual(3, len(files))
+        self.assertTrue(all(file.closed for file in files))
+
+    def test_extend_duplicated_file_path(self):
+        service = HandoverDocumentArchiveService()
+        group = mock.Mock(**{'to_dir_tree.return_value': 'rooms'})
+        handover_document_media = mock.Mock(**{'media.name': 'troom.png'})
+        archived_paths = set()
+
+        first_path = service._get_file_path(archived_paths, group, handover_document_media)
+        second_path = service._get_file_path(archived_paths, group, handover_document_media)
+
+        self.assertEqual('rooms/troom.png', first_path)
+        self.assertRegex(second_path, r'^rooms/troom_[0-9a-f-]+\.png$')
+        self.assertEqual({first_path, second_path}, archived_paths)
+
     def test_archive_name_generation(self):
         archive_part = HandoverDocumentArchivePart.objects.filter(
             status=HandoverDocumentArchivePart.Status.WAITING).order_by('id').first()
@@ -302,6 +393,19 @@ class HandoverDocumentArchiveTest(TestCase):
         self.assertEqualsFixture(json.loads(created_parts),
                                  '/handover_document_archive/initial_generation.json')
 
+    @mock.patch('api.services.handover_document_archive_service.HANDOVER_DOCUMENT_ARCHIVE_PARTS_CONCURRENCY', 2)
+    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService.create_archive_part_file',
+                lambda *args, **kwargs: None)
+    def test_initial_generation_with_parts_concurrency_limit(self):
+        user = User.objects.get(id=3)
+        generation_started_at = pendulum.parse('2020-07-30T12:21:16.135Z')
+        HandoverDocumentArchiveService().initiate_generation_process(5, user, generation_started_at)
+
+        created_parts = HandoverDocumentArchivePart.objects.filter(handover_document_archive__user=user)
+        self.assertEqual(2, created_parts.filter(status=HandoverDocumentArchivePart.Status.QUEUED).count())
+        self.assertEqual(created_parts.count() - 2,
+                         created_parts.filter(status=HandoverDocumentArchivePart.Status.WAITING).count())
+
     @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService.initiate_generation_process',
                 lambda *args, **kwargs: None)
     def test_get_archive_by_company_admin(self):
@@ -400,21 +504,21 @@ class HandoverDocumentArchiveTest(TestCase):
 
         self.assertForbidden(response)
 
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService.create_archive_part_file',
-                lambda *args, **kwargs: None)
-    def test_recover_failed_archive_part(self):
+    @mock.patch('api.services.handover_document_archive_service.generate_archive_part.delay')
+    def test_recover_failed_archive_part(self, generate_archive_part_delay):
         call_command('recover_failed_archive_part', 1)
         self.assertDatabaseHas(HandoverDocumentArchivePart,
-                               {'id': 1, 'status': HandoverDocumentArchivePart.Status.WAITING,
+                               {'id': 1, 'status': HandoverDocumentArchivePart.Status.QUEUED,
                                 'error_track_id__isnull': True})
+        self.assertEqual([call.args[0].id for call in generate_archive_part_delay.call_args_list], [1])
 
-    @mock.patch('api.services.handover_document_archive_service.HandoverDocumentArchiveService.create_archive_part_file',
-                lambda *args, **kwargs: None)
-    def test_recover_all_failed_archive_part(self):
+    @mock.patch('api.services.handover_document_archive_service.generate_archive_part.delay')
+    def test_recover_all_failed_archive_part(self, generate_archive_part_delay):
         call_command('recover_failed_archive_part', all=True)
         self.assertDatabaseMissing(HandoverDocumentArchivePart,
                                    {'status': HandoverDocumentArchivePart.Status.FAILED,
                                     'error_track_id__isnull': False})
+        self.assertEqual(sorted(call.args[0].id for call in generate_archive_part_delay.call_args_list), [1, 10])
 
     def test_recover_failed_archive_part_without_all_options(self):
         call_command('recover_failed_archive_part')
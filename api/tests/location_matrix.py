@@ -25,7 +25,8 @@ class LocationMatrixTest(TestCase):
         project_staff_in_edit_mode = self._get_staff(project=6, editmode__project__pk=6)
 
         self.force_login_user(project_staff_in_edit_mode.pk)
-        response = self.client.post('/api/projects/6/location-matrix/', new_location_matrix)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/6/location-matrix/', new_location_matrix)
 
         self.assertCreated(response)
         self.assertDatabaseHas(LocationMatrix, {'project': 6, **new_location_matrix})
@@ -298,7 +299,8 @@ class LocationMatrixTest(TestCase):
         update_location_matrix = self.load_request_fixture('/location_matrix/update_location_matrix.json')
 
         self.force_login_user(project_staff.pk)
-        response = self.client.put('/api/location-matrix/5/', update_location_matrix)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/location-matrix/5/', update_location_matrix)
 
         self.assertOk(response)
         self.assertDatabaseHas(LocationMatrix, {'pk': 5, **update_location_matrix})
@@ -335,7 +337,8 @@ class LocationMatrixTest(TestCase):
     def test_delete_by_project_staff_in_edit_mode(self):
         project_staff_in_edit_mode = self._get_staff(editmode__project__locationmatrix=5, project__locationmatrix=5)
         self.force_login_user(project_staff_in_edit_mode.pk)
-        response = self.client.delete('/api/location-matrix/5/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/location-matrix/5/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(LocationMatrix, 5)
@@ -524,7 +527,8 @@ class LocationMatrixTest(TestCase):
         sync_data = self.load_request_fixture('/location_matrix/sync_location_matrix.json')
 
         self.force_login_user(project_staff_in_edit_mode.pk)
-        response = self.client.post('/api/projects/1/location-matrix/sync/', sync_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/location-matrix/sync/', sync_data)
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/location_matrix/sync_all.json')
@@ -590,7 +594,8 @@ class LocationMatrixTest(TestCase):
         project_staff = self._get_staff(project=1, editmode__project=1)
 
         self.force_login_user(project_staff.pk)
-        response = self.client.post('/api/projects/1/location-matrix/sync/', sync_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/location-matrix/sync/', sync_data)
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/location_matrix/sync_all_order.json')
@@ -628,7 +633,8 @@ class LocationMatrixTest(TestCase):
         sync_data = self.load_request_fixture('/location_matrix/sync_location_matrix_with_castling.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/3/location-matrix/sync/', sync_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/3/location-matrix/sync/', sync_data)
 
         self.assertOk(response)
         self.assertDatabaseHas(LocationMatrix, {'id': 6, 'project': 3, 'building': "Building A", 'level': "1R", 'area': "Soup"})
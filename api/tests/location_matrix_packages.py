@@ -232,7 +232,8 @@ class LocationMatrixPackagesTest(TestCase):
         sync_data = self.load_request_fixture('/location_matrix_package/sync_location_matrix_package.json')
 
         self.force_login_user(project_staff.pk)
-        response = self.client.put('/api/projects/5/location-matrix-packages/sync/', sync_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/projects/5/location-matrix-packages/sync/', sync_data)
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/location_matrix_package/sync_all.json')
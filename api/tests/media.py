@@ -1,16 +1,23 @@
 from copy import deepcopy
+from io import BytesIO
 from unittest.mock import patch
 
 import PIL
 from PIL import Image
 from PIL.Image import DecompressionBombError
 from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError
+from safedelete import HARD_DELETE
 
 from api.models import Media
 from api.models.media_thumbnail import MediaThumbnail
+from api.services.media_entity_service import MediaEntityService
 from api.services.media_thumbnail_entity_service import MediaThumbnailEntityService
+from api.services.signed_url_cache_service import SignedUrlCacheService
 from api.storages import AzurePrivateMediaStorage
 from api.tests.test import TestCase, data_provider
+from api.utilities.image_utilities import resize_image_cascade
+from api.utilities.pdf_utilities import PdfRasterizer
 from api.utilities.tests_utilities import load_json
 
 
@@ -95,7 +102,8 @@ class MediaTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_user(is_superuser=True)
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/media/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/media/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(Media, 1)
@@ -118,7 +126,8 @@ class MediaTest(TestCase):
         staff = self._get_user(is_staff=True)
 
         self.force_login_user(staff.pk)
-        response = self.client.put('/api/media/1/', update_media)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/media/1/', update_media)
 
         self.assertOk(response)
         self.assertDatabaseHas(Media, update_media)
@@ -348,3 +357,123 @@ class MediaTest(TestCase):
         ):
             self.assertIsNotNone(thumbnail)
             self.assertIsNone(PIL.Image.MAX_IMAGE_PIXELS)
+
+    def test_resize_image_cascade(self):
+        source = BytesIO()
+        Image.new('RGB', size=(3000, 1500), color=(155, 0, 0)).save(source, 'jpeg')
+        source.seek(0)
+        boxes = [(sizes.width, sizes.height) for sizes in MediaThumbnail.PROJECT_IMAGE_THUMBNAIL_SIZES]
+
+        resized_images = dict(resize_image_cascade(Image.open(source), boxes))
+
+        self.assertEqual(set(boxes), set(resized_images))
+        for (width, height), resized_image in resized_images.items():
+            self.assertEqual('RGB', resized_image.mode)
+            self.assertEqual((width, height // 2), resized_image.size)
+
+    @patch('api.storages.AzurePrivateMediaStorage.save', fss.save)
+    @patch('api.storages.AzurePrivateMediaStorage.url', fss.path)
+    @patch('django.core.files.storage.FileSystemStorage.url', fss.path)
+    @patch('api.storages.AzurePrivateMediaStorage.open', fss.open)
+    @patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
+    def test_create_thumbnails_for_many_with_existing_thumbnails(self):
+        self._log_in_as_superuser()
+        self.client.post('/api/media/bulk-create/', {'uuid_1': self.generate_fake_image(), 'uuid_2': self.generate_fake_image()},
+                         format='multipart')
+        media = list(Media.objects.filter(local_id__in=['uuid_1', 'uuid_2']))
+
+        MediaEntityService().create_thumbnails_for_many(media)
+
+        for media_item in media:
+            self.assertEqual(1, MediaThumbnail.objects.filter(original_media=media_item, width=72, height=72).count())
+
+    @patch('api.storages.AzurePrivateMediaStorage.save', fss.save)
+    @patch('api.storages.AzurePrivateMediaStorage.url', fss.path)
+    @patch('django.core.files.storage.FileSystemStorage.url', fss.path)
+    @patch('api.storages.AzurePrivateMediaStorage.open', fss.open)
+    @patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
+    @patch('api.services.media_entity_service.capture_exception')
+    @patch('api.services.media_thumbnail_entity_service.LocationMatrixSnapshotFragmentService.invalidate_for_media')
+    def test_create_thumbnails_for_many_with_failed_media(self, mock_invalidate_for_media, mock_capture_exception):
+        self._log_in_as_superuser()
+        self.client.post('/api/media/bulk-create/', {'uuid_1': self.generate_fake_image(), 'uuid_2': self.generate_fake_image()},
+                         format='multipart')
+        failed_media, media = Media.objects.filter(
+            local_id__in=['uuid_1', 'uuid_2'], mediathumbnail__isnull=False
+        ).distinct().order_by('local_id')
+        MediaThumbnail.all_objects.filter(original_media__in=[failed_media, media]).delete(force_policy=HARD_DELETE)
+        get_thumbnails = MediaEntityService._get_thumbnails
+
+        def get_thumbnails_or_fail(service, media_item):
+            if media_item == failed_media:
+                raise ValueError('Broken media.')
+
+            return get_thumbnails(service, media_item)
+
+        with patch.object(MediaEntityService, '_get_thumbnails', autospec=True, side_effect=get_thumbnails_or_fail):
+            MediaEntityService().create_thumbnails_for_many([failed_media, media])
+
+        mock_capture_exception.assert_called_once()
+        mock_invalidate_for_media.assert_called_with({media.pk})
+        self.assertDatabaseMissing(MediaThumbnail, {'original_media': failed_media})
+        self.assertDatabaseHas(MediaThumbnail, {'original_media': media, 'width': 72, 'height': 72})
+
+    @patch('api.storages.AzurePrivateMediaStorage.save', fss.save)
+    @patch('api.storages.AzurePrivateMediaStorage.url', fss.path)
+    @patch('django.core.files.storage.FileSystemStorage.url', fss.path)
+    @patch('api.storages.AzurePrivateMediaStorage.open', fss.open)
+    @patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
+    @patch('api.storages.AzurePrivateMediaStorage.delete')
+    def test_delete_thumbnail_media_when_thumbnails_insert_failed(self, mock_delete):
+        self._log_in_as_superuser()
+        self.client.post('/api/media/bulk-create/', {'uuid_1': self.generate_fake_image()}, format='multipart')
+        media = Media.objects.filter(local_id='uuid_1', mediathumbnail__isnull=False).distinct().get()
+        MediaThumbnail.all_objects.filter(original_media=media).delete(force_policy=HARD_DELETE)
+        media_ids = set(Media.all_objects.values_list('id', flat=True))
+
+        with patch.object(MediaThumbnail.objects, 'bulk_create', side_effect=IntegrityError), \
+                self.assertRaises(IntegrityError):
+            MediaEntityService().create_thumbnails_for_many([media])
+
+        mock_delete.assert_called_once()
+        self.assertNotEqual(media.original_link, mock_delete.call_args.args[0])
+        self.assertEqual(media_ids, set(Media.all_objects.values_list('id', flat=True)))
+
+    def test_render_pdf_pages_from_one_document(self):
+        storage = FileSystemStorage(location=f'{self.requests_fixtures_dir}/media')
+
+        with PdfRasterizer.from_storage(storage, 'test.pdf') as rasterizer:
+            image = rasterizer.render(page_number=1, dpi=(72, 72))
+            double_dpi_image = rasterizer.render(page_number=1, dpi=(144, 144), alpha_layer=255)
+            missing_page_image = rasterizer.render(page_number=rasterizer.page_count + 1)
+
+        self.assertEqual((72, 72), image.info['dpi'])
+        self.assertEqual('RGBA', double_dpi_image.mode)
+        self.assertAlmostEqual(image.width * 2, double_dpi_image.width, delta=1)
+        self.assertAlmostEqual(image.height * 2, double_dpi_image.height, delta=1)
+        self.assertIsNone(missing_page_image)
+
+    @patch('api.storages.AzurePrivateMediaStorage.url')
+    def test_get_private_with_cached_url(self, mock_url):
+        mock_url.return_value = 'https://teststorage.com/image.png'
+        user = self._get_user()
+
+        self.force_login_user(user.pk)
+        for _ in range(2):
+            response = self.client.get('/api/media/private/c0b7387122b04fee87602fce2a48028b/')
+            self.assertRedirects(response, 'https://teststorage.com/image.png', fetch_redirect_response=False)
+
+        mock_url.assert_called_once()
+
+    @patch('api.storages.AzurePrivateMediaStorage.url', lambda storage, name: f'https://teststorage.com/{name}?sig')
+    def test_get_signed_urls(self):
+        storage = AzurePrivateMediaStorage()
+        SignedUrlCacheService().get_url(storage, 'first.png')
+
+        with patch('api.storages.AzurePrivateMediaStorage.url') as mock_url:
+            mock_url.return_value = 'https://teststorage.com/second.png?sig'
+            urls = SignedUrlCacheService().get_urls(storage, ['first.png', 'second.png'])
+
+        mock_url.assert_called_once_with('second.png')
+        self.assertEqual({'first.png': 'https://teststorage.com/first.png?sig',
+                          'second.png': 'https://teststorage.com/second.png?sig'}, urls)
@@ -24,7 +24,8 @@ class PackageTest(TestCase):
         new_package = self.load_request_fixture('/package/new_package.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/packages/', new_package)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/packages/', new_package)
 
         self.assertCreated(response)
         self.assertDatabaseHas(Package, {'name': 'Twelve package'})
@@ -65,7 +66,8 @@ class PackageTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/packages/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/packages/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(Package, 1)
@@ -88,7 +90,8 @@ class PackageTest(TestCase):
         update_package = self.load_request_fixture('/package/update_package.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/packages/1/', update_package)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/packages/1/', update_package)
 
         self.assertOk(response)
         self.assertDatabaseHas(Package, {'name': 'Updated first package', 'pk': 1})
@@ -155,7 +158,8 @@ class PackageTest(TestCase):
         superuser = self._get_superuser()
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/packages/?sort=order', request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/packages/?sort=order', request)
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/package/synced_response.json')
@@ -171,7 +175,8 @@ class PackageTest(TestCase):
     def test_sync_with_empty_data_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/packages/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/packages/')
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/package/synced_with_empty_data_response.json')
@@ -211,7 +216,8 @@ class PackageTest(TestCase):
         request = self.load_request_fixture('/package/sync_existing_removed_and_new_packages.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/packages/', request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/packages/', request)
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/package/synced_with_creation_and_update_response.json')
@@ -248,7 +254,8 @@ class PackageTest(TestCase):
         superuser = self._get_superuser()
         request = self.load_request_fixture('/package/sync_with_same_name_like_deleted_package.json')
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/packages/', request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/packages/', request)
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/package/synced_with_same_name_like_deleted_response.json')
         self.assertSoftDeleted(Package, 7)
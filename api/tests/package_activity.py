@@ -26,7 +26,8 @@ class PackageActivityTest(TestCase):
         new_package_activity = self.load_request_fixture('/package_activity/new_package_activity.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/package-activities/', new_package_activity)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/package-activities/', new_package_activity)
 
         self.assertCreated(response)
         self.assertEqualsFixture(response.data, '/package_activity/create_new_package_activity.json')
@@ -87,7 +88,8 @@ class PackageActivityTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/package-activities/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/package-activities/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(PackageActivity, 1)
@@ -110,7 +112,8 @@ class PackageActivityTest(TestCase):
         update_package_activity = self.load_request_fixture('/package_activity/update_package_activity.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/package-activities/1/', update_package_activity)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/package-activities/1/', update_package_activity)
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/package_activity/update_package_activity.json')
@@ -145,7 +148,8 @@ class PackageActivityTest(TestCase):
         update_package_activity = self.load_request_fixture('/package_activity/update_package_activity_task_with_same_description.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/package-activities/1/', update_package_activity)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/package-activities/1/', update_package_activity)
 
         self.assertOk(response)
         self.assertDatabaseHas(PackageActivity, {'name': 'Updated package activity', 'pk': 1})
@@ -12,7 +12,8 @@ class PackageActivityTaskTest(TestCase):
         new_package_activity_task = self.load_request_fixture('/package_activity_task/new_package_activity_task.json')
 
         self._log_in_as_superuser()
-        response = self.client.post('/api/package-activity-tasks/', new_package_activity_task)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/package-activity-tasks/', new_package_activity_task)
 
         self.assertCreated(response)
         self.assertDatabaseHas(PackageActivityTask, new_package_activity_task)
@@ -54,7 +55,8 @@ class PackageActivityTaskTest(TestCase):
 
     def test_delete_by_superuser(self):
         self._log_in_as_superuser()
-        response = self.client.delete('/api/package-activity-tasks/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/package-activity-tasks/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(PackageActivityTask, 1)
@@ -76,7 +78,8 @@ class PackageActivityTaskTest(TestCase):
         update_package_activity_task = self.load_request_fixture('/package_activity_task/update_package_activity_task.json')
 
         self._log_in_as_superuser()
-        response = self.client.put('/api/package-activity-tasks/1/', update_package_activity_task)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/package-activity-tasks/1/', update_package_activity_task)
 
         self.assertOk(response)
         self.assertDatabaseHas(PackageActivityTask, {**update_package_activity_task, 'pk': 1})
@@ -144,7 +147,8 @@ class PackageActivityTaskTest(TestCase):
     def test_hide_by_project_staff(self):
         deleting_task_id = 1
         self._log_in_as_staff(project=5)
-        response = self.client.post('/api/projects/5/package-matrix/3/activity-tasks/6/hide/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/package-matrix/3/activity-tasks/6/hide/')
 
         self.assertOk(response)
         self.assertDatabaseHas(PackageMatrixHiddenActivityTask, {'pk': 3, 'package_matrix': 3, 'package_activity_task': 6})
@@ -168,7 +172,8 @@ class PackageActivityTaskTest(TestCase):
     def test_show_by_project_staff(self):
         restoring_task_id = 2
         self._log_in_as_staff(project=5)
-        response = self.client.post('/api/projects/5/package-matrix/2/activity-tasks/5/show/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/package-matrix/2/activity-tasks/5/show/')
 
         self.assertOk(response)
         self.assertDatabaseMissing(PackageMatrixHiddenActivityTask, {'pk': 1, 'package_matrix': 2,
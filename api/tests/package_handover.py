@@ -25,7 +25,8 @@ class PackageHandoverTest(TestCase):
     def test_create(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/package-matrix/', {'package': 2, 'package_activity': [3, 5]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/package-matrix/', {'package': 2, 'package_activity': [3, 5]})
 
         self.assertCreated(response)
         # Check that deleted matrix restored
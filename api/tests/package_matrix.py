@@ -106,7 +106,8 @@ class PackageMatrixTest(TestCase):
     def test_delete_by_project_staff(self):
         project_staff = self._get_staff(project__packagematrix=1)
         self.force_login_user(project_staff.pk)
-        response = self.client.delete('/api/package-matrix/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/package-matrix/1/')
 
         self.assertNoContent(response)
 
@@ -40,7 +40,8 @@ class ProjectTest(TestCase):
 
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/', new_project)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/', new_project)
 
         self.assertCreated(response)
         self.assertDatabaseHas(Project, new_project)
@@ -143,7 +144,8 @@ class ProjectTest(TestCase):
     def test_delete_as_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/projects/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(Project, 1)
@@ -171,7 +173,8 @@ class ProjectTest(TestCase):
 
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/projects/5/', update_project)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/projects/5/', update_project)
 
         self.assertOk(response)
         self.assertDatabaseHas(Project, update_project)
@@ -368,7 +371,8 @@ class ProjectTest(TestCase):
     def test_add_users_by_project_staff(self):
         project_staff = self._get_staff(project=1)
         self.force_login_user(project_staff.pk)
-        response = self.client.post('/api/projects/1/users/add/', {'users': [11, 12]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/users/add/', {'users': [11, 12]})
 
         self.assertOk(response)
         self.assertDatabaseHas(Project, {'users__pk': 11, 'pk': 1})
@@ -392,7 +396,8 @@ class ProjectTest(TestCase):
     def test_add_users_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/1/users/add/', {'users': [11, 12]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/users/add/', {'users': [11, 12]})
 
         self.assertOk(response)
         self.assertDatabaseHas(Project, {'users__pk': 11, 'pk': 1})
@@ -402,7 +407,8 @@ class ProjectTest(TestCase):
     def test_update_user_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/projects/1/users/2/', {'is_notifications_enabled': True})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/projects/1/users/2/', {'is_notifications_enabled': True})
 
         self.assertNoContent(response)
         self.assertDatabaseHas(ProjectUser, {'user': 2, 'is_notifications_enabled': True})
@@ -423,7 +429,8 @@ class ProjectTest(TestCase):
     def test_remove_himself_by_manager(self):
         project_manager = self._get_user(project=1, groups=User.Group.MANAGER.value)
         self.force_login_user(project_manager.pk)
-        response = self.client.post('/api/projects/1/users/remove/', {'users': [project_manager.pk]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/users/remove/', {'users': [project_manager.pk]})
 
         self.assertOk(response)
         self.assertEventsExist('/project/remove_himself_by_manager_events_assertion.json')
@@ -438,7 +445,8 @@ class ProjectTest(TestCase):
     def test_remove_users_by_admin(self):
         admin = self._get_staff(project=2, groups=User.Group.ADMIN.value)
         self.force_login_user(admin.pk)
-        response = self.client.post('/api/projects/2/users/remove/', {'users': [2, 3]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/2/users/remove/', {'users': [2, 3]})
 
         self.assertOk(response)
         self.assertDatabaseMissing(Project, {'users__pk': 2, 'pk': 2})
@@ -471,7 +479,8 @@ class ProjectTest(TestCase):
     def test_remove_users_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/2/users/remove/', {'users': [2, 3]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/2/users/remove/', {'users': [2, 3]})
 
         self.assertOk(response)
         self.assertDatabaseMissing(Project, {'users__pk': 2, 'pk': 2})
@@ -481,7 +490,8 @@ class ProjectTest(TestCase):
     def test_add_key_contacts_by_project_staff(self):
         project_staff = self._get_staff(project=1)
         self.force_login_user(project_staff.pk)
-        response = self.client.post('/api/projects/1/key-contacts/add/', {'key_contacts': [1, 3]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/key-contacts/add/', {'key_contacts': [1, 3]})
 
         self.assertOk(response)
         self.assertDatabaseHas(Project, {'key_contacts__pk': 1, 'pk': 1})
@@ -491,7 +501,8 @@ class ProjectTest(TestCase):
     def test_add_key_contacts_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/1/key-contacts/add/', {'key_contacts': [1, 3]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/key-contacts/add/', {'key_contacts': [1, 3]})
 
         self.assertOk(response)
         self.assertDatabaseHas(Project, {'key_contacts__pk': 1, 'pk': 1})
@@ -513,7 +524,8 @@ class ProjectTest(TestCase):
     def test_remove_key_contacts_by_project_staff(self):
         project_staff = self._get_staff(project=2)
         self.force_login_user(project_staff.pk)
-        response = self.client.post('/api/projects/2/key-contacts/remove/', {'key_contacts': [2, 3]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/2/key-contacts/remove/', {'key_contacts': [2, 3]})
 
         self.assertOk(response)
         self.assertDatabaseMissing(Project, {'key_contacts__pk': 2, 'pk': 2})
@@ -530,7 +542,8 @@ class ProjectTest(TestCase):
     def test_remove_key_contacts_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/2/key-contacts/remove/', {'key_contacts': [2, 3]})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/2/key-contacts/remove/', {'key_contacts': [2, 3]})
 
         self.assertOk(response)
         self.assertDatabaseMissing(Project, {'key_contacts__pk': 2, 'pk': 2})
@@ -12,7 +12,8 @@ class ProjectNewsTest(TestCase):
         new_project_news = self.load_request_fixture('/project_news/new_project_news.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/project-news/', new_project_news)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/project-news/', new_project_news)
 
         self.assertCreated(response)
         self.assertDatabaseHas(ProjectNews, new_project_news)
@@ -74,7 +75,8 @@ class ProjectNewsTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/project-news/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/project-news/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(ProjectNews, 1)
@@ -105,7 +107,8 @@ class ProjectNewsTest(TestCase):
         update_project_news = self.load_request_fixture('/project_news/update_project_news.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/project-news/1/', update_project_news)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/project-news/1/', update_project_news)
 
         self.assertOk(response)
         self.assertDatabaseHas(ProjectNews, update_project_news)
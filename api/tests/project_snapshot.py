@@ -0,0 +1,226 @@
+import io
+import json
+import os
+from unittest import mock
+from zipfile import ZipFile
+
+import pendulum
+from django.db.models import Q
+from safedelete import HARD_DELETE
+
+from api.models import Subtask, Task, Project
+from api.models.project_snapshot import ProjectSnapshot
+from api.queues.core.update_project_subtasks_defect_status import update_project_subtasks_defect_status
+from api.services.location_matrix_snapshot_fragment_service import LocationMatrixSnapshotFragmentService
+from api.services.project_snapshot_service import ProjectSnapshotService
+from api.tests.test import TestCase
+
+
+class ProjectSnapshotTest(TestCase):
+    fixtures = ['api/tests/fixtures/dumps/command.json']
+
+    def mock_media_link(self, *args, **kwargs):
+        return 'http://localhost/media/troom.png'
+
+    def setUp(self) -> None:
+        super().setUp()
+        LocationMatrixSnapshotFragmentService().invalidate(range(1, 7))
+
+    def tearDown(self) -> None:
+        if os.path.exists('project_snapshot.zip'):
+            os.remove('project_snapshot.zip')
+
+        super().tearDown()
+
+    @mock.patch('api.services.project_snapshot_service.ProjectSnapshotService._open_archive_stream',
+                lambda *args, **kwargs: open('project_snapshot.zip', 'wb'))
+    @mock.patch('api.storages.AzurePrivateProjectSnapshotStorage.url', mock_media_link)
+    @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
+    def test_generate_by_superuser(self):
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.post('/api/projects/5/snapshots/?location_matrix=1&location_matrix=2')
+
+        self.assertCreated(response)
+        self.assertEquals(response.data['status'], ProjectSnapshot.Statuses.COMPLETED.value)
+        self.assertEquals(response.data['url'], 'http://localhost/media/troom.png')
+
+        snapshot = ProjectSnapshot.objects.get(pk=response.data['id'])
+        self.assertEquals(snapshot.archive, f'snapshots/5/{snapshot.pk}.zip')
+        self.assertEquals(snapshot.location_matrices, [1, 2])
+        self.assertEquals(snapshot.user, superuser.pk)
+
+        with ZipFile('project_snapshot.zip', 'r') as zip_archive:
+            self.assertEquals(zip_archive.namelist(), ['project_5.json'])
+            snapshot_content = json.loads(zip_archive.read('project_5.json'))
+
+        self.assertEquals(snapshot_content['project_id'], 5)
+        self.assertEquals([location_matrix['id'] for location_matrix in snapshot_content['data']['location_matrix']], [1, 2])
+
+        response = self.client.get(f'/api/projects/5/snapshots/{snapshot.pk}/')
+
+        self.assertOk(response)
+        self.assertEquals(response.data['id'], str(snapshot.pk))
+        self.assertEquals(response.data['url'], 'http://localhost/media/troom.png')
+
+    @mock.patch('api.services.project_snapshot_service.ProjectSnapshotService._open_archive_stream',
+                lambda *args, **kwargs: open('project_snapshot.zip', 'wb'))
+    @mock.patch('api.storages.AzurePrivateProjectSnapshotStorage.url', mock_media_link)
+    @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
+    def test_generate_delta_by_superuser(self):
+        previous_snapshot = ProjectSnapshot.objects.create(
+            project_id=5,
+            location_matrices=[1, 2, 3],
+            status=ProjectSnapshot.Statuses.COMPLETED.value,
+            archive='snapshots/5/previous.zip',
+            generation_started_at=pendulum.datetime(2021, 1, 1),
+            created_at=pendulum.datetime(2021, 1, 1),
+            updated_at=pendulum.datetime(2021, 1, 1),
+        )
+        Subtask.objects.filter(pk=1).update(updated_at=pendulum.datetime(2021, 2, 1))
+        Task.all_objects.filter(pk=4).update(deleted=pendulum.datetime(2021, 2, 1), updated_at=pendulum.datetime(2021, 2, 1))
+
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.post('/api/projects/5/snapshots/?location_matrix=1&location_matrix=2'
+                                    f'&location_matrix=3&previous_snapshot={previous_snapshot.pk}')
+
+        self.assertCreated(response)
+        self.assertEquals(response.data['status'], ProjectSnapshot.Statuses.COMPLETED.value)
+        self.assertEquals(response.data['previous_snapshot'], str(previous_snapshot.pk))
+
+        with ZipFile('project_snapshot.zip', 'r') as zip_archive:
+            snapshot_content = json.loads(zip_archive.read('project_5.json'))
+
+        self.assertEquals(snapshot_content['since'], '2021-01-01 00:00:00')
+        self.assertEquals(snapshot_content['previous_snapshot'], str(previous_snapshot.pk))
+        self.assertEquals([location_matrix['id'] for location_matrix in snapshot_content['data']['location_matrix']], [1, 2])
+        self.assertEquals(snapshot_content['data']['deleted'], {
+            'location_matrix': [],
+            'location_matrix_package': [],
+            'task': [4],
+            'task_update': [],
+            'subtask': [],
+            'subtask_update': [],
+            'quality_issue': [],
+            'quality_issue_update': [],
+        })
+
+    @mock.patch('api.services.project_snapshot_service.ProjectSnapshotService._open_archive_stream',
+                lambda *args, **kwargs: open('project_snapshot.zip', 'wb'))
+    @mock.patch('api.storages.AzurePrivateProjectSnapshotStorage.url', mock_media_link)
+    @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
+    def test_generate_delta_after_hard_delete_and_queryset_update(self):
+        previous_snapshot = ProjectSnapshot.objects.create(
+            project_id=5,
+            location_matrices=[1, 2, 3],
+            status=ProjectSnapshot.Statuses.COMPLETED.value,
+            archive='snapshots/5/previous.zip',
+            generation_started_at=pendulum.now(),
+            created_at=pendulum.now(),
+            updated_at=pendulum.now(),
+        )
+        for _, model, _ in ProjectSnapshotService.delta_entities:
+            model.all_objects.update(updated_at=pendulum.datetime(2020, 1, 1))
+            model.deleted_objects.update(deleted=pendulum.datetime(2020, 1, 1))
+        with self.captureOnCommitCallbacks(execute=True):
+            Subtask.all_objects.filter(pk=2).delete(force_policy=HARD_DELETE)
+        update_project_subtasks_defect_status(5, pendulum.now().subtract(days=1).to_datetime_string())
+
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.post('/api/projects/5/snapshots/?location_matrix=1&location_matrix=2'
+                                    f'&location_matrix=3&previous_snapshot={previous_snapshot.pk}')
+
+        self.assertCreated(response)
+        with ZipFile('project_snapshot.zip', 'r') as zip_archive:
+            snapshot_content = json.loads(zip_archive.read('project_5.json'))
+
+        self.assertEquals([location_matrix['id'] for location_matrix in snapshot_content['data']['location_matrix']], [1, 2])
+        self.assertEquals(snapshot_content['data']['deleted']['subtask'], [2])
+        self.assertEquals(snapshot_content['data']['deleted']['task'], [])
+
+    def test_generate_delta_with_unknown_previous_snapshot(self):
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.post('/api/projects/5/snapshots/?previous_snapshot=61d4b2d6d41f2c6a3e4bf2c1')
+
+        self.assertBadRequest(response)
+
+    def test_generate_delta_since_duration(self):
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.post('/api/projects/5/snapshots/?since=P1D')
+
+        self.assertBadRequest(response)
+
+    @mock.patch('api.services.project_snapshot_service.ProjectSnapshotService._open_archive_stream',
+                lambda *args, **kwargs: open('project_snapshot.zip', 'wb'))
+    @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
+    @mock.patch('api.services.project_snapshot_service.ProjectSnapshotService.write_snapshot',
+                mock.Mock(side_effect=Exception('Broken snapshot')))
+    def test_generate_failed(self):
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.post('/api/projects/5/snapshots/?location_matrix=1')
+
+        self.assertCreated(response)
+        self.assertEquals(response.data['status'], ProjectSnapshot.Statuses.FAILED.value)
+        self.assertIsNone(response.data['url'])
+
+    def test_forbid_generate_by_non_project_user(self):
+        non_project_user = self._get_user(~Q(project=5), is_superuser=False)
+        self.force_login_user(non_project_user.pk)
+        response = self.client.post('/api/projects/5/snapshots/')
+
+        self.assertForbidden(response)
+
+    def test_retrieve_missing_generated_snapshot(self):
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.get('/api/projects/5/snapshots/61d4b2d6d41f2c6a3e4bf2c1/')
+
+        self.assertNotFound(response)
+
+    def test_retrieve_by_superuser(self):
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        response = self.client.get('/api/projects/5/snapshot/?location_matrix=1')
+
+        self.assertOk(response)
+        self.assertEquals(response['Content-Disposition'], 'attachment; filename=project_5.zip')
+
+    @mock.patch('api.services.project_snapshot_service.ProjectSnapshotService._prefetch_location_matrices',
+                lambda self, location_matrices: location_matrices)
+    @mock.patch('api.services.project_snapshot_service.LocationMatrixSerializer')
+    def test_reuse_cached_location_matrix_fragments(self, location_matrix_serializer):
+        location_matrix_serializer.side_effect = lambda location_matrix, **kwargs: mock.Mock(data={'id': location_matrix.id})
+        project = Project.objects.get(pk=5)
+
+        def get_snapshot_location_matrices():
+            snapshot_file = io.BytesIO()
+            ProjectSnapshotService().write_snapshot(snapshot_file, project, [1, 2], pendulum.now())
+
+            with ZipFile(snapshot_file, 'r') as zip_archive:
+                return json.loads(zip_archive.read('project_5.json'))['data']['location_matrix']
+
+        self.assertEquals(get_snapshot_location_matrices(), [{'id': 1}, {'id': 2}])
+        self.assertEquals(location_matrix_serializer.call_count, 2)
+
+        self.assertEquals(get_snapshot_location_matrices(), [{'id': 1}, {'id': 2}])
+        self.assertEquals(location_matrix_serializer.call_count, 2)
+
+        subtask = Subtask.objects.get(pk=1)
+        subtask.description = 'Updated description'
+        subtask.save(update_fields=['description'])
+
+        self.assertEquals(get_snapshot_location_matrices(), [{'id': 1}, {'id': 2}])
+        self.assertEquals(location_matrix_serializer.call_count, 3)
+        self.assertEquals(location_matrix_serializer.call_args.args[0].id, 1)
+
+        user = subtask.user
+        user.first_name = 'Renamed'
+        user.save(update_fields=['first_name', 'updated_at'])
+
+        self.assertEquals(get_snapshot_location_matrices(), [{'id': 1}, {'id': 2}])
+        self.assertEquals(location_matrix_serializer.call_count, 5)
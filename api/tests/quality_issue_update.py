@@ -15,7 +15,8 @@ class QualityIssueUpdateTest(TestCase):
         new_quality_issue_update = self.load_request_fixture('/quality_issue_updates/new_quality_issue_update.json')
 
         self.force_login_user(consultant.pk)
-        response = self.client.post('/api/projects/5/quality-issues/1/updates/', new_quality_issue_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/quality-issues/1/updates/', new_quality_issue_update)
 
         del new_quality_issue_update['files']
         recipients = new_quality_issue_update.pop('recipients')
@@ -212,7 +213,8 @@ class QualityIssueUpdateTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/projects/5/quality-issues/5/updates/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/5/quality-issues/5/updates/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(QualityIssueUpdate, 1)
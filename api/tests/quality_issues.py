@@ -46,7 +46,8 @@ class QualityIssueTest(TestCase):
         new_quality_issue = self.load_request_fixture('/quality_issue/create_quality_issue.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/quality-issues/', new_quality_issue)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/quality-issues/', new_quality_issue)
 
         del new_quality_issue['attachments']
         del new_quality_issue['recipients']
@@ -150,6 +151,8 @@ class QualityIssueTest(TestCase):
         response = self.client.post('/api/projects/5/quality-issues/', new_quality_issue)
 
         self.assertCreated(response)
+        self.assertDatabaseHas(QualityIssue, {'pk': response.data['id'], 'building': 'Building A', 'level': 'A',
+                                              'area': 'Hall', 'project': 5})
 
     def test_forbid_create_by_non_project_client(self):
         non_project_client = self._get_user(~Q(project=5), groups=User.Group.CLIENT.value)
@@ -236,6 +239,14 @@ class QualityIssueTest(TestCase):
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/quality_issues/get_quality_issue_count_by_staff.json')
 
+    def test_get_count_with_default_sort(self):
+        project_staff = self._get_staff(project=5)
+        self.force_login_user(project_staff.pk)
+        response = self.client.get('/api/projects/5/quality-issues/count/', {'sort': 'default_sort'})
+
+        self.assertOk(response)
+        self.assertEqual(self.client.get('/api/projects/5/quality-issues/count/').data, response.data)
+
     def test_get_count_by_non_project_user(self):
         non_project_user = self._get_user(~Q(project=5))
         self.force_login_user(non_project_user.pk)
@@ -297,7 +308,8 @@ class QualityIssueTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/projects/5/quality-issues/3/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/5/quality-issues/3/')
 
         self.assertNoContent(response)
         self.assertDatabaseMissing(QualityIssue, 3)
@@ -406,6 +418,42 @@ class QualityIssueTest(TestCase):
 
         self.assertUnauthorized(response)
 
+    def get_keyset_pagination_sorts(self):
+        return ('created_at', '-created_at', 'default_sort')
+
+    @data_provider(get_keyset_pagination_sorts)
+    def test_list_with_keyset_pagination_by_microsecond_timestamps(self, sort):
+        # Timestamps differ only in microseconds, so they are equal when cut to milliseconds.
+        for quality_issue in QualityIssue.objects.all():
+            QualityIssue.objects.filter(pk=quality_issue.pk).update(
+                created_at=pendulum.datetime(2020, 9, 30, 12, 0, 0, 123000 + quality_issue.pk)
+            )
+
+        superuser = self._get_superuser()
+        self.force_login_user(superuser.pk)
+        expected_response = self.client.get('/api/projects/5/quality-issues/', {'all': True, 'sort': sort})
+
+        quality_issues = []
+        query_params = {'use_keyset_pagination': True, 'per_page': 1, 'sort': sort}
+        for _ in expected_response.data['items']:
+            response = self.client.get('/api/projects/5/quality-issues/', query_params)
+
+            self.assertOk(response)
+            quality_issues.extend(response.data['items'])
+
+            if response.data['next_cursor'] is None:
+                break
+
+            query_params['after'] = response.data['next_cursor']
+
+        self.assertIsNone(response.data['next_cursor'])
+        quality_issue_ids = [quality_issue['id'] for quality_issue in quality_issues]
+        expected_ids = [quality_issue['id'] for quality_issue in expected_response.data['items']]
+        if sort == 'default_sort':
+            self.assertCountEqual(quality_issue_ids, expected_ids)
+        else:
+            self.assertEqual(quality_issue_ids, expected_ids)
+
     def get_filters(self):
         return (
             (
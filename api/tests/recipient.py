@@ -12,7 +12,8 @@ class RecipientTest(TestCase):
         new_recipient = self.load_request_fixture('/recipients/new_recipient.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/recipients/', new_recipient)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/recipients/', new_recipient)
 
         self.assertCreated(response)
         self.assertDatabaseHas(Recipient, new_recipient)
@@ -56,7 +57,8 @@ class RecipientTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/recipients/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/recipients/1/')
         self.assertNoContent(response)
         self.assertSoftDeleted(Recipient, 1)
         self.assertEventsExist('/recipients/delete_events_assertion.json')
@@ -78,7 +80,8 @@ class RecipientTest(TestCase):
         update_recipient = self.load_request_fixture('/recipients/update_recipient.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/recipients/1/', update_recipient)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/recipients/1/', update_recipient)
 
         self.assertOk(response)
         self.assertDatabaseHas(Recipient, update_recipient)
@@ -246,7 +249,8 @@ class RecipientTest(TestCase):
     def test_delete_with_m2m_reverse_relations(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/recipients/3/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/recipients/3/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(Recipient, 3)
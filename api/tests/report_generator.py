@@ -0,0 +1,152 @@
+import os
+from io import BytesIO
+
+from PyPDF2 import PdfFileReader, PdfWriter
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import AssetHandoverDocumentMediaUpdate, Company, Media, Project, Task, User
+from api.services.csv_file_service import CsvFileService
+from api.services.report_cache_service import ReportCacheService
+from api.tests.test import TestCase
+from api.utilities.report_generators.company_report_generator import CompanyReportGenerator
+from api.utilities.report_generators.pdf_chunk_renderer import PdfChunkRenderer
+from api.utilities.report_generators.task_report_generator import TaskReportGenerator
+
+
+class PdfChunkRendererTest(TestCase):
+    fixtures = ['api/tests/fixtures/dumps/command.json']
+
+    @staticmethod
+    def render_tasks(task_ids: list) -> bytes:
+        # Page width keeps the task id to check order of merged pages.
+        writer = PdfWriter()
+        for task_id in task_ids:
+            writer.add_blank_page(width=100 + task_id, height=100)
+
+        pdf = BytesIO()
+        writer.write(pdf)
+
+        return pdf.getvalue()
+
+    @override_settings(PDF_FILE_GENERATION_THREADS_BATCH_SIZE=2)
+    def test_render(self):
+        queryset = Task.objects.order_by('-id')
+        expected_task_ids = list(queryset.values_list('id', flat=True))
+        renderer = PdfChunkRenderer(chunk_size=1)
+
+        chunks = ([task.pk for task in tasks] for tasks in renderer.iterate_chunks(queryset))
+        report = renderer.render('report.pdf', chunks, self.render_tasks)
+
+        self.assertEqual('report.pdf', report.name)
+        self.assertEqual(report.size, len(report.read()))
+
+        report.seek(0)
+        pages = PdfFileReader(report).pages
+        self.assertEqual(expected_task_ids, [int(page.mediabox.width) - 100 for page in pages])
+
+    def test_render_without_chunks(self):
+        report = PdfChunkRenderer(chunk_size=1).render('report.pdf', iter([]), self.render_tasks)
+
+        self.assertEqual(report.size, len(report.read()))
+        report.seek(0)
+        self.assertEqual(0, len(PdfFileReader(report).pages))
+
+    def test_iterate_chunks(self):
+        queryset = Task.objects.order_by('-id')
+        renderer = PdfChunkRenderer(chunk_size=3)
+
+        chunks = [[task.pk for task in tasks] for tasks in renderer.iterate_chunks(queryset)]
+
+        task_ids = list(queryset.values_list('id', flat=True))
+        self.assertEqual([task_ids[start:start + 3] for start in range(0, len(task_ids), 3)], chunks)
+
+
+class CsvFileServiceTest(TestCase):
+    def test_create_file(self):
+        rows = ([index, f'Row "{index}"'] for index in range(3))
+
+        csv_file = CsvFileService('report.csv').create_file(['ID', 'Name'], rows)
+
+        content = csv_file.read()
+        self.assertEqual('report.csv', csv_file.name)
+        self.assertEqual(len(content), csv_file.size)
+        self.assertEqual(b'ID,Name\r\n0,"Row ""0"""\r\n1,"Row ""1"""\r\n2,"Row ""2"""\r\n', content)
+
+    def test_create_file_with_short_row(self):
+        csv_service = CsvFileService('report.csv')
+
+        with self.assertRaises(ValueError):
+            csv_service.create_file(['ID', 'Name'], iter([[1]]))
+
+        self.assertTrue(csv_service.csv_file.closed)
+        self.assertFalse(os.path.exists(csv_service.csv_file.temporary_file_path()))
+
+
+class ReportCacheServiceTest(TestCase):
+    fixtures = ['api/tests/fixtures/dumps/command.json']
+
+    def get_generator(self, query_params: dict) -> CompanyReportGenerator:
+        request = Request(APIRequestFactory().get('/', query_params))
+        request.user = User.objects.get(pk=1)
+
+        return CompanyReportGenerator(None, Company, request)
+
+    def test_get_cached_report(self):
+        report_cache_service = ReportCacheService()
+        generator = self.get_generator({'search': 'company'})
+        key = report_cache_service.get_key(generator, 'csv')
+        version = report_cache_service.get_version(generator)
+        report = Media.objects.first()
+
+        report_cache_service.set(key, version, report)
+
+        self.assertEqual(key, report_cache_service.get_key(self.get_generator({'search': 'company'}), 'csv'))
+        self.assertEqual(version, report_cache_service.get_version(generator))
+        self.assertEqual(report, report_cache_service.get(key, version))
+
+    def test_get_report_of_another_fingerprint(self):
+        report_cache_service = ReportCacheService()
+        generator = self.get_generator({'search': 'company'})
+        key = report_cache_service.get_key(generator, 'csv')
+
+        self.assertNotEqual(key, report_cache_service.get_key(generator, 'pdf'))
+        self.assertNotEqual(key, report_cache_service.get_key(self.get_generator({'search': 'another'}), 'csv'))
+
+    def test_get_outdated_report(self):
+        report_cache_service = ReportCacheService()
+        generator = self.get_generator({})
+        key = report_cache_service.get_key(generator, 'csv')
+        version = report_cache_service.get_version(generator)
+        report_cache_service.set(key, version, Media.objects.first())
+
+        Company.objects.first().delete()
+
+        self.assertNotEqual(version, report_cache_service.get_version(generator))
+        self.assertIsNone(report_cache_service.get(key, report_cache_service.get_version(generator)))
+
+    def test_get_project_lookup(self):
+        self.assertEqual('pk', ReportCacheService._get_project_lookup(Project))
+        self.assertEqual('project', ReportCacheService._get_project_lookup(Task))
+        self.assertEqual('asset_handover_document_media__asset_handover_document__asset_handover__project',
+                         ReportCacheService._get_project_lookup(AssetHandoverDocumentMediaUpdate))
+        self.assertIsNone(ReportCacheService._get_project_lookup(Company))
+
+
+class ProjectReportCacheServiceTest(TestCase):
+    fixtures = ['api/tests/fixtures/dumps/tasks.json']
+
+    def test_get_report_after_change_of_another_project(self):
+        report_cache_service = ReportCacheService()
+        request = Request(APIRequestFactory().get('/'))
+        request.user = User.objects.get(pk=1)
+        project_generator = TaskReportGenerator(Project.objects.get(pk=5), Task, request)
+        another_project_generator = TaskReportGenerator(Project.objects.get(pk=6), Task, request)
+        project_version = report_cache_service.get_version(project_generator)
+        another_project_version = report_cache_service.get_version(another_project_generator)
+
+        Task.objects.filter(project=5).first().delete()
+
+        self.assertNotEqual(project_version, report_cache_service.get_version(project_generator))
+        self.assertEqual(another_project_version, report_cache_service.get_version(another_project_generator))
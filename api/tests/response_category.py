@@ -12,7 +12,8 @@ class ResponseCategoryTest(TestCase):
         new_response_category = self.load_request_fixture('/response_category/new_response_category.json')
 
         self.force_login_user(company_admin.pk)
-        response = self.client.post('/api/projects/1/response-categories/', new_response_category)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/1/response-categories/', new_response_category)
 
         self.assertCreated(response)
         self.assertDatabaseHas(ResponseCategory, new_response_category)
@@ -38,7 +39,8 @@ class ResponseCategoryTest(TestCase):
         update_response_category = self.load_request_fixture('/response_category/update_response_category.json')
 
         self.force_login_user(company_admin.pk)
-        response = self.client.put('/api/projects/1/response-categories/1/', update_response_category)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/projects/1/response-categories/1/', update_response_category)
 
         self.assertOk(response)
         self.assertDatabaseHas(ResponseCategory, {'pk': 1, **update_response_category})
@@ -63,7 +65,8 @@ class ResponseCategoryTest(TestCase):
     def test_delete(self):
         company_admin = self._get_company_admin()
         self.force_login_user(company_admin.pk)
-        response = self.client.delete('/api/projects/1/response-categories/2/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/1/response-categories/2/')
 
         self.assertNoContent(response)
         self.assertDatabaseMissing(ResponseCategory, 2)
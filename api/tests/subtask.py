@@ -1,3 +1,4 @@
+import json
 from unittest import mock
 
 import pendulum
@@ -10,8 +11,11 @@ from django_rq import get_worker
 
 from api.tests.test import TransactionTestCase, data_provider
 
+from api.http.serializers.subtask.subtasks_report_serializer import SubtasksReportSerializer
 from api.models import Subtask, Task, Recipient, SubtaskUpdate, QualityIssue, QualityIssueUpdate, ProjectUser, User, \
-    FloorPlanAreaPin
+    FloorPlanAreaPin, Project
+from api.utilities.report_generators.subtask_report_generator import SubtaskReportGenerator
+from api.utilities.report_utilities import ReportUtilities
 
 
 class SubtaskTest(TransactionTestCase):
@@ -187,6 +191,8 @@ class SubtaskTest(TransactionTestCase):
 
         self.assertCreated(response)
         self.assertDatabaseHas(FloorPlanAreaPin, {'content_type': content_type, **new_subtask['floor_plan_area_pin']})
+        self.assertDatabaseHas(Subtask, {'pk': response.data['id'], 'project': 5,
+                                         'package_activity': Task.objects.get(pk=new_subtask['task']).package_activity_id})
 
     def test_unauthorized_create(self):
         new_subtask = self.load_request_fixture('/subtask/new_subtask.json')
@@ -787,6 +793,63 @@ class SubtaskTest(TransactionTestCase):
 
         self.assertUnauthorized(response)
 
+    def get_keyset_pagination_filters(self):
+        return (
+            {},
+            {'sort': 'status'},
+            {'sort': '-updated_at'},
+        )
+
+    @data_provider(get_keyset_pagination_filters)
+    def test_list_with_keyset_pagination(self, filters):
+        project_staff = self._get_staff(project=self.WORK_PROJECT_ID)
+        self.force_login_user(project_staff.pk)
+        expected_response = self.client.get('/api/projects/5/subtasks/', {'all': True, **filters})
+
+        subtasks = []
+        query_params = {'use_keyset_pagination': True, 'per_page': 2, **filters}
+        while True:
+            response = self.client.get('/api/projects/5/subtasks/', query_params)
+
+            self.assertOk(response)
+            subtasks.extend(response.data['items'])
+
+            if response.data['next_cursor'] is None:
+                break
+
+            query_params['after'] = response.data['next_cursor']
+
+        self.assertEqual([subtask['id'] for subtask in subtasks], [subtask['id'] for subtask in expected_response.data['items']])
+
+    def test_list_all_with_keyset_pagination(self):
+        project_staff = self._get_staff(project=self.WORK_PROJECT_ID)
+        self.force_login_user(project_staff.pk)
+        expected_response = self.client.get('/api/projects/5/subtasks/', {'all': True})
+
+        with mock.patch('api.http.pagination.KeysetPagination.chunk_size', 2):
+            response = self.client.get('/api/projects/5/subtasks/', {'all': True, 'use_keyset_pagination': True})
+
+        self.assertOk(response)
+        subtasks = json.loads(b''.join(response.streaming_content))['items']
+        self.assertEqual([subtask['id'] for subtask in subtasks], [subtask['id'] for subtask in expected_response.data['items']])
+
+    def test_list_with_invalid_keyset_cursor(self):
+        project_staff = self._get_staff(project=self.WORK_PROJECT_ID)
+        self.force_login_user(project_staff.pk)
+        response = self.client.get('/api/projects/5/subtasks/', {'use_keyset_pagination': True, 'after': 'invalid'})
+
+        self.assertBadRequest(response)
+
+    def test_get_approximate_total_items_count(self):
+        project_staff = self._get_staff(project=self.WORK_PROJECT_ID)
+        self.force_login_user(project_staff.pk)
+        response = self.client.get('/api/projects/5/subtasks/', {
+            'get_total_items_count': True, 'approximate_total_items_count': True
+        })
+
+        self.assertOk(response)
+        self.assertGreater(response.data['total_items'], 0)
+
     @data_provider(get_filters)
     def test_search_superuser(self, filters, fixture):
         superuser = self._get_superuser()
@@ -866,6 +929,37 @@ class SubtaskTest(TransactionTestCase):
 
         self.assertUnauthorized(response)
 
+    def test_csv_rows_match_report_serializer(self):
+        pendulum.set_test_now(pendulum.datetime(2020, 1, 1, 00, 00))
+        queryset = Subtask.objects.filter(task__project=self.WORK_PROJECT_ID).order_by('id')
+        expected_rows = [[
+            '%s-R-%s%s' % (subtask['expanded_project_number'], subtask['id'],
+                           f" (QI-{subtask['quality_issue']})" if subtask['quality_issue'] else ''),
+            subtask['description'], subtask['expanded_project_number'], subtask['expanded_building'],
+            subtask['expanded_level'], subtask['expanded_area'], subtask['location_description'],
+            subtask['expanded_package'], subtask['expanded_package_activity_name'],
+            subtask['expanded_package_activity_id'], subtask['expanded_package_activity_task_description'],
+            subtask['expanded_identified_user'], subtask['expanded_date_raised'], subtask['expanded_time_raised'],
+            subtask['expanded_files_urls'], subtask['expanded_date_of_completion'],
+            subtask['expanded_time_of_completion'], subtask['expanded_recipients'], subtask['expanded_due_date'],
+            subtask['expanded_due_time'], subtask['expanded_estimation'], subtask['expanded_user_closed'],
+            subtask['expanded_closed_comments'], subtask['expanded_closed_files_urls'],
+            subtask['expanded_last_status'], subtask['expanded_last_user'], subtask['expanded_last_update_date'],
+            subtask['expanded_last_update_time'], subtask['subcontractor_company'], subtask['subcontractor_name'],
+            subtask['expanded_last_comment'],
+        ] for subtask in SubtasksReportSerializer(
+            queryset, many=True, expand=SubtasksReportSerializer.Meta.expandable_fields.keys(),
+            export_producer=SubtasksReportSerializer.ExportProducer.CSV
+        ).data]
+
+        generator = SubtaskReportGenerator(Project.objects.get(pk=self.WORK_PROJECT_ID), Subtask, None)
+        # Small chunks check that values loaded per chunk don't leak into other chunks.
+        rows = [row for subtasks in ReportUtilities.iterate_by_chunks(generator._prefetch_csv_data(queryset), 2)
+                for row in generator._get_csv_rows(subtasks)]
+
+        self.assertTrue(expected_rows)
+        self.assertEqual(expected_rows, rows)
+
     @mock.patch('api.storages.AzurePrivateReportStorage.save', fss.save)
     @mock.patch('api.storages.AzurePrivateReportStorage.url', mock_url_generate)
     @mock.patch('api.services.media_entity_service.MediaEntityService._generate_link', mock_media_link)
@@ -1,7 +1,7 @@
 from django.db.models import Q
 from rest_framework.reverse import reverse
 
-from api.models import SubtaskUpdate, Subtask, QualityIssue, QualityIssueUpdate, User
+from api.models import SubtaskUpdate, Subtask, QualityIssue, QualityIssueUpdate, User, Task, LocationMatrix
 from api.tests.test import TestCase, data_provider
 
 
@@ -14,7 +14,8 @@ class SubtaskUpdateTest(TestCase):
         new_subtask_update = self.load_request_fixture('/subtasks_updates/new_subtask_update.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/subtasks/1/updates/', new_subtask_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/subtasks/1/updates/', new_subtask_update)
 
         del new_subtask_update['files']
         del new_subtask_update['recipients']
@@ -65,7 +66,8 @@ class SubtaskUpdateTest(TestCase):
         new_subtask_update = self.load_request_fixture('/subtasks_updates/new_subtask_update_by_subcontractor.json')
 
         self.force_login_user(subcontractor.pk)
-        response = self.client.post('/api/projects/5/subtasks/1/updates/', new_subtask_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/subtasks/1/updates/', new_subtask_update)
 
         del new_subtask_update['files']
         del new_subtask_update['recipients']
@@ -248,7 +250,8 @@ class SubtaskUpdateTest(TestCase):
         new_subtask_update = self.load_request_fixture('/subtasks_updates/new_subtask_update_with_files.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/subtasks/1/updates/', new_subtask_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/subtasks/1/updates/', new_subtask_update)
 
         self.assertCreated(response)
 
@@ -341,7 +344,8 @@ class SubtaskUpdateTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/projects/5/subtasks/1/updates/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/5/subtasks/1/updates/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(SubtaskUpdate, 1)
@@ -705,6 +709,23 @@ class SubtaskUpdateTest(TestCase):
         self.assertDatabaseMissing(QualityIssue, {'pk': 2, 'location_matrix': 1})
         self.assertDatabaseHas(QualityIssue, {'pk': 2, 'location_matrix': 2})
 
+    def test_update_location_matrix_copies_location_fields(self):
+        project_staff = self._get_staff(project=5)
+        new_subtask_update = self.load_request_fixture('/subtasks_updates/update_subtask_location.json')
+        task = Task.objects.get(pk=4)
+        location_matrix = LocationMatrix.objects.get(pk=2)
+
+        self.force_login_user(project_staff.pk)
+        response = self.client.post('/api/projects/5/subtasks/1/updates/', new_subtask_update)
+
+        self.assertCreated(response)
+        self.assertDatabaseHas(Subtask, {'pk': 1, 'task': 4, 'building': task.building, 'level': task.level,
+                                         'area': task.area, 'project': task.location_matrix.project_id,
+                                         'package_activity': task.package_activity_id})
+        self.assertDatabaseHas(QualityIssue, {'pk': 2, 'location_matrix': 2, 'building': location_matrix.building,
+                                              'level': location_matrix.level, 'area': location_matrix.area,
+                                              'project': location_matrix.project_id})
+
     def test_update_approval_reason_for_requesting_approval(self):
         project_staff = self._get_staff(project=5)
         new_subtask_update = self.load_request_fixture('/subtasks_updates/update_approval_evidence.json')
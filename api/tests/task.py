@@ -36,7 +36,8 @@ class TaskTest(TestCase):
         sync_data = self.load_request_fixture('/tasks/create_tasks.json')
 
         self.force_login_user(project_staff.pk)
-        response = self.client.put('/api/projects/5/location-matrix-packages/sync/', sync_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/projects/5/location-matrix-packages/sync/', sync_data)
 
         self.assertOk(response)
         self.assertEqualsFixture(response.data, '/tasks/sync_all.json')
@@ -162,7 +163,8 @@ class TaskTest(TestCase):
         update_task = self.load_request_fixture('/tasks/update_task.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.put('/api/projects/5/tasks/2/', update_task)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/projects/5/tasks/2/', update_task)
 
         self.assertOk(response)
         self.assertDatabaseHas(Task, {'pk': 2, 'status': Task.Statuses.ACCEPTED.value})
@@ -326,6 +328,38 @@ class TaskTest(TestCase):
         self.assertOk(response)
         self.assertEqualsFixture(response.data, fixture)
 
+    def test_search_by_changed_user_and_location(self):
+        task = Task.objects.filter(project=5).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            task.user.last_name = 'Westbrook'
+            task.user.save(update_fields=['last_name'])
+            task.location_matrix.building = 'Tower'
+            task.location_matrix.save(update_fields=['building'])
+            # Location values are copied to tasks after the location matrix is saved.
+            Task.objects.filter(location_matrix=task.location_matrix).update(building='Tower')
+
+        self._log_in_as_superuser()
+        response = self.client.get('/api/projects/5/tasks/', {'search': 'westbrook tower'})
+
+        self.assertOk(response)
+        self.assertCountEqual(
+            [item['id'] for item in response.data['items']],
+            Task.objects.filter(project=5, user=task.user, location_matrix=task.location_matrix).values_list('pk', flat=True)
+        )
+
+    @mock.patch('api.services.search_document_service.SearchDocumentService.refresh')
+    def test_skip_search_document_refresh_on_unrelated_save(self, refresh):
+        task = Task.objects.filter(project=5).first()
+        task.status = Task.Statuses.ACCEPTED
+        task.save(update_fields=['status'])
+
+        self.assertNotIn(mock.call(Task, [task.pk]), refresh.call_args_list)
+
+        task.building = 'Tower'
+        task.save(update_fields=['building'])
+
+        self.assertIn(mock.call(Task, [task.pk]), refresh.call_args_list)
+
     def test_forbid_search_by_project_staff(self):
         non_project_staff = self._get_staff(~Q(project=5))
         self.force_login_user(non_project_staff.pk)
@@ -12,7 +12,8 @@ class TaskUpdateTest(TestCase):
         new_task_update = self.load_request_fixture('/tasks_updates/new_task_update.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/tasks/1/updates/', new_task_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/tasks/1/updates/', new_task_update)
 
         del new_task_update['files']
         recipients = new_task_update.pop('recipients')
@@ -88,7 +89,8 @@ class TaskUpdateTest(TestCase):
         new_task_update = self.load_request_fixture('/tasks_updates/new_bulk_task_update.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/tasks/updates/', new_task_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/tasks/updates/', new_task_update)
 
         recipients = new_task_update.pop('recipients')
 
@@ -175,7 +177,8 @@ class TaskUpdateTest(TestCase):
         new_task_update = self.load_request_fixture('/tasks_updates/part_complete_task_update.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/tasks/1/updates/', new_task_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/tasks/1/updates/', new_task_update)
 
         del new_task_update['files']
         recipients = new_task_update.pop('recipients')
@@ -208,7 +211,8 @@ class TaskUpdateTest(TestCase):
         new_task_update = self.load_request_fixture('/tasks_updates/new_task_update_with_files.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/projects/5/tasks/1/updates/', new_task_update)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/projects/5/tasks/1/updates/', new_task_update)
 
         self.assertCreated(response)
         task_update = TaskUpdate.objects.filter(pk=response.data['id']).get()
@@ -272,7 +276,8 @@ class TaskUpdateTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/projects/5/tasks/1/updates/1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/projects/5/tasks/1/updates/1/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(TaskUpdate, 1)
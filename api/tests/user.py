@@ -32,7 +32,8 @@ class UserTest(TestCase):
         new_user = self.load_request_fixture('/user/new_user.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/users/', new_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/users/', new_user)
 
         self.assertCreated(response)
         self.assertDatabaseHas(User, {'groups__in': [1], 'is_superuser': True, 'is_staff': True,
@@ -56,7 +57,8 @@ class UserTest(TestCase):
 
         manager = self._get_user(groups=User.Group.MANAGER.value)
         self.force_login_user(manager.pk)
-        response = self.client.post('/api/users/', new_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/users/', new_user)
 
         self.assertCreated(response)
         self.assertDatabaseHas(User, {'groups__in': [User.Group.ADMIN], 'is_staff': True, 'email': new_user['email'],
@@ -99,7 +101,8 @@ class UserTest(TestCase):
         new_user = self.load_request_fixture('/user/new_user_status_rejected.json')
 
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/users/', new_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/users/', new_user)
 
         self.assertCreated(response)
         self.assertDatabaseMissing(User, {'groups__in': [1], 'is_superuser': True, 'is_staff': True,
@@ -138,7 +141,8 @@ class UserTest(TestCase):
     def test_register(self):
         new_user = self.load_request_fixture('/user/register_user.json')
 
-        response = self.client.post('/api/users/register/', new_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/users/register/', new_user)
 
         self.assertCreated(response)
         self.assertIsNotNone(response.data)
@@ -396,7 +400,8 @@ class UserTest(TestCase):
     def test_delete_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.delete('/api/users/2/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/users/2/')
 
         self.assertNoContent(response)
         self.assertSoftDeleted(User, 2)
@@ -528,7 +533,8 @@ class UserTest(TestCase):
     def test_restore_user_by_superuser(self):
         superuser = self._get_superuser()
         self.force_login_user(superuser.pk)
-        response = self.client.post('/api/users/strong.bat@gmail.com/restore/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/users/strong.bat@gmail.com/restore/')
 
         self.assertNoContent(response)
         self.assertDatabaseHas(User, {'email': 'strong.bat@gmail.com'})
@@ -387,6 +387,8 @@ urlpatterns = [
     path('projects/<int:pk>/events/', EventViewSet.as_view({'get': 'list', 'post': 'create'})),
     path('projects/<int:pk>/commands/', CommandViewSet.as_view({'post': 'create', 'get': 'list'})),
     path('projects/<int:pk>/snapshot/', ProjectSnapshotViewSet.as_view({'get': 'retrieve'})),
+    path('projects/<int:pk>/snapshots/', ProjectSnapshotViewSet.as_view({'post': 'generate'}), name='project_snapshots_generate'),
+    path('projects/<int:pk>/snapshots/<str:snapshot_pk>/', ProjectSnapshotViewSet.as_view({'get': 'retrieve_generated'}), name='project_snapshots_retrieve'),
 
     path('projects/csv/', ProjectViewSet.as_view({'get': 'generate_csv'}), name='project_generate_csv'),
 
@@ -0,0 +1,69 @@
+import base64
+import io
+from typing import Iterator, Optional
+
+from azure.storage.blob import BlobClient, BlobBlock, ContentSettings
+from storages.backends.azure_storage import AzureStorage
+
+
+def download_blob_chunks(storage: AzureStorage, name: str) -> Iterator[bytes]:
+    """
+    Download blob of the storage chunk by chunk, so the whole blob is never held in memory.
+    """
+    blob_client = storage.client.get_blob_client(storage._get_valid_path(name))
+
+    return blob_client.download_blob(timeout=storage.timeout).chunks()
+
+
+class AzureBlockBlobWriter(io.RawIOBase):
+    """
+    Write-only stream which stages written data as blocks of a block blob.
+    The blob is committed only when the stream is left without an error,
+    otherwise Azure discards uncommitted blocks by itself.
+    """
+    block_size = 8 * 1024 * 1024
+
+    def __init__(self, blob_client: BlobClient, content_settings: Optional[ContentSettings] = None):
+        super().__init__()
+
+        self._blob_client = blob_client
+        self._content_settings = content_settings
+        self._buffer = bytearray()
+        self._block_list = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        self._position += len(data)
+
+        while len(self._buffer) >= self.block_size:
+            self._stage_block(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+
+        return len(data)
+
+    def commit(self) -> None:
+        if self._buffer:
+            self._stage_block(bytes(self._buffer))
+            self._buffer.clear()
+
+        self._blob_client.commit_block_list(self._block_list, content_settings=self._content_settings)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+    def _stage_block(self, data: bytes) -> None:
+        # All block ids of a blob must have the same length.
+        block_id = base64.b64encode(f'{len(self._block_list):010d}'.encode()).decode()
+
+        self._blob_client.stage_block(block_id, data, length=len(data))
+        self._block_list.append(BlobBlock(block_id=block_id))
@@ -0,0 +1,263 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+import pendulum
+import ujson
+from celery import Task
+from django.apps import apps
+from django.db.models import Model
+from django.utils.datastructures import MultiValueDict
+from django.utils.encoding import is_protected_type
+from django.utils.module_loading import import_string
+
+
+TASK_ARGUMENTS_SERIALIZER = 'task_arguments'
+TASK_ARGUMENTS_CONTENT_TYPE = 'application/x-task-arguments+json'
+# Plain objects which are sent to tasks as their attributes.
+TASK_ARGUMENTS_OBJECTS = ('api.utilities.helpers.Request', 'api.utilities.tasks_utilities.SerializableRequest')
+
+
+def send_as_snapshot(instance: Model) -> Model:
+    """
+    Send model instance to tasks as a snapshot of its concrete fields and
+    `update_fields_original_values` instead of a reference. Use it for instances
+    describing a change and instances which may be deleted before the task is started.
+    """
+    instance._send_as_snapshot = True
+
+    return instance
+
+
+class MissingModelInstance:
+    """
+    Reference to a model instance which didn't exist when the task message was decoded,
+    for example because the transaction which created it was not committed yet.
+    """
+
+    def __init__(self, app_label: str, model_name: str, pk: Any) -> None:
+        self.app_label = app_label
+        self.model_name = model_name
+        self.pk = pk
+
+    @property
+    def model(self) -> type[Model]:
+        return apps.get_model(self.app_label, self.model_name)
+
+    def __repr__(self) -> str:
+        return '%s.%s with pk %s' % (self.app_label, self.model_name, self.pk)
+
+
+class ModelReferencesTask(Task):
+    """
+    Task which is retried while model instances referenced by its arguments are missing,
+    so messages consumed before the commit of these instances are not lost.
+    """
+    missing_instances_retry_delay = 5
+    missing_instances_max_retries = 5
+
+    def __call__(self, *args, **kwargs):
+        missing_instances = find_missing_instances((args, kwargs))
+
+        if missing_instances:
+            if self.request.called_directly or self.request.retries >= self.missing_instances_max_retries:
+                raise missing_instances[0].model.DoesNotExist('%r does not exist.' % missing_instances[0])
+
+            raise self.retry(countdown=self.missing_instances_retry_delay,
+                             max_retries=self.missing_instances_max_retries)
+
+        return super().__call__(*args, **kwargs)
+
+
+def find_missing_instances(value: Any) -> list[MissingModelInstance]:
+    if isinstance(value, MissingModelInstance):
+        return [value]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [missing_instance for item in value for missing_instance in find_missing_instances(item)]
+    if isinstance(value, dict):
+        return find_missing_instances(list(value.values()))
+
+    return []
+
+
+def encode_task_arguments(body: Any) -> str:
+    """
+    Encode task message to JSON. Model instances are encoded as references
+    `(app_label, model, pk)`, unless they are sent as snapshots by `send_as_snapshot`.
+    Values without JSON representation, like querysets, raise `TypeError`.
+    """
+    return ujson.dumps(_encode(body))
+
+
+def decode_task_arguments(data: str) -> Any:
+    """
+    Decode task message encoded by `encode_task_arguments`. Referenced model instances
+    are loaded from the database with one query per model, snapshots are restored from sent values.
+    Instances which don't exist are decoded as `MissingModelInstance`, so the task is retried
+    by `ModelReferencesTask` instead of the message being rejected.
+    """
+    body = ujson.loads(data)
+    references = {}
+    _collect_references(body, references)
+
+    instances = {}
+    for (app_label, model_name), pks in references.items():
+        model = apps.get_model(app_label, model_name)
+        instances.update(((app_label, model_name, instance.pk), instance)
+                         for instance in model._base_manager.filter(pk__in=pks))
+
+    return _decode(body, instances)
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': [_encode(item) for item in value]}
+    if isinstance(value, MultiValueDict):
+        return {'__multi_value_dict__': [[_encode(key), _encode(items)] for key, items in value.lists()]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and not key.startswith('__') for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+
+        return {'__dict__': [[_encode(key), _encode(item)] for key, item in value.items()]}
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, time):
+        return {'__time__': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, UUID):
+        return {'__uuid__': str(value)}
+    if isinstance(value, Enum):
+        return {'__enum__': [_get_class_path(type(value)), _encode(value.value)]}
+    if isinstance(value, Model) and getattr(value, '_send_as_snapshot', False):
+        # Deferred fields are not sent to not load them on encoding.
+        fields = {field.attname: _get_field_value(value, field)
+                  for field in value._meta.concrete_fields if field.attname in vars(value)}
+
+        return {
+            '__model_snapshot__': [value._meta.app_label, value._meta.model_name],
+            'fields': _encode(fields),
+            'update_fields_original_values': _encode(getattr(value, 'update_fields_original_values', None)),
+        }
+    if isinstance(value, Model) and value.pk is not None:
+        return {'__model__': [value._meta.app_label, value._meta.model_name, _encode(value.pk)]}
+    if isinstance(value, MissingModelInstance):
+        return {'__model__': [value.app_label, value.model_name, _encode(value.pk)]}
+    if isinstance(value, type) and issubclass(value, Model):
+        return {'__model_class__': [value._meta.app_label, value._meta.model_name]}
+    if _get_class_path(type(value)) in TASK_ARGUMENTS_OBJECTS:
+        return {'__object__': [_get_class_path(type(value)), _encode(vars(value))]}
+
+    raise TypeError('Value of type %s cannot be sent to tasks.' % type(value).__name__)
+
+
+def _get_class_path(cls: type) -> str:
+    return '%s.%s' % (cls.__module__, cls.__qualname__)
+
+
+def _get_field_value(instance: Model, field) -> Any:
+    value = field.value_from_object(instance)
+
+    # Values may be assigned as strings and not converted yet, like dates from request data.
+    if is_protected_type(value) or isinstance(value, (str, bool)):
+        return value
+
+    return field.value_to_string(instance)
+
+
+def _collect_references(value: Any, references: dict) -> None:
+    if isinstance(value, list):
+        for item in value:
+            _collect_references(item, references)
+    elif isinstance(value, dict):
+        if '__model__' in value:
+            app_label, model_name, pk = value['__model__']
+            references.setdefault((app_label, model_name), set()).add(_decode(pk, {}))
+        elif '__model_snapshot__' in value:
+            _collect_references(value['update_fields_original_values'], references)
+        else:
+            for item in value.values():
+                _collect_references(item, references)
+
+
+def _decode(value: Any, instances: dict) -> Any:
+    if isinstance(value, list):
+        return [_decode(item, instances) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    if '__model__' in value:
+        app_label, model_name, pk = value['__model__']
+        pk = _decode(pk, instances)
+        if (app_label, model_name, pk) not in instances:
+            return MissingModelInstance(app_label, model_name, pk)
+
+        return instances[(app_label, model_name, pk)]
+    if '__model_snapshot__' in value:
+        instance = send_as_snapshot(_restore_instance(*value['__model_snapshot__'], value['fields']))
+        if value['update_fields_original_values'] is not None:
+            instance.update_fields_original_values = _decode(value['update_fields_original_values'], instances)
+
+        return instance
+    if '__tuple__' in value:
+        return tuple(_decode(item, instances) for item in value['__tuple__'])
+    if '__set__' in value:
+        return {_decode(item, instances) for item in value['__set__']}
+    if '__multi_value_dict__' in value:
+        return MultiValueDict({_decode(key, instances): _decode(items, instances)
+                               for key, items in value['__multi_value_dict__']})
+    if '__dict__' in value:
+        return {_decode(key, instances): _decode(item, instances) for key, item in value['__dict__']}
+    if '__datetime__' in value:
+        value = datetime.fromisoformat(value['__datetime__'])
+
+        return pendulum.instance(value) if value.tzinfo else value
+    if '__date__' in value:
+        return date.fromisoformat(value['__date__'])
+    if '__time__' in value:
+        return time.fromisoformat(value['__time__'])
+    if '__decimal__' in value:
+        return Decimal(value['__decimal__'])
+    if '__uuid__' in value:
+        return UUID(value['__uuid__'])
+    if '__enum__' in value:
+        enum_class = import_string(value['__enum__'][0])
+        if not issubclass(enum_class, Enum):
+            raise TypeError('%s is not an enum.' % value['__enum__'][0])
+
+        return enum_class(_decode(value['__enum__'][1], instances))
+    if '__model_class__' in value:
+        return apps.get_model(*value['__model_class__'])
+    if '__object__' in value:
+        path, attributes = value['__object__']
+        if path not in TASK_ARGUMENTS_OBJECTS:
+            raise TypeError('%s cannot be sent to tasks.' % path)
+
+        cls = import_string(path)
+        instance = cls.__new__(cls)
+        vars(instance).update(_decode(attributes, instances))
+
+        return instance
+
+    return {key: _decode(item, instances) for key, item in value.items()}
+
+
+def _restore_instance(app_label: str, model_name: str, fields: dict) -> Model:
+    model = apps.get_model(app_label, model_name)
+    instance = model(**{
+        field.attname: field.to_python(_decode(fields[field.attname], {}))
+        for field in model._meta.concrete_fields if field.attname in fields
+    })
+    instance._state.adding = False
+
+    return instance
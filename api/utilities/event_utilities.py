@@ -1,4 +1,6 @@
 import pendulum
+from django.apps import apps
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.forms import model_to_dict
 from safedelete.models import is_safedelete_cls
@@ -18,6 +20,7 @@ from api.http.serializers.task_update.task_update_serializer import TaskUpdateSe
 from api.http.serializers.user.user_serializer import UserSerializer
 from api.models import Event
 from api.models.managers import BaseManager
+from api.utilities.transaction_utilities import get_transaction_outbox
 
 
 def perform_event_creation(parent_entity_field: str, child_entity_field: str, entity_name: str, kwargs):
@@ -89,7 +92,7 @@ def create_events_for_bulk_post_save(**kwargs):
     entity_name = instances[0].get_snake_case_class_name()
     event_type = define_event_type(instances[0], is_creation, updated_fields)
 
-    create_events(instances, event_type, entity_name, kwargs.get('project_id'))
+    create_model_events(instances, event_type, entity_name)
 
 
 def create_events_for_post_update(**kwargs):
@@ -100,9 +103,8 @@ def create_events_for_post_update(**kwargs):
 
     entity_name = entities[0].get_snake_case_class_name()
     event_type = define_event_type_for_update(update_fields)
-    project_id = get_project_id(entities[0])
 
-    create_events(entities, event_type, entity_name, project_id)
+    create_model_events(entities, event_type, entity_name)
 
 
 def create_events_for_post_delete(**kwargs):
@@ -170,9 +172,90 @@ def define_event_type(obj, is_creation, updated_fields: dict) -> Event.Types:
     return event_type
 
 
+class EventOutbox:
+    """
+    Collects events created inside a transaction and writes them
+    with a single insert once the transaction is committed.
+    Events are stamped when they are written, so that clients syncing
+    by creation time don't skip events of long transactions.
+    """
+
+    def __init__(self):
+        self.events = list()
+        self.batches = list()
+
+    def __call__(self) -> None:
+        if self.events:
+            insert_events(self.events)
+
+        if self.batches:
+            from api.queues.event import create_events_from_batches
+
+            create_events_from_batches(self.batches)
+
+
+def get_event_outbox() -> Optional[EventOutbox]:
+    if not settings.EVENTS_OUTBOX_ENABLED:
+        return None
+
+    return get_transaction_outbox('event', EventOutbox)
+
+
+def create_model_events(instances: list, event_type: Event.Types, entity_name: str) -> None:
+    outbox = get_event_outbox()
+
+    # Deleted entities may not exist anymore when the batch is processed.
+    if outbox and settings.EVENTS_ASYNC_SERIALIZATION and event_type != Event.Types.ENTITY_DELETED:
+        # Batches are sent to the queue, so they hold only plain values.
+        outbox.batches.append({
+            'model': instances[0]._meta.label,
+            'pks': [instance.pk for instance in instances],
+            'event_type': event_type.value,
+            'entity_name': entity_name,
+        })
+        return
+
+    create_events(instances, event_type, entity_name, get_project_id(instances[0]))
+
+
 def create_events(entities: list, event_type: Event.Types, entity_name: str, project_id: int = None) -> None:
+    outbox = get_event_outbox()
+    events = serialize_events(entities, event_type, entity_name, project_id)
+
+    if outbox:
+        outbox.events.extend(events)
+    elif events:
+        return insert_events(events)
+
+
+def create_events_from_batches(batches: list[dict]) -> None:
     events = list()
+    for batch in batches:
+        instances = apps.get_model(batch['model'])._base_manager.in_bulk(batch['pks'])
+        instances = [instances[pk] for pk in batch['pks'] if pk in instances]
+        if not instances:
+            continue
+
+        project_id = get_project_id(instances[0])
+        events.extend(serialize_events(instances, Event.Types(batch['event_type']), batch['entity_name'], project_id))
+
+    if events:
+        insert_events(events)
+
+
+def insert_events(events: list[Event]) -> list[Event]:
+    # All events of one insert share the time, the order is kept by their ids.
     time = pendulum.now()
+    for event in events:
+        event.created_at = time
+        event.updated_at = time
+
+    return Event.objects.insert(events)
+
+
+def serialize_events(entities: list, event_type: Event.Types, entity_name: str,
+                     project_id: Optional[int]) -> list[Event]:
+    events = list()
     for entity in entities:
         if type(entity) is not dict:
             serialization_map = model_serialization_map(entity)
@@ -185,13 +268,10 @@ def create_events(entities: list, event_type: Event.Types, entity_name: str, pro
             data=entity,
             entity=entity_name,
             type=event_type.value,
-            created_at=time,
-            updated_at=time,
             project_id=project_id
         ))
 
-    if events:
-        return Event.objects.insert(events)
+    return events
 
 
 def project_field_path(instance) -> Optional[list[str]]:
@@ -0,0 +1,135 @@
+from io import BytesIO
+from math import ceil
+from typing import Iterator, Optional, Tuple
+
+from PIL import Image
+from django.core.files.base import ContentFile
+from storages.base import BaseStorage
+
+
+class FloorPlanRaster:
+    """
+    Pre-rendered raster of a floor plan image: a downscaled overview and a pyramid of tiles,
+    where each next level is half of the previous one. Parts of the floor plan are composed
+    from tiles of the smallest level which still keeps the requested resolution, so the full
+    size image is never decoded. Decoded tiles are kept by the raster for its lifetime.
+    """
+    def __init__(self, storage: BaseStorage, metadata: dict):
+        self.storage = storage
+        self.path = metadata['path']
+        self.width, self.height = metadata['levels'][0]
+        self.mode = metadata['mode']
+        self.levels = [tuple(size) for size in metadata['levels']]
+        self.tile_size = metadata['tile_size']
+        self._overview = None
+        self._tiles = {}
+
+    @classmethod
+    def create(cls, storage: BaseStorage, path: str, image: Image.Image, tile_size: int,
+               overview_size: Tuple[int, int]) -> 'FloorPlanRaster':
+        levels = []
+        level_image = overview = image
+
+        while True:
+            levels.append(level_image.size)
+            for (column, row), tile in cls._split_to_tiles(level_image, tile_size):
+                cls._save_image(storage, cls.get_tile_name(path, len(levels) - 1, column, row), tile)
+
+            # Overview is resized from the smallest level which is still larger than the overview.
+            if level_image.width >= overview_size[0] or level_image.height >= overview_size[1]:
+                overview = level_image
+
+            if max(level_image.size) <= tile_size:
+                break
+
+            level_image = level_image.reduce(2)
+
+        overview = overview.copy()
+        overview.thumbnail(overview_size, Image.LANCZOS)
+        cls._save_image(storage, cls.get_overview_name(path), overview)
+
+        return cls(storage, {'path': path, 'mode': image.mode, 'levels': levels, 'tile_size': tile_size})
+
+    @property
+    def metadata(self) -> dict:
+        return {'path': self.path, 'mode': self.mode, 'levels': [list(size) for size in self.levels],
+                'tile_size': self.tile_size}
+
+    def get_overview(self) -> Image.Image:
+        if self._overview is None:
+            self._overview = self._open_image(self.get_overview_name(self.path))
+
+        return self._overview
+
+    def crop(self, box: Tuple[float, float, float, float], max_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        Get part of the floor plan in the box of full size coordinates. With max_size the part is composed
+        from the smallest level which is still not less than max_size, so it is returned downscaled.
+        """
+        level = self._get_level_for_box(box, max_size) if max_size else 0
+        factor = 2 ** level
+        level_width, level_height = self.levels[level]
+        left, top, right, bottom = (round(coordinate / factor) for coordinate in box)
+
+        image = Image.new(self.mode, (max(right - left, 1), max(bottom - top, 1)))
+        for row in range(max(top // self.tile_size, 0), min(ceil(bottom / self.tile_size), ceil(level_height / self.tile_size))):
+            for column in range(max(left // self.tile_size, 0), min(ceil(right / self.tile_size), ceil(level_width / self.tile_size))):
+                image.paste(self._get_tile(level, column, row), (column * self.tile_size - left, row * self.tile_size - top))
+
+        return image
+
+    def delete(self) -> None:
+        for level, (level_width, level_height) in enumerate(self.levels):
+            for row in range(ceil(level_height / self.tile_size)):
+                for column in range(ceil(level_width / self.tile_size)):
+                    self.storage.delete(self.get_tile_name(self.path, level, column, row))
+
+        self.storage.delete(self.get_overview_name(self.path))
+        self._overview = None
+        self._tiles = {}
+
+    @staticmethod
+    def get_tile_name(path: str, level: int, column: int, row: int) -> str:
+        return f'{path}/{level}/{column}_{row}.png'
+
+    @staticmethod
+    def get_overview_name(path: str) -> str:
+        return f'{path}/overview.png'
+
+    def _get_level_for_box(self, box: Tuple[float, float, float, float], max_size: Tuple[int, int]) -> int:
+        width, height = box[2] - box[0], box[3] - box[1]
+        scale = min(max_size[0] / width, max_size[1] / height, 1)
+
+        level = 0
+        while level + 1 < len(self.levels) and 2 ** (level + 1) * scale <= 1:
+            level += 1
+
+        return level
+
+    def _get_tile(self, level: int, column: int, row: int) -> Image.Image:
+        key = (level, column, row)
+        if key not in self._tiles:
+            self._tiles[key] = self._open_image(self.get_tile_name(self.path, level, column, row))
+
+        return self._tiles[key]
+
+    def _open_image(self, name: str) -> Image.Image:
+        with self.storage.open(name) as file:
+            image = Image.open(file)
+            image.load()
+
+        return image
+
+    @staticmethod
+    def _split_to_tiles(image: Image.Image, tile_size: int) -> Iterator[Tuple[Tuple[int, int], Image.Image]]:
+        width, height = image.size
+        for row in range(ceil(height / tile_size)):
+            for column in range(ceil(width / tile_size)):
+                left, top = column * tile_size, row * tile_size
+                yield (column, row), image.crop((left, top, min(left + tile_size, width), min(top + tile_size, height)))
+
+    @staticmethod
+    def _save_image(storage: BaseStorage, name: str, image: Image.Image) -> None:
+        content = BytesIO()
+        image.save(content, format='PNG', optimize=True)
+        storage.save(name, ContentFile(content.getvalue()))
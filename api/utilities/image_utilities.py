@@ -1,25 +1,76 @@
 from io import BytesIO
+from typing import IO, Iterable, Iterator, Tuple
 
+import PIL
 from PIL import Image
+from PIL.Image import DecompressionBombError
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from pillow_heif import register_heif_opener
+from wand.image import Image as WandImage
 
 from api.models.media_thumbnail import ThumbnailSizes
 
 
-def resize_image_and_save(image_file_name, image, sizes: ThumbnailSizes) -> None:
+def open_image(image_file: IO, file_name: str) -> Image.Image:
+    if file_name.lower().endswith('heic'):
+        register_heif_opener()
+    elif file_name.lower().endswith('svg'):
+        with WandImage(file=image_file) as svg_file, svg_file.convert('png') as converted_file:
+            image_file = BytesIO()
+            converted_file.save(file=image_file)
+            image_file.seek(0)
+
+    try:
+        return Image.open(image_file)
+    except DecompressionBombError:
+        PIL.Image.MAX_IMAGE_PIXELS = None
+        image_file.seek(0)
+        return Image.open(image_file)
+
+
+def resize_image_cascade(image: Image.Image, boxes: Iterable[Tuple[int, int]]) -> Iterator[Tuple[Tuple[int, int], Image.Image]]:
+    """
+    Resize the image to fit each of the boxes. The image is decoded once, JPEG is decoded
+    right at the reduced scale of the largest box, and each smaller size is resized
+    from the previous one instead of the full size image.
+    """
+    boxes = sorted(set(boxes), reverse=True)
+    if not boxes:
+        return
+
+    # Draft is a no-op for formats other than JPEG and for already loaded images.
+    image.draft('RGB', boxes[0])
+    source_image = image.convert('RGB')
+
+    previous_box, previous_image = None, source_image
+    for box in boxes:
+        fits_previous = previous_box is not None and box[0] <= previous_box[0] and box[1] <= previous_box[1]
+        resized_image = (previous_image if fits_previous else source_image).copy()
+        resized_image.thumbnail(box, Image.LANCZOS)
+
+        yield box, resized_image
+
+        previous_box, previous_image = box, resized_image
+
+
+def save_image_to_buffer(image: Image.Image, pil_format: str) -> BytesIO:
     b = BytesIO()
+    image.save(b, format=pil_format, quality='maximum', optimize=True, progressive=True)
 
-    copied_image = image.convert('RGB').copy()
-    copied_image.thumbnail((sizes.width * 2, sizes.height * 2), Image.ANTIALIAS)
-    copied_image.save(b, format='JPEG', quality='maximum', optimize=True, progressive=True)
+    return b
 
-    resized_image_file = InMemoryUploadedFile(b, None, 'temp.jpg', 'image/jpeg', b.getbuffer().nbytes, None)
 
-    new_filename = generate_image_name_by_size(image_file_name, sizes)
-    default_storage.save(new_filename, resized_image_file)
+def resize_image_and_save(image_file_name, image, sizes: list[ThumbnailSizes]) -> None:
+    boxes = {(size.width * 2, size.height * 2): size for size in sizes}
+
+    for box, resized_image in resize_image_cascade(image, boxes):
+        b = save_image_to_buffer(resized_image, 'JPEG')
+        resized_image_file = InMemoryUploadedFile(b, None, 'temp.jpg', 'image/jpeg', b.getbuffer().nbytes, None)
+
+        new_filename = generate_image_name_by_size(image_file_name, boxes[box])
+        default_storage.save(new_filename, resized_image_file)
 
 
 def generate_image_name_by_size(name, sizes: ThumbnailSizes):
     return '%sx%s_%s' % (sizes.width, sizes.height, name)
-
@@ -0,0 +1,38 @@
+from collections.abc import Iterator
+from typing import Any
+
+import ujson
+
+
+class EncodedJSON(str):
+    """
+    Already encoded JSON which is emitted by `iterencode` as is.
+    """
+
+
+def iterencode(value: Any) -> Iterator[str]:
+    """
+    Encode value to JSON chunk by chunk. Dictionaries are encoded key by key
+    and iterators are encoded as arrays item by item, so iterator items can be
+    produced lazily and never have to be kept in memory all at once.
+    """
+    if isinstance(value, EncodedJSON):
+        yield value
+    elif isinstance(value, dict):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            if index:
+                yield ','
+            yield ujson.dumps(str(key))
+            yield ':'
+            yield from iterencode(item)
+        yield '}'
+    elif isinstance(value, Iterator):
+        yield '['
+        for index, item in enumerate(value):
+            if index:
+                yield ','
+            yield item if isinstance(item, EncodedJSON) else ujson.dumps(item)
+        yield ']'
+    else:
+        yield ujson.dumps(value)
@@ -1,4 +1,5 @@
-from django.db.models import Func, F, Value, FloatField, When, Case
+from django.db.models import Func, F, Value, FloatField, When, Case, CharField
+from django.db.models.expressions import RawSQL
 from django.db.models.functions import NullIf, Cast
 
 
@@ -29,3 +30,16 @@ def annotate_location_matrix_level_parts(queryset, level_field='level'):
         # It helps us to sort rows in the right alphabetically order.
         level_postfix=NullIf(Func(F(level_field), Value('^(-?\d+)'), Value(''), function='regexp_replace'), Value('')),
     )
+
+
+# Tables `location_matrix`, `subtasks` and `quality_issue` store the same level parts in generated
+# columns, which are covered by indexes of the default location ordering. Use them instead of
+# computing the parts for each row. Columns are read from the queryset table, which is always
+# selected, so the annotations don't depend on joins of the query.
+def annotate_stored_level_parts(queryset):
+    table = queryset.model._meta.db_table
+
+    return queryset.annotate(
+        level_number=RawSQL(f'"{table}"."level_number"', (), output_field=FloatField()),
+        level_postfix=RawSQL(f'"{table}"."level_postfix"', (), output_field=CharField()),
+    )
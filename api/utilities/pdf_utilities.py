@@ -1,56 +1,71 @@
-import os
-import tempfile
 from io import BytesIO
 from typing import Optional, Tuple
 
-import pydash
 import fitz
 from PIL import Image
+from django.core.files.storage import Storage
 
 
 DEFAULT_PDF_DPI = 72
 MAX_PDF_IMAGE_RESOLUTION = 6000
 
 
-def convert_pdf_page_to_image(page_number: int, pdf_data: BytesIO, image_options=None) -> \
-        Optional[BytesIO]:
-    if image_options is None:
-        image_options = {
-            'dpi': (DEFAULT_PDF_DPI, DEFAULT_PDF_DPI),
-            'alpha_layer': None
-        }
-
-    document = fitz.open(stream=pdf_data, filetype='pdf')
-
-    b = BytesIO()
-    try:
-        page = document[page_number - 1]
-        scale_x, scale_y, desired_dpi = calculate_scaling_factors((DEFAULT_PDF_DPI, DEFAULT_PDF_DPI),
-                                                                  pydash.get(image_options, 'dpi'),
+class PdfRasterizer:
+    """
+    Renders pages of an opened PDF document to Pillow images. Pixmap samples are wrapped
+    into the image directly, so nothing is written to temporary files, and several pages
+    or DPIs may be rendered from the same document.
+    """
+    def __init__(self, document: fitz.Document):
+        self.document = document
+
+    @classmethod
+    def from_data(cls, pdf_data: BytesIO | bytes) -> 'PdfRasterizer':
+        return cls(fitz.open(stream=pdf_data, filetype='pdf'))
+
+    @classmethod
+    def from_storage(cls, storage: Storage, name: str) -> 'PdfRasterizer':
+        # Local files are opened by path, so the document is read by pages on demand.
+        try:
+            return cls(fitz.open(storage.path(name), filetype='pdf'))
+        except NotImplementedError:
+            pass
+
+        with storage.open(name) as pdf_file:
+            return cls.from_data(pdf_file.read())
+
+    @property
+    def page_count(self) -> int:
+        return self.document.page_count
+
+    def render(self, page_number: int, dpi: Tuple[int, int] = (DEFAULT_PDF_DPI, DEFAULT_PDF_DPI),
+               alpha_layer: Optional[int] = None) -> Optional[Image.Image]:
+        try:
+            page = self.document[page_number - 1]
+        except IndexError:
+            return None
+
+        scale_x, scale_y, desired_dpi = calculate_scaling_factors((DEFAULT_PDF_DPI, DEFAULT_PDF_DPI), dpi,
                                                                   MAX_PDF_IMAGE_RESOLUTION,
                                                                   page.rect.width, page.rect.height)
 
-        matrix = fitz.Matrix(scale_x, scale_y)
-        pixmap = page.get_pixmap(matrix=matrix)
-
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            pixmap.save(temp_file.name, 'png')
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(scale_x, scale_y))
+        image = Image.frombytes('RGBA' if pixmap.alpha else 'RGB', (pixmap.width, pixmap.height), pixmap.samples)
+        image.info['dpi'] = desired_dpi
 
-        with Image.open(temp_file.name) as image:
-            alpha_layer = pydash.get(image_options, 'alpha_layer')
+        if alpha_layer is not None:
+            image.putalpha(alpha_layer)
 
-            if alpha_layer is not None:
-                image.putalpha(alpha_layer)
+        return image
 
-            image.save(b, 'png', dpi=desired_dpi)
+    def close(self) -> None:
+        self.document.close()
 
-        os.remove(temp_file.name)
+    def __enter__(self) -> 'PdfRasterizer':
+        return self
 
-        return b
-    except IndexError:
-        return None
-    finally:
-        document.close()
+    def __exit__(self, *args) -> None:
+        self.close()
 
 
 def calculate_scaling_factors(current_dpi: Tuple[int, int], desired_dpi: Tuple[int, int], max_resolution: int,
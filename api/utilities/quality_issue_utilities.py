@@ -3,7 +3,7 @@ from api.models import User
 
 def apply_default_queryset_filters(kwargs, queryset, request):
     if 'project_pk' in kwargs:
-        queryset = queryset.filter(location_matrix__project_id=kwargs['project_pk'])
+        queryset = queryset.filter(project_id=kwargs['project_pk'])
 
     user = request.user
     if getattr(user, 'is_client', False):
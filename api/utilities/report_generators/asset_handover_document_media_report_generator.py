@@ -1,16 +1,17 @@
 import csv
-from io import StringIO
 
 import pendulum
-from django.core.files.uploadedfile import SimpleUploadedFile
 
 from api.http.serializers.asset_handover.asset_handover_document_media.asset_handover_document_media_report_serializer import \
     AssetHandoverDocumentMediaReportSerializer
-from api.models import AssetHandover
+from api.models import AssetHandover, AssetHandoverDocumentMediaUpdate
+from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
 class AssetHandoverDocumentMediaReportGenerator(BaseReportGenerator):
+    cache_dependencies = (AssetHandoverDocumentMediaUpdate,)
+
     def generateCsv(self):
         from api.http.views import AssetHandoverViewSet
 
@@ -29,77 +30,76 @@ class AssetHandoverDocumentMediaReportGenerator(BaseReportGenerator):
             asset_handover_document__asset_handover__in=queryset.values('id')
         )
 
-        f = StringIO()
-
-        writer = csv.writer(f)
-        writer.writerow([
-            'Status',
-            'Document UID',
-            'Building',
-            'Level',
-            'Area',
-            'Package',
-            'Package Activity',
-            'Package Activity ID',
-            'User Identified',
-            'Date Uploaded',
-            'Time Uploaded',
-            'Date Modified',
-            'Time Modified',
-            'Date Complete',
-            'Time Complete',
-            'Status History',
-            'Status By',
-            'Status Comments',
-            'Status Change Date',
-            'Status Change Time',
-            'Document Title',
-            'Document Type',
-            'Document Format',
-        ])
-        queryset = queryset.select_related(
-            'asset_handover_document__asset_handover__location_matrix', 'media'
-        )
-        asset_handover_document_media_serializer = AssetHandoverDocumentMediaReportSerializer(
-            queryset,
-            many=True,
-            expand=AssetHandoverDocumentMediaReportSerializer.Meta.expandable_fields.keys(),
-            export_producer=AssetHandoverDocumentMediaReportSerializer.ExportProducer.CSV
-        )
-
-        for asset_handover_document_media in asset_handover_document_media_serializer.data:
+        csv_service = CsvFileService(file_name)
+        with csv_service.open_file() as f:
+            writer = csv.writer(f)
             writer.writerow([
-                asset_handover_document_media['expanded_status_view'],
-                asset_handover_document_media['uid'],
-
-                asset_handover_document_media['expanded_building'],
-                asset_handover_document_media['expanded_level'],
-                asset_handover_document_media['expanded_area'],
-
-                asset_handover_document_media['expanded_package'],
-                asset_handover_document_media['package_activity'],
-                asset_handover_document_media['package_activity_id'],
-
-                asset_handover_document_media['expanded_user_identified'],
-                asset_handover_document_media['expanded_last_uploaded_date'],
-                asset_handover_document_media['expanded_last_uploaded_time'],
-                asset_handover_document_media['expanded_last_modified_date'],
-                asset_handover_document_media['expanded_last_modified_time'],
-                asset_handover_document_media['expanded_completed_date'],
-                asset_handover_document_media['expanded_completed_time'],
-
-                asset_handover_document_media['expanded_status_history'],
-                asset_handover_document_media['expanded_status_by'],
-                asset_handover_document_media['expanded_status_comments'],
-                asset_handover_document_media['expanded_status_change_date'],
-                asset_handover_document_media['expanded_status_change_time'],
-
-                asset_handover_document_media['title'],
-                asset_handover_document_media['asset_handover_document_type'],
-                asset_handover_document_media['expanded_extension'],
+                'Status',
+                'Document UID',
+                'Building',
+                'Level',
+                'Area',
+                'Package',
+                'Package Activity',
+                'Package Activity ID',
+                'User Identified',
+                'Date Uploaded',
+                'Time Uploaded',
+                'Date Modified',
+                'Time Modified',
+                'Date Complete',
+                'Time Complete',
+                'Status History',
+                'Status By',
+                'Status Comments',
+                'Status Change Date',
+                'Status Change Time',
+                'Document Title',
+                'Document Type',
+                'Document Format',
             ])
-
-        return SimpleUploadedFile(content=f.getvalue().encode('utf8'), name=file_name, content_type='text/csv')
+            queryset = queryset.select_related(
+                'asset_handover_document__asset_handover__location_matrix', 'media'
+            )
+            asset_handover_document_media_data = self._serialize_by_chunks(
+                queryset, AssetHandoverDocumentMediaReportSerializer,
+                expand=AssetHandoverDocumentMediaReportSerializer.Meta.expandable_fields.keys(),
+                export_producer=AssetHandoverDocumentMediaReportSerializer.ExportProducer.CSV
+            )
+
+            for asset_handover_document_media in asset_handover_document_media_data:
+                writer.writerow([
+                    asset_handover_document_media['expanded_status_view'],
+                    asset_handover_document_media['uid'],
+
+                    asset_handover_document_media['expanded_building'],
+                    asset_handover_document_media['expanded_level'],
+                    asset_handover_document_media['expanded_area'],
+
+                    asset_handover_document_media['expanded_package'],
+                    asset_handover_document_media['package_activity'],
+                    asset_handover_document_media['package_activity_id'],
+
+                    asset_handover_document_media['expanded_user_identified'],
+                    asset_handover_document_media['expanded_last_uploaded_date'],
+                    asset_handover_document_media['expanded_last_uploaded_time'],
+                    asset_handover_document_media['expanded_last_modified_date'],
+                    asset_handover_document_media['expanded_last_modified_time'],
+                    asset_handover_document_media['expanded_completed_date'],
+                    asset_handover_document_media['expanded_completed_time'],
+
+                    asset_handover_document_media['expanded_status_history'],
+                    asset_handover_document_media['expanded_status_by'],
+                    asset_handover_document_media['expanded_status_comments'],
+                    asset_handover_document_media['expanded_status_change_date'],
+                    asset_handover_document_media['expanded_status_change_time'],
+
+                    asset_handover_document_media['title'],
+                    asset_handover_document_media['asset_handover_document_type'],
+                    asset_handover_document_media['expanded_extension'],
+                ])
+
+        return csv_service.close_file()
 
     def generatePdf(self):
         pass
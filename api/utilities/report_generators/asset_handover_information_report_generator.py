@@ -1,16 +1,17 @@
 import csv
-from io import StringIO
 
 import pendulum
-from django.core.files.uploadedfile import SimpleUploadedFile
 
 from api.http.serializers.asset_handover.asset_handover_document_media.asset_handover_document_media_report_serializer import \
     AssetHandoverDocumentMediaReportSerializer
-from api.models import AssetHandoverDocumentMedia
+from api.models import AssetHandoverDocumentMedia, AssetHandoverDocumentMediaUpdate
+from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
 class AssetHandoverInformationReportGenerator(BaseReportGenerator):
+    cache_dependencies = (AssetHandoverDocumentMediaUpdate,)
+
     def generateCsv(self):
         from api.http.views import AssetHandoverDocumentMediaViewSet
 
@@ -26,53 +27,52 @@ class AssetHandoverInformationReportGenerator(BaseReportGenerator):
         for backend in list(viewset.filter_backends):
             queryset = backend().filter_queryset(self.request, queryset, viewset)
 
-        f = StringIO()
-
-        writer = csv.writer(f)
-        writer.writerow([
-            'Building',
-            'Level',
-            'Area',
-            'Package',
-            'Package Activity',
-            'Company',
-            'Document Type',
-            'File Name',
-            'UID',
-            'Information',
-            'File Type'
-        ])
-
-        asset_handover_document_media_serializer = AssetHandoverDocumentMediaReportSerializer(
-            queryset,
-            many=True,
-            expand=[
-                'expanded_building',
-                'expanded_level',
-                'expanded_area',
-                'expanded_package',
-                'expanded_company',
-                'expanded_extension',
-            ],
-            export_producer=AssetHandoverDocumentMediaReportSerializer.ExportProducer.CSV
-        )
-
-        for asset_handover_document_media in asset_handover_document_media_serializer.data:
+        csv_service = CsvFileService(file_name)
+        with csv_service.open_file() as f:
+            writer = csv.writer(f)
             writer.writerow([
-                asset_handover_document_media['expanded_building'],
-                asset_handover_document_media['expanded_level'],
-                asset_handover_document_media['expanded_area'],
-                asset_handover_document_media['expanded_package'],
-                asset_handover_document_media['package_activity'],
-                asset_handover_document_media['expanded_company'],
-                asset_handover_document_media['asset_handover_document_type'],
-                asset_handover_document_media['title'],
-                asset_handover_document_media['uid'],
-                '',
-                asset_handover_document_media['expanded_extension'],
+                'Building',
+                'Level',
+                'Area',
+                'Package',
+                'Package Activity',
+                'Company',
+                'Document Type',
+                'File Name',
+                'UID',
+                'Information',
+                'File Type'
             ])
 
-        return SimpleUploadedFile(content=f.getvalue().encode('utf8'), name=file_name, content_type='text/csv')
+            asset_handover_document_media_data = self._serialize_by_chunks(
+                queryset, AssetHandoverDocumentMediaReportSerializer,
+                expand=[
+                    'expanded_building',
+                    'expanded_level',
+                    'expanded_area',
+                    'expanded_package',
+                    'expanded_company',
+                    'expanded_extension',
+                ],
+                export_producer=AssetHandoverDocumentMediaReportSerializer.ExportProducer.CSV
+            )
+
+            for asset_handover_document_media in asset_handover_document_media_data:
+                writer.writerow([
+                    asset_handover_document_media['expanded_building'],
+                    asset_handover_document_media['expanded_level'],
+                    asset_handover_document_media['expanded_area'],
+                    asset_handover_document_media['expanded_package'],
+                    asset_handover_document_media['package_activity'],
+                    asset_handover_document_media['expanded_company'],
+                    asset_handover_document_media['asset_handover_document_type'],
+                    asset_handover_document_media['title'],
+                    asset_handover_document_media['uid'],
+                    '',
+                    asset_handover_document_media['expanded_extension'],
+                ])
+
+        return csv_service.close_file()
 
     def generatePdf(self):
         pass
@@ -1,23 +1,47 @@
 from abc import abstractmethod, ABC
-from typing import Type
+from typing import Any, Callable, Iterator, Type
 
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db.models import QuerySet
 from rest_framework.request import Request
 
 from api.models import Project
 from api.models.base_model import BaseModel
+from api.utilities.report_utilities import ReportUtilities
 
 
 class BaseReportGenerator(ABC):
+    # Models besides the report model whose data is exported, used to detect changes of cached reports.
+    cache_dependencies: tuple = ()
+
     def __init__(self, project: Project, model: Type[BaseModel], request: Request):
         self.model = model
         self.project = project
         self.request = request
 
     @abstractmethod
-    def generatePdf(self) -> SimpleUploadedFile:
+    def generatePdf(self) -> UploadedFile:
         ...
 
     @abstractmethod
-    def generateCsv(self) -> SimpleUploadedFile:
+    def generateCsv(self) -> UploadedFile:
         ...
+
+    def _render_pdf_by_chunks(self, file_name: str, queryset: QuerySet,
+                              prepare_chunk: Callable[[list], Any], render_chunk: Callable[[Any], bytes]) -> UploadedFile:
+        from api.utilities.report_generators.pdf_chunk_renderer import PdfChunkRenderer
+
+        renderer = PdfChunkRenderer()
+        chunks = (prepare_chunk(objects) for objects in renderer.iterate_chunks(queryset))
+
+        return renderer.render(file_name, chunks, render_chunk)
+
+    def _iterate_queryset(self, queryset: QuerySet) -> Iterator:
+        for objects in ReportUtilities.iterate_by_chunks(queryset, settings.CSV_FILE_GENERATION_CHUNK_SIZE):
+            yield from objects
+
+    def _serialize_by_chunks(self, queryset: QuerySet, serializer_class: Type, **serializer_kwargs) -> Iterator[dict]:
+        # Only a chunk of serialized objects is kept in memory at once.
+        for objects in ReportUtilities.iterate_by_chunks(queryset, settings.CSV_FILE_GENERATION_CHUNK_SIZE):
+            yield from serializer_class(objects, many=True, **serializer_kwargs).data
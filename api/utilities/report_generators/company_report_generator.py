@@ -1,14 +1,16 @@
-from typing import List
+from typing import Iterator, List
 
 import pendulum
 from django.db.models import QuerySet, Count, Q
 
 from api.http.filters.company.company_filter import CompanyFilter
+from api.models import User
 from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
 class CompanyReportGenerator(BaseReportGenerator):
+    cache_dependencies = (User,)
 
     def generatePdf(self):
         pass
@@ -29,14 +31,14 @@ class CompanyReportGenerator(BaseReportGenerator):
         csv_service = CsvFileService(file_name)
         return csv_service.create_file(titles, rows_data)
 
-    def preparing_rows_data(self, queryset: QuerySet) -> List[List[str]]:
+    def preparing_rows_data(self, queryset: QuerySet) -> Iterator[List[str]]:
         date_format = '%d/%m/%Y'
-        return [
+        return (
             [obj.name,
              obj.user_count,
              obj.created_at.strftime(date_format)]
-            for obj in queryset
-        ]
+            for obj in self._iterate_queryset(queryset)
+        )
 
     def search_in_queryset(self, queryset: QuerySet) -> QuerySet:
         search = self.request.query_params.get('search')
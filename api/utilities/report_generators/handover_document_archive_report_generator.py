@@ -1,19 +1,22 @@
 import csv
-from io import StringIO
+from typing import TextIO
 
 import pendulum
+from django.conf import settings
 
 from api.models import PackageHandoverDocumentMedia, AssetHandoverDocumentMedia, Project
+from api.utilities.report_utilities import ReportUtilities
 
 
 class HandoverDocumentArchiveReportGenerator:
     def __init__(self, project: Project):
         self.project = project
 
-    def generate_csv(self) -> tuple:
-        file_name = self._get_report_file_name() + '.csv'
-        f = StringIO()
-        writer = csv.writer(f)
+    def get_file_name(self) -> str:
+        return self._get_report_file_name() + '.csv'
+
+    def write_csv(self, stream: TextIO) -> None:
+        writer = csv.writer(stream)
         writer.writerow([
             'Building',
             'Level',
@@ -31,8 +34,6 @@ class HandoverDocumentArchiveReportGenerator:
         self.__add_package_handover_rows(writer)
         self.__add_asset_handover_rows(writer)
 
-        return f.getvalue(), file_name
-
     def __add_package_handover_rows(self, writer) -> None:
         from api.http.serializers.package_handover.package_handover_document_media import \
             PackageHandoverDocumentMediaReportSerializer
@@ -42,18 +43,16 @@ class HandoverDocumentArchiveReportGenerator:
             package_handover_document__package_handover__deleted__isnull=True,
         ).all()
 
-        package_handover_document_media_serializer = PackageHandoverDocumentMediaReportSerializer(
+        for package_handover_document_media in self.__serialize_by_chunks(
             queryset,
-            many=True,
+            PackageHandoverDocumentMediaReportSerializer,
             expand=[
                 'expanded_company',
                 'expanded_extension',
                 'expanded_title',
             ],
             export_producer=PackageHandoverDocumentMediaReportSerializer.ExportProducer.CSV
-        )
-
-        for package_handover_document_media in package_handover_document_media_serializer.data:
+        ):
             writer.writerow([
                 '',
                 '',
@@ -78,9 +77,9 @@ class HandoverDocumentArchiveReportGenerator:
             asset_handover_document__deleted__isnull=True,
         ).all()
 
-        asset_handover_document_media_serializer = AssetHandoverDocumentMediaReportSerializer(
+        for asset_handover_document_media in self.__serialize_by_chunks(
             queryset,
-            many=True,
+            AssetHandoverDocumentMediaReportSerializer,
             expand=[
                 'expanded_building',
                 'expanded_level',
@@ -90,9 +89,7 @@ class HandoverDocumentArchiveReportGenerator:
                 'expanded_extension',
             ],
             export_producer=AssetHandoverDocumentMediaReportSerializer.ExportProducer.CSV
-        )
-
-        for asset_handover_document_media in asset_handover_document_media_serializer.data:
+        ):
             writer.writerow([
                 asset_handover_document_media['expanded_building'],
                 asset_handover_document_media['expanded_level'],
@@ -107,6 +104,11 @@ class HandoverDocumentArchiveReportGenerator:
                 asset_handover_document_media['expanded_extension'],
             ])
 
+    def __serialize_by_chunks(self, queryset, serializer_class, **serializer_kwargs):
+        # Rows are written to the archive entry, so only a chunk of serialized media is kept in memory.
+        for objects in ReportUtilities.iterate_by_chunks(queryset, settings.CSV_FILE_GENERATION_CHUNK_SIZE):
+            yield from serializer_class(objects, many=True, **serializer_kwargs).data
+
     def _get_report_file_name(self):
         project_name = self.project.name.replace(' ', '_')
         current_date = pendulum.now().to_datetime_string().replace(' ', '_')
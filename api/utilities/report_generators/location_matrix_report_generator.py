@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List
 
 import pendulum
 from django.db.models import QuerySet
@@ -31,11 +31,11 @@ class LocationMatrixReportGenerator(BaseReportGenerator):
 
         return csv_service.create_file(titles, rows_data)
 
-    def preparing_rows_data(self, queryset: QuerySet) -> List[List[str]]:
-        return [
+    def preparing_rows_data(self, queryset: QuerySet) -> Iterator[List[str]]:
+        return (
             [obj.building, obj.level, obj.area]
-            for obj in queryset
-        ]
+            for obj in self._iterate_queryset(queryset)
+        )
 
     def filter_queryset(self, queryset: QuerySet) -> QuerySet:
         f = LocationMatrixFilter(self.request.query_params, queryset=queryset)
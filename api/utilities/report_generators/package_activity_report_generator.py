@@ -1,15 +1,16 @@
-from typing import List
+from typing import Iterator, List
 
 import pendulum
 from django.db.models import QuerySet, Q
 
 from api.http.filters.package_activity import PackageActivityFilter
-from api.models import Project
+from api.models import Project, PackageActivityTask, PackageMatrix
 from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
 class PackageActivityReportGenerator(BaseReportGenerator):
+    cache_dependencies = (PackageActivityTask, PackageMatrix, Project)
 
     def generatePdf(self):
         pass
@@ -32,15 +33,15 @@ class PackageActivityReportGenerator(BaseReportGenerator):
         csv_service = CsvFileService(file_name)
         return csv_service.create_file(titles, rows_data)
 
-    def preparing_rows_data(self, queryset: QuerySet) -> List[List[str]]:
-        return [
+    def preparing_rows_data(self, queryset: QuerySet) -> Iterator[List[str]]:
+        return (
             [obj.name,
              obj.activity_id or '',
              self.get_quality_critical_tasks(obj.packageactivitytask_set.all()),
              self.get_projects_names(obj.id),
              self.get_files_urls(obj.files.all())]
-            for obj in queryset
-        ]
+            for obj in self._iterate_queryset(queryset)
+        )
 
     def get_projects_names(self, activity_pk: int) -> str:
         queryset = Project.objects.filter(
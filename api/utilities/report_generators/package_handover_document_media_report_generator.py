@@ -1,15 +1,16 @@
 import csv
-from io import StringIO
 
 import pendulum
-from django.core.files.uploadedfile import SimpleUploadedFile
 
 from api.http.serializers.package_handover.package_handover_document_media import PackageHandoverDocumentMediaReportSerializer
-from api.models import PackageHandover
+from api.models import PackageHandover, PackageHandoverDocumentMediaUpdate
+from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
 class PackageHandoverDocumentMediaReportGenerator(BaseReportGenerator):
+    cache_dependencies = (PackageHandoverDocumentMediaUpdate,)
+
     def generateCsv(self):
         from api.http.views import PackageHandoverViewSet
 
@@ -28,64 +29,63 @@ class PackageHandoverDocumentMediaReportGenerator(BaseReportGenerator):
             package_handover_document__package_handover__in=list(queryset.values_list('id', flat=True))
         )
 
-        f = StringIO()
-
-        writer = csv.writer(f)
-        writer.writerow([
-            'Status',
-            'Document UID',
-            'Package',
-            'Package Activity',
-            'Package Activity ID',
-            'User Identified',
-            'Date Uploaded',
-            'Time Uploaded',
-            'Date Modified',
-            'Time Modified',
-            'Date Complete',
-            'Time Complete',
-            'Status History',
-            'Status By',
-            'Status Comments',
-            'Status Change Date',
-            'Status Change Time',
-            'Document Title',
-            'Document Type',
-            'Document Format',
-        ])
-
-        package_handover_document_media_serializer = PackageHandoverDocumentMediaReportSerializer(
-            queryset,
-            many=True,
-            expand=PackageHandoverDocumentMediaReportSerializer.Meta.expandable_fields.keys(),
-            export_producer=PackageHandoverDocumentMediaReportSerializer.ExportProducer.CSV
-        )
-
-        for package_handover_document_media in package_handover_document_media_serializer.data:
+        csv_service = CsvFileService(file_name)
+        with csv_service.open_file() as f:
+            writer = csv.writer(f)
             writer.writerow([
-                package_handover_document_media['expanded_status_view'],
-                package_handover_document_media['uid'],
-                package_handover_document_media['package'],
-                package_handover_document_media['package_activity'],
-                package_handover_document_media['package_activity_id'],
-                package_handover_document_media['expanded_user_identified'],
-                package_handover_document_media['expanded_last_uploaded_date'],
-                package_handover_document_media['expanded_last_uploaded_time'],
-                package_handover_document_media['expanded_last_modified_date'],
-                package_handover_document_media['expanded_last_modified_time'],
-                package_handover_document_media['expanded_completed_date'],
-                package_handover_document_media['expanded_completed_time'],
-                package_handover_document_media['expanded_status_history'],
-                package_handover_document_media['expanded_status_by'],
-                package_handover_document_media['expanded_status_comments'],
-                package_handover_document_media['expanded_status_change_date'],
-                package_handover_document_media['expanded_status_change_time'],
-                package_handover_document_media['expanded_title'],
-                package_handover_document_media['package_handover_document_type'],
-                package_handover_document_media['expanded_extension'],
+                'Status',
+                'Document UID',
+                'Package',
+                'Package Activity',
+                'Package Activity ID',
+                'User Identified',
+                'Date Uploaded',
+                'Time Uploaded',
+                'Date Modified',
+                'Time Modified',
+                'Date Complete',
+                'Time Complete',
+                'Status History',
+                'Status By',
+                'Status Comments',
+                'Status Change Date',
+                'Status Change Time',
+                'Document Title',
+                'Document Type',
+                'Document Format',
             ])
 
-        return SimpleUploadedFile(content=f.getvalue().encode('utf8'), name=file_name, content_type='text/csv')
+            package_handover_document_media_data = self._serialize_by_chunks(
+                queryset, PackageHandoverDocumentMediaReportSerializer,
+                expand=PackageHandoverDocumentMediaReportSerializer.Meta.expandable_fields.keys(),
+                export_producer=PackageHandoverDocumentMediaReportSerializer.ExportProducer.CSV
+            )
+
+            for package_handover_document_media in package_handover_document_media_data:
+                writer.writerow([
+                    package_handover_document_media['expanded_status_view'],
+                    package_handover_document_media['uid'],
+                    package_handover_document_media['package'],
+                    package_handover_document_media['package_activity'],
+                    package_handover_document_media['package_activity_id'],
+                    package_handover_document_media['expanded_user_identified'],
+                    package_handover_document_media['expanded_last_uploaded_date'],
+                    package_handover_document_media['expanded_last_uploaded_time'],
+                    package_handover_document_media['expanded_last_modified_date'],
+                    package_handover_document_media['expanded_last_modified_time'],
+                    package_handover_document_media['expanded_completed_date'],
+                    package_handover_document_media['expanded_completed_time'],
+                    package_handover_document_media['expanded_status_history'],
+                    package_handover_document_media['expanded_status_by'],
+                    package_handover_document_media['expanded_status_comments'],
+                    package_handover_document_media['expanded_status_change_date'],
+                    package_handover_document_media['expanded_status_change_time'],
+                    package_handover_document_media['expanded_title'],
+                    package_handover_document_media['package_handover_document_type'],
+                    package_handover_document_media['expanded_extension'],
+                ])
+
+        return csv_service.close_file()
 
     def generatePdf(self):
         pass
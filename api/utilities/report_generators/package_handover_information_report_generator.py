@@ -1,15 +1,16 @@
 import csv
-from io import StringIO
 
 import pendulum
-from django.core.files.uploadedfile import SimpleUploadedFile
 
 from api.http.serializers.package_handover.package_handover_document_media import PackageHandoverDocumentMediaReportSerializer
-from api.models import PackageHandover, PackageHandoverDocumentMedia
+from api.models import PackageHandover, PackageHandoverDocumentMedia, PackageHandoverDocumentMediaUpdate
+from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
 class PackageHandoverInformationReportGenerator(BaseReportGenerator):
+    cache_dependencies = (PackageHandoverDocumentMediaUpdate,)
+
     def generateCsv(self):
         from api.http.views import PackageHandoverDocumentMediaViewSet
 
@@ -24,50 +25,49 @@ class PackageHandoverInformationReportGenerator(BaseReportGenerator):
         for backend in list(viewset.filter_backends):
             queryset = backend().filter_queryset(self.request, queryset, viewset)
 
-        f = StringIO()
-
-        writer = csv.writer(f)
-        writer.writerow([
-            'Building',
-            'Level',
-            'Area',
-            'Package',
-            'Package Activity',
-            'Company',
-            'Document Type',
-            'File Name',
-            'UID',
-            'Information',
-            'File Type'
-        ])
-
-        package_handover_document_media_serializer = PackageHandoverDocumentMediaReportSerializer(
-            queryset,
-            many=True,
-            expand=[
-                'expanded_company',
-                'expanded_extension',
-                'expanded_title',
-            ],
-            export_producer=PackageHandoverDocumentMediaReportSerializer.ExportProducer.CSV
-        )
-
-        for package_handover_document_media in package_handover_document_media_serializer.data:
+        csv_service = CsvFileService(file_name)
+        with csv_service.open_file() as f:
+            writer = csv.writer(f)
             writer.writerow([
-                '',
-                '',
-                '',
-                package_handover_document_media['package'],
-                package_handover_document_media['package_activity'],
-                package_handover_document_media['expanded_company'],
-                package_handover_document_media['package_handover_document_type'],
-                package_handover_document_media['expanded_title'],
-                package_handover_document_media['uid'],
-                package_handover_document_media['information'],
-                package_handover_document_media['expanded_extension'],
+                'Building',
+                'Level',
+                'Area',
+                'Package',
+                'Package Activity',
+                'Company',
+                'Document Type',
+                'File Name',
+                'UID',
+                'Information',
+                'File Type'
             ])
 
-        return SimpleUploadedFile(content=f.getvalue().encode('utf8'), name=file_name, content_type='text/csv')
+            package_handover_document_media_data = self._serialize_by_chunks(
+                queryset, PackageHandoverDocumentMediaReportSerializer,
+                expand=[
+                    'expanded_company',
+                    'expanded_extension',
+                    'expanded_title',
+                ],
+                export_producer=PackageHandoverDocumentMediaReportSerializer.ExportProducer.CSV
+            )
+
+            for package_handover_document_media in package_handover_document_media_data:
+                writer.writerow([
+                    '',
+                    '',
+                    '',
+                    package_handover_document_media['package'],
+                    package_handover_document_media['package_activity'],
+                    package_handover_document_media['expanded_company'],
+                    package_handover_document_media['package_handover_document_type'],
+                    package_handover_document_media['expanded_title'],
+                    package_handover_document_media['uid'],
+                    package_handover_document_media['information'],
+                    package_handover_document_media['expanded_extension'],
+                ])
+
+        return csv_service.close_file()
 
     def generatePdf(self):
         pass
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List
 
 import pendulum
 from django.db.models import QuerySet
@@ -25,10 +25,10 @@ class PackageReportGenerator(BaseReportGenerator):
         csv_service = CsvFileService(file_name)
         return csv_service.create_file(titles, rows_data)
 
-    def preparing_rows_data(self, queryset: QuerySet) -> List[List[str]]:
+    def preparing_rows_data(self, queryset: QuerySet) -> Iterator[List[str]]:
         date_format = '%d/%m/%Y'
-        return [
+        return (
             [obj.name,
              obj.created_at.strftime(date_format)]
-            for obj in queryset
-        ]
+            for obj in self._iterate_queryset(queryset)
+        )
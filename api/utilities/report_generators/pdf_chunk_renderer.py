@@ -0,0 +1,108 @@
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryFile
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import fitz
+from PyPDF2 import PdfWriter
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db.models import QuerySet
+
+from api.utilities.report_utilities import ReportUtilities
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_pdf_render_executor() -> ThreadPoolExecutor:
+    # Pool is shared by all reports of the process to bound amount of wkhtmltopdf runs.
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.PDF_FILE_GENERATION_THREADS_BATCH_SIZE,
+                                           thread_name_prefix='pdf-report')
+
+    return _executor
+
+
+class PdfChunkRenderer:
+    """
+    Renders report by chunks in the shared pool and merges rendered chunks in their order.
+    Chunks are kept in local temporary files and each of them is appended to the report file
+    by an incremental save as soon as it is rendered, so pages of the merged chunks are not
+    held in memory.
+    """
+    def __init__(self, chunk_size: Optional[int] = None, executor: Optional[ThreadPoolExecutor] = None):
+        self.chunk_size = chunk_size or settings.PDF_FILE_GENERATION_CHUNK_SIZE
+        self.executor = executor or get_pdf_render_executor()
+        self.max_pending_chunks = settings.PDF_FILE_GENERATION_THREADS_BATCH_SIZE
+
+    def iterate_chunks(self, queryset: QuerySet) -> Iterator[list]:
+        return ReportUtilities.iterate_by_chunks(queryset, self.chunk_size)
+
+    def render(self, file_name: str, chunks: Iterable[Any], render_chunk: Callable[[Any], bytes]) -> TemporaryUploadedFile:
+        """
+        Render each of prepared chunks with `render_chunk` in the pool. Chunks should be prepared
+        in the caller thread, as it is the one which holds the database connection.
+        """
+        pending_chunks = deque()
+        report = TemporaryUploadedFile(name=file_name, content_type='application/pdf', size=None, charset=None)
+
+        def merge_next_chunk():
+            with pending_chunks.popleft().result() as chunk_file:
+                self._append_chunk(report, chunk_file)
+
+        try:
+            for chunk in chunks:
+                pending_chunks.append(self.executor.submit(self._render_to_file, render_chunk, chunk))
+
+                # Wait for the oldest chunk to keep only a bounded amount of prepared chunks.
+                if len(pending_chunks) >= self.max_pending_chunks:
+                    merge_next_chunk()
+
+            while pending_chunks:
+                merge_next_chunk()
+
+            if not report.tell():
+                PdfWriter().write(report)
+
+            report.seek(0, 2)
+            report.size = report.tell()
+            report.seek(0)
+
+            return report
+        except BaseException:
+            report.close()
+            raise
+        finally:
+            for pending_chunk in pending_chunks:
+                if not pending_chunk.cancel() and pending_chunk.exception() is None:
+                    pending_chunk.result().close()
+
+    @staticmethod
+    def _append_chunk(report: TemporaryUploadedFile, chunk_file) -> None:
+        if not report.tell():
+            # The first chunk is the report itself, next chunks are appended to it.
+            shutil.copyfileobj(chunk_file, report)
+            report.flush()
+            return
+
+        # Report is reopened for each chunk, so only its cross-reference table is loaded.
+        with fitz.open(report.temporary_file_path()) as document, \
+                fitz.open(stream=chunk_file.read(), filetype='pdf') as chunk_document:
+            document.insert_pdf(chunk_document)
+            document.save(report.temporary_file_path(), incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+
+        report.seek(0, 2)
+
+    @staticmethod
+    def _render_to_file(render_chunk: Callable[[Any], bytes], chunk: Any):
+        chunk_file = TemporaryFile()
+        chunk_file.write(render_chunk(chunk))
+        chunk_file.seek(0)
+
+        return chunk_file
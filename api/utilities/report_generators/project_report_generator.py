@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List
 
 import pendulum
 from django.db.models import QuerySet, Q
@@ -38,9 +38,9 @@ class ProjectReportGenerator(BaseReportGenerator):
         csv_service = CsvFileService(file_name)
         return csv_service.create_file(titles, rows_data)
 
-    def preparing_rows_data(self, queryset: QuerySet) -> List[List[str]]:
+    def preparing_rows_data(self, queryset: QuerySet) -> Iterator[List[str]]:
         date_format = '%d/%m/%Y'
-        return [
+        return (
             [obj.name,
              obj.number,
              obj.image.get_full_link() if getattr(obj, 'image', None) else '',
@@ -52,8 +52,8 @@ class ProjectReportGenerator(BaseReportGenerator):
              self.boll_to_human_case(obj.show_estimated_man_hours),
              self.boll_to_human_case(obj.is_subtask_visible_for_clients),
              self.boll_to_human_case(obj.is_task_visible_for_clients)]
-            for obj in queryset
-        ]
+            for obj in self._iterate_queryset(queryset)
+        )
 
     def search_in_queryset(self, queryset: QuerySet) -> QuerySet:
         search = self.request.query_params.get('search')
@@ -1,5 +1,4 @@
 import csv
-from io import StringIO
 
 import pendulum
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -10,6 +9,7 @@ from api.http.serializers.user import UserReportSerializer
 from api.http.serializers.quality_issue.quality_issue_report_serializer import QualityIssueReportSerializer
 from api.models import QualityIssueUpdate
 from api.utilities.quality_issue_utilities import apply_default_queryset_filters
+from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
@@ -64,65 +64,64 @@ class QualityIssueReportGenerator(BaseReportGenerator):
         from api.http.views import QualityIssueViewSet
 
         file_name = self.__get_report_file_name() + '.csv'
-        f = StringIO()
-
-        writer = csv.writer(f)
-        writer.writerow([
-            'ID', 'Building', 'Level', 'Area', 'Quality Issue Description', 'Attachments URLs', 'Status By',
-            'Created By', 'Created Date', 'Created Time', 'Response category', 'Response Date', 'Response Time',
-            'Current Status', 'Latest Comment', 'Comment User', 'Comment Date'
-        ])
-
-        queryset = self.model.objects.all()
-        viewset = QualityIssueViewSet()
-        queryset = apply_default_queryset_filters(self.request.parser_context['kwargs'], queryset, self.request)
-
-        for backend in list(viewset.filter_backends):
-            queryset = backend().filter_queryset(self.request, queryset, viewset)
+        csv_service = CsvFileService(file_name)
+        with csv_service.open_file() as f:
+            writer = csv.writer(f)
+            writer.writerow([
+                'ID', 'Building', 'Level', 'Area', 'Quality Issue Description', 'Attachments URLs', 'Status By',
+                'Created By', 'Created Date', 'Created Time', 'Response category', 'Response Date', 'Response Time',
+                'Current Status', 'Latest Comment', 'Comment User', 'Comment Date'
+            ])
 
-        queryset = queryset.select_related(
-            'location_matrix__project',
-            'user__company',
-            'response_category'
-        ).prefetch_related(
-            'attachments',
-            Prefetch(
-                'qualityissueupdate_set',
-                queryset=QualityIssueUpdate.objects.filter(
-                    is_comment=True).select_related('user').order_by('-created_at'),
-                to_attr='latest_comment'
+            queryset = self.model.objects.all()
+            viewset = QualityIssueViewSet()
+            queryset = apply_default_queryset_filters(self.request.parser_context['kwargs'], queryset, self.request)
+
+            for backend in list(viewset.filter_backends):
+                queryset = backend().filter_queryset(self.request, queryset, viewset)
+
+            queryset = queryset.select_related(
+                'location_matrix__project',
+                'user__company',
+                'response_category'
+            ).prefetch_related(
+                'attachments',
+                Prefetch(
+                    'qualityissueupdate_set',
+                    queryset=QualityIssueUpdate.objects.filter(
+                        is_comment=True).select_related('user').order_by('-created_at'),
+                    to_attr='latest_comment'
+                )
             )
-        )
-
-        quality_issue_serializer = QualityIssueReportSerializer(
-            queryset,
-            expand=QualityIssueReportSerializer.Meta.expandable_fields.keys(),
-            many=True,
-            export_producer=QualityIssueReportSerializer.ExportProducer.CSV
-        )
 
-        for quality_issue_data in quality_issue_serializer.data:
-            writer.writerow([
-                quality_issue_data['expanded_id'],
-                quality_issue_data['expanded_building'],
-                quality_issue_data['expanded_level'],
-                quality_issue_data['expanded_area'],
-                quality_issue_data['description'],
-                quality_issue_data['expanded_files_urls'],
-                quality_issue_data['expanded_status_by'],
-                quality_issue_data['expanded_created_by'],
-                quality_issue_data['expanded_created_date'],
-                quality_issue_data['expanded_created_time'],
-                quality_issue_data['expanded_response_category'],
-                quality_issue_data['expanded_response_date'],
-                quality_issue_data['expanded_response_time'],
-                quality_issue_data['expanded_status_name'],
-                quality_issue_data['expanded_latest_comment'],
-                quality_issue_data['expanded_latest_comment_user'],
-                quality_issue_data['expanded_latest_comment_date']
-            ])
+            quality_issues_data = self._serialize_by_chunks(
+                queryset, QualityIssueReportSerializer,
+                expand=QualityIssueReportSerializer.Meta.expandable_fields.keys(),
+                export_producer=QualityIssueReportSerializer.ExportProducer.CSV
+            )
 
-        return SimpleUploadedFile(content=f.getvalue().encode('utf8'), name=file_name, content_type='text/csv')
+            for quality_issue_data in quality_issues_data:
+                writer.writerow([
+                    quality_issue_data['expanded_id'],
+                    quality_issue_data['expanded_building'],
+                    quality_issue_data['expanded_level'],
+                    quality_issue_data['expanded_area'],
+                    quality_issue_data['description'],
+                    quality_issue_data['expanded_files_urls'],
+                    quality_issue_data['expanded_status_by'],
+                    quality_issue_data['expanded_created_by'],
+                    quality_issue_data['expanded_created_date'],
+                    quality_issue_data['expanded_created_time'],
+                    quality_issue_data['expanded_response_category'],
+                    quality_issue_data['expanded_response_date'],
+                    quality_issue_data['expanded_response_time'],
+                    quality_issue_data['expanded_status_name'],
+                    quality_issue_data['expanded_latest_comment'],
+                    quality_issue_data['expanded_latest_comment_user'],
+                    quality_issue_data['expanded_latest_comment_date']
+                ])
+
+        return csv_service.close_file()
 
     def __get_report_file_name(self):
         project_name = self.project.name.replace(' ', '-')
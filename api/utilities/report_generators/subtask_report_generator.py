@@ -1,17 +1,29 @@
 import csv
-from io import StringIO
+from datetime import datetime
+from typing import Iterator, Optional
 
 import pendulum
+from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import Prefetch, QuerySet
 from wkhtmltopdf import render_pdf_from_template
 
 from api.http.serializers.user import UserReportSerializer
 from api.http.serializers.subtask.subtasks_report_serializer import SubtasksReportSerializer
+from api.models import PackageMatrix, Subtask, SubtaskUpdate, User
+from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
+from api.utilities.report_utilities import ReportUtilities
 from api.utilities.subtask_utilities import apply_common_filters_queryset, apply_default_ordering
+from api.utilities.time_utilities import change_timezone_to_london
 
 
 class SubtaskReportGenerator(BaseReportGenerator):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Subcontractor names are shared by subtasks of the same project and company.
+        self._subcontractor_names = {}
+
     def generatePdf(self):
         from api.http.views import SubtaskViewSet
 
@@ -64,86 +76,144 @@ class SubtaskReportGenerator(BaseReportGenerator):
         from api.http.views import SubtaskViewSet
 
         file_name = self._get_report_file_name() + '.csv'
-        f = StringIO()
-
-        writer = csv.writer(f)
-        writer.writerow([
-            'Rework ID', 'Rework Description', 'Project Number', 'Building', 'Level', 'Area', 'Location Description',
-            'Package', 'Package Activity', 'Package Activity ID', 'Quality Critical Task', 'User Identified',
-            'Date Raised', 'Time Raised', 'Attachment URLs', 'Date Complete', 'Time Complete', 'Recipients', 'Due Date',
-            'Due Time', 'Estimated man hours to be completed', 'User Closed', 'Closed Comments', 'Closed Image URLs',
-            'Status', 'Last User', 'Last Update Date', 'Last Update Time', 'Subcontractor Company',
-            'Subcontractor Name', 'Latest Comment'
-        ])
-
-        queryset = self.model.objects.all()
-        viewset = SubtaskViewSet()
-        queryset = apply_common_filters_queryset(queryset, self.request, self.request.parser_context['kwargs'])
-        queryset = apply_default_ordering(queryset, self.request)
-
-        for backend in list(viewset.filter_backends):
-            queryset = backend().filter_queryset(self.request, queryset, viewset)
-
-        subtasks_serializer = SubtasksReportSerializer(
-            queryset,
-            expand=SubtasksReportSerializer.Meta.expandable_fields.keys(),
-            many=True,
-            export_producer=SubtasksReportSerializer.ExportProducer.CSV
-        )
-
-        for subtask_data in subtasks_serializer.data:
+        csv_service = CsvFileService(file_name)
+        with csv_service.open_file() as f:
+            writer = csv.writer(f)
             writer.writerow([
-                self._get_rework_id(subtask_data),
-                subtask_data['description'],
-                subtask_data['expanded_project_number'],
-
-                subtask_data['expanded_building'],
-                subtask_data['expanded_level'],
-                subtask_data['expanded_area'],
-                subtask_data['location_description'],
-
-                subtask_data['expanded_package'],
-                subtask_data['expanded_package_activity_name'],
-                subtask_data['expanded_package_activity_id'],
-                subtask_data['expanded_package_activity_task_description'],
-
-                subtask_data['expanded_identified_user'],
-                subtask_data['expanded_date_raised'],
-                subtask_data['expanded_time_raised'],
-                subtask_data['expanded_files_urls'],
-
-                subtask_data['expanded_date_of_completion'],
-                subtask_data['expanded_time_of_completion'],
-
-                subtask_data['expanded_recipients'],
-
-                subtask_data['expanded_due_date'],
-                subtask_data['expanded_due_time'],
-
-                subtask_data['expanded_estimation'],
-
-                subtask_data['expanded_user_closed'],
-                subtask_data['expanded_closed_comments'],
-                subtask_data['expanded_closed_files_urls'],
-
-                subtask_data['expanded_last_status'],
-                subtask_data['expanded_last_user'],
-                subtask_data['expanded_last_update_date'],
-                subtask_data['expanded_last_update_time'],
-
-                subtask_data['subcontractor_company'],
-                subtask_data['subcontractor_name'],
-                subtask_data['expanded_last_comment'],
+                'Rework ID', 'Rework Description', 'Project Number', 'Building', 'Level', 'Area', 'Location Description',
+                'Package', 'Package Activity', 'Package Activity ID', 'Quality Critical Task', 'User Identified',
+                'Date Raised', 'Time Raised', 'Attachment URLs', 'Date Complete', 'Time Complete', 'Recipients', 'Due Date',
+                'Due Time', 'Estimated man hours to be completed', 'User Closed', 'Closed Comments', 'Closed Image URLs',
+                'Status', 'Last User', 'Last Update Date', 'Last Update Time', 'Subcontractor Company',
+                'Subcontractor Name', 'Latest Comment'
             ])
 
-        return SimpleUploadedFile(content=f.getvalue().encode('utf8'), name=file_name, content_type='text/csv')
+            queryset = self.model.objects.all()
+            viewset = SubtaskViewSet()
+            queryset = apply_common_filters_queryset(queryset, self.request, self.request.parser_context['kwargs'])
+            queryset = apply_default_ordering(queryset, self.request)
+
+            for backend in list(viewset.filter_backends):
+                queryset = backend().filter_queryset(self.request, queryset, viewset)
+
+            for subtasks in ReportUtilities.iterate_by_chunks(self._prefetch_csv_data(queryset),
+                                                              settings.CSV_FILE_GENERATION_CHUNK_SIZE):
+                writer.writerows(self._get_csv_rows(subtasks))
+
+        return csv_service.close_file()
+
+    def _prefetch_csv_data(self, queryset: QuerySet) -> QuerySet:
+        return queryset.select_related(
+            'user', 'company', 'task__project', 'task__location_matrix__project',
+            'task__package_activity', 'task__package_activity_task'
+        ).prefetch_related(
+            'files',
+            Prefetch(
+                'subtaskupdate_set',
+                queryset=SubtaskUpdate.objects.select_related('user').prefetch_related('recipients', 'files')
+                .order_by('created_at', 'id'),
+                to_attr='report_updates'
+            ),
+        )
+
+    def _get_csv_rows(self, subtasks: list[Subtask]) -> Iterator[list]:
+        # Rows are built from values loaded for the whole chunk, the same values
+        # as SubtasksReportSerializer gives with queries per subtask.
+        packages = self._get_packages(subtasks)
+
+        for subtask in subtasks:
+            task = subtask.task
+            location_matrix = task.location_matrix
+            updates = subtask.report_updates
+            last_update = updates[-1] if updates else None
+            closing_update = next((update for update in reversed(updates)
+                                   if (update.new_data or {}).get('status') == Subtask.Status.CLOSED), None)
+            comment_update = next((update for update in reversed(updates) if update.is_comment), None)
+
+            yield [
+                '%s-R-%s%s' % (location_matrix.project.number, subtask.pk,
+                               f' (QI-{subtask.quality_issue_id})' if subtask.quality_issue_id else ''),
+                subtask.description,
+                location_matrix.project.number,
+
+                location_matrix.building,
+                location_matrix.level,
+                location_matrix.area,
+                subtask.location_description,
+
+                packages.get((location_matrix.project_id, task.package_activity_id)),
+                task.package_activity.name,
+                task.package_activity.activity_id or '',
+                task.package_activity_task.description,
+
+                subtask.user.get_full_name(),
+                self._format_csv_date(subtask.created_at),
+                self._format_csv_time(subtask.created_at),
+                ' '.join(ReportUtilities.get_file_link(file) for file in subtask.files.all()),
+
+                self._format_csv_date(subtask.date_of_completion),
+                self._format_csv_time(subtask.date_of_completion),
+
+                ''.join(f"{count} {', '.join(recipient.email for recipient in update.recipients.all())}\n"
+                        for count, update in enumerate(updates, start=1)),
+
+                self._format_csv_date(subtask.due_date),
+                self._format_csv_time(subtask.due_date),
+
+                subtask.estimation,
+
+                closing_update.user.get_full_name() if closing_update else '',
+                closing_update.comment if closing_update else '',
+                ', '.join(ReportUtilities.get_file_link(file) for file in closing_update.files.all())
+                if closing_update else '',
+
+                subtask.get_to_report_status_name(),
+                last_update.user.get_full_name() if last_update else '',
+                self._format_csv_date(getattr(last_update, 'created_at', None)),
+                self._format_csv_time(getattr(last_update, 'created_at', None)),
+
+                subtask.company.name if subtask.company else '',
+                self._get_subcontractor_name(subtask),
+                comment_update.comment if comment_update else None,
+            ]
+
+    def _get_packages(self, subtasks: list[Subtask]) -> dict[tuple[int, int], str]:
+        # Package of a deleted package matrix is used only when the activity has no other one.
+        package_matrices = PackageMatrix.all_objects.filter(
+            project__in={subtask.task.location_matrix.project_id for subtask in subtasks},
+            package_activity__in={subtask.task.package_activity_id for subtask in subtasks},
+        ).select_related('package').order_by('pk')
+
+        packages, deleted_packages = {}, {}
+        for package_matrix in package_matrices:
+            key = (package_matrix.project_id, package_matrix.package_activity_id)
+            (deleted_packages if package_matrix.deleted else packages).setdefault(key, package_matrix.package.name)
+
+        return {**deleted_packages, **packages}
+
+    def _get_subcontractor_name(self, subtask: Subtask) -> str:
+        if not subtask.task.project:
+            return ''
+
+        key = (subtask.task.project_id, subtask.company_id)
+        if key not in self._subcontractor_names:
+            filters = {'group_id': User.Group.SUBCONTRACTOR}
+            if subtask.company:
+                filters['company_id'] = subtask.company_id
+            self._subcontractor_names[key] = '\n'.join(
+                user.get_full_name() for user in subtask.task.project.users.filter(**filters)
+            )
+
+        return self._subcontractor_names[key]
+
+    def _format_csv_date(self, date: Optional[datetime]) -> str:
+        return change_timezone_to_london(date).strftime('%d/%m/%Y') if date else ''
+
+    def _format_csv_time(self, date: Optional[datetime]) -> str:
+        return change_timezone_to_london(date).strftime('%I:%M %p') if date else ''
 
     def _get_report_file_name(self):
         project_name = self.project.name.replace(' ', '-')
         current_date = pendulum.now().to_datetime_string().replace(' ', '_').replace(':', '-')
 
         return '%s-R-Report_%s' % (project_name, current_date)
-
-    def _get_rework_id(self, task_data):
-        return '%s-R-%s%s' % (task_data['expanded_project_number'], task_data['id'],
-                              f" (QI-{task_data['quality_issue']})" if task_data['quality_issue'] else '')
@@ -1,14 +1,16 @@
-from typing import List
+from typing import Iterator, List
 
 import pendulum
 from django.db.models import QuerySet, Q
 
 from api.http.filters import UserFilter
+from api.models import Company, Project
 from api.services.csv_file_service import CsvFileService
 from api.utilities.report_generators import BaseReportGenerator
 
 
 class UserReportGenerator(BaseReportGenerator):
+    cache_dependencies = (Company, Project)
 
     def generatePdf(self):
         pass
@@ -36,9 +38,9 @@ class UserReportGenerator(BaseReportGenerator):
         csv_service = CsvFileService(file_name)
         return csv_service.create_file(titles, rows_data)
 
-    def preparing_rows_data(self, queryset: QuerySet) -> List[List[str]]:
+    def preparing_rows_data(self, queryset: QuerySet) -> Iterator[List[str]]:
         date_format = '%d/%m/%Y'
-        return [
+        return (
             [user.get_status_display(),
              user.first_name,
              user.last_name,
@@ -49,8 +51,8 @@ class UserReportGenerator(BaseReportGenerator):
              user.get_group_label(),
              self.get_projects(user.project_set.all()),
              user.created_at.strftime(date_format)]
-            for user in queryset
-        ]
+            for user in self._iterate_queryset(queryset)
+        )
 
     def get_projects(self, projects: QuerySet) -> str:
         return '\n'.join([project.name for project in projects])
@@ -1,4 +1,7 @@
+from typing import Iterator
+
 from django.core.files.storage import default_storage
+from django.db.models import QuerySet
 
 from mbuild.settings import IMAGE_EXTENSIONS
 
@@ -28,3 +31,27 @@ class ReportUtilities:
     def get_file_link(cls, media) -> str:
         return default_storage.url(media.name) if media.is_public else media.link
 
+    @classmethod
+    def iterate_by_chunks(cls, queryset: QuerySet, chunk_size: int) -> Iterator[list]:
+        # Iterator doesn't apply prefetching, so such querysets are
+        # loaded by chunks of primary keys fetched in their order.
+        if not queryset._prefetch_related_lookups:
+            chunk = []
+            for obj in queryset.iterator(chunk_size=chunk_size):
+                chunk.append(obj)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+
+            if chunk:
+                yield chunk
+
+            return
+
+        pks = list(dict.fromkeys(queryset.values_list('pk', flat=True)))
+
+        for start in range(0, len(pks), chunk_size):
+            chunk_pks = pks[start:start + chunk_size]
+            objects = {obj.pk: obj for obj in queryset.filter(pk__in=chunk_pks)}
+
+            yield [objects[pk] for pk in chunk_pks if pk in objects]
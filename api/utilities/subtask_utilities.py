@@ -17,7 +17,7 @@ def apply_common_filters_queryset(queryset, request, kwargs, filter_subcontracto
 
     if 'project_pk' in kwargs:
         filters = {
-            'task__project': kwargs['project_pk']
+            'project': kwargs['project_pk']
         }
 
         if filter_subcontractors and bool(request.user) and request.user.is_subcontractor:
@@ -39,7 +39,7 @@ def apply_default_ordering(queryset, request):
                      RawSQL('subtasks.level_number', ()).desc(),
                      RawSQL('subtasks.level_postfix', ()),
                      'area',
-                     'task__package_activity').all()
+                     'package_activity_id').all()
 
     return queryset
 
@@ -0,0 +1,32 @@
+from typing import Callable, Optional, TypeVar
+
+from django.db import transaction
+
+Outbox = TypeVar('Outbox', bound=Callable[[], None])
+
+
+def get_transaction_outbox(name: str, create_outbox: Callable[[], Outbox]) -> Optional[Outbox]:
+    """
+    Returns the outbox of the current savepoint, which is called once the transaction is committed.
+    Outside of a transaction there is no outbox, so the caller should write at once.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+
+    # Outboxes are registered as commit hooks per savepoint, so Django drops them together
+    # with their content on rollback. Django replaces the list of commit hooks when a transaction
+    # ends or a savepoint is rolled back, so outboxes collected for the previous list are
+    # not used anymore. Outboxes which are still registered are called on commit anyway.
+    attribute = f'{name}_outboxes'
+    commit_hooks, outboxes = getattr(connection, attribute, (None, None))
+    if commit_hooks is not connection.run_on_commit:
+        outboxes = dict()
+        setattr(connection, attribute, (connection.run_on_commit, outboxes))
+
+    savepoint_ids = tuple(connection.savepoint_ids)
+    if savepoint_ids not in outboxes:
+        outboxes[savepoint_ids] = create_outbox()
+        transaction.on_commit(outboxes[savepoint_ids])
+
+    return outboxes[savepoint_ids]
@@ -1,6 +1,10 @@
 import os
 from celery import Celery
 from kombu import Queue
+from kombu.serialization import register
+
+from api.utilities.celery_utilities import TASK_ARGUMENTS_CONTENT_TYPE, TASK_ARGUMENTS_SERIALIZER, \
+    decode_task_arguments, encode_task_arguments
 
 from mbuild.settings import AZURE_ACCOUNT_KEY, AZURE_ACCOUNT_NAME, AZURE_BASE_DOMAIN, REDIS_HOST
 from mbuild.settings.common import env, ENV
@@ -10,13 +14,17 @@ AVAILABLE_ENVS = ['local', 'development', 'staging', 'testing', 'production']
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mbuild.settings')
 
-app = Celery('mbuild')
+app = Celery('mbuild', task_cls='api.utilities.celery_utilities:ModelReferencesTask')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
+register(TASK_ARGUMENTS_SERIALIZER, encode_task_arguments, decode_task_arguments,
+         content_type=TASK_ARGUMENTS_CONTENT_TYPE, content_encoding='utf-8')
+
 app.conf.update(
-    task_serializer='pickle',
-    result_serializer='pickle',
-    accept_content=['pickle'],
+    task_serializer=TASK_ARGUMENTS_SERIALIZER,
+    result_serializer='json',
+    # Pickle is still accepted for messages sent before the task arguments serializer was introduced.
+    accept_content=[TASK_ARGUMENTS_SERIALIZER, 'pickle'],
     broker_transport_options={'use_lock_renewal': True}
 )
 
@@ -39,6 +47,7 @@ app.conf.imports = (
     'api.queues.celery.asset_handover_statistics',
     'api.queues.celery.delete_related_to_hidden_qct_tasks',
     'api.queues.celery.destroy_project',
+    'api.queues.celery.event',
     'api.queues.celery.floor_plan',
     'api.queues.celery.handover_document',
     'api.queues.celery.handover_document_archive',
@@ -49,10 +58,12 @@ app.conf.imports = (
     'api.queues.celery.package_activity_tasks_hard_delete_related_qct',
     'api.queues.celery.package_handover',
     'api.queues.celery.package_handover_statistics',
+    'api.queues.celery.project_snapshot',
     'api.queues.celery.quality_issue',
     'api.queues.celery.restore_related_to_hidden_qct_tasks',
     'api.queues.celery.restore_tasks_related_to_reinstated_location_matrix',
     'api.queues.celery.restore_tasks_related_to_reinstated_package_matrix',
+    'api.queues.celery.search_document',
     'api.queues.celery.send_report',
     'api.queues.celery.subtask_update',
     'api.queues.celery.subtasks',
@@ -155,14 +155,26 @@ PRIVATE_MEDIA_URL_CACHE_LIFETIME = env.int('PRIVATE_MEDIA_URL_CACHE_LIFETIME', 6
 PRIVATE_REPORT_URL_CACHE_LIFETIME = env.int('PRIVATE_REPORT_URL_CACHE_LIFETIME', 60 * 60)  # 1 hour
 PRIVATE_PROJECT_SNAPSHOT_URL_CACHE_LIFETIME = env.int('PRIVATE_PROJECT_SNAPSHOT_URL_CACHE_LIFETIME', 60 * 60)  # 1 hour
 
+PROJECT_ACCESS_CACHE_LIFETIME = env.int('PROJECT_ACCESS_CACHE_LIFETIME', 60 * 5)  # 5 minutes
+
 PROJECT_SNAPSHOT_GENERATION_DELAY_IN_MINUTES = env.int('PROJECT_SNAPSHOT_GENERATION_DELAY_IN_MINUTES', 60)
+PROJECT_SNAPSHOT_FRAGMENT_CACHE_LIFETIME = env.int('PROJECT_SNAPSHOT_FRAGMENT_CACHE_LIFETIME', 60 * 60 * 24)  # 1 day
 
 SUBTASK_DEFECT_STATUS_UPDATE_IN_MINUTES = env.int('SUBTASK_DEFECT_STATUS_UPDATE_IN_MINUTES', 60)
 
+COMMANDS_PROCESSING_BATCH_SIZE = env.int('COMMANDS_PROCESSING_BATCH_SIZE', 100)
+
 SUMMARY_RUN_AT_TIME = env.str('SUMMARY_RUN_AT_TIME', '17:00')
 
 EXPORT_EVENTS = env.bool('EXPORT_EVENTS', False)
 
+# Collect events created inside a transaction and insert them once on commit.
+EVENTS_OUTBOX_ENABLED = env.bool('EVENTS_OUTBOX_ENABLED', True)
+# Serialize collected events on the `events` queue instead of the request.
+EVENTS_ASYNC_SERIALIZATION = env.bool('EVENTS_ASYNC_SERIALIZATION', False)
+# Events older than the horizon are folded into the latest state of each entity.
+EVENTS_COMPACTION_HORIZON_IN_DAYS = env.int('EVENTS_COMPACTION_HORIZON_IN_DAYS', 90)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 PROCESS_COMMANDS_SCHEDULE_IN_MINUTES = env.int('PROCESS_COMMANDS_SCHEDULE_IN_MINUTES', 1)
@@ -174,6 +186,8 @@ GENERATE_ONLY_JSON_SNAPSHOT = env.bool('GENERATE_ONLY_JSON_SNAPSHOT', False)
 
 PDF_FILE_GENERATION_CHUNK_SIZE = env.int('PDF_FILE_GENERATION_CHUNK_SIZE', 100)
 PDF_FILE_GENERATION_THREADS_BATCH_SIZE = env.int('PDF_FILE_GENERATION_THREADS_BATCH_SIZE', 8)
+CSV_FILE_GENERATION_CHUNK_SIZE = env.int('CSV_FILE_GENERATION_CHUNK_SIZE', 500)
+REPORT_CACHE_LIFETIME = env.int('REPORT_CACHE_LIFETIME', 60 * 60 * 24)  # 1 day
 
 IMAGE_EXTENSIONS = tuple(ext.lstrip('.')
                          for ext in mimetypes.types_map
@@ -187,4 +201,12 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 2000
 
 HANDOVER_DOCUMENT_ARCHIVE_EXPIRATION_IN_DAYS = env.str('HANDOVER_DOCUMENT_ARCHIVE_EXPIRATION_IN_DAYS', 30)
 HANDOVER_DOCUMENT_ARCHIVE_PART_SIZE_IN_GB = env.str('HANDOVER_DOCUMENT_ARCHIVE_PART_SIZE_IN_GB', 10)
-HANDOVER_DOCUMENT_ARCHIVE_TEMP_FILE_FOLDER = env.str('HANDOVER_DOCUMENT_ARCHIVE_TEMP_FILE_FOLDER', '')
+HANDOVER_DOCUMENT_ARCHIVE_DOWNLOAD_THREADS = env.int('HANDOVER_DOCUMENT_ARCHIVE_DOWNLOAD_THREADS', 4)
+# Number of parts of a single archive generated at the same time.
+HANDOVER_DOCUMENT_ARCHIVE_PARTS_CONCURRENCY = env.int('HANDOVER_DOCUMENT_ARCHIVE_PARTS_CONCURRENCY', 4)
+HANDOVER_DOCUMENT_ARCHIVE_COMPRESSION_LEVEL = env.int('HANDOVER_DOCUMENT_ARCHIVE_COMPRESSION_LEVEL', 6)
+# Already compressed formats which are stored in archives as is.
+HANDOVER_DOCUMENT_ARCHIVE_STORED_EXTENSIONS = env.tuple('HANDOVER_DOCUMENT_ARCHIVE_STORED_EXTENSIONS', default=(
+    'pdf', 'jpg', 'jpeg', 'png', 'gif', 'webp', 'heic', 'heif', 'mp4', 'mov', 'm4v', 'avi', 'mkv', 'webm',
+    'mp3', 'm4a', 'aac', 'zip', 'rar', '7z', 'gz', 'docx', 'xlsx', 'pptx',
+))
@@ -6,6 +6,8 @@ CRON_CLASSES = [
     'api.jobs.UpdateSubtaskDefectStatusJob',
     'api.jobs.RemoveExpiredEditModeJob',
     'api.jobs.RecalculateStatisticsJob',
+    'api.jobs.CompactEventsJob',
+    'api.jobs.RefreshSearchDocumentsJob',
 ]
 
 if ENV != 'staging':